@@ -6,6 +6,10 @@ const nextConfig = {
   },
   // Enable static export for Vercel
   output: 'standalone',
+  // Episode data is read from data/ at runtime (src/lib/episodes.ts), not bundled
+  outputFileTracingIncludes: {
+    '/*': ['./data/**/*'],
+  },
 };
 
 export default nextConfig;
@@ -1,4 +1,11 @@
-import episodesData from './episodes_database.json';
+import fs from 'node:fs';
+import path from 'node:path';
+
+// Data is exported by scripts/export_nextjs_data.py:
+//   data/index.json          card fields of every episode, newest first
+//   data/map.json            episode number -> shard file
+//   data/episodes/<n>.json   full record of one episode
+const DATA_DIR = path.join(process.cwd(), 'data');
 
 // TypeScript interfaces
 export interface Episode {
@@ -23,36 +30,65 @@ export interface Episode {
     listeners?: string;
 }
 
-export interface EpisodesDatabase {
+// Listing entry: only what the episode cards render
+export type EpisodeSummary = Pick<
+    Episode,
+    'number' | 'title' | 'date' | 'status' | 'description' | 'topics' | 'flyer_urls'
+>;
+
+export interface EpisodesIndex {
     metadata: {
         total_episodes: number;
         last_updated: string;
     };
-    episodes: Episode[];
+    episodes: EpisodeSummary[];
+}
+
+function readJson<T>(file: string): T {
+    return JSON.parse(fs.readFileSync(path.join(DATA_DIR, file), 'utf-8')) as T;
 }
 
-// Cast the imported JSON to our type
-const database = episodesData as EpisodesDatabase;
+// The index and map are small; shards are read per request and never cached
+let index: EpisodesIndex | null = null;
+let shardMap: Record<string, string> | null = null;
+
+function getIndex(): EpisodesIndex {
+    if (!index) {
+        index = readJson<EpisodesIndex>('index.json');
+    }
+    return index;
+}
+
+function getShardMap(): Record<string, string> {
+    if (!shardMap) {
+        shardMap = readJson<Record<string, string>>('map.json');
+    }
+    return shardMap;
+}
 
 /**
- * Get all episodes
+ * Get all episodes (card fields only)
  */
-export function getAllEpisodes(): Episode[] {
-    return database.episodes;
+export function getAllEpisodes(): EpisodeSummary[] {
+    return getIndex().episodes;
 }
 
 /**
- * Get episode by number
+ * Get episode by number, reading only its shard
  */
 export function getEpisodeById(id: string): Episode | undefined {
-    return database.episodes.find(ep => ep.number === id);
+    const file = getShardMap()[id];
+    if (!file) {
+        return undefined;
+    }
+    return readJson<Episode>(path.join('episodes', file));
 }
 
 /**
  * Get hosted episodes (status: archived or published)
  */
-export function getHostedEpisodes(): Episode[] {
-    return database.episodes.filter(
+export function getHostedEpisodes(): EpisodeSummary[] {
+    return getAllEpisodes().filter(
         ep => ep.status === 'archived' || ep.status === 'published'
     );
 }
@@ -60,8 +96,8 @@ export function getHostedEpisodes(): Episode[] {
 /**
  * Get co-hosted episodes
  */
-export function getCohostedEpisodes(): Episode[] {
-    return database.episodes.filter(
+export function getCohostedEpisodes(): EpisodeSummary[] {
+    return getAllEpisodes().filter(
         ep => ep.status === 'co-hosted'
     );
 }
@@ -69,8 +105,8 @@ export function getCohostedEpisodes(): Episode[] {
 /**
  * Get scheduled episodes
  */
-export function getScheduledEpisodes(): Episode[] {
-    return database.episodes.filter(
+export function getScheduledEpisodes(): EpisodeSummary[] {
+    return getAllEpisodes().filter(
         ep => ep.status === 'scheduled'
     );
 }
@@ -79,5 +115,5 @@ export function getScheduledEpisodes(): Episode[] {
  * Get episode count
  */
 export function getEpisodeCount(): number {
-    return database.metadata.total_episodes;
+    return getIndex().metadata.total_episodes;
 }
@@ -1,6 +1,7 @@
 import json
 from datetime import datetime
 from pathlib import Path
+from db_io import load_json
 
 # Data from user
 raw_data = """
@@ -24,8 +25,7 @@ def parse_date(date_str):
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
 
     new_formatted_episodes = []
     
@@ -1,10 +1,10 @@
 import json
 from pathlib import Path
+from db_io import load_json
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
 
     # Check if 072 exists
     ep_072 = None
@@ -1,12 +1,11 @@
-import json
 import os
+from db_io import load_json, save_json
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, 'shared', 'episodes_database.json')
 
 def add_episode_046():
-    with open(DB_PATH, 'r') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
 
     episodes = data.get('episodes', [])
     
@@ -49,8 +48,7 @@ def add_episode_046():
     
     data['episodes'] = episodes
 
-    with open(DB_PATH, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    save_json(DB_PATH, data)
     
     print("Added Episode 046 and saved database.")
 
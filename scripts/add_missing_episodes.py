@@ -3,6 +3,7 @@ import json
 import os
 import glob
 from datetime import datetime
+from db_io import save_json
 
 DB_PATH = 'shared/episodes_database.json'
 AUDIO_DIR = 'shared/audio'
@@ -13,8 +14,7 @@ def load_db():
         return json.load(f)
 
 def save_db(data):
-    with open(DB_PATH, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    save_json(DB_PATH, data)
 
 def get_existing_ids(data):
     ids = set()
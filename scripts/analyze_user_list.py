@@ -1,12 +1,11 @@
-import json
 import re
 from pathlib import Path
+from db_io import load_json
 
 def main():
     # Load DB
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
     existing_nums = {ep["number"] for ep in db["episodes"]}
     
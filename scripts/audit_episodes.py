@@ -1,7 +1,7 @@
 
-import json
 import os
 import re
+from db_io import load_json
 
 DB_PATH = 'shared/episodes_database.json'
 NEW_DATA_PATH = 'scripts/new_data.txt'
@@ -74,8 +74,7 @@ def parse_new_data():
 def audit():
     new_eps = parse_new_data()
     
-    with open(DB_PATH, 'r') as f:
-        db = json.load(f)
+    db = load_json(DB_PATH)
         
     db_eps = {ep.get('number'): ep for ep in db.get('episodes', [])}
     
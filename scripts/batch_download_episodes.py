@@ -16,6 +16,7 @@ import argparse
 from pathlib import Path
 from typing import List, Dict
 from colorama import Fore, Style, init
+from db_io import save_json
 
 # Initialize colorama
 init(autoreset=True)
@@ -48,8 +49,7 @@ class BatchEpisodeDownloader:
     
     def save_database(self, db: Dict):
         """Save episodes database."""
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(db, f, indent=2, ensure_ascii=False)
+        save_json(self.db_path, db)
     
     def get_episodes_to_download(self, episode_nums: List[str] = None, pending_only: bool = False) -> List[Dict]:
         """Get list of episodes to download."""
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+BandaWeb3 Batch Content Generator
+Backfills threads, articles, LinkedIn posts and highlights for every
+transcribed space that has no generated content yet.
+
+Episodes are discovered from the hosted and spoken databases and matched to
+transcripts in E{num}_{date}/transcripts, shared/transcriptions and
+shared/transcriptions_fireflies. Progress is checkpointed per content type
+so an interrupted run resumes where it stopped and only failed types are
+retried. An episode counts as completed (and gets content_generated in the
+databases, in one batched update at the end) once every requested type
+succeeded.
+
+Usage:
+    python3 scripts/batch_generate_content.py --dry-run
+    python3 scripts/batch_generate_content.py --workers 3 --token-budget 2000000
+    python3 scripts/batch_generate_content.py --episodes 074,075 -t thread article
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+sys.path.append(str(Path(__file__).parent))
+
+import generate_content as gc
+from db_io import load_json, save_json, edit_json
+from episode_schema import extract_space_id
+from transcript_reader import open_path
+
+BASE_DIR = Path(__file__).parent.parent
+SHARED_DIR = BASE_DIR / "shared"
+DB_PATHS = [
+    SHARED_DIR / "episodes_database.json",
+    SHARED_DIR / "spoken_database.json",
+    SHARED_DIR / "consolidated_database.json",
+]
+DEEPGRAM_DIR = SHARED_DIR / "transcriptions"
+FIREFLIES_DIR = SHARED_DIR / "transcriptions_fireflies"
+CONTENT_DIR = SHARED_DIR / "content"
+CHECKPOINT_PATH = SHARED_DIR / "cache" / "batch_content_checkpoint.json"
+
+# Rough token estimate for planning the budget before any call is made
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS = {"thread": 4096, "article": 6000, "linkedin": 4096, "highlights": 3000}
+
+
+def find_episode_dirs(episodes_root):
+    """Map episode number -> E{num}_{date} directory with a transcript"""
+    dirs = {}
+    root = Path(episodes_root)
+    if not root.is_dir():
+        return dirs
+
+    for path in root.glob("E*_*"):
+        match = re.match(r'^E(\d+)_\d{4}-\d{2}-\d{2}$', path.name)
+        if match and (path / "transcripts").is_dir():
+            dirs[match.group(1).zfill(3)] = path
+    return dirs
+
+
+class BatchContentGenerator:
+    """Discover eligible episodes and generate their content in parallel."""
+
+    def __init__(self, episodes_root, content_types, workers=2, token_budget=None,
+                 force=False):
+        self.episodes_root = Path(episodes_root)
+        self.content_types = content_types
+        self.workers = workers
+        self.token_budget = token_budget
+        self.force = force
+        self.checkpoint = self.load_checkpoint()
+        self._lock = threading.Lock()
+
+    def load_checkpoint(self):
+        """Load progress from a previous run"""
+        checkpoint = load_json(CHECKPOINT_PATH) if CHECKPOINT_PATH.exists() else {}
+        checkpoint.setdefault("completed", {})
+        checkpoint.setdefault("failed", {})       # key -> {content type: error}
+        checkpoint.setdefault("partial", {})      # key -> {content type: saved file}
+        checkpoint.setdefault("tokens_used", 0)
+        return checkpoint
+
+    def save_checkpoint(self):
+        """Persist progress atomically (caller holds the lock)"""
+        save_json(CHECKPOINT_PATH, self.checkpoint)
+
+    def discover(self, episode_nums=None):
+        """
+        Build the work queue of episodes with a transcript and no content
+
+        Returns:
+            list: Jobs sorted by date (newest first)
+        """
+        episode_dirs = find_episode_dirs(self.episodes_root)
+        jobs = {}
+
+        # Consolidated duplicates both source DBs, so it is only used for
+        # the final flag update, not for discovery
+        for db_path in DB_PATHS[:2]:
+            if not db_path.exists():
+                continue
+            db = load_json(db_path)
+
+            for ep in db.get("episodes", []):
+                number = str(ep.get("number") or "")
+                space_id = extract_space_id(ep.get("space_url"))
+                key = space_id or number
+                if not key or key in jobs:
+                    continue
+                if episode_nums and number not in episode_nums:
+                    continue
+                if key in self.checkpoint["completed"]:
+                    continue
+                if ep.get("content_generated") and not self.force:
+                    continue
+
+                job = self.make_job(ep, key, space_id, episode_dirs.get(number.zfill(3)))
+                if job:
+                    jobs[key] = job
+
+        return sorted(jobs.values(), key=lambda j: j["metadata"]["date"], reverse=True)
+
+    def make_job(self, ep, key, space_id, episode_dir):
+        """Locate the transcript and output directory for one episode"""
+        # Types that succeeded in an earlier run are not generated again
+        done = self.checkpoint["partial"].get(key, {})
+        types = [t for t in self.content_types if t not in done]
+        transcript_path = None
+        if episode_dir is not None:
+            output_dir = episode_dir / "content"
+        else:
+            output_dir = CONTENT_DIR / key
+            if space_id:
+                for candidate in (DEEPGRAM_DIR / f"{space_id}.txt",
+                                  FIREFLIES_DIR / f"{space_id}_fireflies.txt"):
+                    if candidate.exists():
+                        transcript_path = candidate
+                        break
+            if transcript_path is None:
+                return None
+
+        if episode_dir is not None:
+            size = sum(p.stat().st_size for p in (episode_dir / "transcripts").glob("transcription.*"))
+        else:
+            size = transcript_path.stat().st_size
+
+        return {
+            "key": key,
+            "episode_dir": episode_dir,
+            "transcript_path": transcript_path,
+            "output_dir": output_dir,
+            "types": types,
+            "estimated_tokens": self.estimate_tokens(size, types),
+            "metadata": {
+                "episode_number": ep.get("number", "XXX"),
+                "title": ep.get("title", "BandaWeb3 Space"),
+                "date": ep.get("date") or "",
+            },
+        }
+
+    def estimate_tokens(self, transcript_bytes, types):
+        """Upper-bound token estimate for one episode across its content types"""
+        prompt_tokens = transcript_bytes // CHARS_PER_TOKEN
+        return sum(prompt_tokens + OUTPUT_TOKENS[t] for t in types)
+
+    def load_transcript(self, job):
+        """Load the transcript in the shape generate_content expects"""
+        if job["episode_dir"] is not None:
+            return gc.load_transcription(job["episode_dir"])
+        return gc.transcription_data(open_path(job["transcript_path"]))
+
+    def process(self, job):
+        """
+        Generate and save content for one episode
+
+        Returns:
+            tuple: ({content type: saved file}, [failed content types])
+        """
+        transcript = self.load_transcript(job)
+        content = gc.generate_all(transcript, job["metadata"], job["types"])
+        saved = {}
+        for content_type in job["types"]:
+            if content.get(content_type):
+                paths = gc.save_generated_content({content_type: content[content_type]}, job["output_dir"])
+                saved[content_type] = str(paths[0])
+        return saved, [t for t in job["types"] if t not in saved]
+
+    def run(self, jobs):
+        """Run the queue with bounded concurrency and token-budget accounting"""
+        total = len(jobs)
+        queue = list(jobs)
+        in_flight = {}
+        reserved = 0
+        done = 0
+        tokens_at_start = self.checkpoint["tokens_used"]
+
+        print(f"\n🚀 Generating content for {total} episodes with {self.workers} workers")
+        if self.token_budget:
+            print(f"💰 Token budget: {self.token_budget:,}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while queue or in_flight:
+                # Fill free worker slots while the budget allows
+                while queue and len(in_flight) < self.workers:
+                    job = queue[0]
+                    spent = tokens_at_start + gc.token_usage.total
+                    if self.token_budget and spent + reserved + job["estimated_tokens"] > self.token_budget:
+                        if not in_flight:
+                            print(f"\n⚠️  Token budget reached, {len(queue)} episodes left for the next run")
+                            queue = []
+                        break
+                    queue.pop(0)
+                    reserved += job["estimated_tokens"]
+                    in_flight[executor.submit(self.process, job)] = job
+
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = in_flight.pop(future)
+                    reserved -= job["estimated_tokens"]
+                    done += 1
+
+                    with self._lock:
+                        key = job["key"]
+                        try:
+                            saved, failed = future.result()
+                            errors = {t: "generation failed" for t in failed}
+                        except Exception as e:
+                            saved, failed = {}, job["types"]
+                            errors = {t: str(e) for t in failed}
+
+                        partial = self.checkpoint["partial"].setdefault(key, {})
+                        partial.update(saved)
+                        if failed:
+                            # Only the failed types are retried on the next run
+                            self.checkpoint["failed"][key] = errors
+                            print(f"❌ [{done}/{total}] {key}: failed {', '.join(failed)} "
+                                  f"({len(saved)} saved)")
+                        else:
+                            self.checkpoint["completed"][key] = sorted(partial.values())
+                            self.checkpoint["partial"].pop(key, None)
+                            self.checkpoint["failed"].pop(key, None)
+                            print(f"✓ [{done}/{total}] {key}: {len(partial)} files")
+                        self.checkpoint["tokens_used"] = tokens_at_start + gc.token_usage.total
+                        self.save_checkpoint()
+
+    def mark_generated(self):
+        """Set content_generated for every completed episode, one write per DB"""
+        completed = set(self.checkpoint["completed"])
+        if not completed:
+            return
+
+        for db_path in DB_PATHS:
+            if not db_path.exists():
+                continue
+            # Under the DB lock, so a sync running meanwhile doesn't lose its edits
+            with edit_json(db_path) as db:
+                changed = 0
+                for ep in db.get("episodes", []):
+                    key = extract_space_id(ep.get("space_url")) or str(ep.get("number") or "")
+                    if key in completed and not ep.get("content_generated"):
+                        ep["content_generated"] = True
+                        changed += 1
+
+            if changed:
+                print(f"💾 {db_path.name}: marked {changed} episodes as content_generated")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill generated content across the transcribed catalog"
+    )
+    parser.add_argument(
+        "--episodes",
+        help="Comma-separated episode numbers to limit the run (e.g., 074,075)"
+    )
+    parser.add_argument(
+        "--episodes-root",
+        default=os.getenv("BASE_STORAGE_PATH", str(BASE_DIR.parent)),
+        help="Directory containing E{num}_{date} episode folders"
+    )
+    parser.add_argument(
+        "-t", "--types",
+        nargs="+",
+        choices=gc.CONTENT_TYPES + ["all"],
+        default=["all"],
+        help="Content types to generate"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Episodes processed at the same time (default: 2)"
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Maximum simultaneous Claude API calls across all workers"
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        help="Stop queueing new episodes once this many tokens are spent"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Include episodes already marked content_generated"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the work queue"
+    )
+
+    args = parser.parse_args()
+
+    content_types = gc.CONTENT_TYPES if "all" in args.types else [
+        t for t in gc.CONTENT_TYPES if t in args.types
+    ]
+    episode_nums = None
+    if args.episodes:
+        episode_nums = [num.strip() for num in args.episodes.split(",")]
+
+    batch = BatchContentGenerator(
+        episodes_root=args.episodes_root,
+        content_types=content_types,
+        workers=args.workers,
+        token_budget=args.token_budget,
+        force=args.force
+    )
+    jobs = batch.discover(episode_nums)
+
+    estimated = sum(job["estimated_tokens"] for job in jobs)
+    print(f"📋 {len(jobs)} episodes eligible (~{estimated:,} tokens estimated)")
+    print(f"✓ {len(batch.checkpoint['completed'])} already completed in checkpoint")
+
+    if args.dry_run:
+        for job in jobs:
+            print(f"  - {job['key']} ({job['metadata']['date']}): {job['metadata']['title']}")
+        return
+
+    if not jobs and not batch.checkpoint["completed"]:
+        print("⚠️  Nothing to generate")
+        return
+
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        print("❌ ERROR: ANTHROPIC_API_KEY not found in environment variables")
+        sys.exit(1)
+
+    gc.rate_limiter = gc.RateLimiter(max_concurrent=args.max_concurrent)
+    gc.response_cache = gc.ResponseCache()
+
+    start = time.monotonic()
+    try:
+        batch.run(jobs)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted, saving progress...")
+    finally:
+        batch.mark_generated()
+
+    stats = gc.response_cache.stats
+    print(f"\n{'='*60}")
+    print("✅ BATCH GENERATION COMPLETE")
+    print(f"{'='*60}")
+    print(f"Completed: {len(batch.checkpoint['completed'])}")
+    print(f"Failed: {len(batch.checkpoint['failed'])}")
+    print(f"Tokens used (all runs): {batch.checkpoint['tokens_used']:,}")
+    print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses")
+    print(f"Elapsed: {time.monotonic() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the build and data scripts on synthetic catalogs.
+
+The real catalog is ~1,000 episodes, too small to show how the build and
+sync scripts scale. `run` generates a workspace per catalog size with the
+same layout the scripts expect (shared/*.json databases, Deepgram and
+Fireflies transcript JSON, Spaces Dashboard XLSX exports) and runs each
+benchmark in a fresh child process with that workspace as cwd. For each
+one it records:
+
+    wall        seconds spent in the benchmarked call (imports and setup excluded)
+    peak_rss    max resident set size of the child, KiB
+    file_ops    opens for read / write, renames, removes, copies, dir listings
+                (counted with a sys.addaudithook hook)
+    io          bytes read / written by the child (/proc/self/io, Linux)
+    counters    instrumentation counters (pages_rendered, bytes_written, ...)
+
+Results are appended to shared/cache/benchmarks.jsonl together with the
+git commit they were measured on; `compare` lines two commits up side by
+side. Benchmarks run in a fixed order and some mutate the workspace
+(update_stats writes stats, the Excel syncs add episodes), so a run is
+only comparable with runs of the same sizes and seed.
+
+Usage:
+    python3 scripts/benchmark.py run                                  # 10k episodes
+    python3 scripts/benchmark.py run --sizes 10000 100000 --transcripts 2000
+    python3 scripts/benchmark.py run --only simple_build merge_full
+    python3 scripts/benchmark.py compare                              # last two commits
+    python3 scripts/benchmark.py compare 4c2d79b HEAD
+    python3 scripts/benchmark.py list
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import string
+import zipfile
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from collections import Counter
+from xml.sax.saxutils import escape
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+sys.path.append(str(SCRIPTS_DIR))
+
+RESULTS_PATH = REPO_DIR / 'shared' / 'cache' / 'benchmarks.jsonl'
+STATIC_DIR = REPO_DIR / 'website' / 'static'
+
+DEFAULT_SIZES = (10_000,)
+DEFAULT_TRANSCRIPTS = 1_000
+DEFAULT_SEED = 42
+DEFAULT_TIMEOUT = 1800
+UTTERANCES_PER_TRANSCRIPT = 400
+SENTENCES_PER_TRANSCRIPT = 800
+SPOKEN_RATIO = 0.5        # spoken_database size relative to the catalog
+SPOKEN_OVERLAP = 0.25     # share of spoken records that duplicate a catalog episode
+EXCEL_NEW_ROWS = 0.1      # share of dashboard rows with no episode in the DB
+INCREMENTAL_CHANGES = 0.01
+
+WORDS = (
+    "web3 blockchain ethereum comunidad desarrolladores hackathon defi nft dao "
+    "contratos inteligentes wallets seguridad privacidad zk rollups layer2 gobernanza "
+    "tokens stablecoins mexico latam builders evento conferencia pagos identidad "
+    "descentralizada infraestructura validadores staking oráculos bitcoin solana "
+    "educación regulación mercado startups inversión comunidad espacio invitados"
+).split()
+TOPICS = ("DeFi", "NFTs", "DAOs", "ZK", "Layer 2", "Ethereum", "Bitcoin", "Regulación",
+          "Hackathon", "Educación", "Pagos", "Identidad", "Gaming", "Seguridad")
+DURATION_STYLES = ('clock', 'short', 'minutes', 'long')
+
+
+# --- Synthetic data ---
+
+def _words(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def _space_id(rng):
+    return '1' + ''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(12))
+
+
+def _duration(rng):
+    seconds = rng.randint(15 * 60, 3 * 3600)
+    h, m, s = seconds // 3600, seconds % 3600 // 60, seconds % 60
+    style = rng.choice(DURATION_STYLES)
+    if style == 'clock':
+        return f"{h:02}:{m:02}:{s:02}"
+    if style == 'short':
+        return f"{h}h {m}m" if h else f"{m}m"
+    if style == 'minutes':
+        return f"{seconds // 60} min"
+    return f"{h} hours, {m} minutes, {s} seconds"
+
+
+def _handles(rng, n):
+    return [f"@{rng.choice(WORDS)}_{i}" for i in range(n)]
+
+
+def make_catalog(n, rng):
+    """episodes_database records: hosted (some numbered) and co-hosted, oldest first"""
+    hosts = _handles(rng, max(50, n // 20))
+    start = date(2019, 1, 1)
+    days = max(1, (date(2025, 12, 31) - start).days)
+    per_day = Counter()
+    numbered = 0
+    episodes = []
+    for i in range(n):
+        day = start + timedelta(days=i * days // n)
+        per_day[day] += 1
+        hosted = rng.random() < 0.6
+        is_numbered = hosted and rng.random() < 0.05
+        if is_numbered:
+            numbered += 1
+            number = f"{numbered:03d}"
+        else:
+            number = day.strftime('%Y%m%d')
+            if per_day[day] > 1:
+                number += f"-{per_day[day]}"
+        space_id = _space_id(rng)
+        title = _words(rng, rng.randint(4, 10)).capitalize()
+        episode = {
+            'number': number,
+            'title': f"BandaWeb3 #{number} {title}" if is_numbered else title,
+            'date': day.isoformat(),
+            'space_url': f"https://x.com/i/spaces/{space_id}",
+            'flyer_urls': [f"flyer_{number}.jpg"] if is_numbered else [],
+            'guests': [rng.choice(hosts) for _ in range(rng.randint(0, 4))],
+            'duration': _duration(rng),
+            'description': _words(rng, rng.randint(20, 60)).capitalize() + '.',
+            'topics': rng.sample(TOPICS, rng.randint(0, 5)),
+            'status': 'published' if hosted else 'co-hosted',
+            'transcript_available': False,
+            'content_generated': False,
+            'type': 'hosted' if hosted else 'co-hosted',
+            'listeners': rng.randint(5, 3000) if rng.random() < 0.8 else str(rng.randint(5, 3000)),
+            'host': '@meximalist' if hosted else rng.choice(hosts),
+            'speakers': rng.randint(2, 25),
+            'spacesdashboard_url': f"https://spacesdashboard.com/space/{space_id}/{title.lower().replace(' ', '-')[:40]}",
+            'is_numbered': is_numbered,
+        }
+        episodes.append(episode)
+    return episodes
+
+
+def make_spoken(catalog, rng):
+    """spoken_database records; SPOKEN_OVERLAP of them share a space with the catalog"""
+    n = int(len(catalog) * SPOKEN_RATIO)
+    hosts = _handles(rng, max(50, n // 10))
+    spoken = []
+    for _ in range(n):
+        if rng.random() < SPOKEN_OVERLAP:
+            base = rng.choice(catalog)
+            space_url = base['space_url']
+            day = base['date']
+        else:
+            space_url = f"https://x.com/i/spaces/{_space_id(rng)}"
+            day = (date(2019, 1, 1) + timedelta(days=rng.randint(0, 2500))).isoformat()
+        spoken.append({
+            'type': 'Spoken',
+            'title': _words(rng, rng.randint(4, 10)).capitalize(),
+            'host': rng.choice(hosts),
+            'listeners': rng.randint(5, 5000),
+            'date': day,
+            'speakers': rng.randint(2, 30),
+            'duration': _duration(rng),
+            'space_url': space_url,
+            'spacesdashboard_url': space_url.replace('x.com/i/spaces', 'spacesdashboard.com/space'),
+            'number': day.replace('-', ''),
+        })
+    return spoken
+
+
+def make_deepgram(rng, duration=3600):
+    """Deepgram /v1/listen response with diarized utterances"""
+    utterances = []
+    t = 0.0
+    step = duration / UTTERANCES_PER_TRANSCRIPT
+    for _ in range(UTTERANCES_PER_TRANSCRIPT):
+        length = step * rng.uniform(0.5, 1.5)
+        sentences = [_words(rng, rng.randint(5, 18)).capitalize() + rng.choice('.?!')
+                     for _ in range(rng.randint(1, 6))]
+        utterances.append({
+            'start': round(t, 2),
+            'end': round(t + length, 2),
+            'confidence': round(rng.uniform(0.7, 1.0), 4),
+            'channel': 0,
+            'transcript': ' '.join(sentences),
+            'speaker': rng.randint(0, 5),
+        })
+        t += length
+    return {
+        'metadata': {'duration': round(t, 2), 'channels': 1, 'models': ['nova-2']},
+        'results': {'utterances': utterances},
+    }
+
+
+def make_fireflies(rng, title, duration=3600):
+    """Fireflies GraphQL `transcript` payload"""
+    speakers = [{'id': i, 'name': f"Speaker {i}"} for i in range(rng.randint(2, 8))]
+    sentences = []
+    t = 0.0
+    step = duration / SENTENCES_PER_TRANSCRIPT
+    for i in range(SENTENCES_PER_TRANSCRIPT):
+        speaker = rng.choice(speakers)
+        text = _words(rng, rng.randint(4, 20)).capitalize() + '.'
+        sentences.append({
+            'index': i,
+            'speaker_name': speaker['name'],
+            'speaker_id': speaker['id'],
+            'text': text,
+            'raw_text': text.lower(),
+            'start_time': round(t, 2),
+            'end_time': round(t + step, 2),
+        })
+        t += step
+    return {'id': _space_id(rng), 'title': f"BandaWeb3 - {title}", 'date': 0,
+            'duration': round(t / 60, 2), 'speakers': speakers, 'sentences': sentences}
+
+
+def _dashboard_date(iso):
+    d = date.fromisoformat(iso)
+    return f"{d.strftime('%b')} {d.day} {d.year}"
+
+
+def _dashboard_rows(episodes, rng, cohosted=False):
+    """Spaces Dashboard rows for episodes, plus EXCEL_NEW_ROWS unknown spaces"""
+    rows = []
+    extra = [dict(e, title=_words(rng, 6).capitalize(), space_url=f"https://x.com/i/spaces/{_space_id(rng)}")
+             for e in rng.sample(episodes, int(len(episodes) * EXCEL_NEW_ROWS))] if episodes else []
+    for ep in episodes + extra:
+        desc = (f"{ep['title']} - Ended: {_dashboard_date(ep['date'])} - "
+                f"Speakers: {ep['speakers']} - Duration: {ep['duration']}")
+        row = {
+            'B': (desc, ep['spacesdashboard_url']),
+            'C': (str(ep['listeners']), None),
+            'D': ('Link', ep['space_url']),
+        }
+        if cohosted:
+            handle = ep['host'].lstrip('@')
+            row['A'] = (f"{handle.title()}@{handle}12k", f"https://spacesdashboard.com/u/{handle}")
+            row['E'] = ('@meximalist', None)
+        rows.append(row)
+    return rows
+
+
+def write_xlsx(path, rows, header=('Host', 'Description', 'Listeners', 'Link', 'Cohost')):
+    """
+    Minimal single-sheet workbook: inline strings and cell hyperlinks, the
+    parts of a Spaces Dashboard export that xlsx_reader reads
+    """
+    cells = []
+    links = []
+    all_rows = [{col: (text, None) for col, text in zip('ABCDE', header)}] + rows
+    for r, row in enumerate(all_rows, 1):
+        parts = [f'<row r="{r}">']
+        for col in sorted(row):
+            text, link = row[col]
+            ref = f"{col}{r}"
+            parts.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(str(text))}</t></is></c>')
+            if link:
+                links.append((ref, link))
+        parts.append('</row>')
+        cells.append(''.join(parts))
+
+    ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    ns_r = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    ns_pkg = 'http://schemas.openxmlformats.org/package/2006/relationships'
+    hyperlinks = ''.join(f'<hyperlink ref="{ref}" r:id="rId{i}"/>' for i, (ref, _) in enumerate(links, 1))
+    sheet = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+             f'<worksheet xmlns="{ns}" xmlns:r="{ns_r}"><sheetData>{"".join(cells)}</sheetData>'
+             f'<hyperlinks>{hyperlinks}</hyperlinks></worksheet>')
+    sheet_rels = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{ns_pkg}">'
+                  + ''.join(f'<Relationship Id="rId{i}" Type="{ns_r}/hyperlink" Target="{escape(url)}" '
+                            f'TargetMode="External"/>' for i, (_, url) in enumerate(links, 1))
+                  + '</Relationships>')
+    workbook = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><workbook xmlns="{ns}" '
+                f'xmlns:r="{ns_r}"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>')
+    workbook_rels = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{ns_pkg}">'
+                     f'<Relationship Id="rId1" Type="{ns_r}/worksheet" Target="worksheets/sheet1.xml"/>'
+                     f'</Relationships>')
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>')
+    root_rels = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{ns_pkg}">'
+                 f'<Relationship Id="rId1" Type="{ns_r}/officeDocument" Target="xl/workbook.xml"/>'
+                 f'</Relationships>')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', content_types)
+        zf.writestr('_rels/.rels', root_rels)
+        zf.writestr('xl/workbook.xml', workbook)
+        zf.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+        zf.writestr('xl/worksheets/sheet1.xml', sheet)
+        zf.writestr('xl/worksheets/_rels/sheet1.xml.rels', sheet_rels)
+
+
+def build_workspace(root, size, transcripts, seed):
+    """Populate root with a synthetic shared/ tree for a catalog of `size` episodes"""
+    from db_io import save_json
+
+    rng = random.Random(f"{seed}-{size}")
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    shared = root / 'shared'
+    for sub in ('inputs', 'cache', 'flyers', 'transcriptions', 'transcriptions_fireflies'):
+        (shared / sub).mkdir(parents=True, exist_ok=True)
+    if STATIC_DIR.exists():
+        shutil.copytree(STATIC_DIR, root / 'website' / 'static')
+
+    catalog = make_catalog(size, rng)
+    spoken = make_spoken(catalog, rng)
+    today = datetime.now().strftime('%Y-%m-%d')
+    save_json(shared / 'episodes_database.json', {
+        'metadata': {'podcast_name': 'BandaWeb3', 'last_updated': today, 'total_episodes': len(catalog)},
+        'episodes': catalog,
+    })
+    save_json(shared / 'spoken_database.json', {
+        'metadata': {'podcast_name': 'BandaWeb3 Spoken', 'last_updated': today, 'total_episodes': len(spoken)},
+        'episodes': spoken,
+    })
+
+    for ep in rng.sample(catalog, min(transcripts, len(catalog))):
+        space_id = ep['space_url'].rsplit('/', 1)[-1]
+        save_json(shared / 'transcriptions' / f"{space_id}.json", make_deepgram(rng))
+        save_json(shared / 'transcriptions_fireflies' / f"{space_id}_fireflies.json",
+                  make_fireflies(rng, ep['title']))
+
+    hosted = [e for e in catalog if e['type'] == 'hosted']
+    cohosted = [e for e in catalog if e['type'] == 'co-hosted']
+    write_xlsx(shared / 'inputs' / 'Hosted - Spaces Dashboard.xlsx', _dashboard_rows(hosted, rng))
+    write_xlsx(shared / 'inputs' / 'Cohosted - Spaces Dashboard.xlsx', _dashboard_rows(cohosted, rng, cohosted=True))
+    return root
+
+
+# --- Benchmarks ---
+#
+# Each entry: (setup, prepare). setup() runs in its own child before the
+# measured one; prepare() does the imports and returns the callable that is
+# timed. Both run with the workspace as cwd.
+
+def _format_deepgram():
+    from db_io import load_json
+    import transcribe_deepgram
+    files = sorted(Path('shared/transcriptions').glob('*.json'))
+
+    def run():
+        for path in files:
+            text = transcribe_deepgram.generate_formatted_transcript(load_json(path), space_id=path.stem)
+            path.with_suffix('.txt').write_text(text, encoding='utf-8')
+    return run
+
+
+def _format_fireflies():
+    from db_io import load_json
+    import download_fireflies_transcripts as fireflies
+    files = sorted(Path('shared/transcriptions_fireflies').glob('*_fireflies.json'))
+
+    def run():
+        db_data = fireflies.load_database()
+        for path in files:
+            space_id = path.name[:-len('_fireflies.json')]
+            metadata = fireflies.find_episode_in_db(space_id, db_data)
+            text = fireflies.generate_formatted_transcript(load_json(path), metadata)
+            path.with_name(f"{space_id}_fireflies.txt").write_text(text, encoding='utf-8')
+    return run
+
+
+def _update_stats(full):
+    def prepare():
+        import update_stats
+        return lambda: update_stats.update_stats(full=full)
+    return prepare
+
+
+def _merge(full):
+    def prepare():
+        import merge_databases
+        return lambda: merge_databases.merge_databases(full=full)
+    return prepare
+
+
+def _touch_spoken():
+    """Change INCREMENTAL_CHANGES of the spoken records, for the incremental merge"""
+    from db_io import edit_json
+    with edit_json('shared/spoken_database.json') as data:
+        episodes = data['episodes']
+        step = max(1, int(1 / INCREMENTAL_CHANGES))
+        for ep in episodes[::step]:
+            ep['listeners'] = ep.get('listeners', 0) + 1
+
+
+def _simple_build():
+    import simple_build
+    return simple_build.generate
+
+
+def _sync_hosted():
+    import runpy
+    script = str(SCRIPTS_DIR / 'sync_hosted_excel.py')
+    return lambda: runpy.run_path(script, run_name='__main__')
+
+
+def _sync_cohosted():
+    import sync_cohosted_excel
+    return sync_cohosted_excel.sync
+
+
+BENCHMARKS = {
+    'format_deepgram': (None, _format_deepgram),
+    'format_fireflies': (None, _format_fireflies),
+    'update_stats_full': (None, _update_stats(True)),
+    'update_stats': (None, _update_stats(False)),
+    'merge_full': (None, _merge(True)),
+    'merge_incremental': (_touch_spoken, _merge(False)),
+    'simple_build': (None, _simple_build),
+    'sync_hosted_excel': (None, _sync_hosted),
+    'sync_cohosted_excel': (None, _sync_cohosted),
+}
+
+
+# --- Child process ---
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+_AUDIT_EVENTS = {
+    'os.rename': 'renames',
+    'os.remove': 'removes',
+    'shutil.copyfile': 'copies',
+    'os.listdir': 'listdirs',
+    'os.scandir': 'listdirs',
+    'os.mkdir': 'mkdirs',
+}
+
+
+def _proc_io():
+    """(bytes read, bytes written) of this process, or None off Linux"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _child(name, phase, result_path):
+    import resource
+    import instrumentation as instr
+
+    setup, prepare = BENCHMARKS[name]
+    if phase == 'setup':
+        setup()
+        return
+
+    func = prepare()
+    ops = Counter()
+    active = False
+
+    def hook(event, args):
+        if not active:
+            return
+        if event == 'open':
+            mode, flags = args[1], args[2]
+            writing = any(c in mode for c in 'wax+') if isinstance(mode, str) else bool(flags & _WRITE_FLAGS)
+            ops['writes' if writing else 'reads'] += 1
+        elif event in _AUDIT_EVENTS:
+            ops[_AUDIT_EVENTS[event]] += 1
+
+    sys.addaudithook(hook)
+    io_before = _proc_io()
+    active = True
+    t0 = time.perf_counter()
+    func()
+    wall = time.perf_counter() - t0
+    active = False
+    io_after = _proc_io()
+
+    result = {
+        'wall': round(wall, 4),
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'file_ops': dict(ops),
+        'counters': instr.registry.snapshot()['counters'],
+    }
+    if io_before and io_after:
+        result['io'] = {'read': io_after[0] - io_before[0], 'written': io_after[1] - io_before[1]}
+    Path(result_path).write_text(json.dumps(result), encoding='utf-8')
+
+
+def _spawn(name, phase, workspace, result_path, timeout):
+    """Run one child; returns 'ok', 'timeout' or 'failed (exit N)'"""
+    log = Path(workspace) / 'logs' / f"{name}.{phase}.log"
+    log.parent.mkdir(exist_ok=True)
+    env = dict(os.environ, BANDAWEB3_TRACE='off', PYTHONHASHSEED='0')
+    env.pop('BANDAWEB3_PROFILE', None)
+    with open(log, 'w') as out:
+        try:
+            proc = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), '_child', name, phase, str(result_path)],
+                cwd=workspace, env=env, stdout=out, stderr=subprocess.STDOUT, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return 'timeout'
+    return 'ok' if proc.returncode == 0 else f"failed (exit {proc.returncode}, see {log})"
+
+
+# --- Run / compare ---
+
+def git_revision():
+    """(short commit, dirty) of the repository the benchmarks were run from"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+
+def _fmt_bytes(n):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(n) < 1024 or unit == 'GiB':
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+def run(sizes, transcripts, seed, only, timeout, workdir=None, keep=False, results_path=RESULTS_PATH):
+    names = [n for n in BENCHMARKS if not only or n in only]
+    commit, dirty = git_revision()
+    base = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix='bandaweb3-bench-'))
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Commit {commit}{' (dirty)' if dirty else ''}, workspaces in {base}")
+    for size in sizes:
+        workspace = base / f"catalog-{size}"
+        t0 = time.perf_counter()
+        build_workspace(workspace, size, transcripts, seed)
+        print(f"\n{'='*78}\n{size:,} episodes, {min(transcripts, size):,} transcripts "
+              f"(generated in {time.perf_counter() - t0:.1f}s)\n{'='*78}")
+        print(f"{'benchmark':<22}{'wall':>10}{'peak RSS':>12}{'reads':>8}{'writes':>8}{'renames':>9}{'written':>11}")
+
+        for name in names:
+            result_file = workspace / 'logs' / f"{name}.json"
+            status = 'ok'
+            if BENCHMARKS[name][0] is not None:
+                status = _spawn(name, 'setup', workspace, result_file, timeout)
+            if status == 'ok':
+                status = _spawn(name, 'run', workspace, result_file, timeout)
+
+            record = {
+                'benchmark': name, 'size': size, 'transcripts': min(transcripts, size), 'seed': seed,
+                'commit': commit, 'dirty': dirty, 'python': sys.version.split()[0],
+                'timestamp': datetime.now().isoformat(timespec='seconds'), 'status': status,
+            }
+            if status == 'ok':
+                record.update(json.loads(result_file.read_text(encoding='utf-8')))
+                ops = record['file_ops']
+                written = _fmt_bytes(record['io']['written']) if 'io' in record else '-'
+                print(f"{name:<22}{record['wall']:>9.2f}s{_fmt_bytes(record['peak_rss'] * 1024):>12}"
+                      f"{ops.get('reads', 0):>8}{ops.get('writes', 0):>8}{ops.get('renames', 0):>9}{written:>11}")
+            else:
+                print(f"{name:<22}  {status}")
+            with open(results_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    if not keep and not workdir:
+        shutil.rmtree(base, ignore_errors=True)
+    print(f"\nResults appended to {results_path}")
+
+
+def load_results(path=RESULTS_PATH):
+    records = []
+    if Path(path).exists():
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    return records
+
+
+def compare(base=None, head=None, results_path=RESULTS_PATH):
+    records = [r for r in load_results(results_path) if r.get('status') == 'ok']
+    commits = list(dict.fromkeys(r['commit'] for r in records))
+    if head in (None, 'HEAD'):
+        head = commits[-1] if commits else None
+    if base is None:
+        earlier = [c for c in commits if c != head]
+        base = earlier[-1] if earlier else None
+    if not base or not head:
+        print("Need results for two commits; run the benchmarks on each first.")
+        return
+
+    def latest(commit):
+        picked = {}
+        for r in records:
+            if r['commit'].startswith(commit) or commit.startswith(r['commit']):
+                picked[(r['benchmark'], r['size'])] = r
+        return picked
+
+    a, b = latest(base), latest(head)
+    keys = [k for k in b if k in a]
+    if not keys:
+        print(f"No benchmark was run on both {base} and {head}.")
+        return
+
+    print(f"{base} -> {head}")
+    print(f"{'benchmark':<22}{'size':>9}{'wall':>19}{'change':>9}{'peak RSS':>23}{'file ops':>16}")
+    for name, size in sorted(keys, key=lambda k: (k[1], list(BENCHMARKS).index(k[0]) if k[0] in BENCHMARKS else 0)):
+        ra, rb = a[(name, size)], b[(name, size)]
+        change = (rb['wall'] - ra['wall']) / ra['wall'] if ra['wall'] else 0
+        ops_a, ops_b = sum(ra['file_ops'].values()), sum(rb['file_ops'].values())
+        print(f"{name:<22}{size:>9,}{ra['wall']:>9.2f}s ->{rb['wall']:>6.2f}s{change:>+9.0%}"
+              f"{_fmt_bytes(ra['peak_rss'] * 1024):>11} ->{_fmt_bytes(rb['peak_rss'] * 1024):>9}"
+              f"{ops_a:>8} ->{ops_b:>6}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '_child':
+        _child(*sys.argv[2:5])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the build and data scripts on synthetic catalogs")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_p = sub.add_parser('run', help="Generate catalogs and run the benchmarks")
+    run_p.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Catalog sizes (episodes)")
+    run_p.add_argument('--transcripts', type=int, default=DEFAULT_TRANSCRIPTS,
+                       help=f"Transcripts per provider (default: {DEFAULT_TRANSCRIPTS})")
+    run_p.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    run_p.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Run only these benchmarks")
+    run_p.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="Seconds per benchmark")
+    run_p.add_argument('--workdir', help="Where to build the workspaces (default: a temp dir)")
+    run_p.add_argument('--keep', action='store_true', help="Keep the workspaces afterwards")
+    run_p.add_argument('--results', default=str(RESULTS_PATH))
+
+    cmp_p = sub.add_parser('compare', help="Compare the results of two commits")
+    cmp_p.add_argument('base', nargs='?', help="Base commit (default: the previous one benchmarked)")
+    cmp_p.add_argument('head', nargs='?', help="Head commit (default: the latest one benchmarked)")
+    cmp_p.add_argument('--results', default=str(RESULTS_PATH))
+
+    sub.add_parser('list', help="List the benchmarks")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run(args.sizes, args.transcripts, args.seed, args.only, args.timeout,
+            workdir=args.workdir, keep=args.keep, results_path=args.results)
+    elif args.command == 'compare':
+        compare(args.base, args.head, args.results)
+    else:
+        for name, (setup, _) in BENCHMARKS.items():
+            print(f"{name}{'  (with setup)' if setup else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-import json
+from db_io import load_json, save_json
 
 db_path = 'shared/episodes_database.json'
 
@@ -14,8 +14,7 @@ corrections = {
     'Diego Benítez Concha': '@diegobc28'
 }
 
-with open(db_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 count = 0
 for ep in data['episodes']:
@@ -30,7 +29,6 @@ for ep in data['episodes']:
             count += 1
             print(f"Updated host for '{title}': {old_host} -> {new_host}")
 
-with open(db_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+save_json(db_path, data)
 
 print(f"Cleaned {count} host handles.")
@@ -3,18 +3,20 @@
 Script para eliminar duplicados internos de episodes_database.json y hacer merge de la información
 """
 
-import json
-from collections import defaultdict
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from duplicate_engine import DuplicateEngine
+import db_io
 
 def load_json(filepath):
     """Carga un archivo JSON"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return db_io.load_json(filepath)
 
 def save_json(data, filepath):
-    """Guarda datos en un archivo JSON"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Guarda datos en un archivo JSON (escritura atómica, solo si cambiaron)"""
+    return db_io.save_json(filepath, data)
 
 def merge_episode_data(ep1, ep2):
     """Merge dos episodios duplicados, tomando la mejor información de cada uno"""
@@ -86,44 +88,43 @@ def remove_internal_duplicates():
     
     print(f"📊 Episodios antes: {len(episodes_list)}")
     
-    # Agrupar episodios por space_url
-    episodes_by_url = defaultdict(list)
-    episodes_without_url = []
-    
-    for ep in episodes_list:
-        space_url = ep.get('space_url', '')
-        if space_url:
-            episodes_by_url[space_url].append(ep)
-        else:
-            episodes_without_url.append(ep)
+    # Agrupar duplicados por space ID (hash-join del duplicate_engine)
+    groups = DuplicateEngine({'episodes': episodes_list}).find().within('episodes')
+    first_of_group = {}
+    duplicate_indices = set()
+    for group in groups:
+        indices = [m.index for m in group.members]
+        first_of_group[indices[0]] = group
+        duplicate_indices.update(indices[1:])
     
-    # Procesar duplicados
+    # Procesar duplicados, conservando el orden original
     unique_episodes = []
     duplicates_merged = []
     
-    for space_url, eps in episodes_by_url.items():
-        if len(eps) == 1:
+    for index, ep in enumerate(episodes_list):
+        if index in duplicate_indices:
+            continue
+        group = first_of_group.get(index)
+        if group is None:
             # No hay duplicado
-            unique_episodes.append(eps[0])
-        else:
-            # Hay duplicados, hacer merge
-            print(f"🔄 Merging {len(eps)} duplicados: {eps[0].get('title', 'N/A')}")
-            
-            # Merge todos los duplicados
-            merged = eps[0]
-            for ep in eps[1:]:
-                merged = merge_episode_data(merged, ep)
-            
-            unique_episodes.append(merged)
-            duplicates_merged.append({
-                'space_url': space_url,
-                'title': merged.get('title'),
-                'count': len(eps),
+            unique_episodes.append(ep)
+            continue
+        
+        # Hay duplicados, hacer merge
+        eps = [m.record for m in group.members]
+        print(f"🔄 Merging {len(eps)} duplicados: {eps[0].get('title', 'N/A')}")
+        
+        merged = eps[0]
+        for dup in eps[1:]:
+            merged = merge_episode_data(merged, dup)
+        
+        unique_episodes.append(merged)
+        duplicates_merged.append({
+            'space_url': merged.get('space_url'),
+            'title': merged.get('title'),
+            'count': len(eps),
                 'numbers': [ep.get('number') for ep in eps]
-            })
-    
-    # Agregar episodios sin URL
-    unique_episodes.extend(episodes_without_url)
+        })
     
     # Ordenar por fecha (más reciente primero)
     unique_episodes.sort(key=lambda x: x.get('date', ''), reverse=True)
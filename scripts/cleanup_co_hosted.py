@@ -1,11 +1,11 @@
 
 import json
 from pathlib import Path
+from db_io import load_json
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
 
     # Filter out episodes that look like the ones we just added
     # They have description starting with "Co-hosted Space:"
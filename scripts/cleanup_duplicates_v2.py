@@ -1,19 +1,12 @@
 
-import json
 import os
 
+from db_io import load_json, save_json
+
 DB_PATH = 'shared/episodes_database.json'
 SPOKEN_PATH = 'shared/spoken_database.json'
 AUDIO_DIR = 'shared/audio'
 
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_json(path, data):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 def main():
     print("🧹 Cleaning up duplicates...")
     db = load_json(DB_PATH)
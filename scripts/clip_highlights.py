@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Cut the highlight clips that generate_content.py picks.
+
+For every highlight in content/video_highlights.json:
+
+1. start_time/end_time ("MM:SS" or "HH:MM:SS") are snapped to the
+   nearest utterance boundary within SNAP_SECONDS (transcript_index), or
+   to the nearest word boundary, so clips do not start or end mid-word.
+2. The clip is cut from the episode audio with ffmpeg stream copy
+   (-ss before -i seeks to the nearest MP3 frame; nothing is re-encoded).
+   Only if the copy fails is the clip re-encoded. With --video an
+   audiogram (waveform MP4) is rendered too. That needs a video encode,
+   but only over the clip's own seconds.
+3. Cuts run in a process pool. Results are cached in shared/cache/clips
+   by (audio sha256, start, end, kind), so rerunning after editing one
+   highlight only cuts that one.
+
+Output, next to the highlights:
+
+    content/clips/01-<title>.mp3 (.mp4)
+    content/clips/01-<title>.srt (.vtt)   captions timed from the clip start
+    content/clips/clips.json     title, requested and aligned times, text and
+                                 the cache key each file was published from
+
+Targets are episode folders (E073_2025-01-15: content/, raw/audio.mp3,
+transcripts/ or the Space transcript from metadata.json) or Space content
+folders of the batch generator (shared/content/<space_id>:
+shared/audio/<space_id>.mp3, shared/transcriptions/<space_id>.*).
+
+Usage:
+    python3 scripts/clip_highlights.py episodes/E073_2025-01-15
+    python3 scripts/clip_highlights.py shared/content/* --video --workers 4
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+import unicodedata
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json
+from episode_schema import extract_space_id
+from transcript_reader import open_episode_dir, open_transcript, segment_words
+from transcript_index import load_index, parse_time, segments_between, text_between
+from subtitles import build_cues, words_of, write_captions
+import instrumentation as instr
+
+AUDIO_DIR = Path('shared/audio')
+CACHE_DIR = Path('shared/cache/clips')
+AUDIO_HASHES_PATH = CACHE_DIR / 'audio_hashes.json'
+
+# Bump when the ffmpeg commands change so cached clips are not reused
+CLIP_VERSION = '1'
+SNAP_SECONDS = 8.0
+MIN_CLIP_SECONDS = 3.0
+MAX_CLIP_SECONDS = 300.0
+AUDIOGRAM_SIZE = '1280x720'
+AUDIOGRAM_COLOR = '0xF7931A'
+
+
+def _slug(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')[:60] or 'clip'
+
+
+# --- Inputs ---
+
+def load_highlights(content_dir):
+    """Highlight dicts of video_highlights.json (or the raw .txt reply, if it holds the JSON)"""
+    content_dir = Path(content_dir)
+    path = content_dir / 'video_highlights.json'
+    if path.exists():
+        data = load_json(path)
+    else:
+        path = content_dir / 'video_highlights.txt'
+        if not path.exists():
+            return []
+        text = path.read_text(encoding='utf-8')
+        m = re.search(r'\{.*\}', text, re.S)
+        if not m:
+            return []
+        try:
+            data = json.loads(m.group(0))
+        except ValueError:
+            return []
+    return data.get('highlights', []) if isinstance(data, dict) else data
+
+
+def resolve(target):
+    """(content dir, audio path, Transcript) of an episode folder or a Space content folder"""
+    target = Path(target)
+    if (target / 'raw').is_dir() or (target / 'transcripts').is_dir():
+        transcript = open_episode_dir(target)
+        metadata_path = target / 'metadata.json'
+        space_id = None
+        if metadata_path.exists():
+            space_id = extract_space_id(load_json(metadata_path).get('space_url'))
+        if transcript is None and space_id:
+            transcript = open_transcript(space_id)
+        audio = target / 'raw' / 'audio.mp3'
+        if not audio.exists() and space_id:
+            audio = AUDIO_DIR / f"{space_id}.mp3"
+        return target / 'content', audio, transcript
+    return target, AUDIO_DIR / f"{target.name}.mp3", open_transcript(target.name)
+
+
+def audio_hash(path, known):
+    """sha256 of an audio file; known maps path -> {sha256, size, mtime_ns} and is updated"""
+    st = path.stat()
+    key = path.as_posix()
+    entry = known.get(key)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        return entry['sha256']
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    known[key] = {'sha256': h.hexdigest(), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    return known[key]['sha256']
+
+
+# --- Alignment ---
+
+def _nearest(value, candidates):
+    best = min(candidates, key=lambda c: abs(c - value), default=None)
+    return best if best is not None and abs(best - value) <= SNAP_SECONDS else None
+
+
+def align(transcript, start, end, index=None):
+    """(start, end, boundary) snapped to utterance boundaries, else word
+    boundaries, within SNAP_SECONDS; boundary is 'segment', 'word' or None"""
+    if transcript is None:
+        return start, end, None
+    index = index or load_index(transcript)
+    segments = segments_between(transcript, start - SNAP_SECONDS, end + SNAP_SECONDS, index)
+    seg_start = _nearest(start, [seg.start for seg in segments])
+    seg_end = _nearest(end, [seg.end for seg in segments])
+    if seg_start is not None and seg_end is not None and seg_end - seg_start >= MIN_CLIP_SECONDS:
+        return seg_start, seg_end, 'segment'
+
+    words = [w for seg in segments for w in segment_words(seg)]
+    word_start = _nearest(start, [w[1] for w in words])
+    word_end = _nearest(end, [w[2] for w in words])
+    if word_start is not None and word_end is not None and word_end - word_start >= MIN_CLIP_SECONDS:
+        return word_start, word_end, 'word'
+    return start, end, None
+
+
+def write_clip_captions(transcript, start, end, index, base):
+    """<base>.srt and <base>.vtt of start..end, timed from the clip's start"""
+    words = [(word, max(w_start, start) - start, min(w_end, end) - start, speaker)
+             for word, w_start, w_end, speaker in words_of(segments_between(transcript, start, end, index))
+             if w_end > start and w_start < end]
+    write_captions(build_cues(words), base.with_suffix('.srt'), base.with_suffix('.vtt'))
+
+
+# --- Cutting ---
+
+def clip_key(sha, start, end, kind):
+    return hashlib.sha256(f"{CLIP_VERSION}|{sha}|{start:.3f}|{end:.3f}|{kind}".encode()).hexdigest()
+
+
+def _ffmpeg(args):
+    return subprocess.run(['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y'] + args,
+                          capture_output=True, text=True)
+
+
+def cut(job):
+    """Cut one clip into the cache; returns (key, cached, stream_copy, error)"""
+    key, audio, start, end, kind = job['key'], job['audio'], job['start'], job['end'], job['kind']
+    target = Path(job['cache'])
+    if target.exists():
+        return key, True, None, None
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.stem}.{os.getpid()}.tmp{target.suffix}")
+    seek = ['-ss', f"{start:.3f}", '-t', f"{end - start:.3f}", '-i', str(audio)]
+
+    if kind == 'audio':
+        attempts = [
+            (True, seek + ['-map', '0:a:0', '-c', 'copy', '-avoid_negative_ts', 'make_zero', str(tmp)]),
+            (False, seek + ['-map', '0:a:0', '-c:a', 'libmp3lame', '-b:a', '128k', str(tmp)]),
+        ]
+    else:
+        waves = (f"[0:a]showwaves=s={AUDIOGRAM_SIZE}:mode=cline:colors={AUDIOGRAM_COLOR},"
+                 f"format=yuv420p[v]")
+        video = ['-filter_complex', waves, '-map', '[v]', '-map', '0:a:0',
+                 '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '28']
+        attempts = [
+            (True, seek + video + ['-c:a', 'copy', '-shortest', '-movflags', '+faststart', str(tmp)]),
+            (False, seek + video + ['-c:a', 'aac', '-b:a', '128k', '-shortest', '-movflags', '+faststart', str(tmp)]),
+        ]
+
+    error = None
+    for stream_copy, args in attempts:
+        result = _ffmpeg(args)
+        if result.returncode == 0 and tmp.exists() and tmp.stat().st_size:
+            os.replace(tmp, target)
+            return key, False, stream_copy, None
+        error = (result.stderr.strip().splitlines() or [f"ffmpeg exit {result.returncode}"])[-1]
+    if tmp.exists():
+        tmp.unlink()
+    return key, False, None, error
+
+
+def _publish(cached, path, key, published_key):
+    """Copy a cached clip into the content folder unless the clip there was
+    published from the same cache key (clips.json of the previous run)"""
+    if path.exists() and published_key == key:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(cached, path)
+
+
+# --- Driver ---
+
+def plan(target, known_hashes, video=False):
+    """(content dir, [clip dict], [cut job]) for one target"""
+    content_dir, audio, transcript = resolve(target)
+    highlights = load_highlights(content_dir)
+    if not highlights:
+        print(f"⚠️  {target}: sin highlights")
+        return content_dir, [], []
+    if not audio.exists():
+        print(f"⚠️  {target}: no se encontró el audio ({audio})")
+        return content_dir, [], []
+
+    sha = audio_hash(audio, known_hashes)
+    index = load_index(transcript) if transcript else None
+    # Cache key each output file was last published from
+    manifest_path = content_dir / 'clips' / 'clips.json'
+    published = {}
+    if manifest_path.exists():
+        for old in load_json(manifest_path).get('clips', []):
+            for kind, key in (old.get('keys') or {}).items():
+                published[old.get(kind)] = key
+    kinds = [('audio', '.mp3')] + ([('video', '.mp4')] if video else [])
+    clips, jobs = [], []
+    for n, highlight in enumerate(highlights, 1):
+        title = highlight.get('title') or f"Clip {n}"
+        try:
+            requested = (parse_time(str(highlight['start_time'])), parse_time(str(highlight['end_time'])))
+        except (KeyError, ValueError):
+            print(f"⚠️  {target}: timestamps inválidos en '{title}'")
+            continue
+        start, end, boundary = align(transcript, *requested, index=index)
+        if not MIN_CLIP_SECONDS <= end - start <= MAX_CLIP_SECONDS:
+            print(f"⚠️  {target}: '{title}' dura {end - start:.0f}s, se omite")
+            continue
+
+        name = f"{n:02d}-{_slug(title)}"
+        clip = {
+            'title': title,
+            'speaker': highlight.get('speaker'),
+            'requested': list(requested),
+            'start': round(start, 3),
+            'end': round(end, 3),
+            'aligned_to': boundary,
+            'text': text_between(transcript, start, end, index) if transcript else highlight.get('transcript'),
+            'keys': {},
+        }
+        for kind, suffix in kinds:
+            key = clip_key(sha, start, end, kind)
+            clip[kind] = f"clips/{name}{suffix}"
+            clip['keys'][kind] = key
+            jobs.append({
+                'key': key, 'audio': str(audio), 'start': start, 'end': end, 'kind': kind,
+                'cache': str(CACHE_DIR / key[:2] / f"{key}{suffix}"),
+                'output': str(content_dir / clip[kind]),
+                'published_key': published.get(clip[kind]),
+            })
+        if transcript:
+            write_clip_captions(transcript, start, end, index, content_dir / 'clips' / name)
+            clip['captions'] = f"clips/{name}.vtt"
+        clips.append(clip)
+    return content_dir, clips, jobs
+
+
+def clip_all(targets, video=False, workers=None):
+    if not shutil.which('ffmpeg'):
+        print("❌ ffmpeg no está instalado (https://ffmpeg.org/download.html)")
+        return None
+
+    known_hashes = load_json(AUDIO_HASHES_PATH) if AUDIO_HASHES_PATH.exists() else {}
+    planned = []
+    with instr.span('clips.plan', targets=len(targets)):
+        for target in targets:
+            planned.append(plan(target, known_hashes, video))
+    save_json(AUDIO_HASHES_PATH, known_hashes)
+
+    jobs = [job for _, _, target_jobs in planned for job in target_jobs]
+    # The same cut can be requested twice (e.g. repeated highlight); cut it once
+    unique = list({job['key']: job for job in jobs}.values())
+    results = {}
+    hits = 0
+    with instr.span('clips.cut', clips=len(unique)):
+        if unique:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for key, cached, stream_copy, error in pool.map(cut, unique):
+                    results[key] = error
+                    if cached:
+                        hits += 1
+                        instr.inc('clips_cache_hits')
+                    elif error:
+                        instr.inc('clips_failed')
+                        print(f"❌ {key[:12]}: {error}")
+                    else:
+                        instr.inc('clips_stream_copied' if stream_copy else 'clips_reencoded')
+
+    for job in jobs:
+        if results.get(job['key']) is None:
+            _publish(Path(job['cache']), Path(job['output']), job['key'], job['published_key'])
+    for content_dir, clips, _ in planned:
+        for clip in clips:
+            # A failed cut was not published; don't claim its key
+            clip['keys'] = {kind: key for kind, key in clip['keys'].items() if results.get(key) is None}
+        if clips:
+            save_json(content_dir / 'clips' / 'clips.json', {'clips': clips})
+
+    failed = sum(1 for error in results.values() if error)
+    episodes = sum(1 for _, clips, _ in planned if clips)
+    print(f"✅ {len(unique) - failed} clips de {episodes} episodios "
+          f"({len(unique) - failed - hits} cortados, {hits} en caché, {failed} fallidos)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut highlight clips from episode audio")
+    parser.add_argument('targets', nargs='+', help="Episode folders or shared/content/<space_id> folders")
+    parser.add_argument('--video', action='store_true', help="Also render audiogram MP4s")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with instr.run('clip_highlights'):
+        clip_all(args.targets, video=args.video, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
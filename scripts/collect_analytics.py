@@ -28,6 +28,7 @@ import requests
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 import pandas as pd
+from db_io import load_json
 
 # Initialize colorama
 init(autoreset=True)
@@ -164,8 +165,7 @@ class AnalyticsCollector:
             print(f"{Fore.YELLOW}⚠️  No metadata found for episode {episode_num}")
             return ""
         
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = load_json(metadata_file)
         
         # Collect metrics
         all_metrics = {
@@ -284,8 +284,7 @@ class AnalyticsCollector:
             print(f"{Fore.RED}❌ Metrics file not found. Run collection first.")
             return
         
-        with open(metrics_file, 'r') as f:
-            metrics = json.load(f)
+        metrics = load_json(metrics_file)
         
         # Flatten metrics for CSV
         rows = []
@@ -5,6 +5,11 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+sys.path.append(str(Path(__file__).parent))
+from episode_matcher import EpisodeMatcher, MatchReport
+from episode_schema import canonical_duration
+from db_io import load_json
+
 def parse_date(date_str):
     try:
         # Format: Dec 5 2024
@@ -22,17 +27,11 @@ def main():
         print(f"Error: CSV file not found at {csv_path}")
         return
 
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
-    # Map Date -> List of Episodes
-    db_dates = {}
-    for ep in db["episodes"]:
-        d = ep.get("date")
-        if d:
-            if d not in db_dates:
-                db_dates[d] = []
-            db_dates[d].append(ep)
+    # Index episodes by space ID, number, date and title signature
+    matcher = EpisodeMatcher(db["episodes"])
+    report = MatchReport()
     
     new_episodes = []
     conflicts = []
@@ -50,7 +49,7 @@ def main():
             
             title = row[2].strip()
             date_str_raw = row[3].strip()
-            duration = row[5].strip()
+            duration = canonical_duration(row[5].strip())
             link = row[8].strip()
             
             if not title or not date_str_raw:
@@ -62,66 +61,55 @@ def main():
                 continue
             
             # Check existence
-            if date_iso in db_dates:
-                existing_eps = db_dates[date_iso]
-                match_found = False
+            candidate = matcher.best({"title": title, "date": date_iso, "space_url": link}, report=report)
+            if candidate:
+                ep = candidate.record
+                # Update Link if missing
+                if link and (not ep.get("space_url") or ep["space_url"] == ""):
+                    ep["space_url"] = link
+                    updated_links += 1
+
+            elif matcher.by_date.get(date_iso):
+                existing_eps = matcher.records_on(date_iso)
+                # Date match but title different.
+                # Could be a second event on same day.
+                # Treat as potential conflict or new episode?
+                # User asked to "add spaces that you don't have".
+                # If the title is very different, assume it's a different Space on the same day.
+                # But also report it so user knows.
+                
+                # Check if we should add it
+                conflicts.append({
+                    "date": date_iso,
+                    "existing_titles": [e.get("title") for e in existing_eps],
+                    "new_title": title,
+                    "action": "Adding as new episode (Date collision)"
+                })
                 
-                for ep in existing_eps:
-                    db_title = ep.get("title", "")
-                    
-                    # Fuzzy match title
-                    # Normalizing
-                    t1 = re.sub(r'\W+', '', title.lower())
-                    t2 = re.sub(r'\W+', '', db_title.lower())
-                    
-                    if t1 in t2 or t2 in t1 or (len(t1) > 10 and t1[:10] == t2[:10]):
-                        match_found = True
-                        # Update Link if missing
-                        if link and (not ep.get("space_url") or ep["space_url"] == ""):
-                            ep["space_url"] = link
-                            updated_links += 1
-                        break
+                # Add as new
+                ep_num = f"{date_id}-S7" # Suffix to avoid ID collision
                 
-                if not match_found:
-                    # Date match but title different.
-                    # Could be a second event on same day.
-                    # Treat as potential conflict or new episode?
-                    # User asked to "add spaces that you don't have".
-                    # If the title is very different, assume it's a different Space on the same day.
-                    # But also report it so user knows.
-                    
-                    # Check if we should add it
-                    conflicts.append({
-                        "date": date_iso,
-                        "existing_titles": [e.get("title") for e in existing_eps],
-                        "new_title": title,
-                        "action": "Adding as new episode (Date collision)"
-                    })
-                    
-                    # Add as new
-                    ep_num = f"{date_id}-S7" # Suffix to avoid ID collision
-                    
-                    guests = re.findall(r"@(\w+)", title)
-                    guest_links = {g: f"https://x.com/{g}" for g in guests}
+                guests = re.findall(r"@(\w+)", title)
+                guest_links = {g: f"https://x.com/{g}" for g in guests}
 
-                    new_ep = {
-                        "number": ep_num,
-                        "title": title,
-                        "date": date_iso,
-                        "duration": duration,
-                        "guests": guests,
-                        "guest_links": guest_links,
-                        "space_url": link,
-                        "description": title,
-                        "topics": [],
-                        "status": "archived",
-                        "transcript_available": False,
-                        "content_generated": False,
-                        "flyer_urls": []
-                    }
-                    new_episodes.append(new_ep)
-                    db_dates[date_iso].append(new_ep)
-                    
+                new_ep = {
+                    "number": ep_num,
+                    "title": title,
+                    "date": date_iso,
+                    "duration": duration,
+                    "guests": guests,
+                    "guest_links": guest_links,
+                    "space_url": link,
+                    "description": title,
+                    "topics": [],
+                    "status": "archived",
+                    "transcript_available": False,
+                    "content_generated": False,
+                    "flyer_urls": []
+                }
+                new_episodes.append(new_ep)
+                matcher.add(new_ep)
+                
             else:
                 # Totally new date
                 ep_num = date_id
@@ -145,12 +133,10 @@ def main():
                     "flyer_urls": []
                 }
                 new_episodes.append(new_ep)
-                if date_iso not in db_dates:
-                    db_dates[date_iso] = []
-                db_dates[date_iso].append(new_ep)
+                matcher.add(new_ep)
 
     # Dedup new episodes within the list itself? (CSV might have duplicates)
-    # The loop adds to db_dates immediately so duplicates in CSV logic above handles it (it will match the one just added).
+    # New episodes are added to the matcher immediately, so a CSV duplicate matches the one just added.
     
     print(f"Analysis Complete.")
     print(f"New Episodes to Add: {len(new_episodes)}")
@@ -172,6 +158,8 @@ def main():
             json.dump(db, f, indent=4, ensure_ascii=False)
         print("Database updated.")
     
+    report.print_summary()
+
     if conflicts:
         print("\n--- Date Collisions (Added as New) ---")
         for c in conflicts:
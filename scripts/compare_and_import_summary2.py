@@ -5,6 +5,11 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+sys.path.append(str(Path(__file__).parent))
+from episode_matcher import EpisodeMatcher, MatchReport
+from episode_schema import canonical_duration, parse_duration
+from db_io import load_json
+
 def parse_date(date_str):
     try:
         # Format: Mar 2 2023
@@ -22,18 +27,12 @@ def main():
         print(f"Error: CSV file not found at {csv_path}")
         return
 
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
-    # Map Date -> Episode(s)
-    # Some dates might have multiple episodes, so list of eps.
-    db_dates = {}
-    for ep in db["episodes"]:
-        d = ep.get("date")
-        if d:
-            if d not in db_dates:
-                db_dates[d] = []
-            db_dates[d].append(ep)
+    # Index episodes by space ID, number, date and title signature
+    # Some dates might have multiple episodes; the matcher ranks them by title.
+    matcher = EpisodeMatcher(db["episodes"])
+    report = MatchReport()
     
     new_episodes = []
     conflicts = []
@@ -48,7 +47,7 @@ def main():
             
             title = row[0].strip()
             date_str_raw = row[1].strip()
-            duration = row[3].strip()
+            duration = canonical_duration(row[3].strip())
             
             date_iso, date_id = parse_date(date_str_raw)
             if not date_iso:
@@ -56,47 +55,36 @@ def main():
                 continue
                 
             # Check for existence
-            if date_iso in db_dates:
-                # Potential conflict or match
-                existing_eps = db_dates[date_iso]
-                match_found = False
-                for ep in existing_eps:
-                    # Simple fuzzy match on title? or just assume match if date matches?
-                    # Let's say if date matches, it's likely the same event unless we have multiple on same day.
-                    # We report diffs.
-                    
-                    db_title = ep.get("title", "")
-                    db_dur = ep.get("duration", "")
-                    
-                    # Normalize for comparison
-                    if title.lower() in db_title.lower() or db_title.lower() in title.lower():
-                        match_found = True
-                        
-                        diffs = []
-                        if title != db_title and abs(len(title) - len(db_title)) > 5: 
-                             diffs.append(f"Title mismatch: '{title}' vs '{db_title}'")
-                        if duration != db_dur and duration != "" and db_dur != "":
-                             diffs.append(f"Duration mismatch: '{duration}' vs '{db_dur}'")
-                        
-                        if diffs:
-                            conflicts.append({
-                                "date": date_iso,
-                                "existing_title": db_title,
-                                "new_title": title,
-                                "issues": diffs
-                            })
-                        break # Found the matching event
+            candidate = matcher.best({"title": title, "date": date_iso}, report=report)
+            if candidate:
+                # Matching event found; report diffs.
+                ep = candidate.record
+                db_title = ep.get("title", "")
+                db_dur = ep.get("duration", "")
+                
+                diffs = []
+                if title != db_title and abs(len(title) - len(db_title)) > 5: 
+                     diffs.append(f"Title mismatch: '{title}' vs '{db_title}'")
+                if duration != "" and db_dur != "" and parse_duration(duration) != parse_duration(db_dur):
+                     diffs.append(f"Duration mismatch: '{duration}' vs '{db_dur}'")
                 
-                if not match_found and len(existing_eps) > 0:
-                     # Date exists but title is very different. Could be a second event on same day?
-                     # Or just a title change.
-                     # Let's verify.
-                     conflicts.append({
-                         "date": date_iso,
-                         "existing_title": [e.get("title") for e in existing_eps],
-                         "new_title": title,
-                         "issues": ["Date collision but titles differ significantly. Check manually."]
-                     })
+                if diffs:
+                    conflicts.append({
+                        "date": date_iso,
+                        "existing_title": db_title,
+                        "new_title": title,
+                        "issues": diffs
+                    })
+            elif matcher.by_date.get(date_iso):
+                 # Date exists but title is very different. Could be a second event on same day?
+                 # Or just a title change.
+                 # Let's verify.
+                 conflicts.append({
+                     "date": date_iso,
+                     "existing_title": [e.get("title") for e in matcher.records_on(date_iso)],
+                     "new_title": title,
+                     "issues": ["Date collision but titles differ significantly. Check manually."]
+                 })
             else:
                 # New Episode
                 ep_num = date_id
@@ -121,10 +109,8 @@ def main():
                     "flyer_urls": []
                 }
                 new_episodes.append(new_ep)
-                # Add to local map to prevent duplications within the CSV itself
-                if date_iso not in db_dates:
-                    db_dates[date_iso] = []
-                db_dates[date_iso].append(new_ep)
+                # Index it to prevent duplications within the CSV itself
+                matcher.add(new_ep)
 
     # Process results
     print(f"Analysis Complete.")
@@ -145,6 +131,8 @@ def main():
             json.dump(db, f, indent=4, ensure_ascii=False)
         print("Database updated with new episodes.")
     
+    report.print_summary()
+
     print("\n--- Conflicts Report ---")
     for c in conflicts:
         print(f"Date: {c['date']}")
@@ -0,0 +1,188 @@
+"""
+Load/save layer for the shared/*.json databases.
+
+    from db_io import load_json, save_json, edit_json
+
+    data = load_json('shared/episodes_database.json')
+    save_json('shared/episodes_database.json', data)
+
+    # Read-modify-write under the database's lock
+    with edit_json('shared/spoken_database.json') as data:
+        data['episodes'].append(new_ep)
+
+- Serialization uses orjson when it is installed and falls back to the
+  json module. Both produce the repo's format: indent=2, non-ASCII
+  characters kept as-is.
+- Writes are atomic. The bytes go to a temp file in the same directory,
+  which is fsynced and then os.replace()d over the target. A crash leaves
+  either the old file or the new one, never a truncated database.
+- A save whose serialized bytes equal what is already on disk does not
+  touch the file, so mtimes stay put and sweeps that change nothing are
+  cheap.
+- file_lock() takes an advisory lock on a '<name>.lock' sidecar (fcntl;
+  a no-op where fcntl is unavailable). edit_json() and save_json(...,
+  lock=True) hold it, so two scripts updating the same database take
+  turns.
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_MISSING = object()
+
+
+# --- Serialization ---
+
+def loads(payload):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def dumps(data, indent=2, ensure_ascii=False, sort_keys=False):
+    """
+    Serialize to UTF-8 bytes in the layout json.dump(data, f, indent=indent,
+    ensure_ascii=ensure_ascii) would write
+    """
+    if orjson is not None and indent == 2 and not ensure_ascii:
+        option = orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # Non-str keys, big ints, ...: the stdlib handles (or reports) them
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii,
+                      sort_keys=sort_keys).encode('utf-8')
+
+
+# --- Files ---
+
+def load_json(path, default=_MISSING):
+    """
+    Load a JSON file
+
+    Args:
+        path: File to read
+        default: Returned when the file does not exist (raises otherwise)
+    """
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        if default is _MISSING:
+            raise
+        return default
+
+
+def write_atomic(path, payload):
+    """
+    Write bytes to path through a fsynced temp file and os.replace
+
+    Returns False (and leaves the file alone) when it already holds payload.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(payload) and path.read_bytes() == payload:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Persist the rename itself
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
+
+
+def save_json(path, data, indent=2, ensure_ascii=False, sort_keys=False, lock=False):
+    """
+    Atomically write data as JSON; returns True if the file changed
+
+    Args:
+        lock: Hold the file's advisory lock while writing
+    """
+    payload = dumps(data, indent=indent, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
+    if lock:
+        with file_lock(path):
+            return write_atomic(path, payload)
+    return write_atomic(path, payload)
+
+
+# --- Locking ---
+
+def lock_path(path):
+    path = Path(path)
+    return path.with_name(path.name + '.lock')
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Advisory lock for a database file, held for the duration of the block
+
+    Args:
+        shared: Take a shared (reader) lock instead of an exclusive one
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_file = lock_path(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def edit_json(path, default=_MISSING, indent=2, ensure_ascii=False):
+    """
+    Load, modify in place and save a JSON file under its lock
+
+    The file is written only if the block completes and the content changed.
+    """
+    with file_lock(path):
+        data = load_json(path, default)
+        yield data
+        save_json(path, data, indent=indent, ensure_ascii=ensure_ascii)
@@ -1,4 +1,3 @@
-import json
 import zipfile
 import re
 from datetime import datetime
@@ -6,6 +5,7 @@ import sys
 import os
 sys.path.append(os.getcwd())
 import scripts.manual_xlsx_parse as parser
+from db_io import load_json
 
 def normalize_title(t):
     return re.sub(r'[^a-z0-9]', '', t.lower())
@@ -23,8 +23,7 @@ db_path = 'shared/episodes_database.json'
 print("DEBUGGING #071 Match...")
 
 # Load DB 071
-with open(db_path, 'r') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 db_071 = next((e for e in data['episodes'] if '#071' in e.get('title', '')), None)
 if db_071:
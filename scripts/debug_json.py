@@ -1,11 +1,10 @@
-import json
 from pathlib import Path
+from db_io import load_json
 
 def check_db(path):
     print(f"Checking {path}...")
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(path)
         
         episodes = data.get('episodes', [])
         print(f"Type of 'episodes': {type(episodes)}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Deploy manifest for website/output: what changed since the last build.
+
+simple_build.py renders into a staging directory (website/.build) and
+then calls sync() to move the result into website/output:
+
+- files whose content hash is unchanged are not touched, so their
+  mtimes (and git, rsync, CDN caches) stay quiet
+- new and changed files are copied over, removed ones are deleted
+- website/deploy_manifest.json records path -> sha256, size, mtime
+- website/deploy_diff.json lists added/changed/removed paths, which is
+  what a publish step needs to upload
+
+A file whose size and mtime match its manifest entry is trusted without
+rehashing, so a sync costs one hash per staged file plus stat() calls on
+the output tree.
+
+Both JSON files describe this machine's checkout (the mtimes only mean
+something locally), so they are gitignored rather than committed.
+
+Usage:
+    python3 scripts/deploy_manifest.py manifest                 # rebuild the manifest of website/output
+    python3 scripts/deploy_manifest.py diff old.json new.json   # compare two manifests
+    python3 scripts/deploy_manifest.py changed                  # added+changed paths of the last sync
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json
+import instrumentation as instr
+
+OUTPUT_DIR = Path('website/output')
+STAGING_DIR = Path('website/.build')
+MANIFEST_PATH = Path('website/deploy_manifest.json')
+DIFF_PATH = Path('website/deploy_diff.json')
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _walk(root):
+    """rel path (posix) -> os.stat_result for every file under root"""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = Path(dirpath) / name
+            files[path.relative_to(root).as_posix()] = path.stat()
+    return files
+
+
+def _entry(sha, st):
+    return {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _trusted(entry, st):
+    return entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+
+
+def build_manifest(root, previous=None):
+    """Manifest entries of every file under root; reuses hashes from previous
+    for files whose size and mtime did not change"""
+    root = Path(root)
+    previous = previous or {}
+    files = {}
+    for rel, st in sorted(_walk(root).items()):
+        old = previous.get(rel)
+        sha = old["sha256"] if _trusted(old, st) else file_hash(root / rel)
+        files[rel] = _entry(sha, st)
+    return files
+
+
+def diff_manifests(old, new):
+    """{'added': [...], 'changed': [...], 'removed': [...]} between two file maps"""
+    return {
+        "added": sorted(rel for rel in new if rel not in old),
+        "changed": sorted(rel for rel in new if rel in old and new[rel]["sha256"] != old[rel]["sha256"]),
+        "removed": sorted(rel for rel in old if rel not in new),
+    }
+
+
+def load_manifest(path=MANIFEST_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return load_json(path).get("files", {})
+
+
+def sync(src=STAGING_DIR, dst=OUTPUT_DIR, manifest_path=MANIFEST_PATH, diff_path=DIFF_PATH):
+    """Make dst identical to src, touching only files whose content changed"""
+    src, dst = Path(src), Path(dst)
+    dst.mkdir(parents=True, exist_ok=True)
+
+    with instr.span('sync'):
+        # What is deployed now (manifest hashes are trusted where size/mtime match)
+        current = build_manifest(dst, load_manifest(manifest_path))
+        staged = _walk(src)
+
+        files = {}
+        for rel, st in sorted(staged.items()):
+            # Static files are copied with copy2, so an unchanged one still
+            # carries the mtime recorded for it in dst
+            old = current.get(rel)
+            sha = old["sha256"] if _trusted(old, st) else file_hash(src / rel)
+            target = dst / rel
+            if old is None or old["sha256"] != sha:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src / rel, target)
+                files[rel] = _entry(sha, target.stat())
+            else:
+                files[rel] = old
+
+        diff = diff_manifests(current, files)
+        for rel in diff["removed"]:
+            (dst / rel).unlink()
+        # Directories left empty by removals
+        for dirpath, dirnames, filenames in os.walk(dst, topdown=False):
+            if not dirnames and not filenames and Path(dirpath) != dst:
+                os.rmdir(dirpath)
+
+    save_json(manifest_path, {"generated_at": datetime.now().isoformat(), "files": files})
+    save_json(diff_path, {"generated_at": datetime.now().isoformat(), **diff})
+
+    instr.inc('deploy_files_added', len(diff["added"]))
+    instr.inc('deploy_files_changed', len(diff["changed"]))
+    instr.inc('deploy_files_removed', len(diff["removed"]))
+    unchanged = len(files) - len(diff["added"]) - len(diff["changed"])
+    print(f"📦 Deploy: {len(diff['added'])} nuevos, {len(diff['changed'])} modificados, "
+          f"{len(diff['removed'])} eliminados, {unchanged} sin cambios")
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deploy manifest of website/output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("manifest", help="Rebuild the manifest of an output dir")
+    p.add_argument("output", nargs="?", default=str(OUTPUT_DIR))
+    p.add_argument("--manifest", default=str(MANIFEST_PATH))
+
+    p = sub.add_parser("diff", help="Compare two manifests")
+    p.add_argument("old")
+    p.add_argument("new")
+
+    p = sub.add_parser("changed", help="Paths added or changed by the last sync")
+    p.add_argument("--diff", default=str(DIFF_PATH))
+    p.add_argument("--with-removed", action="store_true", help="Also list removed paths, prefixed with '-'")
+
+    args = parser.parse_args()
+
+    if args.command == "manifest":
+        files = build_manifest(args.output, load_manifest(args.manifest))
+        save_json(args.manifest, {"generated_at": datetime.now().isoformat(), "files": files})
+        print(f"✅ {len(files)} archivos en {args.manifest}")
+    elif args.command == "diff":
+        diff = diff_manifests(load_manifest(args.old), load_manifest(args.new))
+        for key, sign in (("added", "+"), ("changed", "~"), ("removed", "-")):
+            for rel in diff[key]:
+                print(f"{sign} {rel}")
+    elif args.command == "changed":
+        diff = load_json(args.diff)
+        for rel in diff["added"] + diff["changed"]:
+            print(rel)
+        if args.with_removed:
+            for rel in diff["removed"]:
+                print(f"-{rel}")
+
+
+if __name__ == "__main__":
+    main()
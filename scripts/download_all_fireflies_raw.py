@@ -5,9 +5,9 @@ Sin procesamiento, solo descarga los 544 transcripts
 """
 import os
 import requests
-import json
 from pathlib import Path
 import time
+from db_io import save_json
 
 # Configuración
 ENV_FILE = Path(".env")
@@ -195,8 +195,7 @@ def main():
         
         if details:
             # Guardar JSON completo
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(details, f, indent=2, ensure_ascii=False)
+            save_json(output_file, details)
             
             print(f"            ✅ Guardado: {transcript_id}.json")
             downloaded += 1
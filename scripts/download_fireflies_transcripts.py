@@ -7,6 +7,9 @@ import requests
 import json
 from pathlib import Path
 import time
+from db_io import save_json
+from transcript_reader import fireflies_segments
+import instrumentation as instr
 
 # Configuración
 ENV_FILE = Path(".env")
@@ -62,7 +65,9 @@ def get_all_transcripts(api_key):
         
         try:
             print(f"   ⏳ Solicitando batch (skip={skip})...")
-            response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=30)
+            with instr.timed_call('fireflies', query='transcripts'):
+                response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=30)
+            instr.inc('bytes_downloaded', len(response.content), api='fireflies')
             
             if response.status_code == 200:
                 result = response.json()
@@ -133,7 +138,9 @@ def get_transcript_details(transcript_id, api_key):
     }
     
     try:
-        response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=60)
+        with instr.timed_call('fireflies', query='transcript'):
+            response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=60)
+        instr.inc('bytes_downloaded', len(response.content), api='fireflies')
         
         if response.status_code == 200:
             result = response.json()
@@ -237,10 +244,10 @@ def generate_formatted_transcript(transcript_data, episode_metadata=None):
     # Transcripción con speakers
     if transcript_data.get('sentences'):
         current_speaker = None
-        for sentence in transcript_data['sentences']:
-            speaker = sentence.get('speaker_name') or f"Speaker {sentence.get('speaker_id', 'N/A')}"
-            text = sentence.get('text', '')
-            start = sentence.get('start_time', 0)
+        for seg in fireflies_segments(transcript_data):
+            speaker = seg.speaker
+            text = seg.text
+            start = seg.start
             
             # Format time as HH:MM:SS
             m, s = divmod(start, 60)
@@ -275,7 +282,8 @@ def main():
     
     # Obtener lista de transcripts
     print("🔍 Consultando transcripts disponibles en Fireflies...")
-    all_transcripts = get_all_transcripts(api_key)
+    with instr.span('list_transcripts'):
+        all_transcripts = get_all_transcripts(api_key)
     
     if not all_transcripts:
         print("❌ No se encontraron transcripts o hubo un error")
@@ -320,23 +328,26 @@ def main():
         print(f"[{i}/{len(bandaweb3_transcripts)}] 🔄 Procesando: {title[:50]}...")
         
         # Obtener detalles completos
-        details = get_transcript_details(transcript_id, api_key)
+        with instr.span('download', transcript=transcript_id):
+            details = get_transcript_details(transcript_id, api_key)
         
         if details and details.get('sentences'):
             # Guardar JSON completo
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(details, f, indent=2, ensure_ascii=False)
+            save_json(output_file, details)
             
             # Guardar TXT formateado usando metadatos
-            formatted_text = generate_formatted_transcript(details, episode_metadata)
+            with instr.span('format', transcript=transcript_id):
+                formatted_text = generate_formatted_transcript(details, episode_metadata)
             with open(txt_file, 'w', encoding='utf-8') as f:
                 f.write(formatted_text)
+            instr.inc('transcripts_written')
             
             meta_status = "✅ Metadatos" if episode_metadata else "⚠️ Sin Metadatos"
             print(f"            ✅ Guardado y actualizado ({meta_status})")
             updated += 1
         else:
             print(f"            ❌ Error al descargar detalles")
+            instr.inc('transcripts_failed')
             failed += 1
         
         # Pausa para no saturar la API
@@ -353,4 +364,5 @@ def main():
     print(f"📂 Archivos guardados en: {OUTPUT_DIR}")
 
 if __name__ == "__main__":
-    main()
+    with instr.run('download_fireflies_transcripts'):
+        main()
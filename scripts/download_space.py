@@ -6,11 +6,11 @@ Downloads audio from X (Twitter) Spaces using twitter-api-client
 
 import os
 import sys
-import json
 import argparse
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
+from db_io import save_json
 
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
@@ -152,8 +152,7 @@ def save_metadata(episode_dir, space_url, episode_number, metadata=None):
         metadata_dict.update(metadata)
 
     metadata_path = episode_dir / "metadata.json"
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata_dict, f, indent=2, ensure_ascii=False)
+    save_json(metadata_path, metadata_dict)
 
     print(f"✓ Metadata saved: {metadata_path}")
 
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Duplicate detection across the episode databases in one pass.
+
+Every record of every database is hash-joined on its normalized space ID
+(the ID part of the space URL, so x.com / twitter.com / trailing-slash
+variants collide): any key shared by two or more records is an exact
+duplicate group. Records are then blocked by date, and only records on the
+same or an adjacent day are compared by title similarity, which yields the
+probable duplicates. Nothing is compared pairwise across the whole catalog.
+
+consolidated_database.json is built from the other two (merge_databases.py),
+so it is only checked against itself; its overlap with the sources is
+expected.
+
+    from duplicate_engine import DuplicateEngine
+
+    result = DuplicateEngine.from_files().find()
+    for group in result.cross('episodes', 'spoken'):
+        ...
+    for group in result.within('episodes'):
+        records = [m.record for m in group.members]
+
+Usage:
+    python3 scripts/duplicate_engine.py
+    python3 scripts/duplicate_engine.py --db episodes --db spoken --output shared/duplicate_groups_report.json
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from collections import defaultdict
+
+sys.path.append(str(Path(__file__).parent))
+from episode_matcher import normalize_title, ngrams, title_similarity
+from episode_schema import extract_space_id
+import db_io
+
+SHARED_DIR = Path(__file__).parent.parent / "shared"
+DATABASES = {
+    'episodes': SHARED_DIR / "episodes_database.json",
+    'spoken': SHARED_DIR / "spoken_database.json",
+    'consolidated': SHARED_DIR / "consolidated_database.json",
+}
+# Databases derived from the others; only duplicates inside them are reported
+DERIVED = {'consolidated'}
+
+REPORT_PATH = SHARED_DIR / "duplicate_groups_report.json"
+TITLE_THRESHOLD = 0.8
+
+
+def load_json(filepath):
+    return db_io.load_json(filepath)
+
+
+def episodes_of(data):
+    """Episode list of a database file ({'episodes': [...]} or a bare list)"""
+    if isinstance(data, dict):
+        return data.get('episodes', [])
+    return data
+
+
+def space_key(record):
+    """Normalized space ID of a record, or None"""
+    return record.get('space_id') or extract_space_id((record.get('space_url') or '').strip())
+
+
+class Member:
+    """One record of a duplicate group: database name, position and record."""
+
+    __slots__ = ('db', 'index', 'record')
+
+    def __init__(self, db, index, record):
+        self.db = db
+        self.index = index
+        self.record = record
+
+    def to_dict(self):
+        r = self.record
+        return {
+            'db': self.db,
+            'index': self.index,
+            'number': r.get('number'),
+            'title': r.get('title'),
+            'date': r.get('date'),
+            'space_url': r.get('space_url'),
+            'host': r.get('host'),
+            'type': r.get('type'),
+            'listeners': r.get('listeners'),
+        }
+
+
+class DuplicateGroup:
+    """Records that are the same space: 'exact' (space ID) or 'probable' (date + title)."""
+
+    __slots__ = ('kind', 'key', 'members', 'score')
+
+    def __init__(self, kind, key, members, score=1.0):
+        self.kind = kind
+        self.key = key
+        self.members = members
+        self.score = score
+
+    @property
+    def dbs(self):
+        return {m.db for m in self.members}
+
+    def in_db(self, db):
+        return [m for m in self.members if m.db == db]
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'key': self.key,
+            'score': round(self.score, 3),
+            'dbs': sorted(self.dbs),
+            'members': [m.to_dict() for m in self.members],
+        }
+
+
+class DuplicateResult:
+    """Exact and probable groups found by DuplicateEngine.find()."""
+
+    def __init__(self, counts, exact, probable):
+        self.counts = counts
+        self.exact = exact
+        self.probable = probable
+
+    def within(self, db, kind='exact'):
+        """Groups with two or more records in the same database"""
+        groups = self.exact if kind == 'exact' else self.probable
+        return [g for g in groups if len(g.in_db(db)) > 1]
+
+    def cross(self, a, b, kind='exact'):
+        """Groups with records in both databases"""
+        groups = self.exact if kind == 'exact' else self.probable
+        return [g for g in groups if a in g.dbs and b in g.dbs]
+
+    def summary(self):
+        summary = {'databases': self.counts, 'exact': {}, 'probable': {}}
+        names = list(self.counts)
+        for kind in ('exact', 'probable'):
+            for db in names:
+                summary[kind][db] = len(self.within(db, kind))
+            for i, a in enumerate(names):
+                for b in names[i + 1:]:
+                    if a in DERIVED or b in DERIVED:
+                        continue
+                    summary[kind][f'{a}+{b}'] = len(self.cross(a, b, kind))
+        return summary
+
+    def to_dict(self):
+        return {
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'summary': self.summary(),
+            'exact': [g.to_dict() for g in self.exact],
+            'probable': [g.to_dict() for g in self.probable],
+        }
+
+    def save(self, path=REPORT_PATH):
+        db_io.save_json(path, self.to_dict())
+
+
+class DuplicateEngine:
+    """Hash-join on space ID, then date blocks compared by title similarity."""
+
+    def __init__(self, databases, derived=DERIVED, title_threshold=TITLE_THRESHOLD):
+        """
+        Args:
+            databases: {name: list of episode dicts}
+            derived: Names only checked against themselves
+            title_threshold: Minimum title similarity for a probable duplicate
+        """
+        self.databases = databases
+        self.derived = set(derived)
+        self.title_threshold = title_threshold
+
+    @classmethod
+    def from_files(cls, names=None, **kwargs):
+        names = names or list(DATABASES)
+        databases = {}
+        for name in names:
+            path = DATABASES.get(name, name)
+            if Path(path).exists():
+                databases[name] = episodes_of(load_json(path))
+        return cls(databases, **kwargs)
+
+    def _comparable(self, a, b):
+        """Derived databases are not compared with other databases"""
+        return a.db == b.db or (a.db not in self.derived and b.db not in self.derived)
+
+    def _split(self, members):
+        """Split a join bucket into groups that may be reported together"""
+        groups = defaultdict(list)
+        for m in members:
+            # Derived databases form their own group; sources share one
+            groups[m.db if m.db in self.derived else None].append(m)
+        return [g for g in groups.values() if len(g) > 1]
+
+    def find(self):
+        by_space = defaultdict(list)
+        by_date = defaultdict(list)
+        members = []
+
+        # Build side: one pass over every record
+        for db, records in self.databases.items():
+            for index, record in enumerate(records):
+                m = Member(db, index, record)
+                members.append(m)
+                key = space_key(record)
+                if key:
+                    by_space[key].append(m)
+                if record.get('date'):
+                    by_date[record['date']].append(m)
+
+        exact = []
+        for key, bucket in by_space.items():
+            for group in self._split(bucket):
+                exact.append(DuplicateGroup('exact', key, group))
+
+        # Probable: same or next day, similar titles, not already the same space
+        probable = []
+        keys = {id(m.record): space_key(m.record) for m in members}
+        titles = {}
+        for m in members:
+            norm = normalize_title(m.record.get('title'))
+            titles[id(m.record)] = (norm, ngrams(norm))
+
+        for date, bucket in sorted(by_date.items()):
+            try:
+                next_day = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+            except ValueError:
+                next_day = None
+            neighbours = by_date.get(next_day, []) if next_day else []
+
+            for i, a in enumerate(bucket):
+                for b in bucket[i + 1:] + neighbours:
+                    if not self._comparable(a, b):
+                        continue
+                    key_a, key_b = keys[id(a.record)], keys[id(b.record)]
+                    # Two known space IDs settle it either way
+                    if key_a and key_b:
+                        continue
+                    (norm_a, grams_a), (norm_b, grams_b) = titles[id(a.record)], titles[id(b.record)]
+                    score = title_similarity(norm_a, norm_b, grams_a, grams_b)
+                    if score >= self.title_threshold:
+                        probable.append(DuplicateGroup('probable', date, [a, b], score))
+
+        exact.sort(key=lambda g: (g.members[0].db, g.members[0].index))
+        probable.sort(key=lambda g: (-g.score, g.key))
+        counts = {db: len(records) for db, records in self.databases.items()}
+        return DuplicateResult(counts, exact, probable)
+
+
+def print_report(result, limit=20):
+    summary = result.summary()
+    print(f"\n{'='*100}")
+    print("DUPLICADOS EN LAS BASES DE DATOS")
+    print(f"{'='*100}\n")
+    for db, count in summary['databases'].items():
+        print(f"📊 {db}: {count} episodios")
+
+    for kind, label in (('exact', 'Exactos (space ID)'), ('probable', 'Probables (fecha + título)')):
+        print(f"\n{label}:")
+        for scope, count in summary[kind].items():
+            print(f"   - {scope}: {count}")
+
+    for kind in ('exact', 'probable'):
+        groups = result.exact if kind == 'exact' else result.probable
+        if not groups:
+            continue
+        print(f"\n{'-'*100}")
+        print(f"{kind.upper()} ({len(groups)})")
+        print(f"{'-'*100}")
+        for group in groups[:limit]:
+            print(f"\n[{group.key}] score {group.score:.2f}")
+            for m in group.members:
+                print(f"   {m.db}[{m.index}] #{m.record.get('number', 'N/A')} "
+                      f"{m.record.get('date', 'N/A')} - {m.record.get('title', 'N/A')}")
+        if len(groups) > limit:
+            print(f"\n... y {len(groups) - limit} más.")
+    print(f"\n{'='*100}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find exact and probable duplicates within and across the episode databases"
+    )
+    parser.add_argument("--db", action="append", choices=list(DATABASES),
+                        help="Database to include (repeatable; default: all)")
+    parser.add_argument("--threshold", type=float, default=TITLE_THRESHOLD,
+                        help=f"Title similarity for probable duplicates (default: {TITLE_THRESHOLD})")
+    parser.add_argument("--output", default=str(REPORT_PATH),
+                        help=f"JSON report path (default: {REPORT_PATH})")
+    parser.add_argument("--limit", type=int, default=20, help="Groups to print per kind")
+
+    args = parser.parse_args()
+
+    engine = DuplicateEngine.from_files(args.db, title_threshold=args.threshold)
+    result = engine.find()
+    print_report(result, limit=args.limit)
+    result.save(args.output)
+    print(f"📄 Reporte guardado en: {args.output}\n")
+
+
+if __name__ == '__main__':
+    main()
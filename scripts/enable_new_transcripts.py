@@ -1,12 +1,11 @@
 
-import json
+from db_io import load_json, save_json
 
 DB_PATH = 'shared/episodes_database.json'
 
 def main():
     print("🔄 Updating transcript availability for 6 new episodes...")
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
     
     ids_to_update = [
         "1BdGYyrpoyvGX",
@@ -33,8 +32,7 @@ def main():
                 print(f"ℹ️ Transcript already enabled for: {ep.get('title', 'Unknown')} ({ep_id})")
                 
     if updated_count > 0:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(DB_PATH, data)
         print(f"💾 Database saved with {updated_count} updates.")
     else:
         print("✅ No updates needed.")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Indexed fuzzy matcher for reconciling spreadsheet rows with DB episodes.
+
+Records (DB episodes or Spaces Dashboard rows) are indexed once by space ID,
+sequence number, date and a MinHash signature of the normalized title, so a
+lookup only scores the handful of records that share at least one key instead
+of scanning every date bucket:
+
+    from episode_matcher import EpisodeMatcher, MatchReport
+
+    matcher = EpisodeMatcher(data['episodes'])
+    report = MatchReport()
+    for row in excel_rows:
+        best = matcher.best(row, report=report)
+        if best:
+            best.record['space_url'] = row['space_url']
+    report.print_summary()
+
+Signals and weights (see score()):
+    space ID     -> definitive (score 1.0)
+    number       -> +0.35, or -0.15 when both sides are numbered differently
+    date         -> +0.35 same day, +0.15 one day apart
+    title        -> +0.4 * trigram similarity (containment counts as 0.9)
+
+A space ID match is what resolves cases like the Excel export listing
+@byluaambriz as #064 when the episode is #063.
+
+Usage:
+    # Reconcile a dashboard export against the episodes DB and save a report
+    python3 scripts/episode_matcher.py "shared/inputs/Hosted - Spaces Dashboard.xlsx"
+    python3 scripts/episode_matcher.py export.xlsx --db shared/spoken_database.json --report report.json
+"""
+
+import re
+import sys
+import json
+import zlib
+import random
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from db_io import save_json
+from episode_schema import extract_space_id
+
+MIN_SCORE = 0.45
+AMBIGUITY_MARGIN = 0.05
+
+NUM_PERM = 32
+BANDS = 16
+NGRAM = 3
+
+WEIGHT_NUMBER = 0.35
+PENALTY_NUMBER = 0.15
+WEIGHT_DATE = 0.35
+WEIGHT_NEAR_DATE = 0.15
+WEIGHT_TITLE = 0.4
+CONTAINMENT_SIMILARITY = 0.9
+
+_MERSENNE = (1 << 61) - 1
+
+
+def normalize_title(t):
+    return re.sub(r'[^a-z0-9]', '', (t or '').lower())
+
+
+def episode_numbers(record):
+    """
+    Sequence numbers of a record: '#NNN' in the title and/or the number field.
+
+    The number field is sometimes a date id (e.g. 20250101), so only values
+    in 1..999 count as sequence numbers.
+    """
+    numbers = set()
+    num_match = re.search(r'#(\d+)', record.get('title') or '')
+    if num_match:
+        numbers.add(int(num_match.group(1)))
+    try:
+        n_val = int(str(record.get('number') or ''))
+        if 0 < n_val < 1000:
+            numbers.add(n_val)
+    except ValueError:
+        pass
+    return numbers
+
+
+def ngrams(norm_title, n=NGRAM):
+    if len(norm_title) <= n:
+        return {norm_title} if norm_title else set()
+    return {norm_title[i:i + n] for i in range(len(norm_title) - n + 1)}
+
+
+def title_similarity(a_norm, b_norm, a_grams=None, b_grams=None):
+    """Jaccard similarity of title trigrams; one title containing the other scores high"""
+    if not a_norm or not b_norm:
+        return 0.0
+    if a_norm == b_norm:
+        return 1.0
+    a_grams = a_grams if a_grams is not None else ngrams(a_norm)
+    b_grams = b_grams if b_grams is not None else ngrams(b_norm)
+    jaccard = len(a_grams & b_grams) / len(a_grams | b_grams)
+    if a_norm in b_norm or b_norm in a_norm:
+        return max(jaccard, CONTAINMENT_SIMILARITY)
+    return jaccard
+
+
+def _parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class _Keys:
+    """Precomputed match keys of one record or query."""
+
+    __slots__ = ('space_id', 'numbers', 'date', 'day', 'norm', 'grams')
+
+    def __init__(self, record, number_override=None):
+        self.space_id = record.get('space_id') or extract_space_id(record.get('space_url'))
+        self.numbers = {number_override} if number_override else episode_numbers(record)
+        self.date = record.get('date') or None
+        self.day = _parse_date(self.date)
+        self.norm = normalize_title(record.get('title'))
+        self.grams = ngrams(self.norm)
+
+
+class Candidate:
+    """A scored match: the indexed record, its score and why it scored."""
+
+    __slots__ = ('record', 'index', 'score', 'reasons')
+
+    def __init__(self, record, index, score, reasons):
+        self.record = record
+        self.index = index
+        self.score = score
+        self.reasons = reasons
+
+    def to_dict(self):
+        return {
+            'title': self.record.get('title'),
+            'date': self.record.get('date'),
+            'number': self.record.get('number'),
+            'score': round(self.score, 3),
+            'reasons': self.reasons,
+        }
+
+    def __repr__(self):
+        return f"Candidate({self.record.get('title')!r}, score={self.score:.3f}, {self.reasons})"
+
+
+class EpisodeMatcher:
+    """Ranks indexed records against a query record in sub-linear time."""
+
+    def __init__(self, records=(), num_perm=NUM_PERM, bands=BANDS, seed=1):
+        """
+        Args:
+            records: Dicts with some of title, date, number, space_url/space_id
+            num_perm: MinHash permutations per title signature
+            bands: LSH bands; num_perm must divide evenly into them
+            seed: Seed for the permutations (fixed so runs are reproducible)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE))
+                       for _ in range(num_perm)]
+        self._rows = num_perm // bands
+
+        self.records = []
+        self._keys = []
+        self.by_space_id = {}
+        self.by_number = {}
+        self.by_date = {}
+        self._lsh = {}
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    # --- Indexing ---
+
+    def _signature(self, grams):
+        hashes = [zlib.crc32(g.encode('utf-8')) for g in grams]
+        return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._perms]
+
+    def _bands(self, grams):
+        if not grams:
+            return []
+        sig = self._signature(grams)
+        r = self._rows
+        return [(i, tuple(sig[i * r:(i + 1) * r])) for i in range(len(sig) // r)]
+
+    def add(self, record):
+        """Index one more record (e.g. an episode created during an import)"""
+        index = len(self.records)
+        keys = _Keys(record)
+        self.records.append(record)
+        self._keys.append(keys)
+
+        if keys.space_id:
+            self.by_space_id.setdefault(keys.space_id, []).append(index)
+        for number in keys.numbers:
+            self.by_number.setdefault(number, []).append(index)
+        if keys.date:
+            self.by_date.setdefault(keys.date, []).append(index)
+        for band in self._bands(keys.grams):
+            self._lsh.setdefault(band, []).append(index)
+        return index
+
+    def records_on(self, date):
+        """Indexed records on a given YYYY-MM-DD date"""
+        return [self.records[i] for i in self.by_date.get(date, [])]
+
+    # --- Lookup ---
+
+    def _candidate_ids(self, q):
+        ids = set()
+        if q.space_id:
+            ids.update(self.by_space_id.get(q.space_id, ()))
+        for number in q.numbers:
+            ids.update(self.by_number.get(number, ()))
+        if q.day:
+            for offset in (-1, 0, 1):
+                ids.update(self.by_date.get((q.day + timedelta(days=offset)).isoformat(), ()))
+        for band in self._bands(q.grams):
+            ids.update(self._lsh.get(band, ()))
+        return ids
+
+    def score(self, q, index):
+        """Score of indexed record `index` for query keys `q`, with reasons"""
+        k = self._keys[index]
+        if q.space_id and q.space_id == k.space_id:
+            return 1.0, ['space_id']
+
+        score = 0.0
+        reasons = []
+        if q.numbers and k.numbers:
+            if q.numbers & k.numbers:
+                score += WEIGHT_NUMBER
+                reasons.append('number')
+            else:
+                score -= PENALTY_NUMBER
+                reasons.append('number_conflict')
+
+        if q.date and q.date == k.date:
+            score += WEIGHT_DATE
+            reasons.append('date')
+        elif q.day and k.day and abs((q.day - k.day).days) == 1:
+            score += WEIGHT_NEAR_DATE
+            reasons.append('date±1')
+
+        similarity = title_similarity(q.norm, k.norm, q.grams, k.grams)
+        if similarity:
+            score += WEIGHT_TITLE * similarity
+            reasons.append(f'title={similarity:.2f}')
+
+        return score, reasons
+
+    def match(self, query, limit=5, number=None):
+        """
+        Ranked candidates for a query record, best first
+
+        Args:
+            query: Dict with some of title, date, number, space_url/space_id
+            limit: Maximum candidates to return (None for all)
+            number: Sequence number to use instead of the one in the query
+        """
+        q = _Keys(query, number_override=number)
+        scored = []
+        for index in self._candidate_ids(q):
+            score, reasons = self.score(q, index)
+            if score > 0:
+                scored.append(Candidate(self.records[index], index, score, reasons))
+        # Ties go to the record indexed first so results are deterministic
+        scored.sort(key=lambda c: (-c.score, c.index))
+        return scored[:limit] if limit else scored
+
+    def best(self, query, min_score=MIN_SCORE, report=None, number=None):
+        """Best candidate scoring at least min_score, or None"""
+        candidates = self.match(query, number=number)
+        chosen = candidates[0] if candidates and candidates[0].score >= min_score else None
+        if report is not None:
+            report.add(query, candidates, chosen)
+        return chosen
+
+
+class MatchReport:
+    """Matched / ambiguous / unmatched queries collected during a reconcile."""
+
+    def __init__(self, min_score=MIN_SCORE, margin=AMBIGUITY_MARGIN):
+        self.min_score = min_score
+        self.margin = margin
+        self.matched = []
+        self.ambiguous = []
+        self.unmatched = []
+
+    def add(self, query, candidates, chosen):
+        entry = {
+            'query': {k: query.get(k) for k in ('title', 'date', 'number', 'space_url') if query.get(k)},
+            'candidates': [c.to_dict() for c in candidates[:3]],
+        }
+        if chosen is None:
+            self.unmatched.append(entry)
+            return
+        self.matched.append(entry)
+        if len(candidates) > 1 and candidates[1].score >= self.min_score \
+                and chosen.score - candidates[1].score < self.margin:
+            self.ambiguous.append(entry)
+
+    def to_dict(self):
+        return {
+            'matched': len(self.matched),
+            'ambiguous': self.ambiguous,
+            'unmatched': self.unmatched,
+        }
+
+    def save(self, path):
+        save_json(path, self.to_dict())
+
+    def print_summary(self):
+        print(f"\nMatch report: {len(self.matched)} matched, "
+              f"{len(self.ambiguous)} ambiguous, {len(self.unmatched)} unmatched")
+        for entry in self.ambiguous:
+            q = entry['query']
+            print(f"  ? [{q.get('date')}] {q.get('title')}")
+            for c in entry['candidates'][:2]:
+                print(f"      {c['score']:.2f} [{c['date']}] {c['title']}")
+        for entry in self.unmatched:
+            q = entry['query']
+            best = entry['candidates'][0] if entry['candidates'] else None
+            hint = f" (closest {best['score']:.2f}: {best['title']})" if best else ""
+            print(f"  ✗ [{q.get('date')}] {q.get('title')}{hint}")
+
+
+def parse_dashboard_description(desc_raw):
+    """
+    Split a Spaces Dashboard description cell.
+
+    "Title - Ended: Nov 3 2025 - Speakers: N - Duration: ..." ->
+    (title, 'YYYY-MM-DD' or None, duration)
+    """
+    parts = desc_raw.split(' - Ended: ')
+    title = parts[0].strip()
+    rest = parts[1] if len(parts) > 1 else ""
+    date_part = rest.split(' - ')[0] if ' - ' in rest else rest
+    try:
+        date_str = datetime.strptime(date_part.strip(), "%b %d %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        date_str = None
+    duration_match = re.search(r'Duration: (.*?)$', desc_raw)
+    duration = duration_match.group(1).strip() if duration_match else ""
+    return title, date_str, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconcile a Spaces Dashboard export against an episodes database"
+    )
+    parser.add_argument("xlsx", help="Spaces Dashboard .xlsx export")
+    parser.add_argument("--db", default="shared/episodes_database.json",
+                        help="Episodes database (default: shared/episodes_database.json)")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE,
+                        help=f"Minimum score for a match (default: {MIN_SCORE})")
+    parser.add_argument("--report", help="Write the match report to this JSON file")
+
+    args = parser.parse_args()
+
+    sys.path.append(str(Path(__file__).parent))
+    from xlsx_reader import XlsxReader
+
+    with open(args.db, 'r', encoding='utf-8') as f:
+        episodes = json.load(f).get('episodes', [])
+
+    matcher = EpisodeMatcher(episodes)
+    report = MatchReport(min_score=args.min_score)
+
+    with XlsxReader(args.xlsx) as reader:
+        for row in reader.iter_rows(typed=False):
+            desc_raw = row.value('B')
+            if 'Ended:' not in desc_raw:
+                continue
+            title, date_str, _ = parse_dashboard_description(desc_raw)
+            query = {'title': title, 'date': date_str, 'space_url': row.link('D') or ""}
+            matcher.best(query, min_score=args.min_score, report=report)
+
+    print(f"Indexed {len(matcher)} episodes from {args.db}")
+    report.print_summary()
+    if args.report:
+        report.save(args.report)
+        print(f"\nReport saved to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Typed, normalized view of episode records.
+
+The databases store durations in mixed formats ("01:10:40", "45 min",
+"1h 5m", "1 hours, 26 minutes, 36 seconds"), listeners as int or str and
+numbers as "076", "20240409-2" or "20250101.1". Episode.from_record() parses
+all of that once, when the records are loaded, so the build, stats and sync
+code work with plain typed fields instead of re-parsing in every loop:
+
+    from episode_schema import load_episodes
+
+    episodes = load_episodes('shared/episodes_database.json')
+    episodes.sort(key=lambda e: e.sort_key, reverse=True)
+    for ep in episodes:
+        print(ep.number, ep.date, ep.duration_seconds, ep.listeners, ep.space_id)
+
+The original dict is kept untouched in Episode.record; ep['title'] and
+ep.get('host') read through to it, so templates written against the raw
+dicts keep working. Sync scripts use canonical_duration() / parse_listeners()
+to store values in the canonical form (HH:MM:SS, int) in the first place.
+
+Usage:
+    # Report records whose fields could not be normalized
+    python3 scripts/episode_schema.py
+    python3 scripts/episode_schema.py shared/spoken_database.json
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import argparse
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from db_io import load_json
+
+SHARED_DIR = Path('shared')
+DATABASES = (
+    SHARED_DIR / 'episodes_database.json',
+    SHARED_DIR / 'spoken_database.json',
+    SHARED_DIR / 'consolidated_database.json',
+)
+
+# x.com/i/spaces/<id> and spacesdashboard.com/space/<id>/<slug>
+_SPACE_ID_RE = re.compile(r'/spaces?/([a-zA-Z0-9]+)')
+_CLOCK_RE = re.compile(r'^(\d+):(\d{1,2})(?::(\d{1,2}(?:\.\d+)?))?$')
+_HOURS_RE = re.compile(r'(\d+)\s*(?:hours?|hrs?|h)(?![a-z])')
+_MINUTES_RE = re.compile(r'(\d+)\s*(?:minutes?|mins?|m)(?![a-z])')
+_SECONDS_RE = re.compile(r'(\d+)\s*(?:seconds?|secs?|s)(?![a-z])')
+# "076", "20240409", "20240409-2", "20250101.1"
+_NUMBER_RE = re.compile(r'^(\d+)(?:[-.](\d+))?(?:[-.](\d+))?$')
+
+
+# --- Field normalizers ---
+
+def parse_duration(value):
+    """
+    Seconds in a stored duration, or None when there is none to read.
+
+    Accepts HH:MM:SS, MM:SS, "1h 5m", "45 min", "1 hours, 26 minutes,
+    36 seconds" and bare numbers (minutes).
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value * 60)
+
+    text = str(value).strip().lower()
+    if not text:
+        return None
+
+    clock = _CLOCK_RE.match(text)
+    if clock:
+        a, b, c = clock.groups()
+        if c is None:  # MM:SS
+            return int(a) * 60 + int(b)
+        return int(a) * 3600 + int(b) * 60 + int(float(c))
+
+    if text.isdigit():
+        return int(text) * 60
+
+    h = _HOURS_RE.search(text)
+    m = _MINUTES_RE.search(text)
+    s = _SECONDS_RE.search(text)
+    if not (h or m or s):
+        return None
+    return ((int(h.group(1)) if h else 0) * 3600
+            + (int(m.group(1)) if m else 0) * 60
+            + (int(s.group(1)) if s else 0))
+
+
+def format_hhmmss(seconds):
+    """Canonical stored form of a duration: HH:MM:SS"""
+    return f"{seconds // 3600:02}:{seconds % 3600 // 60:02}:{seconds % 60:02}"
+
+
+def canonical_duration(value):
+    """A duration in HH:MM:SS when it can be parsed; otherwise the value as given"""
+    seconds = parse_duration(value)
+    return format_hhmmss(seconds) if seconds is not None else (value or '')
+
+
+def format_duration(seconds):
+    """Listing display of a duration: '1h 10m' or '45m'"""
+    if seconds is None:
+        return ''
+    h, m = seconds // 3600, seconds % 3600 // 60
+    return f"{h}h {m}m" if h > 0 else f"{m}m"
+
+
+def parse_listeners(value):
+    """Listener count as int, or None when there is no usable value"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().replace(',', '')
+    if not text:
+        return None
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def parse_date(value):
+    """datetime.date of a YYYY-MM-DD string, or None"""
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def format_date(value):
+    """Display form of a date: 09-Apr-24"""
+    return value.strftime('%d-%b-%y') if value else ''
+
+
+def extract_space_id(url):
+    """Space ID of a space URL, or None"""
+    if not url:
+        return None
+    match = _SPACE_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def parse_number(value):
+    """
+    Sortable form of an episode number: a tuple of ints, or None.
+
+    '076' -> (76,), '20240409-2' -> (20240409, 2); handles and other
+    free-form values are None.
+    """
+    match = _NUMBER_RE.match(str(value if value is not None else '').strip())
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+# --- Schema ---
+
+@dataclass(slots=True)
+class Episode:
+    """One database record with its fields parsed once."""
+
+    record: dict
+    number: str = ''
+    title: str = ''
+    type: str = 'unknown'
+    host: str = ''
+    date: date | None = None
+    duration_seconds: int | None = None
+    listeners: int | None = None
+    space_id: str | None = None
+    sequence: tuple | None = None
+    sort_key: tuple = ()
+    problems: list = field(default_factory=list)
+
+    @classmethod
+    def from_record(cls, record):
+        number = str(record.get('number') if record.get('number') is not None else '')
+        raw_date = record.get('date')
+        raw_duration = record.get('duration')
+        raw_listeners = record.get('listeners')
+
+        ep = cls(
+            record=record,
+            number=number,
+            title=record.get('title') or '',
+            type=record.get('type') or 'unknown',
+            host=record.get('host') or '',
+            date=parse_date(raw_date),
+            duration_seconds=parse_duration(raw_duration),
+            listeners=parse_listeners(raw_listeners),
+            space_id=record.get('space_id') or extract_space_id(record.get('space_url')),
+            sequence=parse_number(number),
+        )
+        # Newest first when sorted in reverse; same-day records by number
+        ep.sort_key = (ep.date.toordinal() if ep.date else 0, ep.sequence or (), number)
+
+        if ep.date is None:
+            ep.problems.append(f"date {raw_date!r}")
+        if ep.duration_seconds is None and raw_duration:
+            ep.problems.append(f"duration {raw_duration!r}")
+        if ep.listeners is None and raw_listeners not in (None, ''):
+            ep.problems.append(f"listeners {raw_listeners!r}")
+        if record.get('space_url') and ep.space_id is None:
+            ep.problems.append(f"space_url {record['space_url']!r}")
+        return ep
+
+    # Dict-style access to the stored record, for templates and legacy callers
+    def __getitem__(self, key):
+        return self.record[key]
+
+    def get(self, key, default=None):
+        return self.record.get(key, default)
+
+    @property
+    def date_str(self):
+        return self.date.isoformat() if self.date else (self.record.get('date') or '')
+
+    @property
+    def month(self):
+        return self.date_str[:7] if self.date else ''
+
+    @property
+    def display_date(self):
+        return format_date(self.date) if self.date else (self.record.get('date') or '')
+
+    @property
+    def display_duration(self):
+        if self.duration_seconds is None:
+            return str(self.record.get('duration') or '').strip()
+        return format_duration(self.duration_seconds)
+
+    @property
+    def transcript_id(self):
+        """Name transcripts are stored under: the space ID, else the number"""
+        return self.space_id or self.number
+
+
+def normalize(records):
+    """Episodes for a list of raw records"""
+    return [Episode.from_record(r) for r in records]
+
+
+def load_episodes(path):
+    """Episodes of a database file ({'episodes': [...]} or a bare list)"""
+    data = load_json(path)
+    records = data.get('episodes', []) if isinstance(data, dict) else data
+    return normalize(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report episode fields that cannot be normalized")
+    parser.add_argument('databases', nargs='*', help="Database files (default: the shared/ databases)")
+    args = parser.parse_args()
+
+    total = 0
+    for path in [Path(p) for p in args.databases] or DATABASES:
+        if not path.exists():
+            continue
+        episodes = load_episodes(path)
+        flagged = [ep for ep in episodes if ep.problems]
+        total += len(flagged)
+        print(f"{path}: {len(episodes)} records, {len(flagged)} with unparsed fields")
+        for ep in flagged:
+            print(f"   #{ep.number} {ep.date_str} {ep.title[:50]!r}: {', '.join(ep.problems)}")
+    return 1 if total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
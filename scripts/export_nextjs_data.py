@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Export the episodes database as sharded JSON for the Next.js site.
+
+nextjs-site/src/lib/episodes.ts used to import the whole database, so every
+route's server bundle carried the full catalog. This writes instead:
+
+    nextjs-site/data/index.json          slim list: card fields only, newest first
+    nextjs-site/data/map.json            episode number -> shard file
+    nextjs-site/data/episodes/<n>.json   one full record per episode
+
+The listing page reads index.json; an episode page reads map.json and its
+own shard. Shards are written through db_io, so an export with no changes
+rewrites nothing, and shards of removed episodes are deleted.
+
+Usage:
+    python3 scripts/export_nextjs_data.py
+    python3 scripts/export_nextjs_data.py --db shared/episodes_database.json --out nextjs-site/data
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json
+from episode_schema import normalize
+
+DB_PATH = Path('shared/episodes_database.json')
+OUTPUT_DIR = Path('nextjs-site/data')
+
+# Fields the listing cards render
+CARD_FIELDS = ('number', 'title', 'date', 'status', 'description', 'topics', 'flyer_urls')
+CARD_DESCRIPTION_CHARS = 240
+CARD_TOPICS = 3
+CARD_FLYERS = 1
+
+_UNSAFE_RE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def shard_name(number, taken):
+    """File name for an episode's shard; unsafe characters and clashes are resolved"""
+    base = _UNSAFE_RE.sub('_', str(number)).strip('.') or 'episode'
+    name, n = f"{base}.json", 1
+    while name in taken:
+        n += 1
+        name = f"{base}-{n}.json"
+    taken.add(name)
+    return name
+
+
+def card(record):
+    """Slim listing entry for one episode"""
+    entry = {k: record[k] for k in CARD_FIELDS if k in record}
+    description = entry.get('description') or ''
+    if len(description) > CARD_DESCRIPTION_CHARS:
+        entry['description'] = description[:CARD_DESCRIPTION_CHARS].rstrip() + '…'
+    if entry.get('topics'):
+        entry['topics'] = entry['topics'][:CARD_TOPICS]
+    if entry.get('flyer_urls'):
+        entry['flyer_urls'] = entry['flyer_urls'][:CARD_FLYERS]
+    return entry
+
+
+def export(db_path=DB_PATH, output_dir=OUTPUT_DIR):
+    """Write index, map and shards; returns (shards written, shards removed)"""
+    data = load_json(db_path)
+    episodes = normalize(data.get('episodes', []))
+    episodes.sort(key=lambda ep: ep.sort_key, reverse=True)
+
+    output_dir = Path(output_dir)
+    shard_dir = output_dir / 'episodes'
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    taken = set()
+    file_map = {}
+    exported = []
+    written = 0
+    for ep in episodes:
+        if ep.number in file_map:
+            print(f"⚠️  Duplicate number, skipped: {ep.number} - {ep.title}")
+            continue
+        name = shard_name(ep.number, taken)
+        file_map[ep.number] = name
+        exported.append(ep.record)
+        if save_json(shard_dir / name, ep.record):
+            written += 1
+
+    removed = 0
+    for path in shard_dir.glob('*.json'):
+        if path.name not in taken:
+            path.unlink()
+            removed += 1
+
+    metadata = data.get('metadata', {})
+    save_json(output_dir / 'map.json', file_map)
+    save_json(output_dir / 'index.json', {
+        'metadata': {
+            'total_episodes': metadata.get('total_episodes', len(file_map)),
+            'last_updated': metadata.get('last_updated', ''),
+        },
+        'episodes': [card(record) for record in exported],
+    })
+    return written, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the episodes DB as sharded JSON for nextjs-site")
+    parser.add_argument('--db', default=str(DB_PATH), help=f"Database (default: {DB_PATH})")
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help=f"Output directory (default: {OUTPUT_DIR})")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    written, removed = export(args.db, args.out)
+    print(f"✅ Exported to {args.out}: {written} shards written, {removed} removed")
+
+
+if __name__ == '__main__':
+    main()
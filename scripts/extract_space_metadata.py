@@ -18,6 +18,7 @@ from datetime import datetime
 import requests
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
+from db_io import save_json
 
 # Initialize colorama
 init(autoreset=True)
@@ -173,8 +174,7 @@ class SpaceMetadataExtractor:
         db["metadata"]["last_updated"] = datetime.now().isoformat()
         db["stats"]["total_episodes"] = len(db["episodes"])
         
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(db, f, indent=2, ensure_ascii=False)
+        save_json(self.db_path, db)
         
         print(f"{Fore.GREEN}✓ Database updated: {self.db_path}")
     
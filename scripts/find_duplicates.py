@@ -3,9 +3,13 @@
 Script para identificar episodios duplicados entre episodes_database.json y spoken_database.json
 """
 
+import sys
 import json
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from duplicate_engine import DuplicateEngine
+
 def load_json(filepath):
     """Carga un archivo JSON"""
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -21,31 +25,27 @@ def find_duplicates():
     episodes_list = episodes_db.get('episodes', [])
     spoken_list = spoken_db.get('episodes', [])
     
-    duplicates = []
+    # Hash-join por space ID (el identificador más confiable)
+    result = DuplicateEngine({'episodes': episodes_list, 'spoken': spoken_list}).find()
     
-    # Comparar por space_url (el identificador más confiable)
-    for episode in episodes_list:
-        space_url = episode.get('space_url', '')
-        if not space_url:
-            continue
-            
-        for spoken in spoken_list:
-            spoken_url = spoken.get('space_url', '')
-            if spoken_url and space_url == spoken_url:
-                duplicates.append({
-                    'space_url': space_url,
-                    'title_episodes': episode.get('title', 'N/A'),
-                    'title_spoken': spoken.get('title', 'N/A'),
-                    'date_episodes': episode.get('date', 'N/A'),
-                    'date_spoken': spoken.get('date', 'N/A'),
-                    'number_episodes': episode.get('number', 'N/A'),
-                    'number_spoken': spoken.get('number', 'N/A'),
-                    'listeners_episodes': episode.get('listeners', 'N/A'),
-                    'listeners_spoken': spoken.get('listeners', 'N/A'),
-                    'host_episodes': episode.get('host', 'N/A'),
-                    'host_spoken': spoken.get('host', 'N/A'),
-                })
-                break
+    duplicates = []
+    for group in result.cross('episodes', 'spoken'):
+        episode = group.in_db('episodes')[0].record
+        spoken = group.in_db('spoken')[0].record
+        duplicates.append({
+            'space_url': episode.get('space_url', ''),
+            'title_episodes': episode.get('title', 'N/A'),
+            'title_spoken': spoken.get('title', 'N/A'),
+            'date_episodes': episode.get('date', 'N/A'),
+            'date_spoken': spoken.get('date', 'N/A'),
+            'number_episodes': episode.get('number', 'N/A'),
+            'number_spoken': spoken.get('number', 'N/A'),
+            'listeners_episodes': episode.get('listeners', 'N/A'),
+            'listeners_spoken': spoken.get('listeners', 'N/A'),
+            'host_episodes': episode.get('host', 'N/A'),
+            'host_spoken': spoken.get('host', 'N/A'),
+        })
+    probable = [g.to_dict() for g in result.cross('episodes', 'spoken', kind='probable')]
     
     # Imprimir resultados
     print(f"\n{'='*100}")
@@ -73,6 +73,13 @@ def find_duplicates():
     else:
         print("No se encontraron episodios duplicados.")
     
+    if probable:
+        print(f"\nPosibles duplicados (misma fecha y título similar, sin space URL en común): {len(probable)}")
+        for group in probable:
+            for m in group['members']:
+                print(f"  - [{m['db']}] {m['date']} - {m['title']}")
+            print()
+    
     print(f"\n{'='*100}\n")
     
     # Guardar resultados en un archivo JSON
@@ -80,7 +87,8 @@ def find_duplicates():
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump({
             'total_duplicates': len(duplicates),
-            'duplicates': duplicates
+            'duplicates': duplicates,
+            'probable_duplicates': probable
         }, f, indent=2, ensure_ascii=False)
     
     print(f"Reporte guardado en: {output_file}\n")
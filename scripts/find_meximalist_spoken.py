@@ -1,9 +1,9 @@
 import json
+from db_io import load_json
 
 def search_episodes():
     try:
-        with open('shared/spoken_database.json', 'r') as f:
-            data = json.load(f)
+        data = load_json('shared/spoken_database.json')
             
         episodes = data.get('episodes', [])
         print(f"Total episodes in database: {len(episodes)}")
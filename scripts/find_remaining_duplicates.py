@@ -3,13 +3,16 @@
 Script para encontrar los duplicados restantes entre episodes_database.json y spoken_database.json
 """
 
-import json
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from duplicate_engine import DuplicateEngine
+import db_io
+
 def load_json(filepath):
     """Carga un archivo JSON"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return db_io.load_json(filepath)
 
 def find_remaining_duplicates():
     """Encuentra duplicados restantes entre las dos bases de datos"""
@@ -29,29 +32,24 @@ def find_remaining_duplicates():
     print(f"📊 Episodios en spoken_database.json: {len(spoken_list)}")
     print(f"📊 Suma total: {len(episodes_list) + len(spoken_list)}")
     
-    # Buscar duplicados por space_url
+    # Buscar duplicados por space ID (hash-join, sin recorrer todos los pares)
+    result = DuplicateEngine({'episodes': episodes_list, 'spoken': spoken_list}).find()
     duplicates = []
     
-    for episode in episodes_list:
-        space_url = episode.get('space_url', '')
-        if not space_url:
-            continue
-            
-        for spoken in spoken_list:
-            spoken_url = spoken.get('space_url', '')
-            if spoken_url and space_url == spoken_url:
-                duplicates.append({
-                    'space_url': space_url,
-                    'title_episodes': episode.get('title', 'N/A'),
-                    'title_spoken': spoken.get('title', 'N/A'),
-                    'date_episodes': episode.get('date', 'N/A'),
-                    'date_spoken': spoken.get('date', 'N/A'),
-                    'number_episodes': episode.get('number', 'N/A'),
-                    'number_spoken': spoken.get('number', 'N/A'),
-                    'host_episodes': episode.get('host', 'N/A'),
-                    'host_spoken': spoken.get('host', 'N/A'),
-                })
-                break
+    for group in result.cross('episodes', 'spoken'):
+        episode = group.in_db('episodes')[0].record
+        spoken = group.in_db('spoken')[0].record
+        duplicates.append({
+            'space_url': episode.get('space_url', ''),
+            'title_episodes': episode.get('title', 'N/A'),
+            'title_spoken': spoken.get('title', 'N/A'),
+            'date_episodes': episode.get('date', 'N/A'),
+            'date_spoken': spoken.get('date', 'N/A'),
+            'number_episodes': episode.get('number', 'N/A'),
+            'number_spoken': spoken.get('number', 'N/A'),
+            'host_episodes': episode.get('host', 'N/A'),
+            'host_spoken': spoken.get('host', 'N/A'),
+        })
     
     print(f"\n❌ Duplicados encontrados: {len(duplicates)}\n")
     
@@ -76,8 +74,7 @@ def find_remaining_duplicates():
         'duplicates': duplicates
     }
     
-    with open('shared/remaining_duplicates_report.json', 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    db_io.save_json('shared/remaining_duplicates_report.json', report)
     
     print(f"📄 Reporte guardado en: shared/remaining_duplicates_report.json\n")
     
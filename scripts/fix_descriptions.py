@@ -1,11 +1,10 @@
 
-import json
+from db_io import load_json, save_json
 
 DB_PATH = 'shared/episodes_database.json'
 
 def main():
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
         
     fixed_count = 0
     for ep in data['episodes']:
@@ -15,8 +14,7 @@ def main():
             fixed_count += 1
             
     if fixed_count > 0:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(DB_PATH, data)
         print(f"✅ Fixed {fixed_count} episodes with missing description.")
     else:
         print("✅ No missing descriptions found.")
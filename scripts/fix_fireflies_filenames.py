@@ -3,6 +3,7 @@ import json
 import shutil
 from pathlib import Path
 from difflib import SequenceMatcher
+from db_io import load_json
 
 TRANSCRIPTS_DIR = Path("shared/transcriptions_fireflies")
 DB_PATH = Path("shared/episodes_database.json")
@@ -36,8 +37,7 @@ def main():
     for filename in files_to_fix:
         filepath = TRANSCRIPTS_DIR / filename
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = load_json(filepath)
             
         ft_title = data.get("title", "")
         cleaned_ft_title = clean_title(ft_title)
@@ -2,10 +2,10 @@
 import json
 import os
 import glob
+from db_io import load_json
 
 # Read the database
-with open('data/episodes_database.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json('data/episodes_database.json')
 
 # Get all flyer files
 flyer_files = glob.glob('website/static/images/flyer_*.*')
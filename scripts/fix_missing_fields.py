@@ -1,12 +1,11 @@
 
-import json
+from db_io import load_json, save_json
 
 DB_PATH = 'shared/episodes_database.json'
 
 def main():
     print("🔧 Fixing missing fields in database...")
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
         
     fixed_count = 0
     for ep in data['episodes']:
@@ -37,8 +36,7 @@ def main():
             print(f"   Fixed: {ep.get('title', 'Unknown')}")
             
     if fixed_count > 0:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(DB_PATH, data)
         print(f"✅ Fixed {fixed_count} episodes with missing fields.")
     else:
         print("✅ No missing fields found.")
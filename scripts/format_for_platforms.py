@@ -19,12 +19,12 @@ Examples:
 
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional
 import pyperclip
 from colorama import Fore, Style, init
+from db_io import load_json
 
 # Initialize colorama
 init(autoreset=True)
@@ -43,8 +43,7 @@ class PlatformFormatter:
         if config_path is None:
             config_path = Path(__file__).parent.parent / "config" / "platforms.json"
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+        self.config = load_json(config_path)
     
     def format_twitter_thread(self) -> str:
         """Format content for Twitter thread."""
@@ -53,8 +52,7 @@ class PlatformFormatter:
         if not thread_file.exists():
             raise FileNotFoundError(f"Thread file not found: {thread_file}")
         
-        with open(thread_file, 'r', encoding='utf-8') as f:
-            thread_data = json.load(f)
+        thread_data = load_json(thread_file)
         
         # Extract tweets
         tweets = thread_data.get('tweets', [])
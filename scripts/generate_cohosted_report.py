@@ -1,5 +1,5 @@
-import json
 import os
+from db_io import load_json
 
 def generate_report():
     # 1. Get file lists
@@ -17,8 +17,7 @@ def generate_report():
         transcription_files = set()
 
     # 2. Load DB
-    with open('shared/episodes_database.json', 'r') as f:
-        data = json.load(f)
+    data = load_json('shared/episodes_database.json')
 
     # 3. Process Co-Hosted Episodes
     report_data = []
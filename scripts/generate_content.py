@@ -7,11 +7,19 @@ Generates social media content from transcriptions using Claude API
 import os
 import sys
 import json
+import time
+import hashlib
 import argparse
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from anthropic import Anthropic
+from db_io import load_json, save_json
+from transcript_reader import open_episode_dir, open_transcript, format_timestamp as format_hms
+from episode_schema import extract_space_id
+import instrumentation as instr
 
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
@@ -19,11 +27,126 @@ load_dotenv(dotenv_path="../config/.env")
 # Configure Anthropic client
 client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
+CACHE_DIR = Path(__file__).parent.parent / "shared" / "cache" / "claude_responses"
+CONTENT_TYPES = ["thread", "article", "linkedin", "highlights"]
+
+
+class ResponseCache:
+    """
+    On-disk cache of Claude responses, one JSON file per request.
+
+    Keys are a SHA-256 of model, prompt, transcript context and parameters,
+    so any change to the template or the transcript is a miss. Entries are
+    evicted least-recently-used once the cache grows past max_entries.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=500):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, prompt, context, params):
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "context": context, "params": params},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        path = self.cache_dir / f"{key}.json"
+        try:
+            entry = load_json(path)
+            os.utime(path)  # Refresh LRU position
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["hits"] += 1
+        return entry
+
+    def put(self, key, entry):
+        save_json(self.cache_dir / f"{key}.json", entry)
+
+        with self._lock:
+            self.stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        excess = len(entries) - self.max_entries
+        for path in entries[:max(excess, 0)]:
+            path.unlink(missing_ok=True)
+            self.stats["evictions"] += 1
+
+
+class RateLimiter:
+    """
+    Shared limiter for Claude calls: caps in-flight requests and spaces
+    request starts by at least min_interval seconds.
+    """
+
+    def __init__(self, max_concurrent=4, min_interval=0.5):
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._min_interval
+        if wait > 0:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+        return False
+
+
+class TokenUsage:
+    """Thread-safe running total of API tokens consumed (cache hits are free)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.calls = 0
+
+    def add(self, usage):
+        with self._lock:
+            self.input_tokens += usage.input_tokens
+            self.input_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
+            cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+            self.input_tokens += cache_read
+            self.cache_read_tokens += cache_read
+            self.output_tokens += usage.output_tokens
+            self.calls += 1
+
+    @property
+    def total(self):
+        return self.input_tokens + self.output_tokens
+
+
+# Shared by every generation call; main() may replace these from CLI flags
+response_cache = None
+rate_limiter = RateLimiter()
+token_usage = TokenUsage()
+
 
 PROMPTS = {
     "thread": """Eres un experto en crear hilos virales para X (Twitter) sobre tecnología blockchain y Web3.
 
-Analiza la siguiente transcripción de un Space de BandaWeb3 y crea un hilo atractivo de máximo 10 tweets.
+Analiza la transcripción anterior de un Space de BandaWeb3 y crea un hilo atractivo de máximo 10 tweets.
 
 REGLAS:
 - Cada tweet debe tener máximo 280 caracteres
@@ -34,9 +157,6 @@ REGLAS:
 - Estilo: Educativo pero conversacional, profesional pero accesible
 - Incluir hashtags relevantes solo en el último tweet: #BandaWeb3 #Web3 #Blockchain
 
-TRANSCRIPCIÓN:
-{transcript}
-
 METADATA:
 Episode: #{episode_number}
 Título: {title}
@@ -55,7 +175,7 @@ Genera el hilo en formato JSON:
 
     "article": """Eres un escritor experto en tecnología blockchain que crea artículos detallados y educativos.
 
-Analiza la siguiente transcripción de un Space de BandaWeb3 y crea un artículo largo y bien estructurado.
+Analiza la transcripción anterior de un Space de BandaWeb3 y crea un artículo largo y bien estructurado.
 
 REQUISITOS:
 - Título atractivo y claro
@@ -69,9 +189,6 @@ REQUISITOS:
 - Estilo: Profesional pero accesible, educativo
 - Público objetivo: Personas interesadas en Web3, desde principiantes hasta expertos
 
-TRANSCRIPCIÓN:
-{transcript}
-
 METADATA:
 Episode: #{episode_number}
 Fecha: {date}
@@ -81,7 +198,7 @@ Genera el artículo en formato Markdown.""",
 
     "linkedin": """Eres un content strategist experto en LinkedIn que crea posts profesionales sobre tecnología.
 
-Analiza la siguiente transcripción de un Space de BandaWeb3 y crea un post para LinkedIn.
+Analiza la transcripción anterior de un Space de BandaWeb3 y crea un post para LinkedIn.
 
 REQUISITOS:
 - Gancho inicial fuerte (primera línea crítica)
@@ -94,9 +211,6 @@ REQUISITOS:
 - NO usar emojis excesivos
 - Enfocarse en insights de negocio o lecciones aprendidas
 
-TRANSCRIPCIÓN:
-{transcript}
-
 METADATA:
 Episode: #{episode_number}
 Título: {title}
@@ -105,7 +219,7 @@ Genera el post.""",
 
     "highlights": """Eres un experto en identificar momentos destacados de podcasts y conversations.
 
-Analiza la siguiente transcripción de un Space de BandaWeb3 e identifica 3-4 momentos CLAVE para crear clips de video.
+Analiza la transcripción anterior de un Space de BandaWeb3 e identifica 3-4 momentos CLAVE para crear clips de video.
 
 CRITERIOS para seleccionar momentos:
 - Frase impactante o controversial
@@ -122,9 +236,6 @@ Para cada momento destacado, proporciona:
 4. Razón por la que es destacado
 5. Speaker (si se identifica)
 
-TRANSCRIPCIÓN CON TIMESTAMPS:
-{transcript_with_timestamps}
-
 Genera la respuesta en formato JSON:
 {{
   "highlights": [
@@ -146,38 +257,61 @@ Genera la respuesta en formato JSON:
 
 def load_transcription(episode_dir):
     """
-    Load transcription files from episode directory
+    Load the transcription of an episode directory
+
+    Reads transcripts/transcription.json|txt (Whisper) and falls back to the
+    Deepgram/Fireflies transcript of the episode's Space (metadata.json
+    space_url), all through transcript_reader.
 
     Args:
         episode_dir (Path): Episode directory
 
     Returns:
-        dict: Transcription data
+        dict: Transcription data ("segments" are transcript_reader.Segment)
     """
     episode_dir = Path(episode_dir)
-    transcripts_dir = episode_dir / "transcripts"
-
-    # Try to load JSON first (has timestamps)
-    json_path = transcripts_dir / "transcription.json"
-    txt_path = transcripts_dir / "transcription.txt"
-
-    if json_path.exists():
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return {
-                "text": data["text"],
-                "segments": data.get("segments", []),
-                "has_timestamps": True
-            }
-    elif txt_path.exists():
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            return {
-                "text": f.read(),
-                "segments": [],
-                "has_timestamps": False
-            }
-    else:
-        raise FileNotFoundError(f"No transcription found in {transcripts_dir}")
+    transcript = open_episode_dir(episode_dir)
+    if transcript is None:
+        space_id = extract_space_id(load_metadata(episode_dir).get("space_url"))
+        transcript = open_transcript(space_id) if space_id else None
+    if transcript is None:
+        raise FileNotFoundError(f"No transcription found in {episode_dir / 'transcripts'}")
+
+    return transcription_data(transcript)
+
+
+def transcription_text(segments):
+    """
+    Prompt text of a transcript. Speaker turns keep the "[Speaker 0 - 00:01:06]"
+    block layout of the TXT transcripts (consecutive segments of one speaker
+    share a block); transcripts without speakers (Whisper) are plain text.
+    """
+    blocks = []
+    speaker = None
+    for seg in segments:
+        if not seg.text:
+            continue
+        if seg.speaker is None:
+            blocks.append(seg.text)
+        elif seg.speaker == speaker:
+            blocks[-1] += " " + seg.text
+        else:
+            blocks.append(f"[{seg.speaker} - {format_hms(seg.start)}]\n{seg.text}")
+        speaker = seg.speaker
+    if all(seg.speaker is None for seg in segments):
+        return " ".join(blocks)
+    return "\n\n".join(blocks)
+
+
+def transcription_data(transcript):
+    """The {"text", "segments", "has_timestamps"} dict of a transcript_reader.Transcript"""
+    segments = list(transcript.segments())
+    has_timestamps = any(seg.end for seg in segments)
+    return {
+        "text": transcription_text(segments),
+        "segments": segments if has_timestamps else [],
+        "has_timestamps": has_timestamps
+    }
 
 
 def load_metadata(episode_dir):
@@ -196,44 +330,99 @@ def load_metadata(episode_dir):
         }
 
 
-def generate_content_claude(prompt, max_tokens=4096):
+def generate_content_claude(prompt, max_tokens=4096, context=None):
     """
     Generate content using Claude API
 
+    The transcript is sent as a separate leading block marked with
+    cache_control, so calls that share the same transcript reuse Anthropic's
+    prompt cache. Full responses are also cached on disk in response_cache.
+
     Args:
         prompt (str): The prompt to send to Claude
         max_tokens (int): Maximum tokens in response
+        context (str): Shared transcript prefix sent before the prompt
 
     Returns:
         str: Generated content
     """
-    try:
-        message = client.messages.create(
-            model=os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022"),
-            max_tokens=max_tokens,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+    model = os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022")
+
+    cache_key = None
+    if response_cache is not None:
+        cache_key = ResponseCache.make_key(model, prompt, context, {"max_tokens": max_tokens})
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            instr.inc("response_cache", result="hit")
+            return cached["text"]
+        instr.inc("response_cache", result="miss")
+
+    content = []
+    if context:
+        content.append({
+            "type": "text",
+            "text": context,
+            "cache_control": {"type": "ephemeral"}
+        })
+    content.append({"type": "text", "text": prompt})
 
-        return message.content[0].text
+    try:
+        with rate_limiter, instr.timed_call("anthropic"):
+            message = client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "user", "content": content}
+                ]
+            )
+
+        text = message.content[0].text
+        token_usage.add(message.usage)
+        instr.inc("api_tokens", message.usage.input_tokens, api="anthropic", direction="in")
+        instr.inc("api_tokens", message.usage.output_tokens, api="anthropic", direction="out")
+        instr.inc("api_tokens", getattr(message.usage, "cache_read_input_tokens", None) or 0,
+                  api="anthropic", direction="cache_read")
 
     except Exception as e:
         print(f"❌ Error calling Claude API: {e}")
         return None
 
+    if cache_key is not None:
+        usage = message.usage
+        response_cache.put(cache_key, {
+            "model": model,
+            "created_at": datetime.now().isoformat(),
+            "text": text,
+            "usage": {
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None),
+                "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None)
+            }
+        })
+
+    return text
+
+
+# Generators whose prompts share transcript_context(), shortest response first
+SHARED_CONTEXT = ("linkedin", "thread", "article")
+
+
+def transcript_context(transcript):
+    """Shared transcript prefix for the thread, article and LinkedIn prompts"""
+    return f"TRANSCRIPCIÓN:\n{transcript['text']}"
+
 
 def generate_thread(transcript, metadata):
     """Generate X thread"""
     print("\n📱 Generating X thread...")
 
     prompt = PROMPTS["thread"].format(
-        transcript=transcript["text"][:15000],  # Limit for API
         episode_number=metadata.get("episode_number", "XXX"),
         title=metadata.get("title", "BandaWeb3 Space")
     )
 
-    response = generate_content_claude(prompt)
+    response = generate_content_claude(prompt, context=transcript_context(transcript))
 
     if response:
         print("✓ Thread generated!")
@@ -246,13 +435,12 @@ def generate_article(transcript, metadata):
     print("\n📝 Generating article...")
 
     prompt = PROMPTS["article"].format(
-        transcript=transcript["text"],
         episode_number=metadata.get("episode_number", "XXX"),
         date=metadata.get("date", datetime.now().strftime("%Y-%m-%d")),
         title=metadata.get("title", "BandaWeb3 Space")
     )
 
-    response = generate_content_claude(prompt, max_tokens=6000)
+    response = generate_content_claude(prompt, max_tokens=6000, context=transcript_context(transcript))
 
     if response:
         print("✓ Article generated!")
@@ -265,12 +453,11 @@ def generate_linkedin_post(transcript, metadata):
     print("\n💼 Generating LinkedIn post...")
 
     prompt = PROMPTS["linkedin"].format(
-        transcript=transcript["text"][:10000],
         episode_number=metadata.get("episode_number", "XXX"),
         title=metadata.get("title", "BandaWeb3 Space")
     )
 
-    response = generate_content_claude(prompt)
+    response = generate_content_claude(prompt, context=transcript_context(transcript))
 
     if response:
         print("✓ LinkedIn post generated!")
@@ -285,18 +472,17 @@ def generate_highlights(transcript, metadata):
     # Format transcript with timestamps if available
     if transcript["has_timestamps"] and transcript["segments"]:
         formatted_transcript = "\n\n".join([
-            f"[{format_timestamp(seg['start'])} - {format_timestamp(seg['end'])}] {seg['text']}"
+            f"[{format_timestamp(seg.start)} - {format_timestamp(seg.end)}] "
+            f"{seg.speaker + ': ' if seg.speaker else ''}{seg.text}"
             for seg in transcript["segments"]
         ])
     else:
         formatted_transcript = transcript["text"]
         print("⚠️  No timestamps available - results may be less accurate")
 
-    prompt = PROMPTS["highlights"].format(
-        transcript_with_timestamps=formatted_transcript[:20000]
-    )
+    context = f"TRANSCRIPCIÓN CON TIMESTAMPS:\n{formatted_transcript[:20000]}"
 
-    response = generate_content_claude(prompt, max_tokens=3000)
+    response = generate_content_claude(PROMPTS["highlights"], max_tokens=3000, context=context)
 
     if response:
         print("✓ Highlights identified!")
@@ -304,6 +490,41 @@ def generate_highlights(transcript, metadata):
     return None
 
 
+GENERATORS = {
+    "thread": generate_thread,
+    "article": generate_article,
+    "linkedin": generate_linkedin_post,
+    "highlights": generate_highlights
+}
+
+
+def generate_all(transcript, metadata, types_to_generate):
+    """
+    Run the requested generators concurrently
+
+    All calls share rate_limiter. A prompt cache entry can only be read
+    once the request that writes it has started responding, so of the
+    generators sharing transcript_context() the first one runs alone (next
+    to highlights, which has its own context) and the rest start when it
+    returns and read the transcript from the cache.
+
+    Returns:
+        dict: content type -> generated text (None on failure)
+    """
+    shared = [t for t in SHARED_CONTEXT if t in types_to_generate]
+    with ThreadPoolExecutor(max_workers=len(types_to_generate) or 1) as executor:
+        def submit(content_type):
+            return executor.submit(
+                instr.timed(f"generate.{content_type}")(GENERATORS[content_type]), transcript, metadata
+            )
+
+        futures = {t: submit(t) for t in types_to_generate if t not in shared[1:]}
+        if len(shared) > 1:
+            futures[shared[0]].result()
+            futures.update({t: submit(t) for t in shared[1:]})
+        return {content_type: futures[content_type].result() for content_type in types_to_generate}
+
+
 def format_timestamp(seconds):
     """Format seconds to MM:SS"""
     minutes = int(seconds // 60)
@@ -337,8 +558,7 @@ def save_generated_content(content_dict, output_dir):
                     else:
                         data = json.loads(content)
 
-                    with open(path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    save_json(path, data)
                 except:
                     path = output_dir / "thread_x.txt"
                     with open(path, 'w', encoding='utf-8') as f:
@@ -363,8 +583,7 @@ def save_generated_content(content_dict, output_dir):
                     else:
                         data = json.loads(content)
 
-                    with open(path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    save_json(path, data)
                 except:
                     path = output_dir / "video_highlights.txt"
                     with open(path, 'w', encoding='utf-8') as f:
@@ -391,6 +610,17 @@ def main():
         default=["all"],
         help="Content types to generate"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the API, ignoring cached responses"
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Maximum simultaneous Claude API calls"
+    )
 
     args = parser.parse_args()
 
@@ -428,37 +658,42 @@ def main():
     # Determine what to generate
     types_to_generate = args.types
     if "all" in types_to_generate:
-        types_to_generate = ["thread", "article", "linkedin", "highlights"]
-
-    # Generate content
-    generated_content = {}
+        types_to_generate = CONTENT_TYPES
+    types_to_generate = [t for t in CONTENT_TYPES if t in types_to_generate]
 
-    if "thread" in types_to_generate:
-        generated_content["thread"] = generate_thread(transcript, metadata)
+    global response_cache, rate_limiter
+    rate_limiter = RateLimiter(max_concurrent=args.max_concurrent)
+    if not args.no_cache:
+        response_cache = ResponseCache()
 
-    if "article" in types_to_generate:
-        generated_content["article"] = generate_article(transcript, metadata)
-
-    if "linkedin" in types_to_generate:
-        generated_content["linkedin"] = generate_linkedin_post(transcript, metadata)
-
-    if "highlights" in types_to_generate:
-        generated_content["highlights"] = generate_highlights(transcript, metadata)
+    # Generate content
+    start = time.monotonic()
+    generated_content = generate_all(transcript, metadata, types_to_generate)
+    elapsed = time.monotonic() - start
 
     # Save all generated content
     output_dir = episode_dir / "content"
-    saved_files = save_generated_content(generated_content, output_dir)
+    with instr.span("save"):
+        saved_files = save_generated_content(generated_content, output_dir)
 
     print(f"\n{'='*60}")
     print("✅ CONTENT GENERATION COMPLETE!")
     print(f"{'='*60}")
     print(f"\nGenerated {len(saved_files)} files in: {output_dir}")
+    print(f"Generation time: {elapsed:.1f}s")
+    print(f"API tokens: {token_usage.input_tokens} in ({token_usage.cache_read_tokens} from prompt cache) / "
+          f"{token_usage.output_tokens} out")
+    if response_cache is not None:
+        stats = response_cache.stats
+        print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evicted")
     print("\nNext steps:")
     print("1. Review generated content")
     print("2. Edit/approve as needed")
     print("3. Use n8n workflow to schedule publications")
-    print("4. Generate video clips (if highlights were created)")
+    print(f"4. Cut highlight clips: python3 scripts/clip_highlights.py {episode_dir}")
 
 
 if __name__ == "__main__":
-    main()
+    with instr.run("generate_content"):
+        main()
@@ -15,7 +15,24 @@ import shutil
 import argparse
 from pathlib import Path
 from typing import Dict, List
-from jinja2 import Environment, FileSystemLoader
+
+sys.path.append(str(Path(__file__).parent))
+from episode_schema import Episode, normalize
+from site_render import write_page
+import optimize_output
+
+TWITTER_URL = "https://twitter.com/BandaWeb3"
+# Navbars (relative links get each page's root prefix)
+NAV_LINKS = [
+    ("hosted.html", "Hosted Spaces"),
+    ("cohosted.html", "Co-hosted Spaces"),
+    (TWITTER_URL, "Twitter"),
+    ("rss.xml", "RSS"),
+]
+EPISODE_NAV_LINKS = [
+    ("index.html", "Todos los episodios"),
+    (TWITTER_URL, "Twitter"),
+]
 
 # Initialize colorama
 class Fore:
@@ -33,13 +50,8 @@ class WebsiteGenerator:
         self.base_dir = Path(__file__).parent.parent
         self.db_path = self.base_dir / "shared" / "episodes_database.json"
         self.flyers_dir = self.base_dir / "shared" / "flyers"
-        self.templates_dir = self.base_dir / "website" / "templates"
         self.static_dir = self.base_dir / "website" / "static"
         self.output_dir = Path(output_dir) if output_dir else self.base_dir / "website" / "output"
-        
-        # Setup Jinja2
-        self.env = Environment(loader=FileSystemLoader(str(self.templates_dir)))
-        self.env.filters['urlencode'] = lambda x: x.replace(' ', '%20')
     
     def load_database(self) -> Dict:
         """Load episodes database."""
@@ -101,8 +113,6 @@ class WebsiteGenerator:
     
     def generate_episode_page(self, episode: Dict, prev_episode: Dict = None, next_episode: Dict = None):
         """Generate individual episode page."""
-        template = self.env.get_template("episode.html")
-        
         # Create a copy to avoid modifying the original
         ep_copy = episode.copy()
         
@@ -110,35 +120,32 @@ class WebsiteGenerator:
         if not ep_copy.get("flyer_url") and ep_copy.get("flyer_urls") and len(ep_copy["flyer_urls"]) > 0:
             ep_copy["flyer_url"] = ep_copy["flyer_urls"][0]
         
-        html = template.render(
+        output_file = self.output_dir / "episodes" / f"episode_{episode['number']}.html"
+        write_page(
+            output_file, "episode.html",
+            root="../", nav_links=EPISODE_NAV_LINKS,
             episode=ep_copy,
             prev_episode=prev_episode,
             next_episode=next_episode,
             page_url=f"https://bandaweb3.com/episodes/episode_{episode['number']}.html"
         )
         
-        output_file = self.output_dir / "episodes" / f"episode_{episode['number']}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
         print(f"{Fore.GREEN}✓ Generated page for episode {episode['number']}")
     
     
-    def generate_index_page(self, episodes: List[Dict], stats: Dict):
+    def generate_index_page(self, episodes: List[Episode], stats: Dict):
         """Generate homepage with latest 6 episodes."""
-        template = self.env.get_template("index.html")
         
         # Sort episodes by date (newest first) and take latest 6
-        sorted_eps = sorted(episodes, key=lambda x: x.get('date', ''), reverse=True)
+        sorted_eps = sorted(episodes, key=lambda ep: ep.sort_key, reverse=True)
         latest_6 = sorted_eps[:6]
         
         # Calculate stats
         total_episodes = len(episodes)
-        total_minutes = 0
         
         index_episodes = []
         for ep in latest_6:
-            ep_copy = ep.copy()
+            ep_copy = ep.record.copy()
             
             # Handle flyer_url(s) and path correction
             f_url = None
@@ -156,55 +163,32 @@ class WebsiteGenerator:
             index_episodes.append(ep_copy)
 
         # Calculate total hours from all episodes
-        for ep in episodes:
-            d_str = ep.get("duration", "0 min")
-            matched = False
-            if 'h' in d_str:
-                parts = d_str.replace("m", "").split("h")
-                try:
-                    h = int(parts[0].strip()) if parts[0].strip() else 0
-                    m = int(parts[1].strip()) if len(parts) > 1 and parts[1].strip() else 0
-                    total_minutes += h * 60 + m
-                    matched = True
-                except:
-                    pass
-            
-            if not matched:
-                try:
-                    val = int(d_str.split()[0])
-                    total_minutes += val
-                except:
-                    pass
-
-        total_hours = total_minutes / 60
+        total_hours = sum(ep.duration_seconds or 0 for ep in episodes) / 3600
         
-        html = template.render(
+        write_page(
+            self.output_dir / "index.html", "index.html",
+            root="", nav_links=NAV_LINKS,
             latest_episodes=index_episodes,
             total_episodes=total_episodes,
             total_hours=int(total_hours)
         )
         
-        output_file = self.output_dir / "index.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
         print(f"{Fore.GREEN}✓ Generated index page")
     
-    def generate_hosted_page(self, episodes: List[Dict], stats: Dict):
+    def generate_hosted_page(self, episodes: List[Episode], stats: Dict):
         """Generate page with all hosted spaces (numeric IDs)."""
         import random
-        template = self.env.get_template("hosted.html")
         
         # Filter hosted episodes (numeric IDs like 001, 072, etc.)
-        hosted = [ep for ep in episodes if ep['number'].isdigit() or (ep['number'].isdigit() and len(ep['number']) <= 3)]
+        hosted = [ep for ep in episodes if ep.number.isdigit() or (ep.number.isdigit() and len(ep.number) <= 3)]
         
         # Sort by date (newest first)
-        hosted_sorted = sorted(hosted, key=lambda x: x.get('date', ''), reverse=True)
+        hosted_sorted = sorted(hosted, key=lambda ep: ep.sort_key, reverse=True)
         
         # Prepare episodes with correct paths
         hosted_episodes = []
         for ep in hosted_sorted:
-            ep_copy = ep.copy()
+            ep_copy = ep.record.copy()
             f_url = None
             if ep.get("flyer_urls") and len(ep["flyer_urls"]) > 0:
                 # Select random flyer if multiple exist
@@ -217,32 +201,29 @@ class WebsiteGenerator:
                 ep_copy["flyer_url"] = f_url
             hosted_episodes.append(ep_copy)
         
-        html = template.render(
+        write_page(
+            self.output_dir / "hosted.html", "hosted.html",
+            root="", nav_links=NAV_LINKS, logo_href="hosted.html",
             episodes=hosted_episodes,
             total_episodes=len(hosted_episodes),
             total_hours=stats.get('total_hours', 0)
         )
         
-        output_file = self.output_dir / "hosted.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
         print(f"{Fore.GREEN}✓ Generated hosted spaces page")
     
-    def generate_cohosted_page(self, episodes: List[Dict], stats: Dict):
+    def generate_cohosted_page(self, episodes: List[Episode], stats: Dict):
         """Generate page with all co-hosted spaces (date-based IDs)."""
-        template = self.env.get_template("cohosted.html")
         
         # Filter co-hosted episodes (date-based IDs like 20230213)
-        cohosted = [ep for ep in episodes if not ep['number'].isdigit() or len(ep['number']) > 3]
+        cohosted = [ep for ep in episodes if not ep.number.isdigit() or len(ep.number) > 3]
         
         # Sort by date (newest first)
-        cohosted_sorted = sorted(cohosted, key=lambda x: x.get('date', ''), reverse=True)
+        cohosted_sorted = sorted(cohosted, key=lambda ep: ep.sort_key, reverse=True)
         
         # Prepare episodes with correct paths
         cohosted_episodes = []
         for ep in cohosted_sorted:
-            ep_copy = ep.copy()
+            ep_copy = ep.record.copy()
             f_url = None
             if ep.get("flyer_urls") and len(ep["flyer_urls"]) > 0:
                 f_url = ep["flyer_urls"][0]
@@ -254,16 +235,14 @@ class WebsiteGenerator:
                 ep_copy["flyer_url"] = f_url
             cohosted_episodes.append(ep_copy)
         
-        html = template.render(
+        write_page(
+            self.output_dir / "cohosted.html", "cohosted.html",
+            root="", nav_links=NAV_LINKS, logo_href="cohosted.html",
             episodes=cohosted_episodes,
             total_episodes=len(cohosted_episodes),
             total_hours=stats.get('total_hours', 0)
         )
         
-        output_file = self.output_dir / "cohosted.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
         print(f"{Fore.GREEN}✓ Generated co-hosted spaces page")
     
     def generate_rss_feed(self, episodes: List[Dict], metadata: Dict):
@@ -330,22 +309,30 @@ class WebsiteGenerator:
             next_ep = episodes[i - 1] if i > 0 else None
             self.generate_episode_page(episode, prev_ep, next_ep)
         
+        # Listing pages work on the parsed records (durations, dates, sort keys)
+        typed = normalize(episodes)
+        
         # Generate index page
         print(f"\n{Fore.CYAN}Generating index page...")
-        self.generate_index_page(episodes, db.get("stats", {}))
+        self.generate_index_page(typed, db.get("stats", {}))
         
         # Generate hosted page
         print(f"\n{Fore.CYAN}Generating hosted spaces page...")
-        self.generate_hosted_page(episodes, db.get("stats", {}))
+        self.generate_hosted_page(typed, db.get("stats", {}))
         
         # Generate co-hosted page
         print(f"\n{Fore.CYAN}Generating co-hosted spaces page...")
-        self.generate_cohosted_page(episodes, db.get("stats", {}))
+        self.generate_cohosted_page(typed, db.get("stats", {}))
         
         # Generate RSS feed
         print(f"\n{Fore.CYAN}Generating RSS feed...")
         self.generate_rss_feed(episodes, metadata)
         
+        # Pages were rewritten in place: minify them and refresh their .br/.gz
+        # siblings so none still holds the previous build
+        print(f"\n{Fore.CYAN}Optimizing output...")
+        optimize_output.optimize(self.output_dir)
+        
         # Summary
         print(f"\n{Fore.CYAN}{'='*60}")
         print(f"{Fore.GREEN}✅ Website generated successfully!")
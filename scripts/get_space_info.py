@@ -11,6 +11,7 @@ import tweepy
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
+from db_io import save_json
 
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
@@ -192,8 +193,7 @@ def main():
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        save_json(output_path, metadata)
 
         print(f"\n💾 Metadata guardada en: {output_path}")
 
@@ -2,6 +2,7 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
+from db_io import load_json
 
 # Logic:
 # Parse co-hosted spaces.
@@ -55,8 +56,7 @@ def parse_smart_date(date_raw):
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
         
     existing_titles = {re.sub(r'\W+', '', ep.get("title", "").lower()): ep for ep in db["episodes"]}
     
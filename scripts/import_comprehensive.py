@@ -2,6 +2,7 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
+from db_io import load_json
 
 # Logic:
 # Parse all episodes.
@@ -21,8 +22,7 @@ def parse_date(date_str, year):
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
     # Map existing by number to update
     existing_nums = {ep["number"]: ep for ep in db["episodes"]}
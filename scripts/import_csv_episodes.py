@@ -3,6 +3,7 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
+from db_io import load_json
 
 def parse_date(date_str):
     try:
@@ -21,8 +22,7 @@ def main():
         print(f"Error: CSV file not found at {csv_path}")
         return
 
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
     # Create a map of existing episodes for easier updating
     ep_map = {ep["number"]: ep for ep in db["episodes"]}
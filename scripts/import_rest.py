@@ -1,4 +1,3 @@
-import json
 import zipfile
 import re
 from datetime import datetime
@@ -7,6 +6,7 @@ import os
 sys.path.append(os.getcwd())
 import scripts.manual_xlsx_parse as parser
 import scripts.sync_cohosted_excel as sync_logic
+from db_io import load_json, save_json
 
 # --- Helpers ---
 def normalize_title(t):
@@ -100,8 +100,7 @@ except Exception as e:
     exit(1)
 
 # 2. Load DB
-with open(db_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 db_titles = set()
 for ep in data['episodes']:
@@ -134,8 +133,7 @@ if to_add:
     data['episodes'].sort(key=lambda x: x.get('date', ''), reverse=True)
     
     # Save
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_json(db_path, data)
     
     print(f"\nSuccessfully added {len(to_add)} episodes!")
 else:
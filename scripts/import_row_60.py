@@ -1,4 +1,3 @@
-import json
 import zipfile
 import re
 from datetime import datetime
@@ -7,6 +6,7 @@ import os
 sys.path.append(os.getcwd())
 import scripts.manual_xlsx_parse as parser
 import scripts.sync_cohosted_excel as sync_logic
+from db_io import load_json, save_json
 
 def extract_date(date_str):
     try:
@@ -83,14 +83,12 @@ try:
                     except: pass
                 
                 # Add to DB
-                with open(db_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = load_json(db_path)
                     
                 data['episodes'].append(ep)
                 data['episodes'].sort(key=lambda x: x.get('date', ''), reverse=True)
                 
-                with open(db_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                save_json(db_path, data)
                     
                 print("Successfully added Row 60 episode.")
             else:
@@ -1,4 +1,3 @@
-import json
 import zipfile
 import re
 from datetime import datetime
@@ -7,6 +6,7 @@ import os
 sys.path.append(os.getcwd())
 import scripts.manual_xlsx_parse as parser
 import scripts.sync_cohosted_excel as sync_logic
+from db_io import load_json, save_json
 
 # --- Helpers ---
 def normalize_title(t):
@@ -93,8 +93,7 @@ except Exception as e:
 print(f"Found {len(excel_eps)} matching rows in Excel.")
 
 # 2. Load DB
-with open(db_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 # Count existing in DB
 db_count = 0
@@ -124,7 +123,6 @@ if needed > 0:
     # Sort
     data['episodes'].sort(key=lambda x: x.get('date', ''), reverse=True)
 
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_json(db_path, data)
 else:
     print("Database already has enough copies.")
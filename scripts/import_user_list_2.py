@@ -2,6 +2,7 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
+from db_io import load_json
 
 def parse_date(date_str):
     try:
@@ -13,8 +14,7 @@ def parse_date(date_str):
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
     existing_titles = {ep.get("title", ""): ep for ep in db["episodes"]}
     # Map normalized titles
@@ -2,6 +2,7 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
+from db_io import load_json
 
 # Based on checks, Ep 30 was likely early 2024.
 # The dates in the file are "May 15", "Feb 4".
@@ -19,8 +20,7 @@ def parse_date(date_str):
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
     
     existing_nums = {ep["number"]: ep for ep in db["episodes"]}
     
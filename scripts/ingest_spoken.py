@@ -1,79 +1,15 @@
-import openpyxl
-import json
 import os
 import re
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
 from collections import defaultdict
 
-def format_seconds(seconds):
-    return str(timedelta(seconds=seconds))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def parse_duration_to_seconds(duration_str):
-    if not duration_str:
-        return 0
-    
-    duration_str = duration_str.lower().strip()
-    
-    # Check for HH:MM:SS or MM:SS
-    if ':' in duration_str:
-        parts = duration_str.split(':')
-        if len(parts) == 3:
-            h, m, s = parts
-            return int(h) * 3600 + int(m) * 60 + int(float(s))
-        elif len(parts) == 2:
-            m, s = parts
-            return int(m) * 60 + int(float(s))
-            
-    # "1 hours, 2 minutes, 3 seconds"
-    h = 0
-    m = 0
-    s = 0
-    
-    match_h = re.search(r'(\d+)\s*(?:hour|hours|h)', duration_str)
-    if match_h:
-        h = int(match_h.group(1))
-        
-    match_m = re.search(r'(\d+)\s*(?:minute|minutes|min|m)(?!s)', duration_str) # negative lookahead for ms? simplier: just look for m or min
-    # Actually 'm' can match 'minutes' if we search specifically
-    if not match_m:
-         match_m = re.search(r'(\d+)\s*m\b', duration_str)
-         
-    if match_m:
-        m = int(match_m.group(1))
-        
-    match_s = re.search(r'(\d+)\s*(?:second|seconds|sec|s)\b', duration_str)
-    if match_s:
-        s = int(match_s.group(1))
-        
-    if h or m or s:
-        return h * 3600 + m * 60 + s
-        
-    # Fallback: simple integer treated as minutes? or seconds?
-    # Usually safer to return 0 if unknown
-    if duration_str.isdigit():
-        return int(duration_str) * 60 # Assume minutes if just a number? Or ignore.
-        
-    return 0
-
-def format_duration_hhmmss(duration_str):
-    seconds = parse_duration_to_seconds(duration_str)
-    if seconds == 0 and duration_str != "0":
-        # Check if it was already 00:00:00 or similar?
-        return duration_str
-        
-    # Format HH:MM:SS
-    # timedelta string is usually H:MM:SS or D days, H:MM:SS
-    td = timedelta(seconds=seconds)
-    s = str(td)
-    if len(s.split(':')) == 2: # 0:00:00
-        return "0" + s if len(s) == 7 else s # 0:05:00 -> 00:05:00
-        
-    # If standard output, it might look like "1 day, 2:00:00". We just want HH:MM:SS total hours
-    # Construct manually
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-    return f"{hours:02}:{minutes:02}:{secs:02}"
+from xlsx_reader import XlsxReader
+from episode_schema import canonical_duration, parse_listeners
+from db_io import edit_json
+from merge_databases import log_rewrite
 
 def parse_host_from_link(hyperlink_target):
     if not hyperlink_target:
@@ -124,19 +60,13 @@ def parse_details(cell_value):
                     pass
             elif part.startswith("Duration: "):
                 raw_duration = part.replace("Duration: ", "").strip()
-                duration = format_duration_hhmmss(raw_duration)
+                duration = canonical_duration(raw_duration)
                 
     return title, date_str, speakers, duration
 
-def extract_urls(cell_b_hyperlink, cell_e_hyperlink):
-    spacesdashboard_url = ""
-    space_url = ""
-    
-    if cell_b_hyperlink:
-        spacesdashboard_url = cell_b_hyperlink.target
-        
-    if cell_e_hyperlink:
-        space_url = cell_e_hyperlink.target
+def extract_urls(cell_b_link, cell_e_link):
+    spacesdashboard_url = cell_b_link or ""
+    space_url = cell_e_link or ""
         
     space_id = ""
     if spacesdashboard_url:
@@ -161,57 +91,47 @@ def ingest_spoken():
     output_file = os.path.join(base_dir, "shared/spoken_database.json")
 
     print(f"Loading {input_file}...")
-    wb = openpyxl.load_workbook(input_file)
-    ws = wb.active
-
     episodes = []
     
-    for row in ws.iter_rows(min_row=4, values_only=False):
-        cell_host = row[0]
-        cell_details = row[1]
-        cell_listeners = row[2]
-        cell_link = row[4]
-        
-        if not cell_details or not cell_details.value:
-            continue
-
-        host = ""
-        if cell_host.hyperlink:
-            host = parse_host_from_link(cell_host.hyperlink.target)
-        else:
-            if cell_host.value:
-                 lines = str(cell_host.value).split('\n')
-                 for line in lines:
-                    if line.strip().startswith('@'):
-                        host = line.strip()
-                        break
-                 if not host:
-                     host = lines[0].strip()
-
-        title, date, speakers, duration = parse_details(cell_details.value)
-        
-        listeners = 0
-        if cell_listeners.value:
-            try:
-                listeners = int(cell_listeners.value)
-            except:
-                pass
-        
-        space_url, spacesdashboard_url = extract_urls(cell_details.hyperlink, cell_link.hyperlink)
-        
-        ep = {
-            "type": "Spoken",
-            "title": title,
-            "host": host,
-            "listeners": listeners,
-            "date": date,
-            "speakers": speakers,
-            "duration": duration,
-            "space_url": space_url,
-            "spacesdashboard_url": spacesdashboard_url
-        }
-        
-        episodes.append(ep)
+    with XlsxReader(input_file) as reader:
+        for row in reader.iter_rows(min_row=4):
+            details = row.value('B', None)
+        
+            if not details:
+                continue
+
+            host = ""
+            if row.link('A'):
+                host = parse_host_from_link(row.link('A'))
+            else:
+                if row.value('A', None):
+                     lines = str(row.value('A')).split('\n')
+                     for line in lines:
+                        if line.strip().startswith('@'):
+                            host = line.strip()
+                            break
+                     if not host:
+                         host = lines[0].strip()
+
+            title, date, speakers, duration = parse_details(details)
+        
+            listeners = parse_listeners(row.value('C', None)) or 0
+        
+            space_url, spacesdashboard_url = extract_urls(row.link('B'), row.link('E'))
+        
+            ep = {
+                "type": "Spoken",
+                "title": title,
+                "host": host,
+                "listeners": listeners,
+                "date": date,
+                "speakers": speakers,
+                "duration": duration,
+                "space_url": space_url,
+                "spacesdashboard_url": spacesdashboard_url
+            }
+        
+            episodes.append(ep)
 
     episodes.sort(key=lambda x: x.get("date", ""), reverse=True)
 
@@ -246,15 +166,17 @@ def ingest_spoken():
             
         final_episodes.append(ep)
 
-    data = {
-        "description": "Database from Spoken - Spaces Dashboard.xlsx",
-        "generated_at": datetime.now().isoformat(),
-        "count": len(final_episodes),
-        "episodes": final_episodes
-    }
-
-    with open(output_file, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Replaced under the database's lock so a concurrent writer doesn't interleave
+    with edit_json(output_file, default={}) as data:
+        old_episodes = data.get('episodes', [])
+        data.clear()
+        data.update({
+            "description": "Database from Spoken - Spaces Dashboard.xlsx",
+            "generated_at": datetime.now().isoformat(),
+            "count": len(final_episodes),
+            "episodes": final_episodes
+        })
+    log_rewrite('spoken', old_episodes, final_episodes, path=output_file)
     
     print(f"Successfully generated {output_file} with {len(final_episodes)} episodes.")
 
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Timing, metrics and profiling for the long-running pipeline scripts.
+
+    import instrumentation as instr
+
+    with instr.run('simple_build'):
+        with instr.span('render.episodes', count=len(episodes)):
+            ...
+        instr.inc('pages_rendered')
+        instr.observe('page_bytes', len(html))
+
+    @instr.timed('deepgram.transcribe')
+    def transcribe_file(filepath, api_key):
+        ...
+
+Spans nest (per thread) and each closed span is appended to a JSONL trace
+together with one summary line per run: total time per top-level stage,
+counters and histogram summaries. `python3 scripts/instrumentation.py
+report` reads the trace back to show which stage dominates a run and how
+the latest run compares with earlier ones.
+
+Everything is driven by environment variables so nightly jobs can opt in
+without code changes:
+
+    BANDAWEB3_TRACE         Trace file (default shared/cache/trace.jsonl; "off" disables)
+    BANDAWEB3_METRICS_PORT  Serve Prometheus text on :PORT/metrics while the run lasts
+    BANDAWEB3_METRICS_FILE  Write Prometheus text to this file when the run ends
+                            (node_exporter textfile collector format)
+    BANDAWEB3_PROFILE       "cprofile" or "sample": profile the run into shared/cache/profiles/
+
+Usage:
+    python3 scripts/instrumentation.py report
+    python3 scripts/instrumentation.py report --script simple_build --last 10
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import signal
+import argparse
+import threading
+import functools
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+
+TRACE_PATH = Path('shared/cache/trace.jsonl')
+PROFILE_DIR = Path('shared/cache/profiles')
+
+ENV_TRACE = 'BANDAWEB3_TRACE'
+ENV_METRICS_PORT = 'BANDAWEB3_METRICS_PORT'
+ENV_METRICS_FILE = 'BANDAWEB3_METRICS_FILE'
+ENV_PROFILE = 'BANDAWEB3_PROFILE'
+
+# Prometheus-style bucket bounds
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(10))  # 1 KiB .. 256 GiB
+RESERVOIR_SIZE = 1024
+SAMPLE_INTERVAL = 0.005
+REGRESSION_THRESHOLD = 0.2
+
+
+# --- Metrics ---
+
+def _num(value):
+    """Counter/sum value without float noise: 5755660, not 5.75566e+06"""
+    return str(int(value)) if float(value).is_integer() else repr(round(value, 6))
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Bucketed observations plus a small reservoir for run-summary quantiles."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'min', 'max', 'reservoir')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.reservoir = []
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = value
+
+    def quantile(self, q):
+        if not self.reservoir:
+            return None
+        values = sorted(self.reservoir)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+
+class Registry:
+    """Counters and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[(name, _label_key(labels))] += value
+
+    def observe(self, name, value, buckets=None, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                if buckets is None:
+                    buckets = BYTES_BUCKETS if name.endswith('bytes') else SECONDS_BUCKETS
+                hist = self.histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    @staticmethod
+    def _series(name, labels):
+        if not labels:
+            return name
+        return name + '{' + ','.join(f'{k}={v}' for k, v in labels) + '}'
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': {self._series(n, l): v for (n, l), v in sorted(self.counters.items())},
+                'histograms': {self._series(n, l): h.summary() for (n, l), h in sorted(self.histograms.items())},
+            }
+
+    def prometheus(self, prefix='bandaweb3_'):
+        """Metrics in the Prometheus text exposition format"""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = prefix + name
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} counter')
+                    typed.add(metric)
+                lines.append(f'{metric}{fmt(labels)} {_num(value)}')
+            for (name, labels), hist in sorted(self.histograms.items()):
+                metric = prefix + name
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} histogram')
+                    typed.add(metric)
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{fmt(labels, [("le", f"{bound:g}")])} {cumulative}')
+                lines.append(f'{metric}_bucket{fmt(labels, [("le", "+Inf")])} {hist.count}')
+                lines.append(f'{metric}_sum{fmt(labels)} {_num(hist.sum)}')
+                lines.append(f'{metric}_count{fmt(labels)} {hist.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def inc(name, value=1, **labels):
+    """Add to a counter (pages_rendered, bytes_written, api_retries, ...)"""
+    registry.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    """Record a histogram observation; names ending in 'bytes' get byte buckets"""
+    registry.observe(name, value, **labels)
+
+
+# --- Trace ---
+
+class _Run:
+    """State of the active run: id, trace sink, stage totals and span ids."""
+
+    def __init__(self, script, trace_path):
+        self.script = script
+        self.id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.trace_path = trace_path
+        self.stages = defaultdict(float)
+        self.lock = threading.Lock()
+        self.next_span = 0
+        self.file = None
+        if trace_path is not None:
+            trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(trace_path, 'a', encoding='utf-8')
+
+    def span_id(self):
+        with self.lock:
+            self.next_span += 1
+            return self.next_span
+
+    def write(self, record):
+        if self.file is None:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+_run = None
+_local = threading.local()
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Time a block; nested spans record their parent
+
+    The duration also lands in the span_seconds histogram, so stages show
+    up in Prometheus output even without a trace file.
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    span_id = _run.span_id() if _run is not None else None
+    stack.append(span_id)
+    started = time.time()
+    t0 = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - t0
+        stack.pop()
+        registry.observe('span_seconds', duration, span=name)
+        if _run is not None:
+            if parent is None:
+                with _run.lock:
+                    _run.stages[name] += duration
+            record = {
+                'type': 'span', 'run': _run.id, 'script': _run.script, 'name': name,
+                'id': span_id, 'parent': parent, 'start': round(started, 6),
+                'duration': round(duration, 6),
+            }
+            if attrs:
+                record['attrs'] = attrs
+            if error:
+                record['error'] = error
+            _run.write(record)
+
+
+def timed(name=None, **attrs):
+    """Decorator form of span(); defaults to the function's qualified name"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timed_call(api, **labels):
+    """Time one external call into api_latency_seconds{api=...}; failures count as api_errors"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.inc('api_errors', api=api, **labels)
+        raise
+    finally:
+        registry.observe('api_latency_seconds', time.perf_counter() - t0, api=api, **labels)
+
+
+# --- Prometheus endpoint ---
+
+def serve_metrics(port):
+    """Serve registry.prometheus() on :port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- Profiling ---
+
+class SamplingProfiler:
+    """
+    Statistical profiler: SIGPROF every `interval` seconds of CPU time
+    records the main thread's stack. Output is folded stacks
+    (flamegraph.pl / speedscope). Unix only.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+            frame = frame.f_back
+        self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _start_profiler(mode):
+    if mode == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    if mode == 'sample':
+        if not hasattr(signal, 'setitimer'):
+            print("⚠️  Sampling profiler needs signal.setitimer; skipping")
+            return None
+        profiler = SamplingProfiler()
+        profiler.start()
+        return profiler
+    print(f"⚠️  Unknown {ENV_PROFILE}={mode!r} (use 'cprofile' or 'sample')")
+    return None
+
+
+def _stop_profiler(profiler, script):
+    """Stop and save a profiler; returns the output path"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+        path = PROFILE_DIR / f"{script}-{stamp}.folded"
+        profiler.save(path)
+    else:
+        import pstats
+        profiler.disable()
+        path = PROFILE_DIR / f"{script}-{stamp}.prof"
+        profiler.dump_stats(path)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+    print(f"🔬 Profile saved: {path}")
+    return path
+
+
+# --- Run ---
+
+def _trace_path():
+    value = os.getenv(ENV_TRACE, '')
+    if value.lower() in ('off', '0', 'false', 'no'):
+        return None
+    return Path(value) if value else TRACE_PATH
+
+
+@contextmanager
+def run(script, profile=None):
+    """
+    Instrument a whole script run
+
+    Args:
+        script: Name the run is recorded under
+        profile: 'cprofile' or 'sample' (default: $BANDAWEB3_PROFILE)
+    """
+    global _run
+    if _run is not None:
+        # Nested run (a script calling another's main): just a span
+        with span(script):
+            yield
+        return
+
+    _run = current = _Run(script, _trace_path())
+    server = None
+    port = os.getenv(ENV_METRICS_PORT)
+    if port:
+        server = serve_metrics(int(port))
+        print(f"📈 Metrics on http://localhost:{port}/metrics")
+
+    mode = profile or os.getenv(ENV_PROFILE)
+    profiler = _start_profiler(mode) if mode else None
+    t0 = time.perf_counter()
+    status = 'ok'
+    try:
+        yield current
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - t0
+        profile_path = _stop_profiler(profiler, script) if profiler is not None else None
+        summary = {
+            'type': 'run', 'run': current.id, 'script': script,
+            'start': datetime.fromtimestamp(current.started).isoformat(timespec='seconds'),
+            'duration': round(duration, 6), 'status': status,
+            'stages': {k: round(v, 6) for k, v in sorted(current.stages.items(), key=lambda x: -x[1])},
+            **registry.snapshot(),
+        }
+        if profile_path:
+            summary['profile'] = str(profile_path)
+        current.write(summary)
+        current.close()
+
+        metrics_file = os.getenv(ENV_METRICS_FILE)
+        if metrics_file:
+            registry.inc('run_seconds', duration, script=script)
+            Path(metrics_file).write_text(registry.prometheus(), encoding='utf-8')
+        if server is not None:
+            server.shutdown()
+        _run = None
+
+
+# --- Report ---
+
+def load_runs(path=TRACE_PATH, script=None):
+    """Run summary records of a trace file, oldest first"""
+    runs = []
+    if not Path(path).exists():
+        return runs
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('type') == 'run' and (script is None or record.get('script') == script):
+                runs.append(record)
+    return runs
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def report(path=TRACE_PATH, script=None, last=5):
+    runs = load_runs(path, script)
+    if not runs:
+        print(f"No runs recorded in {path}")
+        return
+
+    by_script = defaultdict(list)
+    for r in runs:
+        by_script[r['script']].append(r)
+
+    for name, history in by_script.items():
+        latest = history[-1]
+        print(f"\n{'='*70}")
+        print(f"{name}: {len(history)} runs, latest {latest['start']} "
+              f"({latest['duration']:.2f}s, {latest['status']})")
+        print(f"{'='*70}")
+
+        previous = history[-1 - last:-1]
+        print(f"{'stage':<32}{'latest':>10}{'share':>8}{'median prev':>14}{'change':>10}")
+        for stage, seconds in latest['stages'].items():
+            share = seconds / latest['duration'] if latest['duration'] else 0
+            before = [r['stages'][stage] for r in previous if stage in r.get('stages', {})]
+            if before:
+                base = _median(before)
+                change = (seconds - base) / base if base else 0
+                flag = '  ⚠️' if change > REGRESSION_THRESHOLD else ''
+                print(f"{stage:<32}{seconds:>9.2f}s{share:>8.0%}{base:>13.2f}s{change:>+10.0%}{flag}")
+            else:
+                print(f"{stage:<32}{seconds:>9.2f}s{share:>8.0%}{'-':>14}{'-':>10}")
+
+        if latest.get('counters'):
+            print("\ncounters:")
+            for series, value in latest['counters'].items():
+                print(f"   {series}: {_num(value)}")
+        hists = {k: v for k, v in latest.get('histograms', {}).items() if not k.startswith('span_seconds')}
+        if hists:
+            print("\nhistograms:")
+            for series, h in hists.items():
+                print(f"   {series}: n={h['count']} p50={h['p50']:.4g} p95={h['p95']:.4g} max={h['max']:.4g}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize instrumented pipeline runs")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rep = sub.add_parser('report', help="Stage breakdown of the latest runs and change vs. earlier runs")
+    rep.add_argument('--trace', default=str(_trace_path() or TRACE_PATH), help="Trace file")
+    rep.add_argument('--script', help="Only runs of this script")
+    rep.add_argument('--last', type=int, default=5, help="Earlier runs to compare against")
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        report(args.trace, args.script, args.last)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,10 @@
-import json
-import zipfile
-import re
 from datetime import datetime
 import sys
 import os
-sys.path.append(os.getcwd())
-import scripts.manual_xlsx_parse as parser
-
-def normalize_title(t):
-    return re.sub(r'[^a-z0-9]', '', t.lower())
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from xlsx_reader import XlsxReader
+from episode_matcher import EpisodeMatcher, MatchReport
+from db_io import load_json, save_json
 
 def extract_date(date_str):
     try:
@@ -22,8 +18,7 @@ excel_path = 'shared/inputs/Cohosted - Spaces Dashboard.xlsx'
 db_path = 'shared/episodes_database.json'
 
 # Load DB
-with open(db_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 # Identify missing host episodes
 targets = []
@@ -35,20 +30,14 @@ print(f"Found {len(targets)} co-hosted episodes missing host.")
 if not targets:
     exit(0)
 
-# Create lookup map from Excel
-# We need (Date, Title) -> Host
-lookup_map = {} # Key: Date (since titles might vary slightly, but dates are usually good for SpacesDashboard exports)
+# Index Excel rows so each target episode can be matched to (Date, Title) -> Host
+excel_rows = []
 
 try:
-    with zipfile.ZipFile(excel_path, 'r') as zf:
-        strings = parser.parse_shared_strings(zf)
-        links_map = parser.parse_hyperlinks(zf)
-        raw_rows = parser.parse_sheet(zf, strings, links_map)
-        
-        for row in raw_rows:
+    with XlsxReader(excel_path) as reader:
+        for row in reader.iter_rows(typed=False):
             # Col A: Host (The one we want)
-            host_cell = next((c for c in row if c['ref'].startswith('A')), None)
-            host_raw = host_cell['value'] if host_cell else "Unknown"
+            host_raw = row.value('A') if row['A'] else "Unknown"
             
             # Extract handle from Host field (e.g. "Name@handle")
             # Usually format is "Name@handle" or just "Name". 
@@ -63,11 +52,10 @@ try:
                     host_clean = f"@{handle}"
             
             # Col B: Description/Date
-            desc_cell = next((c for c in row if c['ref'].startswith('B')), None)
-            if not desc_cell or not desc_cell.get('value') or 'Ended:' not in desc_cell['value']: continue
+            desc_raw = row.value('B')
+            if 'Ended:' not in desc_raw: continue
             
             try:
-                desc_raw = desc_cell['value']
                 parts = desc_raw.split(' - Ended: ')
                 if len(parts) < 2:
                     continue
@@ -78,10 +66,10 @@ try:
                 
                 if date_str:
                     title = parts[0].strip()
-                    if date_str not in lookup_map:
-                        lookup_map[date_str] = []
-                    lookup_map[date_str].append({
+                    excel_rows.append({
                         'title': title,
+                        'date': date_str,
+                        'space_url': row.link('D') or "",
                         'host': host_clean,
                         'orig_row_host': host_raw
                     })
@@ -94,23 +82,19 @@ except Exception as e:
     exit(1)
 
 # Match and Update
+matcher = EpisodeMatcher(excel_rows)
+report = MatchReport()
 updated_count = 0
 for ep in targets:
     d = ep.get('date')
-    ep_title_norm = normalize_title(ep.get('title', ''))
-    
-    candidates = lookup_map.get(d, [])
-    
-    best_match = None
-    if len(candidates) == 1:
-        best_match = candidates[0]
-    elif len(candidates) > 1:
-        # Fuzzy match title
-        for cand in candidates:
-            cand_norm = normalize_title(cand['title'])
-            if cand_norm in ep_title_norm or ep_title_norm in cand_norm:
-                best_match = cand
-                break
+    candidate = matcher.best(ep, report=report)
+    best_match = candidate.record if candidate else None
+
+    # A single Excel row on that date is taken even if the titles differ
+    if not best_match:
+        same_day = matcher.records_on(d)
+        if len(same_day) == 1:
+            best_match = same_day[0]
     
     if best_match:
         ep['host'] = best_match['host']
@@ -120,7 +104,7 @@ for ep in targets:
         print(f"Could not find match for: [{d}] {ep['title']}")
 
 # Save
-with open(db_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+save_json(db_path, data)
 
+report.print_summary()
 print(f"Update Complete. {updated_count} episodes updated.")
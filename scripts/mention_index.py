@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Where guests, hosts and topics are mentioned across all transcripts.
+
+Every known handle and display name (from the people index) and every
+episode topic is compiled into one Aho-Corasick automaton. Each
+transcript TXT (shared/transcriptions, shared/transcriptions_fireflies)
+is then streamed block by block (transcript_reader) through it once,
+instead of one regex pass per name. A mention records the entity, the speaker of the block and the
+block's start time; an entity counts once per block.
+
+- Text and patterns are lowercased and accent-folded. A match must start
+  and end on a word boundary ("ana" does not match inside "mañana").
+- The C `ahocorasick` module (pyahocorasick) is used when installed,
+  with a pure-Python automaton as the fallback.
+- Files are scanned in a process pool. The index is incremental: a file
+  is rescanned only if its size/mtime changed or the pattern set did.
+
+Index (shared/cache/mentions.json):
+
+    {"patterns": "<hash>",
+     "files": {"shared/transcriptions/<id>.txt": {
+         "episode": "073", "size": ..., "mtime_ns": ...,
+         "speakers": ["Speaker 0", ...],
+         "mentions": {"<entity id>": [[speaker index, seconds], ...]}}}}
+
+Entity ids are people keys (see people_index.person_key) and
+"topic:<slug>" for topics.
+
+Usage:
+    python3 scripts/mention_index.py build [--workers 4]
+    python3 scripts/mention_index.py find @meximalist
+    python3 scripts/mention_index.py find "topic:ethereum"
+"""
+
+import re
+import sys
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json
+from episode_schema import normalize
+from people_index import PeopleIndex, person_key
+from transcript_reader import Transcript
+import instrumentation as instr
+
+CONSOLIDATED_DB_PATH = Path('shared/consolidated_database.json')
+INDEX_PATH = Path('shared/cache/mentions.json')
+TRANSCRIPT_GLOBS = [
+    (Path('shared/transcriptions'), '*.txt', ''),
+    (Path('shared/transcriptions_fireflies'), '*_fireflies.txt', '_fireflies'),
+]
+MIN_PATTERN = 3
+SCAN_VERSION = 2     # bump when scan() output changes
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def topic_id(topic):
+    return 'topic:' + re.sub(r'[^a-z0-9]+', '-', fold(topic)).strip('-')
+
+
+def build_patterns(episodes):
+    """Folded pattern -> entity id for every known person and topic"""
+    people = PeopleIndex.build(episodes)
+    patterns = {}
+    for ep in episodes:
+        for topic in ep.get('topics') or []:
+            patterns.setdefault(fold(topic.strip()), topic_id(topic))
+    # People win over topics that spell the same thing
+    for person in people.people.values():
+        for value in (person.name, person.handle, person.handle and person.handle[1:]):
+            if value:
+                patterns[fold(value.strip())] = person.key
+    return {p: e for p, e in patterns.items() if len(p) >= MIN_PATTERN}
+
+
+def patterns_hash(patterns):
+    lines = [f"v{SCAN_VERSION}"] + [f"{p}\t{e}" for p, e in sorted(patterns.items())]
+    return hashlib.sha256('\n'.join(lines).encode()).hexdigest()
+
+
+class Automaton:
+    """Pure-Python Aho-Corasick with the subset of the pyahocorasick API used here"""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+    def add_word(self, word, value):
+        state = 0
+        for c in word:
+            nxt = self.goto[state].get(c)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][c] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(value)
+
+    def make_automaton(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(c, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, c in enumerate(text):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for value in out[state]:
+                yield i, value
+
+
+def compile_automaton(patterns):
+    automaton = ahocorasick.Automaton() if ahocorasick else Automaton()
+    for pattern, entity in patterns.items():
+        automaton.add_word(pattern, (len(pattern), entity))
+    automaton.make_automaton()
+    return automaton
+
+
+def _boundary(text, start, end):
+    """text[start:end + 1] is a whole word (or words)"""
+    return (start == 0 or not text[start - 1].isalnum()) and \
+           (end + 1 == len(text) or not text[end + 1].isalnum())
+
+
+def scan(path, automaton):
+    """(speakers, {entity: [[speaker index, seconds], ...]}) for one transcript TXT"""
+    speakers, speaker_ids, mentions = [], {}, {}
+    # Blocks only: the metadata header (title, description, links) is not speech
+    for seg in Transcript(path).segments():
+        if seg.speaker is None:
+            continue
+        if seg.speaker not in speaker_ids:
+            speaker_ids[seg.speaker] = len(speakers)
+            speakers.append(seg.speaker)
+        speaker, seconds = speaker_ids[seg.speaker], int(seg.start)
+        text = fold(seg.text)
+        seen = set()
+        for end, (length, entity) in automaton.iter(text):
+            start = end - length + 1
+            if entity not in seen and _boundary(text, start, end):
+                seen.add(entity)
+                mentions.setdefault(entity, []).append([speaker, seconds])
+    return speakers, mentions
+
+
+_automaton = None
+
+
+def _init_worker(patterns):
+    global _automaton
+    _automaton = compile_automaton(patterns)
+
+
+def _scan_file(path):
+    return path, scan(path, _automaton)
+
+
+def transcript_files():
+    """(path, transcript id) of every transcript TXT"""
+    for directory, pattern, suffix in TRANSCRIPT_GLOBS:
+        for path in sorted(directory.glob(pattern)):
+            yield path, path.stem[:-len(suffix)] if suffix else path.stem
+
+
+def build(db_path=CONSOLIDATED_DB_PATH, index_path=INDEX_PATH, workers=None, full=False):
+    episodes = normalize(load_json(db_path).get('episodes', []))
+    by_transcript = {ep.transcript_id: ep.number for ep in episodes}
+    patterns = build_patterns(episodes)
+    phash = patterns_hash(patterns)
+
+    index = load_json(index_path) if Path(index_path).exists() and not full else {}
+    old_files = index.get('files', {}) if index.get('patterns') == phash else {}
+
+    files, todo = {}, []
+    for path, transcript_id in transcript_files():
+        st = path.stat()
+        key = path.as_posix()
+        entry = old_files.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            files[key] = entry
+        else:
+            files[key] = {'episode': by_transcript.get(transcript_id), 'size': st.st_size,
+                          'mtime_ns': st.st_mtime_ns, 'speakers': [], 'mentions': {}}
+            todo.append(key)
+
+    print(f"🔎 {len(patterns)} patrones, {len(files)} transcripciones ({len(todo)} por escanear)")
+    with instr.span('mentions.scan', files=len(todo), patterns=len(patterns)):
+        if todo:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(patterns,)) as pool:
+                for key, (speakers, mentions) in pool.map(_scan_file, todo, chunksize=4):
+                    files[key]['speakers'] = speakers
+                    files[key]['mentions'] = mentions
+                    instr.inc('mentions_found', sum(len(v) for v in mentions.values()))
+    instr.inc('transcripts_scanned', len(todo))
+
+    save_json(index_path, {'patterns': phash, 'files': files})
+    total = sum(len(v) for entry in files.values() for v in entry['mentions'].values())
+    print(f"✅ {total} menciones en {index_path}")
+    return files
+
+
+def mentions_by_entity(files):
+    """entity -> [(episode, speaker, seconds), ...]: the inverted view of an index's files"""
+    by_entity = {}
+    for entry in files.values():
+        for entity, hits in entry['mentions'].items():
+            rows = by_entity.setdefault(entity, [])
+            for speaker, seconds in hits:
+                rows.append((entry['episode'], entry['speakers'][speaker], seconds))
+    return by_entity
+
+
+def load_mentions(index_path=INDEX_PATH):
+    """entity -> mentions of an existing index ({} if it was never built)"""
+    if not Path(index_path).exists():
+        return {}
+    return mentions_by_entity(load_json(index_path).get('files', {}))
+
+
+def by_episode(rows):
+    """[(episode, mentions, first second)] of one entity's mentions, most mentions first"""
+    summary = {}
+    for episode, _, seconds in rows:
+        count, first = summary.get(episode, (0, seconds))
+        summary[episode] = (count + 1, min(first, seconds))
+    return sorted(((ep, n, t) for ep, (n, t) in summary.items() if ep), key=lambda r: (-r[1], str(r[0])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mention index of people and topics across transcripts")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help="Scan new and changed transcripts")
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--full', action='store_true', help="Rescan every transcript")
+    p = sub.add_parser('find', help="Mentions of a person or topic")
+    p.add_argument('entity', help="Handle, name or topic:<slug>")
+    p.add_argument('--limit', type=int, default=30)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with instr.run('mention_index'):
+            build(workers=args.workers, full=args.full)
+        return
+
+    entity = args.entity if args.entity.startswith('topic:') else person_key(args.entity)
+    rows = load_mentions().get(entity, [])
+    print(f"{entity}: {len(rows)} menciones")
+    for episode, speaker, seconds in sorted(rows, key=lambda r: (str(r[0]), r[2]))[:args.limit]:
+        h, rem = divmod(seconds, 3600)
+        print(f"   #{episode or '?'}  {h:02d}:{rem // 60:02d}:{rem % 60:02d}  {speaker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,61 @@
 """
 Script para consolidar episodes_database.json y spoken_database.json en una sola base de datos
 sin duplicados, ordenada por fecha (más reciente primero)
+
+La base consolidada se mantiene de forma incremental: los scripts que escriben las bases de
+origen (sync_hosted_excel.py, sync_cohosted_excel.py, ingest_spoken.py) registran sus cambios
+(upserts/deletes) con log_changes()/log_rewrite() en un log append-only (shared/consolidated_changes.jsonl),
+junto con el tamaño/mtime con que dejaron el archivo. La consolidación aplica solo esos
+cambios sobre consolidated_database.json y las estadísticas. Una base de origen se vuelve a
+recorrer entera únicamente si su tamaño/mtime no coincide con el último registrado, es decir,
+si la escribió un script que no usa el log. Las ediciones hechas directamente en la base
+consolidada se conservan mientras el episodio no cambie en su base de origen.
+
+Uso:
+    # Aplicar el log y revisar las bases escritas fuera de él (la primera vez hace un rebuild)
+    python3 scripts/merge_databases.py
+
+    # Aplicar solo lo que ya está en el log, sin revisar las bases de origen
+    python3 scripts/merge_databases.py --apply-only
+
+    # Comprobar que el resultado incremental es igual a un rebuild completo
+    python3 scripts/merge_databases.py --verify
+
+    # Rebuild completo (descarta ediciones directas y reinicia el log)
+    python3 scripts/merge_databases.py --full
 """
 
+import sys
 import json
+import bisect
+import hashlib
+import argparse
 from datetime import datetime
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from episode_schema import extract_space_id
+import db_io
+
+EPISODES_PATH = Path('shared/episodes_database.json')
+SPOKEN_PATH = Path('shared/spoken_database.json')
+CONSOLIDATED_PATH = Path('shared/consolidated_database.json')
+CHANGE_LOG_PATH = Path('shared/consolidated_changes.jsonl')
+STATE_PATH = Path('shared/consolidated_state.json')
+
+# Orden de prioridad: si un episodio está en ambas, gana episodes_database.json
+SOURCES = {
+    'episodes': EPISODES_PATH,
+    'spoken': SPOKEN_PATH,
+}
+
 def load_json(filepath):
     """Carga un archivo JSON"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return db_io.load_json(filepath)
 
 def save_json(data, filepath):
-    """Guarda datos en un archivo JSON"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Guarda datos en un archivo JSON (escritura atómica, solo si cambiaron)"""
+    return db_io.save_json(filepath, data)
 
 def parse_date(date_str):
     """Convierte una fecha string a objeto datetime para ordenar"""
@@ -26,102 +66,106 @@ def parse_date(date_str):
         # Si falla, retornar una fecha muy antigua
         return datetime(1900, 1, 1)
 
-def merge_databases():
-    """Fusiona las dos bases de datos eliminando duplicados"""
-    
-    print("\n" + "="*100)
-    print("CONSOLIDANDO BASES DE DATOS")
-    print("="*100 + "\n")
-    
-    # Cargar ambas bases de datos
-    episodes_db = load_json('shared/episodes_database.json')
-    spoken_db = load_json('shared/spoken_database.json')
-    
-    episodes_list = episodes_db.get('episodes', [])
-    spoken_list = spoken_db.get('episodes', [])
-    
-    print(f"📊 Episodios en episodes_database.json: {len(episodes_list)}")
-    print(f"📊 Episodios en spoken_database.json: {len(spoken_list)}")
-    
-    # Crear un diccionario para rastrear episodios únicos por space_url
-    unique_episodes = {}
-    
-    # Primero agregar todos los episodios de episodes_database.json
-    for episode in episodes_list:
-        space_url = episode.get('space_url', '')
-        if space_url:
-            unique_episodes[space_url] = episode
-        else:
-            # Si no tiene space_url, usar una clave única basada en otros campos
-            key = f"{episode.get('date', '')}_{episode.get('title', '')}_{episode.get('number', '')}"
-            if key not in unique_episodes:
-                unique_episodes[key] = episode
-    
-    print(f"\n✅ Episodios únicos de episodes_database.json: {len(unique_episodes)}")
-    
-    # Agregar episodios de spoken_database.json que no estén duplicados
-    added_from_spoken = 0
-    for episode in spoken_list:
-        space_url = episode.get('space_url', '')
-        
-        if space_url:
-            if space_url not in unique_episodes:
-                unique_episodes[space_url] = episode
-                added_from_spoken += 1
-        else:
-            # Si no tiene space_url, usar una clave única
-            key = f"{episode.get('date', '')}_{episode.get('title', '')}_{episode.get('number', '')}"
-            if key not in unique_episodes:
-                unique_episodes[key] = episode
-                added_from_spoken += 1
-    
-    print(f"✅ Episodios únicos agregados de spoken_database.json: {added_from_spoken}")
-    
-    # Convertir el diccionario a lista
-    merged_episodes = list(unique_episodes.values())
-    
-    # Ordenar por fecha (más reciente primero)
-    merged_episodes.sort(key=lambda x: parse_date(x.get('date', '1900-01-01')), reverse=True)
-    
-    print(f"\n🎯 Total de episodios únicos en la base de datos consolidada: {len(merged_episodes)}")
-    
-    # Calcular estadísticas
-    total_episodes = len(merged_episodes)
-    episodes_with_listeners = sum(1 for ep in merged_episodes if ep.get('listeners'))
-    total_listeners = sum(ep.get('listeners', 0) for ep in merged_episodes if isinstance(ep.get('listeners'), (int, float)))
-    avg_listeners = total_listeners / episodes_with_listeners if episodes_with_listeners > 0 else 0
-    
-    # Contar por tipo
-    type_breakdown = {}
-    for ep in merged_episodes:
-        ep_type = ep.get('type', 'unknown')
-        type_breakdown[ep_type] = type_breakdown.get(ep_type, 0) + 1
-    
-    # Calcular duración total
-    total_duration_seconds = 0
-    episodes_with_duration = 0
-    for ep in merged_episodes:
-        duration = ep.get('duration', '')
-        if duration and isinstance(duration, str):
-            try:
-                parts = duration.split(':')
-                if len(parts) == 3:  # HH:MM:SS
-                    hours, minutes, seconds = map(int, parts)
-                    total_duration_seconds += hours * 3600 + minutes * 60 + seconds
-                    episodes_with_duration += 1
-                elif len(parts) == 2:  # MM:SS
-                    minutes, seconds = map(int, parts)
-                    total_duration_seconds += minutes * 60 + seconds
-                    episodes_with_duration += 1
-            except:
-                pass
-    
-    avg_duration_seconds = total_duration_seconds / episodes_with_duration if episodes_with_duration > 0 else 0
-    avg_duration_formatted = f"{int(avg_duration_seconds // 3600):02d}:{int((avg_duration_seconds % 3600) // 60):02d}:{int(avg_duration_seconds % 60):02d}"
-    total_duration_formatted = f"{int(total_duration_seconds // 3600):02d}:{int((total_duration_seconds % 3600) // 60):02d}:{int(total_duration_seconds % 60):02d}"
-    
-    # Crear la nueva base de datos consolidada
-    consolidated_db = {
+def merge_key(episode):
+    """
+    Clave estable de un episodio en la base consolidada: el space ID si hay space_url
+    (x.com y twitter.com dan la misma clave), si no fecha + título + número
+    """
+    space_id = extract_space_id(episode.get('space_url', ''))
+    if space_id:
+        return f"space:{space_id}"
+    return f"{episode.get('date', '')}_{episode.get('title', '')}_{episode.get('number', '')}"
+
+def sort_key(episode, key=None):
+    """Más reciente primero; a igual fecha, por clave, para que el orden sea determinista"""
+    date = parse_date(episode.get('date', '1900-01-01'))
+    return (-date.toordinal(), key if key is not None else merge_key(episode))
+
+def record_digest(episode):
+    """Hash del contenido de un episodio, para detectar cambios"""
+    payload = json.dumps(episode, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def file_stamp(path):
+    """Tamaño y mtime de un archivo, o None si no existe"""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def duration_seconds(duration):
+    """Segundos de una duración HH:MM:SS o MM:SS, o None"""
+    if duration and isinstance(duration, str):
+        try:
+            parts = duration.split(':')
+            if len(parts) == 3:  # HH:MM:SS
+                hours, minutes, seconds = map(int, parts)
+                return hours * 3600 + minutes * 60 + seconds
+            elif len(parts) == 2:  # MM:SS
+                minutes, seconds = map(int, parts)
+                return minutes * 60 + seconds
+        except:
+            pass
+    return None
+
+def format_seconds(seconds):
+    return f"{int(seconds // 3600):02d}:{int((seconds % 3600) // 60):02d}:{int(seconds % 60):02d}"
+
+
+class Aggregates:
+    """Totales de la base consolidada, actualizados por episodio agregado o quitado"""
+
+    FIELDS = ('total_episodes', 'total_listeners', 'episodes_with_listeners',
+              'total_duration_seconds', 'episodes_with_duration')
+
+    def __init__(self, values=None):
+        values = values or {}
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field, 0))
+        self.type_breakdown = dict(values.get('type_breakdown', {}))
+
+    def add(self, episode, sign=1):
+        self.total_episodes += sign
+        if episode.get('listeners'):
+            self.episodes_with_listeners += sign
+        if isinstance(episode.get('listeners'), (int, float)):
+            self.total_listeners += sign * episode['listeners']
+        seconds = duration_seconds(episode.get('duration', ''))
+        if seconds is not None:
+            self.total_duration_seconds += sign * seconds
+            self.episodes_with_duration += sign
+        ep_type = episode.get('type', 'unknown')
+        self.type_breakdown[ep_type] = self.type_breakdown.get(ep_type, 0) + sign
+        if not self.type_breakdown[ep_type]:
+            del self.type_breakdown[ep_type]
+
+    def remove(self, episode):
+        self.add(episode, sign=-1)
+
+    def to_dict(self):
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values['type_breakdown'] = self.type_breakdown
+        return values
+
+    def statistics(self):
+        """Bloque 'statistics' de la metadata consolidada"""
+        avg_listeners = self.total_listeners / self.episodes_with_listeners if self.episodes_with_listeners > 0 else 0
+        avg_duration = self.total_duration_seconds / self.episodes_with_duration if self.episodes_with_duration > 0 else 0
+        return {
+            "total_episodes": self.total_episodes,
+            "total_duration": format_seconds(self.total_duration_seconds),
+            "average_duration": format_seconds(avg_duration),
+            "total_listeners": self.total_listeners,
+            "average_listeners": round(avg_listeners, 2),
+            "episodes_with_listener_data": self.episodes_with_listeners,
+            "breakdown_by_type": dict(sorted(self.type_breakdown.items(), key=lambda x: (-x[1], x[0])))
+        }
+
+
+def consolidated_document(episodes, aggregates):
+    """Documento completo de la base consolidada"""
+    return {
         "metadata": {
             "podcast_name": "BandaWeb3 - Consolidated Database",
             "description": "Base de datos consolidada de todos los episodios de BandaWeb3 (hosted, co-hosted y spoken)",
@@ -136,41 +180,416 @@ def merge_databases():
             "website": "https://bandaweb3.com",
             "twitter": "@BandaWeb3",
             "last_updated": datetime.now().strftime('%Y-%m-%d'),
-            "total_episodes": total_episodes,
-            "statistics": {
-                "total_episodes": total_episodes,
-                "total_duration": total_duration_formatted,
-                "average_duration": avg_duration_formatted,
-                "total_listeners": total_listeners,
-                "average_listeners": round(avg_listeners, 2),
-                "episodes_with_listener_data": episodes_with_listeners,
-                "breakdown_by_type": type_breakdown
-            }
+            "total_episodes": aggregates.total_episodes,
+            "statistics": aggregates.statistics()
         },
-        "episodes": merged_episodes
+        "episodes": episodes
     }
-    
-    # Guardar la base de datos consolidada
-    output_file = 'shared/consolidated_database.json'
-    save_json(consolidated_db, output_file)
-    
+
+
+def source_records(source_lists):
+    """
+    {fuente: {clave: episodio}}; dentro de una misma fuente gana la primera aparición
+    (los duplicados internos son cosa de duplicate_engine.py)
+    """
+    records = {}
+    for source, episodes in source_lists.items():
+        by_key = {}
+        for episode in episodes:
+            by_key.setdefault(merge_key(episode), episode)
+        records[source] = by_key
+    return records
+
+
+def build_full(source_lists):
+    """Rebuild completo en memoria: (episodios ordenados, Aggregates)"""
+    unique_episodes = {}
+    for by_key in source_records(source_lists).values():
+        for key, episode in by_key.items():
+            unique_episodes.setdefault(key, episode)
+
+    merged_episodes = sorted(unique_episodes.values(), key=sort_key)
+    aggregates = Aggregates()
+    for episode in merged_episodes:
+        aggregates.add(episode)
+    return merged_episodes, aggregates
+
+
+class ChangeLog:
+    """Log append-only de cambios en las bases de origen, una línea JSON por cambio"""
+
+    def __init__(self, path=CHANGE_LOG_PATH):
+        self.path = Path(path)
+
+    def last_seq(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return 0
+        # Solo hace falta la última línea
+        with open(self.path, 'rb') as f:
+            f.seek(0, 2)
+            pos = f.tell() - 1
+            while pos > 0:
+                f.seek(pos - 1)
+                if f.read(1) == b'\n':
+                    break
+                pos -= 1
+            f.seek(max(pos, 0))
+            return json.loads(f.readline().decode('utf-8'))['seq']
+
+    def append(self, changes):
+        """Agrega cambios (source, op, key, record) al log; devuelve la última secuencia"""
+        with db_io.file_lock(self.path):
+            seq = self.last_seq()
+            ts = datetime.now().isoformat(timespec='seconds')
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for change in changes:
+                    seq += 1
+                    entry = {'seq': seq, 'ts': ts, **change}
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return seq
+
+    def read_since(self, seq):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry['seq'] > seq and entry['op'] != 'checkpoint':
+                        yield entry
+
+    def compact(self, applied_seq):
+        """Descarta las entradas ya aplicadas; un checkpoint conserva la secuencia"""
+        with db_io.file_lock(self.path):
+            pending = list(self.read_since(applied_seq))
+            lines = [json.dumps({'seq': applied_seq, 'op': 'checkpoint'})]
+            lines += [json.dumps(entry, ensure_ascii=False) for entry in pending]
+            db_io.write_atomic(self.path, ('\n'.join(lines) + '\n').encode('utf-8'))
+        return len(pending)
+
+
+def log_changes(source, upserts=(), deletes=(), log=None, path=None):
+    """
+    Registra cambios de una base de origen para la siguiente consolidación.
+
+    Se llama después de guardar la base: además de los cambios se registra el tamaño/mtime
+    del archivo, para que la consolidación sepa que no hace falta recorrerlo.
+
+    Args:
+        source: 'episodes' o 'spoken'
+        upserts: Episodios nuevos o modificados
+        deletes: Episodios eliminados (con los campos de su clave)
+        path: Archivo de la base (default: el de SOURCES)
+    """
+    log = log or ChangeLog()
+    changes = [{'source': source, 'op': 'upsert', 'key': merge_key(ep), 'record': ep} for ep in upserts]
+    changes += [{'source': source, 'op': 'delete', 'key': merge_key(ep)} for ep in deletes]
+    changes.append({'source': source, 'op': 'stamp', 'stamp': file_stamp(path or SOURCES[source])})
+    return log.append(changes)
+
+
+def log_rewrite(source, old_episodes, new_episodes, log=None, path=None):
+    """
+    log_changes() a partir de la lista de episodios antes y después de una escritura.
+
+    Registra solo la diferencia. Sirve para los scripts que regeneran la base entera y para
+    las ediciones que pueden cambiar la clave de un episodio (p. ej. un space_url nuevo): la
+    clave vieja queda registrada como delete.
+    """
+    old = source_records({source: old_episodes})[source]
+    new = source_records({source: new_episodes})[source]
+    upserts = [ep for key, ep in new.items() if key not in old or record_digest(old[key]) != record_digest(ep)]
+    deletes = [ep for key, ep in old.items() if key not in new]
+    return log_changes(source, upserts, deletes, log=log, path=path)
+
+
+class IncrementalConsolidator:
+    """
+    Aplica el log de cambios sobre la base consolidada.
+
+    El estado (shared/consolidated_state.json) guarda el último cambio aplicado, el hash de
+    cada episodio de origen, el tamaño/mtime de cada base de origen ya incorporado, los
+    episodios de spoken tapados por uno de episodes con la misma clave y los totales de las
+    estadísticas.
+    """
+
+    def __init__(self, consolidated_path=CONSOLIDATED_PATH, state_path=STATE_PATH, log=None):
+        self.consolidated_path = Path(consolidated_path)
+        self.state_path = Path(state_path)
+        self.log = log or ChangeLog()
+
+        self.state = load_json(self.state_path) if self.state_path.exists() else None
+        self.episodes = []
+        if self.state is not None:
+            self.aggregates = Aggregates(self.state['aggregates'])
+            if self.consolidated_path.exists():
+                self.episodes = load_json(self.consolidated_path).get('episodes', [])
+        self._index()
+
+    def _index(self):
+        """Claves de orden de la lista consolidada y clave de merge -> clave de orden"""
+        self.keys = [sort_key(ep) for ep in self.episodes]
+        self.positions = {sk[1]: sk for sk in self.keys}
+
+    @property
+    def initialized(self):
+        return self.state is not None
+
+    def bootstrap(self, source_lists, stamps):
+        """Rebuild completo y estado inicial (primera ejecución o --full)"""
+        self.episodes, self.aggregates = build_full(source_lists)
+        self._index()
+        records = source_records(source_lists)
+        self.state = {
+            'applied_seq': self.log.last_seq(),
+            'stamps': stamps,
+            'digests': {source: {key: record_digest(ep) for key, ep in by_key.items()}
+                        for source, by_key in records.items()},
+            'shadowed': {key: ep for key, ep in records.get('spoken', {}).items()
+                         if key in records.get('episodes', {})},
+        }
+        self.save()
+
+    # --- Detección de cambios ---
+
+    def unlogged_sources(self):
+        """Bases de origen cuyo tamaño/mtime no es el último registrado (escritas sin el log)"""
+        stamps = self.state.setdefault('stamps', {})
+        return [source for source, path in SOURCES.items() if file_stamp(path) != stamps.get(source)]
+
+    def detect_changes(self, source_lists):
+        """
+        Compara las bases de origen dadas con los hashes guardados y registra los cambios en
+        el log. Recorre cada episodio: solo se usa para las bases escritas sin log_changes().
+        """
+        changes = []
+        for source, by_key in source_records(source_lists).items():
+            known = self.state['digests'].get(source, {})
+            for key, episode in by_key.items():
+                if known.get(key) != record_digest(episode):
+                    changes.append({'source': source, 'op': 'upsert', 'key': key, 'record': episode})
+            for key in known:
+                if key not in by_key:
+                    changes.append({'source': source, 'op': 'delete', 'key': key})
+        if changes:
+            self.log.append(changes)
+        return len(changes)
+
+    # --- Aplicación ---
+
+    def _find(self, key):
+        """Índice del episodio con esta clave en la lista consolidada, o None"""
+        sk = self.positions.get(key)
+        if sk is None:
+            return None
+        i = bisect.bisect_left(self.keys, sk)
+        if i < len(self.keys) and self.keys[i] == sk:
+            return i
+        return None
+
+    def _remove(self, key):
+        i = self._find(key)
+        if i is None:
+            return
+        self.aggregates.remove(self.episodes[i])
+        del self.episodes[i]
+        del self.keys[i]
+        del self.positions[key]
+
+    def _insert(self, key, episode):
+        sk = sort_key(episode, key)
+        i = bisect.bisect_left(self.keys, sk)
+        self.episodes.insert(i, episode)
+        self.keys.insert(i, sk)
+        self.positions[key] = sk
+        self.aggregates.add(episode)
+
+    def _replace(self, key, episode):
+        self._remove(key)
+        self._insert(key, episode)
+
+    def apply(self, entry):
+        source, op, key = entry['source'], entry['op'], entry.get('key')
+        if op == 'stamp':
+            self.state.setdefault('stamps', {})[source] = entry['stamp']
+            self.state['applied_seq'] = entry['seq']
+            return
+
+        digests = self.state['digests'].setdefault(source, {})
+        primary = self.state['digests'].setdefault('episodes', {})
+        shadowed = self.state['shadowed']
+        episode = entry.get('record')
+
+        if op == 'upsert':
+            if source == 'spoken' and key in primary:
+                # episodes_database.json tiene prioridad; se guarda por si se borra de allí
+                shadowed[key] = episode
+            else:
+                if source == 'episodes' and key not in primary and key in self.state['digests'].get('spoken', {}):
+                    i = self._find(key)
+                    if i is not None:
+                        shadowed[key] = self.episodes[i]
+                self._replace(key, episode)
+            digests[key] = record_digest(episode)
+
+        elif op == 'delete':
+            digests.pop(key, None)
+            if source == 'episodes' and key in shadowed:
+                self._replace(key, shadowed.pop(key))
+            elif source == 'spoken' and key in primary:
+                shadowed.pop(key, None)
+            else:
+                self._remove(key)
+
+        self.state['applied_seq'] = entry['seq']
+
+    def apply_pending(self):
+        """Aplica las entradas del log posteriores al último cambio aplicado"""
+        applied = 0
+        for entry in self.log.read_since(self.state['applied_seq']):
+            self.apply(entry)
+            applied += 1
+        if applied:
+            self.save()
+        return applied
+
+    def save(self):
+        self.state['aggregates'] = self.aggregates.to_dict()
+        save_json(consolidated_document(self.episodes, self.aggregates), self.consolidated_path)
+        save_json(self.state, self.state_path)
+
+
+def load_sources(sources=None):
+    lists = {}
+    for source in sources or SOURCES:
+        lists[source] = load_json(SOURCES[source]).get('episodes', [])
+    return lists
+
+
+def source_stamps(sources=None):
+    return {source: file_stamp(SOURCES[source]) for source in sources or SOURCES}
+
+
+def verify(consolidator, source_lists):
+    """Compara la base consolidada incremental con un rebuild completo; True si son iguales"""
+    full_episodes, full_aggregates = build_full(source_lists)
+    incremental = {merge_key(ep): ep for ep in consolidator.episodes}
+    full = {merge_key(ep): ep for ep in full_episodes}
+
+    only_incremental = [k for k in incremental if k not in full]
+    only_full = [k for k in full if k not in incremental]
+    different = [k for k in full if k in incremental and incremental[k] != full[k]]
+    order_ok = [merge_key(ep) for ep in consolidator.episodes] == [merge_key(ep) for ep in full_episodes]
+    stats_ok = consolidator.aggregates.statistics() == full_aggregates.statistics()
+
+    print(f"📊 Incremental: {len(incremental)} episodios | Rebuild completo: {len(full)} episodios")
+    for label, keys in (("Solo en incremental", only_incremental),
+                        ("Solo en rebuild", only_full),
+                        ("Con diferencias (¿ediciones directas?)", different)):
+        if keys:
+            print(f"\n❌ {label}: {len(keys)}")
+            for key in keys[:10]:
+                ep = incremental.get(key) or full.get(key)
+                print(f"   - {ep.get('date', 'N/A')} {ep.get('title', 'N/A')}")
+    if not order_ok:
+        print("\n❌ El orden de los episodios no coincide")
+    if not stats_ok:
+        print("\n❌ Las estadísticas no coinciden")
+        print(f"   Incremental: {consolidator.aggregates.statistics()}")
+        print(f"   Rebuild:     {full_aggregates.statistics()}")
+
+    ok = not (only_incremental or only_full or different) and order_ok and stats_ok
+    print(f"\n{'✅ La base incremental es igual al rebuild completo' if ok else '❌ La verificación falló'}")
+    return ok
+
+
+def print_statistics(aggregates, output_file):
+    stats = aggregates.statistics()
     print(f"\n{'='*100}")
     print("ESTADÍSTICAS DE LA BASE DE DATOS CONSOLIDADA")
     print(f"{'='*100}")
-    print(f"\n📊 Total de episodios: {total_episodes}")
-    print(f"⏱️  Duración total: {total_duration_formatted}")
-    print(f"⏱️  Duración promedio: {avg_duration_formatted}")
-    print(f"👥 Total de oyentes: {total_listeners:,}")
-    print(f"👥 Promedio de oyentes: {avg_listeners:.2f}")
-    print(f"📈 Episodios con datos de oyentes: {episodes_with_listeners}")
+    print(f"\n📊 Total de episodios: {stats['total_episodes']}")
+    print(f"⏱️  Duración total: {stats['total_duration']}")
+    print(f"⏱️  Duración promedio: {stats['average_duration']}")
+    print(f"👥 Total de oyentes: {stats['total_listeners']:,}")
+    print(f"👥 Promedio de oyentes: {stats['average_listeners']:.2f}")
+    print(f"📈 Episodios con datos de oyentes: {stats['episodes_with_listener_data']}")
     print(f"\n📂 Desglose por tipo:")
-    for ep_type, count in sorted(type_breakdown.items(), key=lambda x: x[1], reverse=True):
+    for ep_type, count in stats['breakdown_by_type'].items():
         print(f"   - {ep_type}: {count}")
-    
+
     print(f"\n✅ Base de datos consolidada guardada en: {output_file}")
     print(f"{'='*100}\n")
-    
-    return consolidated_db
+
+
+def merge_databases(full=False, apply_only=False):
+    """Fusiona las dos bases de datos eliminando duplicados"""
+
+    # Una sola consolidación a la vez sobre la base consolidada
+    with db_io.file_lock(CONSOLIDATED_PATH):
+        print("\n" + "="*100)
+        print("CONSOLIDANDO BASES DE DATOS")
+        print("="*100 + "\n")
+
+        consolidator = IncrementalConsolidator()
+
+        if full or not consolidator.initialized:
+            # El stamp se toma antes de leer: una escritura en medio fuerza otra revisión
+            stamps = source_stamps()
+            source_lists = load_sources()
+            print(f"📊 Episodios en episodes_database.json: {len(source_lists['episodes'])}")
+            print(f"📊 Episodios en spoken_database.json: {len(source_lists['spoken'])}")
+            consolidator.bootstrap(source_lists, stamps)
+            consolidator.log.compact(consolidator.state['applied_seq'])
+            print(f"\n🎯 Rebuild completo: {len(consolidator.episodes)} episodios únicos")
+            print_statistics(consolidator.aggregates, CONSOLIDATED_PATH)
+            return consolidator
+
+        applied = consolidator.apply_pending()
+
+        if not apply_only:
+            unlogged = consolidator.unlogged_sources()
+            if unlogged:
+                stamps = source_stamps(unlogged)
+                detected = consolidator.detect_changes(load_sources(unlogged))
+                consolidator.state['stamps'].update(stamps)
+                applied += consolidator.apply_pending()
+                consolidator.save()
+                print(f"🔍 Bases escritas fuera del log ({', '.join(unlogged)}): {detected} cambios detectados")
+            else:
+                print("📒 Todas las escrituras están en el log; no hace falta recorrer las bases de origen")
+
+        print(f"🔄 Cambios aplicados: {applied}")
+
+        if applied:
+            print_statistics(consolidator.aggregates, CONSOLIDATED_PATH)
+        else:
+            print("\n✅ La base consolidada ya está al día\n")
+
+        return consolidator
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Consolida episodes_database.json y spoken_database.json de forma incremental"
+    )
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild completo (descarta ediciones directas y reinicia el log)")
+    parser.add_argument("--apply-only", action="store_true",
+                        help="Aplicar solo los cambios ya registrados en el log, sin revisar las bases de origen")
+    parser.add_argument("--verify", action="store_true",
+                        help="Comprobar que la base incremental es igual a un rebuild completo")
+    parser.add_argument("--compact", action="store_true",
+                        help="Eliminar del log las entradas ya aplicadas")
+
+    args = parser.parse_args()
+
+    consolidator = merge_databases(full=args.full and not args.verify, apply_only=args.apply_only)
+    if args.compact:
+        pending = consolidator.log.compact(consolidator.state['applied_seq'])
+        print(f"🧹 Log compactado ({pending} entradas pendientes)")
+
+    if args.verify:
+        sys.exit(0 if verify(consolidator, load_sources()) else 1)
 
 if __name__ == '__main__':
-    merge_databases()
+    main()
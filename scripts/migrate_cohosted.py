@@ -1,14 +1,13 @@
-import json
 import os
 import re
+from db_io import load_json, save_json
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, 'shared', 'episodes_database.json')
 
 def migrate_cohosted():
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
 
     episodes = data.get('episodes', [])
     updated_count = 0
@@ -38,8 +37,7 @@ def migrate_cohosted():
 
     if updated_count > 0:
         data['episodes'] = episodes
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(DB_PATH, data)
         print(f"\nSuccessfully marked {updated_count} episodes as co-hosted.")
     else:
         print("\nNo new episodes matched criteria.")
@@ -2,12 +2,11 @@
 """
 Migrate numbered episodes from type="numbered" to type="hosted" + is_numbered=true
 """
-import json
+from db_io import load_json, save_json
 
 def migrate():
     path = 'shared/episodes_database.json'
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(path)
     
     episodes = data.get('episodes', [])
     count = 0
@@ -21,8 +20,7 @@ def migrate():
             count += 1
             print(f"Migrated: {ep.get('title')}")
             
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_json(path, data)
         
     print(f"\nSuccessfully migrated {count} episodes.")
 
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+BandaWeb3 Mock Instagram Graph API
+Local stand-in for the Graph API endpoints used by publish_instagram.py, for
+trying the publisher without a real account or token.
+
+Containers report IN_PROGRESS for --processing seconds before FINISHED, and
+every request waits --latency seconds, so sequential vs concurrent behaviour
+shows up in the timings. Publishing an unfinished container fails like the
+real API does.
+
+Usage:
+    # Serve on http://127.0.0.1:8765/v18.0
+    python3 scripts/mock_graph_api.py
+
+    # Publish a 10-image carousel against the mock and report latency
+    python3 scripts/mock_graph_api.py --demo 10
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ACCOUNT_ID = "17840000000000000"
+
+
+class MockGraphState:
+    """Containers and published media, shared by all request threads."""
+
+    def __init__(self, latency=0.2, processing=1.0):
+        self.latency = latency
+        self.processing = processing
+        self.containers = {}
+        self.published = {}
+        self.request_count = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def new_id(self, prefix):
+        with self._lock:
+            return f"{prefix}{next(self._ids)}"
+
+    def status(self, container_id):
+        container = self.containers.get(container_id)
+        if container is None:
+            return None
+        if container["media_type"] == "CAROUSEL":
+            children = [self.status(c) for c in container["children"]]
+            if "ERROR" in children:
+                return "ERROR"
+        if time.time() - container["created"] < self.processing:
+            return "IN_PROGRESS"
+        return "FINISHED"
+
+
+class MockGraphHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code, message):
+        self._reply(code, {"error": {"message": message, "type": "OAuthException", "code": code}})
+
+    def _parse(self):
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        parts = [p for p in parsed.path.split("/") if p]
+        # Drop the version prefix (e.g. v18.0)
+        if parts and parts[0].startswith("v"):
+            parts = parts[1:]
+
+        with self.state._lock:
+            self.state.request_count += 1
+        time.sleep(self.state.latency)
+        return parts, params
+
+    def do_GET(self):
+        parts, params = self._parse()
+        if not params.get("access_token"):
+            return self._error(400, "An access token is required")
+        if len(parts) != 1:
+            return self._error(404, "Unknown path")
+
+        node_id = parts[0]
+        if node_id == ACCOUNT_ID:
+            return self._reply(200, {"id": ACCOUNT_ID, "username": "bandaweb3_mock", "name": "BandaWeb3 Mock"})
+
+        status = self.state.status(node_id)
+        if status is None:
+            return self._error(404, f"Unsupported get request. Object with ID '{node_id}' does not exist")
+        return self._reply(200, {"id": node_id, "status_code": status})
+
+    def do_POST(self):
+        parts, params = self._parse()
+        if not params.get("access_token"):
+            return self._error(400, "An access token is required")
+        if len(parts) != 2 or parts[0] != ACCOUNT_ID:
+            return self._error(404, "Unknown path")
+
+        if parts[1] == "media":
+            if params.get("media_type") == "CAROUSEL":
+                children = [c for c in params.get("children", "").split(",") if c]
+                if not 2 <= len(children) <= 10 or any(c not in self.state.containers for c in children):
+                    return self._error(400, "Invalid carousel children")
+                if any(self.state.status(c) != "FINISHED" for c in children):
+                    return self._error(400, "Carousel children are not finished processing")
+                container = {"media_type": "CAROUSEL", "children": children}
+            elif params.get("image_url"):
+                container = {"media_type": "IMAGE", "children": []}
+            else:
+                return self._error(400, "image_url is required")
+
+            container_id = self.state.new_id("cont_")
+            container["created"] = time.time()
+            self.state.containers[container_id] = container
+            return self._reply(200, {"id": container_id})
+
+        if parts[1] == "media_publish":
+            creation_id = params.get("creation_id")
+            if self.state.status(creation_id) != "FINISHED":
+                return self._error(400, "Media ID is not available")
+            media_id = self.state.new_id("media_")
+            self.state.published[media_id] = creation_id
+            return self._reply(200, {"id": media_id})
+
+        return self._error(404, "Unknown path")
+
+
+def start_server(host="127.0.0.1", port=8765, latency=0.2, processing=1.0):
+    """Start the mock in a background thread. Returns (server, state, api_base)."""
+    state = MockGraphState(latency=latency, processing=processing)
+    handler = type("Handler", (MockGraphHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://{host}:{server.server_address[1]}/v18.0"
+    return server, state, api_base
+
+
+def run_demo(images, latency, processing):
+    """Publish a carousel through InstagramPublisher against the mock."""
+    server, state, api_base = start_server(port=0, latency=latency, processing=processing)
+    os.environ["INSTAGRAM_API_BASE"] = api_base
+    os.environ.setdefault("INSTAGRAM_ACCESS_TOKEN", "mock-token")
+    os.environ.setdefault("INSTAGRAM_BUSINESS_ACCOUNT_ID", ACCOUNT_ID)
+
+    sys.path.append(str(Path(__file__).parent))
+    from publish_instagram import InstagramPublisher
+
+    publisher = InstagramPublisher()
+    image_urls = [f"https://example.com/slide_{i}.png" for i in range(1, images + 1)]
+
+    start = time.monotonic()
+    result = publisher.publish_carousel(image_urls, "BandaWeb3 mock carousel")
+    elapsed = time.monotonic() - start
+    server.shutdown()
+
+    print(f"\n{'='*60}")
+    print(f"Carousel of {images} images: {'OK' if result.get('success') else 'FAILED'}")
+    print(f"Elapsed: {elapsed:.2f}s (latency {latency}s per request, processing {processing}s)")
+    print(f"Requests: {state.request_count}")
+    return result.get("success", False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local mock of the Instagram Graph API publishing endpoints"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Seconds of latency per request (default: 0.2)")
+    parser.add_argument("--processing", type=float, default=1.0,
+                        help="Seconds before a container is FINISHED (default: 1.0)")
+    parser.add_argument("--demo", type=int, metavar="IMAGES",
+                        help="Publish a carousel with this many images against the mock and exit")
+
+    args = parser.parse_args()
+
+    if args.demo:
+        success = run_demo(args.demo, args.latency, args.processing)
+        sys.exit(0 if success else 1)
+
+    server, state, api_base = start_server(port=args.port, latency=args.latency,
+                                           processing=args.processing)
+    print(f"🧪 Mock Graph API on {api_base}")
+    print(f"   export INSTAGRAM_API_BASE={api_base}")
+    print(f"   export INSTAGRAM_BUSINESS_ACCOUNT_ID={ACCOUNT_ID}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
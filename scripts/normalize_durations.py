@@ -1,7 +1,7 @@
-import json
 import re
 from datetime import timedelta
 import os
+from db_io import load_json, save_json
 
 def parse_duration_to_seconds(duration_str):
     if not duration_str:
@@ -60,8 +60,7 @@ def normalize_database():
     input_file = os.path.join(base_dir, "shared/episodes_database.json")
     
     print(f"Loading {input_file}...")
-    with open(input_file, "r") as f:
-        data = json.load(f)
+    data = load_json(input_file)
         
     episodes = data.get("episodes", [])
     modified_count = 0
@@ -79,8 +78,7 @@ def normalize_database():
             
     print(f"Normalized {modified_count} episode durations.")
     
-    with open(input_file, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    save_json(input_file, data)
         
     print(f"Saved updated {input_file}.")
 
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 import json
+from db_io import load_json
 
 # Read the database
-with open('data/episodes_database.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json('data/episodes_database.json')
 
 # Normalize all flyer_urls to simple format
 for episode in data['episodes']:
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Post-build stage for website/output: minify and precompress.
+
+    python3 scripts/optimize_output.py                  # website/output
+    python3 scripts/optimize_output.py ./custom_output --workers 4
+
+For every HTML/CSS/JS file (and XML/JSON/SVG, which are only compressed):
+
+- the file is minified in place: whitespace runs, HTML comments and
+  CSS/JS comment lines go; <pre>/<textarea> content is left untouched
+- a `.br` (when the brotli module is installed) and a `.gz` sibling are
+  written next to it, at maximum compression
+
+Files are processed in a process pool. Results are cached in
+shared/cache/optimize/ keyed by the SHA-256 of the input. simple_build.py
+renders every page from scratch on each run, but unchanged pages are then
+restored from the cache instead of being minified and compressed again.
+
+vercel.json routes are regenerated from what is committed under the
+output directory (git ls-files), not from what this machine produced, so
+the config is the same with or without brotli installed. An encoding gets
+an `Accept-Encoding` route for a file type only when every committed file
+of that type has a committed sibling; otherwise the route would point at
+files that are not deployed. Until then Vercel compresses on the fly. The
+routes also set Cache-Control: HTML revalidates on every request, CSS/JS
+are cached for a day, and images and flyers for a week.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).parent))
+import instrumentation as instr
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+OUTPUT_DIR = Path('website/output')
+CACHE_DIR = Path('shared/cache/optimize')
+VERCEL_CONFIG = Path('vercel.json')
+
+# Bump when the minifiers change so cached results are not reused
+OPTIMIZER_VERSION = '1'
+
+COMPRESS_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.xml': 'application/xml; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.svg': 'image/svg+xml',
+}
+# Encodings in order of preference: (Content-Encoding, file suffix)
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+CACHE_CONTROL = [
+    (r'.*\.html', 'public, max-age=0, must-revalidate'),
+    (r'.*\.(?:css|js)', 'public, max-age=86400, stale-while-revalidate=604800'),
+    (r'.*\.(?:jpg|jpeg|png|gif|webp|svg|ico)', 'public, max-age=604800, stale-while-revalidate=2592000'),
+]
+
+
+# --- Minifiers ---
+
+_WS = re.compile(r'\s+')
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_CSS_PUNCT = re.compile(r'\s*([{};,>])\s*')
+_HTML_RAW = re.compile(r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+def _collapse(text):
+    """Whitespace runs -> one newline (if the run had one) or one space"""
+    return _WS.sub(lambda m: '\n' if '\n' in m.group() else ' ', text)
+
+
+def minify_css(css):
+    # Drop comments first (strings are matched too so a "/*" inside one survives)
+    css = _CSS_TOKENS.sub(lambda m: m.group(1) or ' ', css)
+    out = []
+    pos = 0
+    for m in _CSS_STRING.finditer(css):
+        out.append(_CSS_PUNCT.sub(r'\1', _WS.sub(' ', css[pos:m.start()])))
+        out.append(m.group())
+        pos = m.end()
+    out.append(_CSS_PUNCT.sub(r'\1', _WS.sub(' ', css[pos:])))
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """Line-based: drops indentation, blank lines and whole-line // comments.
+    Newlines are kept so automatic semicolon insertion is unaffected."""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def minify_html(html):
+    out = []
+    pos = 0
+    for m in _HTML_RAW.finditer(html):
+        out.append(_collapse(_HTML_COMMENT.sub('', html[pos:m.start()])))
+        open_tag, tag, body, close_tag = m.group(1), m.group(2).lower(), m.group(3), m.group(4)
+        if tag == 'script' and 'src=' not in open_tag:
+            body = minify_js(body)
+        elif tag == 'style':
+            body = minify_css(body)
+        out.append(_collapse(open_tag) + body + close_tag)
+        pos = m.end()
+    out.append(_collapse(_HTML_COMMENT.sub('', html[pos:])))
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js}
+
+
+# --- Per-file work (runs in the pool) ---
+
+def _cache_key(data):
+    return hashlib.sha256(OPTIMIZER_VERSION.encode() + b'\0' + data).hexdigest()
+
+
+def _write_if_changed(path, data):
+    """Write unless the file already holds these bytes (keeps its mtime)"""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def optimize_file(path, encodings):
+    """Minify and precompress one file; returns (original, minified, {encoding: size}, cache_hit)"""
+    path = Path(path)
+    raw = path.read_bytes()
+    key = _cache_key(raw)
+    entry = CACHE_DIR / key[:2] / key
+    suffixes = ['.min'] + [suffix for encoding, suffix in ENCODINGS if encoding in encodings]
+    cached = {s: entry.with_suffix(s) for s in suffixes}
+
+    hit = all(p.exists() for p in cached.values())
+    if hit:
+        results = {s: p.read_bytes() for s, p in cached.items()}
+    else:
+        minify = MINIFIERS.get(path.suffix)
+        data = minify(raw.decode('utf-8')).encode('utf-8') if minify else raw
+        results = {'.min': data}
+        for encoding, suffix in ENCODINGS:
+            if encoding in encodings:
+                results[suffix] = _compress(data, encoding)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, blob in results.items():
+            tmp = cached[suffix].with_name(f'{key}{suffix}.{os.getpid()}.tmp')
+            tmp.write_bytes(blob)
+            os.replace(tmp, cached[suffix])
+
+    _write_if_changed(path, results['.min'])
+    sizes = {}
+    for encoding, suffix in ENCODINGS:
+        if suffix in results:
+            _write_if_changed(path.with_name(path.name + suffix), results[suffix])
+            sizes[encoding] = len(results[suffix])
+    return len(raw), len(results['.min']), sizes, hit
+
+
+# --- Driver ---
+
+def available_encodings():
+    return [encoding for encoding, _ in ENCODINGS if encoding != 'br' or brotli]
+
+
+def optimize(output_dir=OUTPUT_DIR, workers=None):
+    """Minify and precompress every eligible file under output_dir"""
+    output_dir = Path(output_dir)
+    encodings = available_encodings()
+    if 'br' not in encodings:
+        print("⚠️  brotli no está instalado: solo se generan .gz (pip install brotli)")
+
+    files = []
+    for path in output_dir.rglob('*'):
+        if not path.is_file():
+            continue
+        if path.suffix in ('.br', '.gz'):
+            # Sibling of a file that no longer exists
+            if not path.with_suffix('').exists():
+                path.unlink()
+            continue
+        if path.suffix in COMPRESS_TYPES:
+            files.append(path)
+
+    totals = {'original': 0, 'minified': 0, 'hits': 0, **{e: 0 for e in encodings}}
+    with instr.span('optimize', files=len(files)):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for original, minified, sizes, hit in pool.map(
+                    optimize_file, files, [encodings] * len(files), chunksize=16):
+                totals['original'] += original
+                totals['minified'] += minified
+                totals['hits'] += hit
+                for encoding, size in sizes.items():
+                    totals[encoding] += size
+
+    instr.inc('optimize_files', len(files))
+    instr.inc('optimize_cache_hits', totals['hits'])
+    instr.inc('bytes_minified_saved', totals['original'] - totals['minified'])
+
+    print(f"✅ Optimizados {len(files)} archivos ({totals['hits']} desde caché)")
+    if files:
+        print(f"   Original:  {totals['original'] / 1e6:.2f} MB")
+        print(f"   Minificado: {totals['minified'] / 1e6:.2f} MB")
+        for encoding in encodings:
+            print(f"   {encoding:<10} {totals[encoding] / 1e6:.2f} MB")
+    return totals
+
+
+def deployed_files(output_dir=OUTPUT_DIR):
+    """Paths committed under output_dir (every file on disk outside a git checkout)"""
+    output_dir = Path(output_dir)
+    try:
+        listing = subprocess.run(['git', 'ls-files', '-z', '--', str(output_dir)],
+                                 capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {p.as_posix() for p in output_dir.rglob('*') if p.is_file()}
+    return {os.fsdecode(name) for name in listing.split(b'\0') if name}
+
+
+def routable(files):
+    """(encoding, ext) pairs where every file of that type has its precompressed sibling"""
+    pairs = set()
+    for ext in COMPRESS_TYPES:
+        typed = [f for f in files if f.endswith(ext)]
+        for encoding, suffix in ENCODINGS:
+            if typed and all(f + suffix in files for f in typed):
+                pairs.add((encoding, ext))
+    return pairs
+
+
+def vercel_routes(files):
+    """Header and precompressed-sibling routes placed ahead of the catch-all"""
+    routes = [
+        {"src": f"/({pattern})", "headers": {"cache-control": value}, "continue": True}
+        for pattern, value in CACHE_CONTROL
+    ]
+    pairs = routable(files)
+    for encoding, suffix in ENCODINGS:
+        for ext, content_type in COMPRESS_TYPES.items():
+            if (encoding, ext) not in pairs:
+                continue
+            routes.append({
+                "src": f"/(.*\\{ext})",
+                "has": [{"type": "header", "key": "accept-encoding", "value": f".*\\b{encoding}\\b.*"}],
+                "headers": {
+                    "content-encoding": encoding,
+                    "content-type": content_type,
+                    "vary": "Accept-Encoding",
+                },
+                "dest": f"/website/output/$1{suffix}",
+            })
+    return routes
+
+
+def write_vercel_config(output_dir=OUTPUT_DIR, path=VERCEL_CONFIG):
+    """Regenerate the routes of vercel.json; only writes when they change"""
+    config = json.loads(path.read_text(encoding='utf-8'))
+    catch_all = {"src": "/(.*)", "dest": "/website/output/$1"}
+    config['routes'] = vercel_routes(deployed_files(output_dir)) + [catch_all]
+    text = json.dumps(config, indent=4, ensure_ascii=False)
+    if path.read_text(encoding='utf-8') != text:
+        path.write_text(text, encoding='utf-8')
+        print(f"✅ {path} actualizado")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify and precompress website/output")
+    parser.add_argument('output', nargs='?', default=str(OUTPUT_DIR), help="Output directory (default: website/output)")
+    parser.add_argument('--workers', type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument('--no-vercel', action='store_true', help="Do not touch vercel.json")
+    args = parser.parse_args()
+
+    optimize(args.output, args.workers)
+    if not args.no_vercel:
+        write_vercel_config(args.output)
+
+
+if __name__ == "__main__":
+    with instr.run('optimize_output'):
+        main()
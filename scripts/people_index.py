@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Index of the people (hosts, cohosts, guests) across all spaces.
+
+One pass over consolidated_database.json builds:
+
+- person key -> display name, X handle/url, role counts and the indexes
+  of the episodes they appear in, so "all spaces with @X" is a dict lookup
+- co-appearance edge counts: how many spaces each pair shared
+
+    from people_index import PeopleIndex
+
+    index = PeopleIndex.build(all_episodes)
+    index.episodes_of('@meximalist')       # Episode objects, newest first
+    index.co_appearances('meximalist', 10)  # [(key, shared spaces), ...]
+
+Keys are the lowercased handle without '@' ("@Meximalist" and
+"meximalist" are the same person). Guests stored by display name use the
+handle of their guest_links entry when there is one, otherwise a slug of
+the name ("Anatoly Yakovenko" -> "anatoly-yakovenko").
+
+Usage:
+    python3 scripts/people_index.py                # top people and pairs
+    python3 scripts/people_index.py @meximalist    # one person
+"""
+
+import re
+import sys
+import argparse
+import unicodedata
+from pathlib import Path
+from itertools import combinations
+from collections import Counter, defaultdict
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json
+from episode_schema import normalize
+
+CONSOLIDATED_DB_PATH = Path('shared/consolidated_database.json')
+
+_HANDLE_URL = re.compile(r'(?:x|twitter)\.com/@?([A-Za-z0-9_]+)', re.I)
+_HANDLE = re.compile(r'^@?[A-Za-z0-9_]+$')
+
+
+def _slug(name):
+    name = unicodedata.normalize('NFKD', name.lower())
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', '-', name).strip('-')
+
+
+def person_key(value, url=None):
+    """Normalized key of a handle or display name ('' if there is nothing to index)"""
+    value = (value or '').strip()
+    if url:
+        m = _HANDLE_URL.search(url)
+        if m:
+            return m.group(1).lower()
+    if _HANDLE.match(value):
+        return value.lstrip('@').lower()
+    return _slug(value)
+
+
+class Person:
+    __slots__ = ('key', 'name', 'handle', 'url', 'roles', 'episodes')
+
+    def __init__(self, key):
+        self.key = key
+        self.name = None     # display name, when one was given
+        self.handle = None   # '@handle'
+        self.url = None
+        self.roles = Counter()
+        self.episodes = []   # indexes into PeopleIndex.episodes
+
+    @property
+    def count(self):
+        return len(self.episodes)
+
+    @property
+    def display(self):
+        """Display name, else @handle"""
+        return self.name or self.handle or self.key
+
+
+class PeopleIndex:
+    def __init__(self, episodes):
+        self.episodes = episodes
+        self.people = {}
+        self.edges = Counter()            # (key_a, key_b) with key_a < key_b -> shared spaces
+        self.neighbors = defaultdict(Counter)
+
+    @classmethod
+    def build(cls, episodes):
+        """episodes: Episode objects (see episode_schema.normalize), newest first"""
+        index = cls(episodes)
+        for i, ep in enumerate(episodes):
+            present = set()
+            host = ep.get('host')
+            if host:
+                present.add(index._add(host, 'host', i))
+            for cohost in ep.get('cohosts') or []:
+                present.add(index._add(cohost, 'cohost', i))
+            links = ep.get('guest_links') or {}
+            for guest in ep.get('guests') or []:
+                present.add(index._add(guest, 'guest', i, links.get(guest)))
+            present.discard('')
+            for a, b in combinations(sorted(present), 2):
+                index.edges[(a, b)] += 1
+                index.neighbors[a][b] += 1
+                index.neighbors[b][a] += 1
+        return index
+
+    def _add(self, value, role, i, url=None):
+        value = (value or '').strip()
+        key = person_key(value, url)
+        if not key:
+            return ''
+        person = self.people.get(key)
+        if person is None:
+            person = self.people[key] = Person(key)
+        # Counted once per space even if listed in more than one role
+        if not person.episodes or person.episodes[-1] != i:
+            person.episodes.append(i)
+        person.roles[role] += 1
+
+        m = _HANDLE_URL.search(url or '')
+        if m:
+            handle = m.group(1)
+            display = value if value.lstrip('@').lower() != handle.lower() else None
+        elif _HANDLE.match(value):
+            handle, display = value.lstrip('@'), None
+        else:
+            handle, display = None, value
+        if handle and not person.handle:
+            person.handle = '@' + handle
+            person.url = url or f"https://x.com/{handle}"
+        if display and not person.name:
+            person.name = display
+        return key
+
+    def get(self, value):
+        return self.people.get(person_key(value))
+
+    def episodes_of(self, value):
+        person = self.get(value)
+        return [self.episodes[i] for i in person.episodes] if person else []
+
+    def co_appearances(self, value, limit=None):
+        return self.neighbors[person_key(value)].most_common(limit)
+
+    def ranked(self):
+        """People by number of spaces, most first"""
+        return sorted(self.people.values(), key=lambda p: (-p.count, p.key))
+
+    def graph(self, min_weight=1):
+        """Compact graph: node list and [source, target, weight] edges by node index"""
+        people = self.ranked()
+        ids = {p.key: n for n, p in enumerate(people)}
+        return {
+            "nodes": [{"id": p.key, "name": p.display, "spaces": p.count} for p in people],
+            "edges": [[ids[a], ids[b], w] for (a, b), w in sorted(self.edges.items()) if w >= min_weight],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="People across all spaces")
+    parser.add_argument('person', nargs='?', help="Handle or name to look up")
+    parser.add_argument('--db', default=str(CONSOLIDATED_DB_PATH))
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    episodes = normalize(load_json(args.db).get('episodes', []))
+    episodes.sort(key=lambda ep: ep.sort_key, reverse=True)
+    index = PeopleIndex.build(episodes)
+
+    if args.person:
+        person = index.get(args.person)
+        if not person:
+            print(f"❌ {args.person} no aparece en {args.db}")
+            return
+        roles = ', '.join(f"{role}: {n}" for role, n in person.roles.most_common())
+        print(f"{person.display} ({person.key}) - {person.count} spaces ({roles})")
+        for ep in index.episodes_of(args.person)[:args.top]:
+            print(f"   {ep.display_date}  #{ep.number} {ep.get('title')}")
+        print("Co-apariciones:")
+        for key, n in index.co_appearances(args.person, args.top):
+            print(f"   {n:4}  {index.people[key].display}")
+        return
+
+    print(f"{len(index.people)} personas, {len(index.edges)} pares")
+    for person in index.ranked()[:args.top]:
+        print(f"   {person.count:4}  {person.display}")
+    print("Pares más frecuentes:")
+    for (a, b), n in index.edges.most_common(args.top):
+        print(f"   {n:4}  {index.people[a].display} + {index.people[b].display}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 
-import json
 import os
+from db_io import load_json, save_json
 
 DB_PATH = 'shared/episodes_database.json'
 TRANSCRIPTS_DIR = 'shared/transcriptions'
@@ -16,8 +16,7 @@ NEW_EPISODE_IDS = [
 
 def main():
     print("🔍 Checking 21 new episodes in database...")
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
         
     found_count = 0
     updated_count = 0
@@ -46,8 +45,7 @@ def main():
             print(f"⚠️ NOT FOUND in Hosted DB: {ep_id}")
 
     if updated_count > 0:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(DB_PATH, data)
         print(f"\n💾 Database saved with {updated_count} updates.")
     else:
         print(f"\nℹ️ No updates needed in Hosted DB.")
@@ -22,12 +22,14 @@ Examples:
 
 import os
 import sys
-import json
+import time
 import argparse
 from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 
@@ -37,9 +39,16 @@ init(autoreset=True)
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / "config" / ".env")
 
+sys.path.append(str(Path(__file__).parent))
+
+from publish_scheduler import PublishScheduler
+
 class InstagramPublisher:
     """Publishes content to Instagram."""
     
+    MAX_CAROUSEL_ITEMS = 10
+    STATUS_POLL_TIMEOUT = 300
+    
     def __init__(self):
         self.access_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.business_account_id = os.getenv("INSTAGRAM_BUSINESS_ACCOUNT_ID")
@@ -49,7 +58,14 @@ class InstagramPublisher:
         if not self.business_account_id:
             raise ValueError("INSTAGRAM_BUSINESS_ACCOUNT_ID not found in environment variables")
         
-        self.api_base = "https://graph.facebook.com/v18.0"
+        # INSTAGRAM_API_BASE lets scripts/mock_graph_api.py stand in for the Graph API
+        self.api_base = os.getenv("INSTAGRAM_API_BASE", "https://graph.facebook.com/v18.0")
+        
+        # Pooled keep-alive connections shared by concurrent carousel requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.MAX_CAROUSEL_ITEMS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def test_connection(self) -> bool:
         """Test Instagram API connection."""
@@ -63,7 +79,7 @@ class InstagramPublisher:
                 "access_token": self.access_token
             }
             
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             
             if response.status_code == 200:
                 account_data = response.json()
@@ -119,7 +135,7 @@ class InstagramPublisher:
                 "access_token": self.access_token
             }
             
-            response = requests.post(url, params=params)
+            response = self.session.post(url, params=params)
             
             if response.status_code == 200:
                 container_id = response.json().get("id")
@@ -134,10 +150,73 @@ class InstagramPublisher:
             print(f"{Fore.RED}❌ Error creating container: {e}")
             return None
     
+    def wait_for_container(self, container_id: str, timeout: float = None) -> bool:
+        """
+        Poll a container's status_code until it is FINISHED.
+        
+        Polling starts fast and backs off, so quick image containers are
+        published almost immediately while slow ones are not hammered.
+        
+        Args:
+            container_id: Container ID
+            timeout: Seconds to wait before giving up
+        
+        Returns:
+            True if the container is ready to publish
+        """
+        timeout = timeout or self.STATUS_POLL_TIMEOUT
+        deadline = time.monotonic() + timeout
+        delay = 0.5
+        
+        url = f"{self.api_base}/{container_id}"
+        params = {
+            "fields": "status_code",
+            "access_token": self.access_token
+        }
+        
+        while True:
+            response = self.session.get(url, params=params)
+            status = response.json().get("status_code") if response.status_code == 200 else None
+            
+            if status == "FINISHED":
+                return True
+            if status in ("ERROR", "EXPIRED"):
+                print(f"{Fore.RED}❌ Container {container_id} status: {status}")
+                return False
+            if time.monotonic() + delay > deadline:
+                print(f"{Fore.RED}❌ Container {container_id} not ready after {timeout}s (status: {status})")
+                return False
+            
+            time.sleep(delay)
+            delay = min(delay * 1.5, 5)
+    
+    def create_carousel_item(self, image_url: str) -> Optional[str]:
+        """Create one carousel child container and wait until it is processed."""
+        url = f"{self.api_base}/{self.business_account_id}/media"
+        params = {
+            "image_url": image_url,
+            "is_carousel_item": True,
+            "access_token": self.access_token
+        }
+        
+        response = self.session.post(url, params=params)
+        
+        if response.status_code != 200:
+            print(f"{Fore.RED}❌ Failed to create container for {image_url}: {response.status_code}")
+            return None
+        
+        child_id = response.json().get("id")
+        if not self.wait_for_container(child_id):
+            return None
+        return child_id
+    
     def create_carousel_container(self, image_urls: List[str], caption: str) -> Optional[str]:
         """
         Create a carousel container for multiple images.
         
+        Child containers are created concurrently over the pooled session,
+        then the parent is created once every child is FINISHED.
+        
         Args:
             image_urls: List of publicly accessible image URLs
             caption: Post caption
@@ -146,28 +225,16 @@ class InstagramPublisher:
             Container ID or None if failed
         """
         try:
-            # First, create containers for each image
-            children_ids = []
+            print(f"{Fore.CYAN}Creating {len(image_urls)} carousel item containers...")
             
-            for i, image_url in enumerate(image_urls, 1):
-                print(f"{Fore.CYAN}Creating container for image {i}/{len(image_urls)}...")
-                
-                url = f"{self.api_base}/{self.business_account_id}/media"
-                params = {
-                    "image_url": image_url,
-                    "is_carousel_item": True,
-                    "access_token": self.access_token
-                }
-                
-                response = requests.post(url, params=params)
-                
-                if response.status_code == 200:
-                    child_id = response.json().get("id")
-                    children_ids.append(child_id)
-                    print(f"{Fore.GREEN}✓ Container {i} created: {child_id}")
-                else:
+            with ThreadPoolExecutor(max_workers=min(len(image_urls), self.MAX_CAROUSEL_ITEMS)) as executor:
+                children_ids = list(executor.map(self.create_carousel_item, image_urls))
+            
+            for i, child_id in enumerate(children_ids, 1):
+                if not child_id:
                     print(f"{Fore.RED}❌ Failed to create container {i}")
                     return None
+                print(f"{Fore.GREEN}✓ Container {i} created: {child_id}")
             
             # Create carousel container
             print(f"{Fore.CYAN}Creating carousel container...")
@@ -180,7 +247,7 @@ class InstagramPublisher:
                 "access_token": self.access_token
             }
             
-            response = requests.post(url, params=params)
+            response = self.session.post(url, params=params)
             
             if response.status_code == 200:
                 carousel_id = response.json().get("id")
@@ -206,6 +273,12 @@ class InstagramPublisher:
             Dict with post URL and metadata
         """
         try:
+            if not self.wait_for_container(container_id):
+                return {
+                    "success": False,
+                    "error": f"Container {container_id} is not ready to publish"
+                }
+            
             print(f"{Fore.CYAN}Publishing container {container_id}...")
             
             url = f"{self.api_base}/{self.business_account_id}/media_publish"
@@ -214,7 +287,7 @@ class InstagramPublisher:
                 "access_token": self.access_token
             }
             
-            response = requests.post(url, params=params)
+            response = self.session.post(url, params=params)
             
             if response.status_code == 200:
                 media_id = response.json().get("id")
@@ -276,8 +349,8 @@ class InstagramPublisher:
         # Validate
         if len(image_urls) < 2:
             return {"success": False, "error": "Carousel requires at least 2 images"}
-        if len(image_urls) > 10:
-            return {"success": False, "error": "Carousel supports max 10 images"}
+        if len(image_urls) > self.MAX_CAROUSEL_ITEMS:
+            return {"success": False, "error": f"Carousel supports max {self.MAX_CAROUSEL_ITEMS} images"}
         
         # Create carousel container
         container_id = self.create_carousel_container(image_urls, caption)
@@ -293,7 +366,7 @@ class InstagramPublisher:
         Schedule a post for later.
         
         Note: Instagram Graph API doesn't support native scheduling.
-        This method saves the post data for later publishing via cron/n8n.
+        This method queues the post in the shared publishing scheduler.
         
         Args:
             post_data: Post data (image_url, caption, type)
@@ -303,36 +376,17 @@ class InstagramPublisher:
             Dict with schedule info
         """
         try:
-            # Parse schedule time
-            scheduled_dt = datetime.strptime(schedule_time, "%Y-%m-%d %H:%M")
-            
-            # Create scheduled posts directory
-            schedule_dir = Path(__file__).parent.parent / "scheduled_posts"
-            schedule_dir.mkdir(exist_ok=True)
-            
-            # Save post data
-            scheduled_post = {
-                "platform": "instagram",
-                "post_data": post_data,
-                "scheduled_time": scheduled_dt.isoformat(),
-                "created_at": datetime.now().isoformat(),
-                "status": "scheduled"
-            }
-            
-            filename = f"instagram_{scheduled_dt.strftime('%Y%m%d_%H%M')}.json"
-            filepath = schedule_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(scheduled_post, f, indent=2, ensure_ascii=False)
+            scheduler = PublishScheduler()
+            post_id = scheduler.schedule("instagram", post_data, schedule_time)
+            scheduled_post = scheduler.store.get(post_id)
             
-            print(f"{Fore.GREEN}✓ Post scheduled for {schedule_time}")
-            print(f"{Fore.CYAN}Saved to: {filepath}")
-            print(f"{Fore.YELLOW}⚠️  Note: You need to set up a cron job or n8n workflow to publish scheduled posts")
+            print(f"{Fore.GREEN}✓ Post {post_id} scheduled for {schedule_time}")
+            print(f"{Fore.CYAN}Run 'python3 scripts/publish_scheduler.py run' to publish scheduled posts")
             
             return {
                 "success": True,
-                "scheduled_time": scheduled_dt.isoformat(),
-                "file": str(filepath)
+                "id": post_id,
+                "scheduled_time": scheduled_post["scheduled_time"]
             }
             
         except Exception as e:
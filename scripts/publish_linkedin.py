@@ -22,7 +22,6 @@ Examples:
 
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
 from typing import Optional, Dict
@@ -37,6 +36,10 @@ init(autoreset=True)
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / "config" / ".env")
 
+sys.path.append(str(Path(__file__).parent))
+
+from publish_scheduler import PublishScheduler
+
 class LinkedInPublisher:
     """Publishes content to LinkedIn."""
     
@@ -196,7 +199,7 @@ class LinkedInPublisher:
         Schedule a post for later.
         
         Note: LinkedIn API doesn't support native scheduling.
-        This method saves the post data for later publishing via cron/n8n.
+        This method queues the post in the shared publishing scheduler.
         
         Args:
             content: Post content
@@ -206,36 +209,17 @@ class LinkedInPublisher:
             Dict with schedule info
         """
         try:
-            # Parse schedule time
-            scheduled_dt = datetime.strptime(schedule_time, "%Y-%m-%d %H:%M")
-            
-            # Create scheduled posts directory
-            schedule_dir = Path(__file__).parent.parent / "scheduled_posts"
-            schedule_dir.mkdir(exist_ok=True)
-            
-            # Save post data
-            post_data = {
-                "platform": "linkedin",
-                "content": content,
-                "scheduled_time": scheduled_dt.isoformat(),
-                "created_at": datetime.now().isoformat(),
-                "status": "scheduled"
-            }
-            
-            filename = f"linkedin_{scheduled_dt.strftime('%Y%m%d_%H%M')}.json"
-            filepath = schedule_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(post_data, f, indent=2, ensure_ascii=False)
+            scheduler = PublishScheduler()
+            post_id = scheduler.schedule("linkedin", {"content": content}, schedule_time)
+            scheduled_post = scheduler.store.get(post_id)
             
-            print(f"{Fore.GREEN}✓ Post scheduled for {schedule_time}")
-            print(f"{Fore.CYAN}Saved to: {filepath}")
-            print(f"{Fore.YELLOW}⚠️  Note: You need to set up a cron job or n8n workflow to publish scheduled posts")
+            print(f"{Fore.GREEN}✓ Post {post_id} scheduled for {schedule_time}")
+            print(f"{Fore.CYAN}Run 'python3 scripts/publish_scheduler.py run' to publish scheduled posts")
             
             return {
                 "success": True,
-                "scheduled_time": scheduled_dt.isoformat(),
-                "file": str(filepath)
+                "id": post_id,
+                "scheduled_time": scheduled_post["scheduled_time"]
             }
             
         except Exception as e:
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+BandaWeb3 Publishing Scheduler
+One scheduler for X, LinkedIn and Instagram posts.
+
+Posts are stored in SQLite (config/scheduled_posts.db) with stable IDs and
+kept in memory in a heap ordered by publish time. The daemon sleeps until the
+next post is due (or its platform's rate-limit window reopens) instead of
+polling, retries failures with exponential backoff and respects per-platform
+limits from config/platforms.json.
+
+Usage:
+    python3 publish_scheduler.py add twitter "Nuevo episodio 🎙️" --time "2024-12-06 09:00"
+    python3 publish_scheduler.py add linkedin --file ../E075_*/content/post_linkedin.txt --time "in 2h"
+    python3 publish_scheduler.py list --status pending
+    python3 publish_scheduler.py run            # daemon
+    python3 publish_scheduler.py run --once     # publish what is due and exit (cron)
+    python3 publish_scheduler.py import-legacy  # migrate scheduled_tweets.json / scheduled_posts/
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import random
+import sqlite3
+import argparse
+import threading
+from collections import deque
+from pathlib import Path
+from datetime import datetime, timedelta
+from db_io import load_json
+
+BASE_DIR = Path(__file__).parent.parent
+DB_PATH = BASE_DIR / "config" / "scheduled_posts.db"
+PLATFORMS_CONFIG = BASE_DIR / "config" / "platforms.json"
+LEGACY_TWEETS_FILE = BASE_DIR / "config" / "scheduled_tweets.json"
+LEGACY_POSTS_DIR = BASE_DIR / "scheduled_posts"
+
+PLATFORMS = ["twitter", "linkedin", "instagram"]
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 3600
+
+DEFAULT_RATE_LIMITS = {
+    "twitter": {"max_posts": 100, "window_seconds": 86400, "min_spacing_seconds": 30},
+    "linkedin": {"max_posts": 150, "window_seconds": 86400, "min_spacing_seconds": 60},
+    "instagram": {"max_posts": 50, "window_seconds": 86400, "min_spacing_seconds": 60},
+}
+
+
+class RateLimitedError(Exception):
+    """Raised by a publisher when the API asks us to back off."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_schedule_time(value):
+    """Parse 'YYYY-MM-DD HH:MM', ISO strings or relative 'in 2h' / 'in 30m'"""
+    if isinstance(value, datetime):
+        return value
+
+    value = value.strip()
+    if value.startswith("in "):
+        amount = value[3:].strip()
+        if amount.endswith("h"):
+            return datetime.now() + timedelta(hours=int(amount[:-1]))
+        if amount.endswith("m"):
+            return datetime.now() + timedelta(minutes=int(amount[:-1]))
+        raise ValueError("Relative time must look like 'in 2h' or 'in 30m'")
+
+    return datetime.fromisoformat(value)
+
+
+def load_rate_limits(config_path=PLATFORMS_CONFIG):
+    """Per-platform rate limits from platforms.json, with defaults"""
+    limits = {p: dict(v) for p, v in DEFAULT_RATE_LIMITS.items()}
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            configured = json.load(f).get("rate_limits", {})
+        for platform, values in configured.items():
+            limits.setdefault(platform, {}).update(values)
+    return limits
+
+
+class ScheduleStore:
+    """SQLite-backed durable storage for scheduled posts."""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                scheduled_time TEXT NOT NULL,
+                run_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                published_at TEXT,
+                published_ts REAL,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_status_run_at ON posts (status, run_at)"
+        )
+        self.conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [self._row_to_dict(r) for r in self.conn.execute(sql, params)]
+
+    @staticmethod
+    def _row_to_dict(row):
+        post = dict(row)
+        post["payload"] = json.loads(post["payload"])
+        if post.get("result"):
+            post["result"] = json.loads(post["result"])
+        return post
+
+    def add(self, platform, payload, scheduled_dt):
+        cursor = self._execute(
+            "INSERT INTO posts (platform, payload, scheduled_time, run_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (platform, json.dumps(payload, ensure_ascii=False), scheduled_dt.isoformat(),
+             scheduled_dt.timestamp(), datetime.now().isoformat())
+        )
+        return cursor.lastrowid
+
+    def get(self, post_id):
+        rows = self._query("SELECT * FROM posts WHERE id = ?", (post_id,))
+        return rows[0] if rows else None
+
+    def pending(self):
+        return self._query("SELECT * FROM posts WHERE status = 'pending' ORDER BY run_at")
+
+    def list(self, status=None):
+        if status:
+            return self._query("SELECT * FROM posts WHERE status = ? ORDER BY run_at", (status,))
+        return self._query("SELECT * FROM posts ORDER BY run_at")
+
+    def mark_published(self, post_id, result):
+        now = datetime.now()
+        self._execute(
+            "UPDATE posts SET status = 'published', published_at = ?, published_ts = ?, "
+            "result = ?, error = NULL, attempts = attempts + 1 WHERE id = ?",
+            (now.isoformat(), now.timestamp(), json.dumps(result, ensure_ascii=False), post_id)
+        )
+
+    def reschedule(self, post_id, run_at, error=None, count_attempt=True):
+        self._execute(
+            "UPDATE posts SET run_at = ?, error = ?, attempts = attempts + ? WHERE id = ?",
+            (run_at, error, 1 if count_attempt else 0, post_id)
+        )
+
+    def mark_failed(self, post_id, error):
+        self._execute(
+            "UPDATE posts SET status = 'failed', error = ?, attempts = attempts + 1 WHERE id = ?",
+            (error, post_id)
+        )
+
+    def cancel(self, post_id):
+        cursor = self._execute(
+            "UPDATE posts SET status = 'cancelled' WHERE id = ? AND status = 'pending'",
+            (post_id,)
+        )
+        return cursor.rowcount > 0
+
+    def published_since(self, platform, since_ts):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT published_ts FROM posts WHERE platform = ? AND status = 'published' "
+                "AND published_ts >= ? ORDER BY published_ts",
+                (platform, since_ts)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def data_version(self):
+        """Changes when another process commits to the database"""
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+class RateWindow:
+    """Sliding-window post counter for one platform."""
+
+    def __init__(self, max_posts, window_seconds, min_spacing_seconds=0, history=()):
+        self.max_posts = max_posts
+        self.window = window_seconds
+        self.spacing = min_spacing_seconds
+        self.sent = deque(history)
+        self.blocked_until = 0.0
+
+    def _trim(self, now):
+        while self.sent and self.sent[0] <= now - self.window:
+            self.sent.popleft()
+
+    def next_slot(self, now):
+        """Earliest time a post may be sent (now if allowed)"""
+        self._trim(now)
+        slot = max(now, self.blocked_until)
+        if self.sent:
+            slot = max(slot, self.sent[-1] + self.spacing)
+        if len(self.sent) >= self.max_posts:
+            slot = max(slot, self.sent[len(self.sent) - self.max_posts] + self.window)
+        return slot
+
+    def record(self, ts):
+        self.sent.append(ts)
+
+    def block(self, until):
+        self.blocked_until = max(self.blocked_until, until)
+
+
+def publish_twitter(payload):
+    import tweepy
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / "config" / ".env")
+    client = tweepy.Client(
+        consumer_key=os.getenv("X_API_KEY"),
+        consumer_secret=os.getenv("X_API_SECRET"),
+        access_token=os.getenv("X_ACCESS_TOKEN"),
+        access_token_secret=os.getenv("X_ACCESS_TOKEN_SECRET"),
+    )
+    try:
+        response = client.create_tweet(text=payload["content"])
+    except tweepy.errors.TooManyRequests as e:
+        reset = e.response.headers.get("x-rate-limit-reset")
+        raise RateLimitedError(str(e), retry_after=float(reset) - time.time() if reset else None)
+
+    return {"success": True, "tweet_id": response.data["id"]}
+
+
+def publish_linkedin(payload):
+    from publish_linkedin import LinkedInPublisher
+
+    publisher = LinkedInPublisher()
+    if payload.get("type") == "article":
+        lines = payload["content"].split('\n')
+        title = lines[0].replace('#', '').strip() if lines else "Article"
+        return publisher.publish_article(title, '\n'.join(lines[1:]).strip(),
+                                         payload.get("visibility", "PUBLIC"))
+    return publisher.publish_post(payload["content"], payload.get("visibility", "PUBLIC"))
+
+
+def publish_instagram(payload):
+    from publish_instagram import InstagramPublisher
+
+    publisher = InstagramPublisher()
+    if payload.get("type") == "carousel":
+        return publisher.publish_carousel(payload["image_urls"], payload["caption"])
+    return publisher.publish_image(payload["image_url"], payload["caption"])
+
+
+PUBLISHERS = {
+    "twitter": publish_twitter,
+    "linkedin": publish_linkedin,
+    "instagram": publish_instagram,
+}
+
+
+class PublishScheduler:
+    """Time-ordered publishing queue with rate limits, retries and one wake-up timer."""
+
+    def __init__(self, store=None, publishers=None, rate_limits=None):
+        self.store = store or ScheduleStore()
+        self.publishers = publishers or PUBLISHERS
+        self.rate_limits = rate_limits or load_rate_limits()
+        self.heap = []
+        self.windows = {}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._data_version = None
+        self.reload()
+
+    def reload(self):
+        """Rebuild the heap and rate windows from storage.
+
+        Publish history comes from the store (it includes other processes);
+        API back-off (blocked_until) only lives in memory and is carried over.
+        """
+        now = time.time()
+        with self._cond:
+            self.heap = [(post["run_at"], post["id"]) for post in self.store.pending()]
+            heapq.heapify(self.heap)
+            for platform, limit in self.rate_limits.items():
+                history = self.store.published_since(platform, now - limit["window_seconds"])
+                window = RateWindow(
+                    limit["max_posts"], limit["window_seconds"],
+                    limit.get("min_spacing_seconds", 0), history
+                )
+                previous = self.windows.get(platform)
+                if previous:
+                    window.block(previous.blocked_until)
+                self.windows[platform] = window
+            self._data_version = self.store.data_version()
+
+    def schedule(self, platform, payload, scheduled_time):
+        """Store a post and wake the run loop if it is now the earliest"""
+        if platform not in self.publishers:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        scheduled_dt = parse_schedule_time(scheduled_time)
+        post_id = self.store.add(platform, payload, scheduled_dt)
+        with self._cond:
+            heapq.heappush(self.heap, (scheduled_dt.timestamp(), post_id))
+            self._cond.notify()
+        return post_id
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+    def run_due(self, platforms=None):
+        """
+        Publish every post whose time has come.
+
+        Args:
+            platforms: Only publish these platforms (default: all)
+
+        Returns:
+            int: Number of posts published
+        """
+        published = 0
+        deferred = []
+
+        while True:
+            now = time.time()
+            with self._cond:
+                if not self.heap or self.heap[0][0] > now:
+                    break
+                run_at, post_id = heapq.heappop(self.heap)
+
+            post = self.store.get(post_id)
+            # Entry is stale if the post was cancelled, published or rescheduled elsewhere
+            if not post or post["status"] != "pending" or post["run_at"] != run_at:
+                continue
+            if platforms and post["platform"] not in platforms:
+                deferred.append((run_at, post_id))
+                continue
+
+            window = self.windows.get(post["platform"])
+            slot = window.next_slot(now) if window else now
+            if slot > now:
+                self.store.reschedule(post_id, slot, post["error"], count_attempt=False)
+                deferred.append((slot, post_id))
+                continue
+
+            if self._publish(post, window):
+                published += 1
+
+        with self._cond:
+            for entry in deferred:
+                heapq.heappush(self.heap, entry)
+        return published
+
+    def _publish(self, post, window):
+        post_id, platform = post["id"], post["platform"]
+        print(f"📤 [{post_id}] Publicando en {platform}...")
+
+        try:
+            result = self.publishers[platform](post["payload"])
+            error = None if result.get("success") else result.get("error", "unknown error")
+        except RateLimitedError as e:
+            retry_at = time.time() + (e.retry_after or BACKOFF_BASE_SECONDS)
+            if window:
+                window.block(retry_at)
+            self.store.reschedule(post_id, retry_at, str(e), count_attempt=False)
+            with self._cond:
+                heapq.heappush(self.heap, (retry_at, post_id))
+            print(f"⏳ [{post_id}] Rate limit de {platform}, reintento a las "
+                  f"{datetime.fromtimestamp(retry_at).strftime('%H:%M:%S')}")
+            return False
+        except Exception as e:
+            result, error = None, str(e)
+
+        if error is None:
+            self.store.mark_published(post_id, result)
+            if window:
+                window.record(time.time())
+            print(f"✅ [{post_id}] Publicado en {platform}")
+            return True
+
+        attempts = post["attempts"] + 1
+        if attempts >= MAX_ATTEMPTS:
+            self.store.mark_failed(post_id, error)
+            print(f"❌ [{post_id}] Falló tras {attempts} intentos: {error}")
+            return False
+
+        delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+        retry_at = time.time() + delay * random.uniform(0.8, 1.2)
+        self.store.reschedule(post_id, retry_at, error)
+        with self._cond:
+            heapq.heappush(self.heap, (retry_at, post_id))
+        print(f"⚠️  [{post_id}] Error ({error}), reintento {attempts}/{MAX_ATTEMPTS - 1} "
+              f"en {int(retry_at - time.time())}s")
+        return False
+
+    def run_forever(self, poll_seconds=5):
+        """
+        Sleep until the next post is due, publish, repeat.
+
+        Posts added through schedule() wake the loop immediately. Posts added
+        by other processes (e.g. `publish_scheduler.py add`) are noticed
+        within poll_seconds: the loop wakes at least that often and checks
+        SQLite's data_version, which is a cheap pragma, and only reloads the
+        queue when it changed.
+        """
+        print(f"🕒 Scheduler iniciado con {len(self.heap)} posts pendientes")
+        while True:
+            with self._cond:
+                if self._stop:
+                    break
+                timeout = poll_seconds
+                if self.heap:
+                    timeout = min(timeout, max(0.0, self.heap[0][0] - time.time()))
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                if self._stop:
+                    break
+
+            if self.store.data_version() != self._data_version:
+                self.reload()
+            self.run_due()
+
+
+def import_legacy(scheduler):
+    """Move pending posts from scheduled_tweets.json and scheduled_posts/ into the store"""
+    imported = 0
+
+    if LEGACY_TWEETS_FILE.exists():
+        tweets = load_json(LEGACY_TWEETS_FILE)
+        for tweet in tweets:
+            if tweet.get("status") == "pending":
+                scheduler.schedule("twitter", {"content": tweet["content"],
+                                               "metadata": tweet.get("metadata", {})},
+                                   tweet["scheduled_time"])
+                imported += 1
+        LEGACY_TWEETS_FILE.rename(LEGACY_TWEETS_FILE.with_suffix(".json.imported"))
+
+    if LEGACY_POSTS_DIR.exists():
+        for path in sorted(LEGACY_POSTS_DIR.glob("*.json")):
+            post = load_json(path)
+            if post.get("status") != "scheduled":
+                continue
+            platform = post["platform"]
+            payload = post.get("post_data") or {"content": post.get("content", "")}
+            scheduler.schedule(platform, payload, post["scheduled_time"])
+            path.rename(path.with_suffix(".json.imported"))
+            imported += 1
+
+    return imported
+
+
+def print_posts(posts):
+    for post in posts:
+        payload = post["payload"]
+        preview = payload.get("content") or payload.get("caption") or ""
+        print(f"\nID: {post['id']}  [{post['platform']}]  {post['status']}")
+        print(f"Programado: {datetime.fromtimestamp(post['run_at']).isoformat(timespec='minutes')}")
+        if post["attempts"]:
+            print(f"Intentos: {post['attempts']}  Último error: {post['error']}")
+        print(f"Contenido: {preview[:80]}...")
+        print("-" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scheduler de publicaciones para X, LinkedIn e Instagram"
+    )
+    subparsers = parser.add_subparsers(dest='command', help='Comandos')
+
+    add_parser = subparsers.add_parser('add', help='Programar nueva publicación')
+    add_parser.add_argument('platform', choices=PLATFORMS)
+    add_parser.add_argument('content', nargs='?', help='Texto del post')
+    add_parser.add_argument('--file', help='Leer el texto desde un archivo')
+    add_parser.add_argument('--time', required=True,
+                            help='Hora de publicación (YYYY-MM-DD HH:MM o "in 2h")')
+    add_parser.add_argument('--type', help='Tipo de post (article/post, image/carousel)')
+    add_parser.add_argument('--image', action='append', help='URL de imagen (Instagram)')
+
+    list_parser = subparsers.add_parser('list', help='Listar publicaciones')
+    list_parser.add_argument('--status', default='pending',
+                             choices=['pending', 'published', 'failed', 'cancelled', 'all'])
+
+    delete_parser = subparsers.add_parser('delete', help='Cancelar publicación pendiente')
+    delete_parser.add_argument('id', type=int)
+
+    run_parser = subparsers.add_parser('run', help='Ejecutar el scheduler')
+    run_parser.add_argument('--once', action='store_true',
+                            help='Publicar lo pendiente y salir (para cron)')
+    run_parser.add_argument('--poll', type=float, default=5,
+                            help='Segundos entre revisiones de cambios de otros procesos (default: 5)')
+
+    subparsers.add_parser('import-legacy', help='Importar scheduled_tweets.json y scheduled_posts/')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    scheduler = PublishScheduler()
+
+    if args.command == 'add':
+        content = args.content
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+        if args.platform == 'instagram':
+            images = args.image or []
+            payload = {"caption": content or "", "type": args.type or ("carousel" if len(images) > 1 else "image")}
+            if payload["type"] == "carousel":
+                payload["image_urls"] = images
+            elif images:
+                payload["image_url"] = images[0]
+            else:
+                print("❌ Instagram requiere --image")
+                sys.exit(1)
+        else:
+            if not content:
+                print("❌ Falta el contenido (texto o --file)")
+                sys.exit(1)
+            payload = {"content": content}
+            if args.type:
+                payload["type"] = args.type
+
+        post_id = scheduler.schedule(args.platform, payload, args.time)
+        post = scheduler.store.get(post_id)
+        print(f"✅ Post {post_id} programado en {args.platform} para: {post['scheduled_time']}")
+
+    elif args.command == 'list':
+        status = None if args.status == 'all' else args.status
+        posts = scheduler.store.list(status)
+        print(f"\n📋 Publicaciones programadas ({args.status}): {len(posts)}")
+        print("=" * 60)
+        print_posts(posts)
+
+    elif args.command == 'delete':
+        if scheduler.store.cancel(args.id):
+            print(f"✅ Post {args.id} cancelado")
+        else:
+            print(f"❌ Post {args.id} no encontrado o ya procesado")
+
+    elif args.command == 'run':
+        if args.once:
+            count = scheduler.run_due()
+            print(f"\n✅ Total publicados: {count}")
+        else:
+            try:
+                scheduler.run_forever(poll_seconds=args.poll)
+            except KeyboardInterrupt:
+                print("\n👋 Scheduler detenido")
+
+    elif args.command == 'import-legacy':
+        count = import_legacy(scheduler)
+        print(f"✅ Importados: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,90 +6,252 @@ Publica automáticamente hilos generados en X (Twitter)
 
 import os
 import sys
-import json
 import time
+import hashlib
 import tweepy
+import requests
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from db_io import load_json, save_json
 
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
 
+# Media IDs from the upload endpoint expire after 24h; re-upload before that
+MEDIA_ID_TTL_SECONDS = 20 * 3600
+
+# 429s on one tweet before giving up; waits longer than the limit window
+# (15 min) mean the 24h posting quota is spent, so we stop instead of waiting
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT_SECONDS = 15 * 60 + 30
+
+
+def thread_hash(thread_data):
+    """Content hash of a thread; saved progress only applies to the same thread"""
+    h = hashlib.sha256()
+    for tweet in thread_data:
+        h.update(tweet.get('content', '').encode('utf-8'))
+        h.update(b'\0' + '\0'.join(tweet.get('media', [])).encode('utf-8') + b'\1')
+    return h.hexdigest()[:16]
+
 
 class TwitterThreadPublisher:
     def __init__(self):
         """Initialize Twitter API client"""
-        # X API v2 credentials
+        # X API v2 credentials. Raw responses keep the rate-limit headers.
         self.client = tweepy.Client(
             bearer_token=os.getenv("X_BEARER_TOKEN"),
             consumer_key=os.getenv("X_API_KEY"),
             consumer_secret=os.getenv("X_API_SECRET"),
             access_token=os.getenv("X_ACCESS_TOKEN"),
             access_token_secret=os.getenv("X_ACCESS_TOKEN_SECRET"),
-            wait_on_rate_limit=True
+            return_type=requests.Response
         )
 
+        # Media upload is only available on the v1.1 API
+        self.api = tweepy.API(tweepy.OAuth1UserHandler(
+            os.getenv("X_API_KEY"),
+            os.getenv("X_API_SECRET"),
+            os.getenv("X_ACCESS_TOKEN"),
+            os.getenv("X_ACCESS_TOKEN_SECRET")
+        ))
+
     def load_thread(self, thread_file):
-        """Load thread from JSON file"""
-        with open(thread_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data.get('thread', [])
+        """Load thread from JSON file (publish format or generated thread_x.json)"""
+        data = load_json(thread_file)
+
+        if 'thread' in data:
+            return data['thread']
+
+        return [
+            {'content': t.get('text', ''), 'media': t.get('media', [])}
+            for t in data.get('tweets', [])
+        ]
+
+    def load_progress(self, progress_file, content_hash=None):
+        """
+        Load checkpoint of a partially published thread
+
+        A checkpoint saved for a different thread (content_hash mismatch)
+        is ignored.
+        """
+        progress = load_json(progress_file, default=None) if progress_file else None
+        if progress and (content_hash is None or progress.get('thread_hash') == content_hash):
+            return progress
+        return {'thread_hash': content_hash, 'tweet_ids': [], 'media_ids': {}}
+
+    def save_progress(self, progress_file, progress):
+        """Persist checkpoint atomically after every posted tweet"""
+        if progress_file:
+            save_json(progress_file, progress)
+
+    def upload_media(self, thread_data, base_dir, progress, max_workers=4):
+        """
+        Upload every media file in the thread concurrently before posting
+
+        Args:
+            thread_data: List of tweet objects (optional 'media' list of paths)
+            base_dir: Directory that relative media paths are resolved from
+            progress: Checkpoint dict; reusable media IDs are kept there
+
+        Returns:
+            Dict of media path -> media ID
+        """
+        now = time.time()
+        media_ids = {
+            path: entry for path, entry in progress.get('media_ids', {}).items()
+            if now - entry['uploaded_at'] < MEDIA_ID_TTL_SECONDS
+        }
+
+        paths = []
+        for tweet in thread_data:
+            for path in tweet.get('media', []):
+                if path not in media_ids and path not in paths:
+                    paths.append(path)
+
+        def upload(path):
+            full_path = Path(path) if Path(path).is_absolute() else Path(base_dir) / path
+            media = self.api.media_upload(filename=str(full_path))
+            return path, {'id': media.media_id_string, 'uploaded_at': time.time()}
+
+        if paths:
+            print(f"\n🖼️  Subiendo {len(paths)} archivos de media en paralelo...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for path, entry in executor.map(upload, paths):
+                    media_ids[path] = entry
+                    print(f"   ✓ {path} -> {entry['id']}")
+
+        progress['media_ids'] = media_ids
+        return media_ids
+
+    @staticmethod
+    def pacing_delay(response, tweets_left, min_delay):
+        """
+        Seconds to wait before the next tweet, from the rate-limit headers
 
-    def publish_thread(self, thread_data, delay=3):
+        Spreads the remaining request budget over the time left in the
+        window, so short threads go out back-to-back and long ones slow
+        down only when the window is nearly exhausted.
+        """
+        headers = response.headers if response is not None else {}
+        remaining = headers.get('x-rate-limit-remaining')
+        reset = headers.get('x-rate-limit-reset')
+        if remaining is None or reset is None:
+            return min_delay
+
+        remaining = int(remaining)
+        until_reset = max(0.0, float(reset) - time.time())
+        if remaining <= 0:
+            return until_reset + 1
+        if remaining >= tweets_left:
+            return min_delay
+        return max(min_delay, until_reset / remaining)
+
+    @staticmethod
+    def rate_limit_wait(response):
+        """
+        Seconds until a 429 clears, from the rate-limit headers
+
+        The per-user 24h posting quota (x-user-limit-24hour-*) wins over the
+        15-minute endpoint window when it is the one exhausted. Returns None
+        when the response carries no reset header.
+        """
+        headers = response.headers if response is not None else {}
+        reset = headers.get('x-rate-limit-reset')
+        if headers.get('x-user-limit-24hour-remaining') == '0' and headers.get('x-user-limit-24hour-reset'):
+            reset = headers['x-user-limit-24hour-reset']
+        if reset is None:
+            return None
+        return max(0.0, float(reset) - time.time()) + 1
+
+    def publish_thread(self, thread_data, delay=1, base_dir=".", progress_file=None):
         """
         Publish thread to X
 
+        Media is uploaded up front. Posted tweet IDs are checkpointed in
+        progress_file, so re-running after a failure resumes from the last
+        posted reply instead of starting over. On a 429 the publisher waits
+        for the window reset at most MAX_RATE_LIMIT_RETRIES times; when the
+        reset is further away than one window (24h quota spent) it stops
+        right away with the progress saved.
+
         Args:
             thread_data: List of tweet objects
-            delay: Seconds to wait between tweets (default: 3)
+            delay: Minimum seconds between tweets (default: 1)
+            base_dir: Directory that relative media paths are resolved from
+            progress_file: Checkpoint file (optional)
 
         Returns:
             List of tweet IDs
         """
-        tweet_ids = []
-        previous_tweet_id = None
+        progress = self.load_progress(progress_file, thread_hash(thread_data))
+        tweet_ids = progress['tweet_ids']
+        previous_tweet_id = tweet_ids[-1] if tweet_ids else None
+
+        media_ids = self.upload_media(thread_data, base_dir, progress)
+        self.save_progress(progress_file, progress)
 
-        print(f"\n🐦 Publicando hilo de {len(thread_data)} tweets...")
+        total = len(thread_data)
+        print(f"\n🐦 Publicando hilo de {total} tweets...")
+        if tweet_ids:
+            print(f"   ↩️  Reanudando desde el tweet {len(tweet_ids) + 1}")
         print("=" * 60)
 
-        for i, tweet in enumerate(thread_data, 1):
+        i = len(tweet_ids)
+        rate_limited = 0
+        while i < total:
+            tweet = thread_data[i]
             content = tweet.get('content', '')
+            tweet_media = [media_ids[p]['id'] for p in tweet.get('media', [])] or None
 
             try:
-                # Publish tweet
-                if previous_tweet_id is None:
-                    # First tweet (no reply)
-                    response = self.client.create_tweet(text=content)
-                else:
-                    # Reply to previous tweet
-                    response = self.client.create_tweet(
-                        text=content,
-                        in_reply_to_tweet_id=previous_tweet_id
-                    )
-
-                tweet_id = response.data['id']
-                tweet_ids.append(tweet_id)
-                previous_tweet_id = tweet_id
-
-                print(f"✅ Tweet {i}/{len(thread_data)} publicado")
-                print(f"   ID: {tweet_id}")
-                print(f"   Preview: {content[:60]}...")
-
-                # Wait before next tweet (avoid rate limits)
-                if i < len(thread_data):
-                    print(f"   ⏳ Esperando {delay} segundos...")
-                    time.sleep(delay)
-
+                response = self.client.create_tweet(
+                    text=content,
+                    in_reply_to_tweet_id=previous_tweet_id,
+                    media_ids=tweet_media
+                )
+            except tweepy.errors.TooManyRequests as e:
+                rate_limited += 1
+                wait = self.rate_limit_wait(e.response)
+                if wait is None:
+                    wait = min(MAX_RATE_LIMIT_WAIT_SECONDS, 60 * 2 ** (rate_limited - 1))
+                if rate_limited > MAX_RATE_LIMIT_RETRIES or wait > MAX_RATE_LIMIT_WAIT_SECONDS:
+                    resume_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(time.time() + wait))
+                    print(f"⛔ Límite de publicación agotado en el tweet {i + 1}; se libera hacia {resume_at}")
+                    if progress_file:
+                        print(f"   💾 Progreso guardado en {progress_file}; vuelve a ejecutar para continuar")
+                    break
+                print(f"   ⏳ Rate limit alcanzado, esperando {int(wait)} segundos "
+                      f"({rate_limited}/{MAX_RATE_LIMIT_RETRIES})...")
+                time.sleep(wait)
+                continue
             except tweepy.errors.TweepyException as e:
-                print(f"❌ Error publicando tweet {i}: {e}")
+                print(f"❌ Error publicando tweet {i + 1}: {e}")
                 print(f"   Contenido: {content}")
-
-                # Ask user if they want to continue
-                if i < len(thread_data):
-                    response = input("\n¿Continuar con siguiente tweet? (y/n): ")
-                    if response.lower() != 'y':
-                        break
-
+                if progress_file:
+                    print(f"   💾 Progreso guardado en {progress_file}; vuelve a ejecutar para continuar")
+                break
+
+            tweet_id = response.json()['data']['id']
+            tweet_ids.append(tweet_id)
+            previous_tweet_id = tweet_id
+            self.save_progress(progress_file, progress)
+            i += 1
+            rate_limited = 0
+
+            print(f"✅ Tweet {i}/{total} publicado")
+            print(f"   ID: {tweet_id}")
+            print(f"   Preview: {content[:60]}...")
+
+            # Pace the next tweet from the rate-limit headers
+            if i < total:
+                wait = self.pacing_delay(response, total - i, delay)
+                if wait > 0:
+                    time.sleep(wait)
+
+        if progress_file and len(tweet_ids) == total:
+            Path(progress_file).unlink(missing_ok=True)
         return tweet_ids
 
     def get_thread_url(self, first_tweet_id, username=None):
@@ -98,7 +260,7 @@ class TwitterThreadPublisher:
             # Try to get username from API
             try:
                 me = self.client.get_me()
-                username = me.data.username
+                username = me.json()['data']['username']
             except:
                 username = "USERNAME"
 
@@ -108,7 +270,7 @@ class TwitterThreadPublisher:
         """Publish a single tweet"""
         try:
             response = self.client.create_tweet(text=content)
-            tweet_id = response.data['id']
+            tweet_id = response.json()['data']['id']
             print(f"✅ Tweet publicado: {tweet_id}")
             return tweet_id
         except tweepy.errors.TweepyException as e:
@@ -128,9 +290,14 @@ def main():
     )
     parser.add_argument(
         "--delay",
-        type=int,
-        default=3,
-        help="Segundos entre tweets (default: 3)"
+        type=float,
+        default=1,
+        help="Segundos mínimos entre tweets; el ritmo real sale de los headers de rate limit (default: 1)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignorar el progreso guardado y publicar el hilo desde el inicio"
     )
     parser.add_argument(
         "--preview",
@@ -171,8 +338,21 @@ def main():
     # Confirm publication
     print(f"\n📊 Resumen:")
     print(f"   Total tweets: {len(thread_data)}")
-    print(f"   Delay entre tweets: {args.delay}s")
+    print(f"   Delay mínimo entre tweets: {args.delay}s")
     print(f"   Archivo: {args.thread_file}")
+
+    thread_dir = Path(args.thread_file).parent
+    progress_file = thread_dir / "thread_progress.json"
+    if args.restart and progress_file.exists():
+        progress_file.unlink()
+    elif progress_file.exists():
+        saved = load_json(progress_file)
+        if saved.get('thread_hash') != thread_hash(thread_data):
+            print(f"❌ {progress_file} corresponde a otra versión del hilo "
+                  f"({len(saved.get('tweet_ids', []))} tweets publicados).")
+            print("   Revisa lo ya publicado y usa --restart para empezar de nuevo")
+            sys.exit(1)
+        print(f"   Progreso previo: {len(saved['tweet_ids'])} tweets ya publicados")
     print()
 
     response = input("¿Publicar hilo en X? (y/n): ")
@@ -181,7 +361,18 @@ def main():
         sys.exit(0)
 
     # Publish thread
-    tweet_ids = publisher.publish_thread(thread_data, delay=args.delay)
+    tweet_ids = publisher.publish_thread(
+        thread_data,
+        delay=args.delay,
+        base_dir=thread_dir,
+        progress_file=progress_file
+    )
+
+    if len(tweet_ids) < len(thread_data):
+        print("\n" + "=" * 60)
+        print(f"⚠️  HILO INCOMPLETO: {len(tweet_ids)}/{len(thread_data)} tweets publicados")
+        print("=" * 60)
+        sys.exit(1)
 
     # Summary
     print("\n" + "=" * 60)
@@ -196,16 +387,14 @@ def main():
         print(f"   {thread_url}")
 
         # Save published info
-        thread_dir = Path(args.thread_file).parent
         published_file = thread_dir / "thread_published.json"
 
-        with open(published_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'published_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'tweet_ids': tweet_ids,
-                'thread_url': thread_url,
-                'total_tweets': len(tweet_ids)
-            }, f, indent=2)
+        save_json(published_file, {
+            'published_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'tweet_ids': tweet_ids,
+            'thread_url': thread_url,
+            'total_tweets': len(tweet_ids)
+        })
 
         print(f"\n💾 Info guardada en: {published_file}")
 
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Related episodes by TF-IDF similarity of title, topics, description and
+(optionally) transcript text.
+
+    from related_episodes import related
+
+    neighbors = related(episodes, k=6)      # neighbors[i] = [(j, score), ...]
+
+- Text is lowercased and accent-folded ("Tecnología" -> "tecnologia"),
+  Spanish and English stopwords are dropped, and fields are weighted
+  (title and topics count more than the description; transcripts much less).
+- Terms found in a single episode or in more than half of them cannot
+  separate episodes and are pruned before scoring.
+- Weights are sublinear TF x smoothed IDF, L2-normalized, so the score
+  is the cosine similarity.
+- With scipy installed, scores come from a sparse X @ X.T computed in row
+  blocks and np.argpartition picks the top k. Without it, an inverted
+  index accumulates scores only over episodes that share a term, using
+  each episode's strongest QUERY_TERMS terms. Each posting list keeps
+  the MAX_POSTINGS episodes where the term weighs most, so a query costs
+  at most QUERY_TERMS x MAX_POSTINGS updates and the scorer stays linear
+  in the catalog size (terms near MAX_DF_RATIO would otherwise make it
+  quadratic). Below ~MAX_POSTINGS / MAX_DF_RATIO episodes nothing is cut.
+- Results are cached in shared/cache/related.json keyed by a hash of the
+  indexed content and parameters; a build whose episodes did not change
+  reuses them. Any change recomputes everything, since IDF is global.
+
+Usage:
+    python3 scripts/related_episodes.py 073            # neighbors of one episode
+    python3 scripts/related_episodes.py 073 --transcripts -k 10
+"""
+
+import re
+import sys
+import math
+import heapq
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+from collections import Counter, defaultdict
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json
+from episode_schema import normalize
+from transcript_reader import open_transcript
+import instrumentation as instr
+
+CACHE_PATH = Path('shared/cache/related.json')
+CACHE_VERSION = 3
+
+FIELD_WEIGHTS = {'title': 3.0, 'topics': 3.0, 'description': 1.0, 'transcript': 0.1}
+MIN_DF = 2
+MAX_DF_RATIO = 0.5
+QUERY_TERMS = 40    # terms per episode used by the pure-Python scorer
+MAX_POSTINGS = 128  # episodes kept per term by the pure-Python scorer
+BLOCK_ROWS = 256    # rows of X @ X.T materialized at once (scipy path)
+
+STOPWORDS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes aqui asi aun bajo bien cada casi como con
+contra cual cuales cuando de del desde donde dos el ella ellas ello ellos en entre era eran es esa esas
+ese eso esos esta estaba estado estan estar estas este esto estos fue fueron ha habia han hasta hay
+hoy la las le les lo los mas me mi mis mucho muy nada ni no nos nosotros nuestra nuestro o otra otras
+otro otros para pero poco por porque pues que quien se sea ser si sido sin sobre solo son su sus tambien
+tan tanto te tiene tienen todo todos tu tus un una uno unos usted ustedes va van vamos y ya yo
+episodio episodios space spaces banda bandaweb3 mexi hoy sera vez
+the and for with from that this are was were you your our have has not but all can will about into
+what when how who why its they them their there here just also more most some than then out over
+""".split())
+
+_TOKEN = re.compile(r'[a-z0-9]{3,}')
+
+
+def fold(text):
+    """Lowercase and strip accents"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def tokens(text):
+    return [t for t in _TOKEN.findall(fold(text)) if t not in STOPWORDS and not t.isdigit()]
+
+
+def transcript_of(ep):
+    return open_transcript(ep.transcript_id) if ep.transcript_id else None
+
+
+def transcript_text(ep):
+    """Spoken text of the episode's transcript (no metadata header)"""
+    transcript = transcript_of(ep)
+    return transcript.text() if transcript else ''
+
+
+def weighted_terms(ep, transcripts=False):
+    """Term -> weighted count over the indexed fields of one episode"""
+    counts = Counter()
+    fields = {
+        'title': ep.get('title') or '',
+        'topics': ' '.join(ep.get('topics') or []),
+        'description': ep.get('description') or '',
+    }
+    if transcripts:
+        fields['transcript'] = transcript_text(ep)
+    for field, text in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for term in tokens(text):
+            counts[term] += weight
+    return counts
+
+
+def content_key(episodes, k, transcripts):
+    """Hash of everything the neighbors depend on"""
+    h = hashlib.sha256(f"{CACHE_VERSION}|{k}|{transcripts}|{sorted(FIELD_WEIGHTS.items())}".encode())
+    for ep in episodes:
+        h.update('\0'.join([
+            str(ep.number), ep.get('title') or '', '|'.join(ep.get('topics') or []),
+            ep.get('description') or '',
+        ]).encode('utf-8'))
+        if transcripts:
+            transcript = transcript_of(ep)
+            if transcript:
+                st = transcript.path.stat()
+                h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def tfidf(docs):
+    """Sparse L2-normalized rows: list of {term_id: weight}; pruned by document frequency"""
+    df = Counter()
+    for counts in docs:
+        df.update(counts.keys())
+    n = len(docs)
+    max_df = max(MIN_DF, int(n * MAX_DF_RATIO))
+    vocab = {}
+    idf = {}
+    for term, d in df.items():
+        if MIN_DF <= d <= max_df:
+            vocab[term] = len(vocab)
+            idf[term] = math.log((1 + n) / (1 + d)) + 1
+
+    rows = []
+    for counts in docs:
+        row = {vocab[t]: (1 + math.log(c)) * idf[t] for t, c in counts.items() if t in vocab and c >= 1}
+        norm = math.sqrt(sum(w * w for w in row.values()))
+        rows.append({t: w / norm for t, w in row.items()} if norm else {})
+    return rows, len(vocab)
+
+
+def _top_k_sparse(rows, n_terms, k):
+    """Top-k cosine neighbors with scipy: X @ X.T in row blocks"""
+    indptr, indices, data = [0], [], []
+    for row in rows:
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+    X = sparse.csr_matrix((np.asarray(data, dtype=np.float32), indices, indptr), shape=(len(rows), n_terms))
+    XT = X.T.tocsc()
+
+    neighbors = []
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = (X[start:start + BLOCK_ROWS] @ XT).toarray()
+        for offset, scores in enumerate(block):
+            scores[start + offset] = 0.0
+            kk = min(k, len(scores) - 1)
+            if kk <= 0:
+                neighbors.append([])
+                continue
+            top = np.argpartition(-scores, kk - 1)[:kk]
+            top = top[np.argsort(-scores[top])]
+            neighbors.append([(int(j), round(float(scores[j]), 4)) for j in top if scores[j] > 0])
+    return neighbors
+
+
+def _top_k_inverted(rows, k):
+    """Top-k neighbors from an inverted index; only co-occurring episodes are scored"""
+    postings = defaultdict(list)
+    for i, row in enumerate(rows):
+        for t, w in row.items():
+            postings[t].append((i, w))
+    for t, posting in postings.items():
+        if len(posting) > MAX_POSTINGS:
+            postings[t] = heapq.nlargest(MAX_POSTINGS, posting, key=lambda jw: jw[1])
+
+    neighbors = []
+    for i, row in enumerate(rows):
+        scores = defaultdict(float)
+        query = heapq.nlargest(QUERY_TERMS, row.items(), key=lambda tw: tw[1])
+        for t, w in query:
+            for j, wj in postings[t]:
+                scores[j] += w * wj
+        scores.pop(i, None)
+        top = heapq.nlargest(k, scores.items(), key=lambda js: js[1])
+        neighbors.append([(j, round(s, 4)) for j, s in top if s > 0])
+    return neighbors
+
+
+def related(episodes, k=6, transcripts=False, cache_path=CACHE_PATH):
+    """
+    Top-k related episodes for each of episodes (Episode objects):
+    neighbors[i] = [(j, score), ...], j indexing episodes, best first.
+    """
+    key = content_key(episodes, k, transcripts)
+    cached = load_json(cache_path) if Path(cache_path).exists() else {}
+    if cached.get('key') == key:
+        instr.inc('related_cache_hits')
+        return [[tuple(pair) for pair in row] for row in cached['neighbors']]
+
+    with instr.span('related.index', episodes=len(episodes), transcripts=transcripts):
+        rows, n_terms = tfidf([weighted_terms(ep, transcripts) for ep in episodes])
+    with instr.span('related.score'):
+        if sparse is not None and n_terms:
+            neighbors = _top_k_sparse(rows, n_terms, k)
+        else:
+            neighbors = _top_k_inverted(rows, k)
+
+    save_json(cache_path, {'key': key, 'neighbors': neighbors})
+    return neighbors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the related episodes of an episode")
+    parser.add_argument('number', help="Episode number, e.g. 073")
+    parser.add_argument('-k', type=int, default=6, help="Neighbors to show (default 6)")
+    parser.add_argument('--transcripts', action='store_true', help="Also index transcript text")
+    parser.add_argument('--db', default='shared/episodes_database.json')
+    args = parser.parse_args()
+
+    episodes = normalize(load_json(args.db).get('episodes', []))
+    # Separate cache so the CLI does not invalidate the build's
+    neighbors = related(episodes, args.k, args.transcripts, cache_path=CACHE_PATH.with_name('related_cli.json'))
+    for i, ep in enumerate(episodes):
+        if ep.number == args.number:
+            print(f"#{ep.number} {ep.get('title')}")
+            for j, score in neighbors[i]:
+                print(f"   {score:.3f}  #{episodes[j].number} {episodes[j].get('title')}")
+            return
+    print(f"❌ Episodio {args.number} no encontrado")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,20 @@ Script para eliminar episodios duplicados de spoken_database.json
 (aquellos que ya existen en episodes_database.json)
 """
 
-import json
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from duplicate_engine import DuplicateEngine
+import db_io
+
 def load_json(filepath):
     """Carga un archivo JSON"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return db_io.load_json(filepath)
 
 def save_json(data, filepath):
-    """Guarda datos en un archivo JSON"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Guarda datos en un archivo JSON (escritura atómica, solo si cambiaron)"""
+    return db_io.save_json(filepath, data)
 
 def remove_duplicates():
     """Elimina episodios duplicados de spoken_database.json"""
@@ -34,27 +36,23 @@ def remove_duplicates():
     print(f"📊 Episodios en episodes_database.json: {len(episodes_list)}")
     print(f"📊 Episodios en spoken_database.json (antes): {len(spoken_list)}")
     
-    # Crear un set de space_urls de episodes_database.json
-    episodes_space_urls = set()
-    for episode in episodes_list:
-        space_url = episode.get('space_url', '')
-        if space_url:
-            episodes_space_urls.add(space_url)
+    # Hash-join por space ID: los de spoken que ya existen en episodes_database son duplicados
+    result = DuplicateEngine({'episodes': episodes_list, 'spoken': spoken_list}).find()
+    duplicate_indices = set()
+    for group in result.cross('episodes', 'spoken'):
+        duplicate_indices.update(m.index for m in group.in_db('spoken'))
     
-    print(f"\n🔍 Space URLs únicos en episodes_database.json: {len(episodes_space_urls)}")
+    print(f"\n🔍 Space IDs de spoken_database.json presentes en episodes_database.json: {len(duplicate_indices)}")
     
     # Filtrar spoken_list para eliminar duplicados
     unique_spoken = []
     duplicates_removed = []
     
-    for spoken_ep in spoken_list:
-        space_url = spoken_ep.get('space_url', '')
-        
-        # Si el episodio tiene space_url y está en episodes_database, es duplicado
-        if space_url and space_url in episodes_space_urls:
+    for index, spoken_ep in enumerate(spoken_list):
+        if index in duplicate_indices:
             duplicates_removed.append({
                 'title': spoken_ep.get('title', 'N/A'),
-                'space_url': space_url,
+                'space_url': spoken_ep.get('space_url', ''),
                 'date': spoken_ep.get('date', 'N/A'),
                 'host': spoken_ep.get('host', 'N/A')
             })
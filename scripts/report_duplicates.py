@@ -1,17 +1,15 @@
 
-import json
 import zipfile
-import re
 from datetime import datetime
 import sys
 import os
 sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
 import scripts.manual_xlsx_parse as parser
+from duplicate_engine import DuplicateEngine
+from db_io import load_json
 
 # --- Helpers ---
-def normalize_title(t):
-    return re.sub(r'[^a-z0-9]', '', t.lower())
-
 def extract_date(date_str):
     try:
         dt = datetime.strptime(date_str.strip(), "%b %d %Y")
@@ -35,6 +33,8 @@ try:
             desc_cell = next((c for c in row if c['ref'].startswith('B')), None)
             if not desc_cell or not desc_cell.get('value') or 'Ended:' not in desc_cell['value']: continue
 
+            link_cell = next((c for c in row if c['ref'].startswith('D')), None)
+
             desc_raw = desc_cell['value']
             parts = desc_raw.split(' - Ended: ')
             title = parts[0].strip()
@@ -43,19 +43,26 @@ try:
             date_str = extract_date(date_part)
             
             if date_str:
-                excel_eps.append({'title': title, 'date': date_str})
+                excel_eps.append({
+                    'title': title,
+                    'date': date_str,
+                    'space_url': (link_cell or {}).get('link') or ""
+                })
 except Exception:
     pass
 
 # 2. Load DB
-with open(db_path, 'r') as f:
-    db = json.load(f)
+db = load_json(db_path)
+
+# Rows already in the DB: same space ID, or same/next day with a similar title
+result = DuplicateEngine({'episodes': db['episodes'], 'excel': excel_eps}).find()
+known = set()
+for kind in ('exact', 'probable'):
+    for group in result.cross('episodes', 'excel', kind=kind):
+        known.update(m.index for m in group.in_db('excel'))
 
-db_titles = set()
 db_dates = {}
 for ep in db['episodes']:
-    t = normalize_title(ep.get('title', ''))
-    if t: db_titles.add(t)
     d = ep.get('date')
     if d:
         if d not in db_dates: db_dates[d] = []
@@ -65,9 +72,8 @@ for ep in db['episodes']:
 print(f"| Fecha | Título en Excel | Título(s) en BD | Notas |")
 print(f"|---|---|---|---|")
 
-for cand in excel_eps:
-    norm_title = normalize_title(cand['title'])
-    if norm_title in db_titles: continue
+for i, cand in enumerate(excel_eps):
+    if i in known: continue
     
     match_on_date = db_dates.get(cand['date'])
     if match_on_date:
@@ -1,17 +1,9 @@
 
-import json
+from db_io import load_json, save_json
 
 EPISODES_DB_PATH = 'shared/episodes_database.json'
 SPOKEN_DB_PATH = 'shared/spoken_database.json'
 
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_json(path, data):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 def main():
     print("🔄 Reverting 5 episodes from Episodes DB back to Spoken DB...")
     
@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
 BandaWeb3 - Schedule Tweet
-Programa tweets para publicación futura (requiere cron o n8n)
+Programa tweets para publicación futura.
+Los tweets se guardan en el scheduler compartido (publish_scheduler.py);
+`publish_scheduler.py run` los publica a su hora sin necesidad de cron.
 """
 
 import os
 import sys
-import json
+import time
 import tweepy
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).parent))
+
+from publish_scheduler import PublishScheduler, PUBLISHERS, RateLimitedError
+
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
 
@@ -28,22 +34,22 @@ class TweetScheduler:
             wait_on_rate_limit=True
         )
 
-        self.schedule_file = Path("../config/scheduled_tweets.json")
-
-    def load_schedule(self):
-        """Load scheduled tweets from file"""
-        if not self.schedule_file.exists():
-            return []
-
-        with open(self.schedule_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.scheduler = PublishScheduler(
+            publishers=dict(PUBLISHERS, twitter=self.publish_payload)
+        )
 
-    def save_schedule(self, schedule):
-        """Save schedule to file"""
-        self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
+    def publish_payload(self, payload):
+        """Publish one scheduled tweet (used by the shared scheduler)"""
+        try:
+            response = self.client.create_tweet(text=payload['content'])
+        except tweepy.errors.TooManyRequests as e:
+            reset = e.response.headers.get('x-rate-limit-reset')
+            raise RateLimitedError(str(e), retry_after=float(reset) - time.time() if reset else None)
 
-        with open(self.schedule_file, 'w', encoding='utf-8') as f:
-            json.dump(schedule, f, indent=2, ensure_ascii=False)
+        tweet_id = response.data['id']
+        print(f"✅ Tweet publicado: {tweet_id}")
+        print(f"   Contenido: {payload['content'][:60]}...")
+        return {'success': True, 'tweet_id': tweet_id}
 
     def add_to_schedule(self, content, scheduled_time, metadata=None):
         """
@@ -54,92 +60,41 @@ class TweetScheduler:
             scheduled_time: datetime object or ISO string
             metadata: Additional metadata (optional)
         """
-        schedule = self.load_schedule()
-
-        # Convert to ISO string if datetime
-        if isinstance(scheduled_time, datetime):
-            scheduled_time = scheduled_time.isoformat()
-
-        tweet_data = {
-            'id': len(schedule) + 1,
-            'content': content,
-            'scheduled_time': scheduled_time,
-            'status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'metadata': metadata or {}
-        }
-
-        schedule.append(tweet_data)
-        self.save_schedule(schedule)
+        post_id = self.scheduler.schedule(
+            'twitter',
+            {'content': content, 'metadata': metadata or {}},
+            scheduled_time
+        )
+        tweet_data = self.scheduler.store.get(post_id)
 
-        print(f"✅ Tweet programado para: {scheduled_time}")
+        print(f"✅ Tweet {post_id} programado para: {tweet_data['scheduled_time']}")
         return tweet_data
 
     def publish_pending_tweets(self):
         """Publish tweets that are due"""
-        schedule = self.load_schedule()
-        now = datetime.now()
-
-        published_count = 0
-
-        for tweet in schedule:
-            if tweet['status'] != 'pending':
-                continue
-
-            scheduled_time = datetime.fromisoformat(tweet['scheduled_time'])
-
-            if scheduled_time <= now:
-                try:
-                    # Publish tweet
-                    response = self.client.create_tweet(text=tweet['content'])
-                    tweet_id = response.data['id']
-
-                    # Update status
-                    tweet['status'] = 'published'
-                    tweet['published_at'] = now.isoformat()
-                    tweet['tweet_id'] = tweet_id
-
-                    print(f"✅ Tweet publicado: {tweet_id}")
-                    print(f"   Contenido: {tweet['content'][:60]}...")
-
-                    published_count += 1
-
-                except tweepy.errors.TweepyException as e:
-                    print(f"❌ Error publicando tweet: {e}")
-                    tweet['status'] = 'failed'
-                    tweet['error'] = str(e)
-
-        # Save updated schedule
-        if published_count > 0:
-            self.save_schedule(schedule)
-
-        return published_count
+        return self.scheduler.run_due(platforms=['twitter'])
 
     def list_scheduled(self, status='pending'):
         """List scheduled tweets"""
-        schedule = self.load_schedule()
-
-        filtered = [t for t in schedule if t['status'] == status]
+        filtered = [
+            t for t in self.scheduler.store.list(status)
+            if t['platform'] == 'twitter'
+        ]
 
-        print(f"\n📋 Tweets programados ({status}):")
+        print(f"\n📋 Tweets programados ({status or 'all'}):")
         print("=" * 60)
 
         for tweet in filtered:
             print(f"\nID: {tweet['id']}")
             print(f"Programado: {tweet['scheduled_time']}")
-            print(f"Contenido: {tweet['content'][:80]}...")
+            print(f"Contenido: {tweet['payload']['content'][:80]}...")
             print("-" * 60)
 
         return filtered
 
     def delete_scheduled(self, tweet_id):
         """Delete scheduled tweet"""
-        schedule = self.load_schedule()
-
-        updated_schedule = [t for t in schedule if t['id'] != tweet_id]
-
-        if len(updated_schedule) < len(schedule):
-            self.save_schedule(updated_schedule)
+        if self.scheduler.store.cancel(tweet_id):
             print(f"✅ Tweet {tweet_id} eliminado del schedule")
             return True
         else:
@@ -174,7 +129,7 @@ def main():
     list_parser.add_argument(
         '--status',
         default='pending',
-        choices=['pending', 'published', 'failed', 'all'],
+        choices=['pending', 'published', 'failed', 'cancelled', 'all'],
         help='Filtrar por estado'
     )
 
@@ -3,7 +3,12 @@
 Script para mostrar detalles de los duplicados en episodes_database.json
 """
 
+import sys
 import json
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from duplicate_engine import DuplicateEngine
 
 def load_json(filepath):
     """Carga un archivo JSON"""
@@ -13,53 +18,42 @@ def load_json(filepath):
 def show_duplicate_details():
     """Muestra detalles de los duplicados en episodes_database.json"""
     
-    # URLs duplicadas
-    duplicate_urls = [
-        'https://x.com/i/spaces/1vOxwjWdZvDJB',
-        'https://x.com/i/spaces/1gqGvQzEDQeKB',
-        'https://x.com/i/spaces/1gqxvQkyovRJB',
-        'https://x.com/i/spaces/1RDGlazORNNJL',
-        'https://x.com/i/spaces/1BRJjZPNmzLJw',
-        'https://x.com/i/spaces/1LyxBqbQPYLJN',
-        'https://x.com/i/spaces/1zqKVPozepnJB'
-    ]
-    
-    # Cargar base de datos
+    # Cargar base de datos y agrupar duplicados por space ID
     episodes_db = load_json('shared/episodes_database.json')
     episodes_list = episodes_db.get('episodes', [])
+    groups = DuplicateEngine({'episodes': episodes_list}).find().within('episodes')
     
     print("\n" + "="*100)
     print("DETALLES DE DUPLICADOS EN EPISODES_DATABASE.JSON")
     print("="*100 + "\n")
     
-    for i, url in enumerate(duplicate_urls, 1):
-        # Encontrar todos los episodios con este URL
-        matching_eps = [ep for ep in episodes_list if ep.get('space_url') == url]
+    if not groups:
+        print("✅ No hay duplicados en episodes_database.json\n")
+    
+    for i, group in enumerate(groups, 1):
+        matching_eps = [m.record for m in group.members]
         
-        if matching_eps:
-            print(f"{i}. DUPLICADO #{i}")
-            print(f"   Space URL: {url}")
-            print(f"   Aparece {len(matching_eps)} veces\n")
-            
-            for j, ep in enumerate(matching_eps, 1):
-                print(f"   OCURRENCIA {j}:")
-                print(f"   ├─ Número: {ep.get('number', 'N/A')}")
-                print(f"   ├─ Título: {ep.get('title', 'N/A')}")
-                print(f"   ├─ Fecha: {ep.get('date', 'N/A')}")
-                print(f"   ├─ Host: {ep.get('host', 'N/A')}")
-                print(f"   ├─ Duración: {ep.get('duration', 'N/A')}")
-                print(f"   ├─ Listeners: {ep.get('listeners', 'N/A')}")
-                print(f"   ├─ Tipo: {ep.get('type', 'N/A')}")
-                
-                desc = ep.get('description', 'N/A')
-                if len(desc) > 150:
-                    desc = desc[:150] + "..."
-                print(f"   └─ Descripción: {desc}")
-                print()
+        print(f"{i}. DUPLICADO #{i}")
+        print(f"   Space ID: {group.key}")
+        print(f"   Aparece {len(matching_eps)} veces\n")
+        
+        for j, ep in enumerate(matching_eps, 1):
+            print(f"   OCURRENCIA {j}:")
+            print(f"   ├─ Número: {ep.get('number', 'N/A')}")
+            print(f"   ├─ Título: {ep.get('title', 'N/A')}")
+            print(f"   ├─ Fecha: {ep.get('date', 'N/A')}")
+            print(f"   ├─ Host: {ep.get('host', 'N/A')}")
+            print(f"   ├─ Duración: {ep.get('duration', 'N/A')}")
+            print(f"   ├─ Listeners: {ep.get('listeners', 'N/A')}")
+            print(f"   ├─ Tipo: {ep.get('type', 'N/A')}")
             
-            print("-" * 100 + "\n")
-        else:
-            print(f"{i}. URL no encontrado: {url}\n")
+            desc = ep.get('description', 'N/A')
+            if len(desc) > 150:
+                desc = desc[:150] + "..."
+            print(f"   └─ Descripción: {desc}")
+            print()
+        
+        print("-" * 100 + "\n")
     
     print("="*100 + "\n")
 
@@ -0,0 +1,77 @@
+"""
+Template rendering shared by simple_build.py and generate_website.py.
+
+Both generators render through one Jinja environment over website/templates:
+
+    layouts/base.html      <html>/<head>, stylesheet, navbar and footer blocks
+    partials/              navbar, footer, episode cards, partners section
+    simple_build/          listing, spoken table, episode and about pages
+    *.html                 generate_website pages
+
+Compiled templates are cached in shared/cache/jinja (FileSystemBytecodeCache),
+so a build only parses the templates that changed since the last one. Pages
+are streamed to disk instead of being assembled into one string first.
+
+    from site_render import write_page
+
+    write_page(output_dir / 'archive.html', 'simple_build/listing.html',
+               root='', title='Archivo', episodes=episodes)
+"""
+
+import os
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+import instrumentation as instr
+
+BASE_DIR = Path(__file__).parent.parent
+TEMPLATES_DIR = BASE_DIR / 'website' / 'templates'
+BYTECODE_CACHE_DIR = BASE_DIR / 'shared' / 'cache' / 'jinja'
+STREAM_BUFFER = 64  # template chunks per write()
+# Cached bytecode is keyed by template source only; bump when the
+# Environment options below change so stale compilations are not reused
+ENV_VERSION = 2
+
+_env = None
+
+
+def linkify_handle(handle):
+    """'@foo' -> link to x.com/foo; anything else is returned as is"""
+    if not handle:
+        return ""
+    if handle.startswith('@'):
+        clean = handle.replace('@', '')
+        return f'<a href="https://x.com/{clean}" target="_blank" class="handle-link">{handle}</a>'
+    return handle
+
+
+def get_env():
+    """The shared Environment (created on first use)"""
+    global _env
+    if _env is None:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _env = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR)),
+            bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR), f'__site_v{ENV_VERSION}_%s.cache'),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+        )
+        _env.filters['urlencode'] = lambda x: x.replace(' ', '%20')
+        _env.filters['handle_link'] = linkify_handle
+    return _env
+
+
+def render(template, **context):
+    """Render a template to a string"""
+    return get_env().get_template(template).render(**context)
+
+
+def write_page(path, template, **context):
+    """Render a template straight into path; counts pages_rendered and bytes_written"""
+    stream = get_env().get_template(template).stream(**context)
+    stream.enable_buffering(STREAM_BUFFER)
+    with open(path, 'w', encoding='utf-8') as f:
+        stream.dump(f)
+    instr.inc('pages_rendered')
+    instr.inc('bytes_written', os.path.getsize(path))
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from db_io import load_json
 
 # Paths
 SHARED_DIR = Path('shared')
@@ -11,8 +12,7 @@ def sort_database():
         return
 
     try:
-        with open(SPOKEN_DB_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(SPOKEN_DB_PATH)
         
         if 'episodes' not in data:
              print("Error: 'episodes' key not found in database.")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SRT and WebVTT captions for every transcript.
+
+Words are streamed out of transcript_reader and packed into cues. A new
+cue starts when:
+
+- the speaker changes
+- the next word would not fit in MAX_LINES lines of MAX_CHARS characters
+- the cue would last longer than MAX_CUE_SECONDS
+- there is a pause longer than MAX_PAUSE_SECONDS
+
+Deepgram transcripts carry real word timings. Fireflies sentences, Whisper
+segments and TXT blocks only have segment times, so their words are spread
+evenly over the segment (transcript_reader.segment_words). The first cue
+of each speaker turn is labelled ("Speaker 1: ..."). WebVTT cues also get a
+<v Speaker 1> voice tag for players that style voices.
+
+    from subtitles import build_cues, transcript_words, write_captions
+
+    cues = build_cues(transcript_words(open_transcript('1BRKjZoZvpaKw')))
+    write_captions(cues, 'out.srt', 'out.vtt')
+
+The batch build writes shared/subtitles/<id>.srt and <id>.vtt for every
+transcript in a process pool. It is incremental: shared/subtitles/
+manifest.json records each source's sha256 (trusted while its size/mtime
+are unchanged) and the cue parameters, and only new or changed
+transcripts are captioned again.
+
+Usage:
+    python3 scripts/subtitles.py build [--workers 4] [--full]
+    python3 scripts/subtitles.py show 1BRKjZoZvpaKw [--vtt]
+"""
+
+import sys
+import hashlib
+import argparse
+from pathlib import Path
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, save_json, write_atomic
+from transcript_reader import open_path, open_transcript, segment_words, transcript_ids
+import instrumentation as instr
+
+SUBTITLES_DIR = Path('shared/subtitles')
+MANIFEST_PATH = SUBTITLES_DIR / 'manifest.json'
+
+# Bump when cue building or the writers change so every file is rewritten
+SUBTITLES_VERSION = 1
+MAX_CHARS = 42
+MAX_LINES = 2
+MAX_CUE_SECONDS = 6.0
+MIN_CUE_SECONDS = 1.0
+MAX_PAUSE_SECONDS = 1.0
+
+Cue = namedtuple('Cue', 'start end speaker label lines')
+
+
+# --- Cues ---
+
+def words_of(segments):
+    """(word, start, end, speaker) for every word of a segment stream"""
+    for seg in segments:
+        for word, start, end in segment_words(seg):
+            yield word, start, end, seg.speaker
+
+
+def transcript_words(transcript):
+    return words_of(transcript.segments())
+
+
+def wrap(words, max_chars=MAX_CHARS, first_indent=0):
+    """Greedy line wrap; the first line has first_indent characters taken (the label)"""
+    lines, line, width = [], [], first_indent
+    for word in words:
+        if line and width + 1 + len(word) > max_chars:
+            lines.append(' '.join(line))
+            line, width = [], 0
+        width += len(word) + (1 if line else 0)
+        line.append(word)
+    if line:
+        lines.append(' '.join(line))
+    return lines
+
+
+def _pack(words, max_chars, max_lines, max_seconds, max_pause):
+    """Cues of a word stream, before end times are adjusted. The greedy wrap
+    is tracked incrementally (lines used, width of the last line) instead
+    of re-wrapping the cue for every word."""
+    current = []
+    speaker = previous = None
+    label = ''
+    lines = width = 0
+    for word, start, end, who in words:
+        word = word.strip()
+        if not word:
+            continue
+        if current:
+            wraps = width + 1 + len(word) > max_chars
+            if (who != speaker or end - current[0][1] > max_seconds or start - current[-1][2] > max_pause
+                    or (wraps and lines == max_lines)):
+                yield Cue(current[0][1], current[-1][2], speaker, label,
+                          wrap([w for w, _, _ in current], max_chars, len(label)))
+                previous, current = speaker, []
+            elif wraps:
+                lines, width = lines + 1, len(word)
+            else:
+                width += 1 + len(word)
+        if not current:
+            speaker = who
+            label = f"{who}: " if who and who != previous else ''
+            lines, width = 1, len(label) + len(word)
+        current.append((word, start, end))
+    if current:
+        yield Cue(current[0][1], current[-1][2], speaker, label,
+                  wrap([w for w, _, _ in current], max_chars, len(label)))
+
+
+def build_cues(words, max_chars=MAX_CHARS, max_lines=MAX_LINES, max_seconds=MAX_CUE_SECONDS,
+               max_pause=MAX_PAUSE_SECONDS, min_seconds=MIN_CUE_SECONDS):
+    """Stream of Cue from (word, start, end, speaker). Short cues are held on
+    screen for min_seconds, but never past the next cue's start."""
+    pending = None
+    for cue in _pack(words, max_chars, max_lines, max_seconds, max_pause):
+        if pending:
+            end = max(pending.end, min(pending.start + min_seconds, cue.start))
+            yield pending._replace(end=end)
+        pending = cue
+    if pending:
+        yield pending._replace(end=max(pending.end, pending.start + min_seconds))
+
+
+# --- Writers ---
+
+def _timestamp(seconds, separator):
+    millis = int(round(max(seconds, 0) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _text(cue):
+    lines = list(cue.lines)
+    lines[0] = cue.label + lines[0]
+    return lines
+
+
+def to_srt(cues):
+    blocks = []
+    for n, cue in enumerate(cues, 1):
+        blocks.append(f"{n}\n{_timestamp(cue.start, ',')} --> {_timestamp(cue.end, ',')}\n" +
+                      '\n'.join(_text(cue)) + '\n')
+    return '\n'.join(blocks)
+
+
+def to_vtt(cues):
+    blocks = ['WEBVTT\n']
+    for cue in cues:
+        lines = _text(cue)
+        if cue.speaker:
+            lines[0] = f"<v {cue.speaker}>{lines[0]}"
+        blocks.append(f"{_timestamp(cue.start, '.')} --> {_timestamp(cue.end, '.')}\n" + '\n'.join(lines) + '\n')
+    return '\n'.join(blocks)
+
+
+def write_captions(cues, srt_path=None, vtt_path=None):
+    """Write cues as SRT and/or WebVTT; returns the number of cues"""
+    cues = list(cues)
+    if srt_path:
+        write_atomic(srt_path, to_srt(cues).encode('utf-8'))
+    if vtt_path:
+        write_atomic(vtt_path, to_vtt(cues).encode('utf-8'))
+    return len(cues)
+
+
+# --- Batch build ---
+
+def params_key():
+    return f"v{SUBTITLES_VERSION}|{MAX_CHARS}|{MAX_LINES}|{MAX_CUE_SECONDS}|{MIN_CUE_SECONDS}|{MAX_PAUSE_SECONDS}"
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _caption_one(job):
+    transcript_id, source, output_dir = job
+    output_dir = Path(output_dir)
+    count = write_captions(build_cues(transcript_words(open_path(source))),
+                           output_dir / f"{transcript_id}.srt", output_dir / f"{transcript_id}.vtt")
+    return transcript_id, count
+
+
+def build(output_dir=SUBTITLES_DIR, manifest_path=MANIFEST_PATH, workers=None, full=False):
+    output_dir = Path(output_dir)
+    manifest = load_json(manifest_path) if Path(manifest_path).exists() and not full else {}
+    old = manifest.get('files', {}) if manifest.get('params') == params_key() else {}
+
+    files, todo = {}, []
+    for transcript_id in transcript_ids():
+        transcript = open_transcript(transcript_id)
+        if transcript is None:
+            continue
+        st = transcript.path.stat()
+        source = transcript.path.as_posix()
+        entry = old.get(transcript_id)
+        if entry and entry['source'] == source and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            sha = entry['sha256']
+        else:
+            sha = file_hash(transcript.path)
+        files[transcript_id] = {'source': source, 'sha256': sha, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                                'cues': entry['cues'] if entry else 0}
+        written = all((output_dir / f"{transcript_id}{suffix}").exists() for suffix in ('.srt', '.vtt'))
+        if not (entry and entry['sha256'] == sha and entry['source'] == source and written):
+            todo.append((transcript_id, source, str(output_dir)))
+
+    print(f"💬 {len(files)} transcripciones ({len(todo)} por subtitular)")
+    with instr.span('subtitles.build', files=len(todo)):
+        if todo:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for transcript_id, count in pool.map(_caption_one, todo, chunksize=4):
+                    files[transcript_id]['cues'] = count
+                    instr.inc('subtitle_cues', count)
+    instr.inc('subtitles_written', len(todo))
+
+    # Captions of transcripts that no longer exist
+    for transcript_id in set(old) - set(files):
+        for suffix in ('.srt', '.vtt'):
+            (output_dir / f"{transcript_id}{suffix}").unlink(missing_ok=True)
+
+    save_json(manifest_path, {'params': params_key(), 'files': files})
+    print(f"✅ {sum(entry['cues'] for entry in files.values())} cues en {output_dir}")
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SRT/WebVTT captions from transcripts")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help="Caption new and changed transcripts")
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--full', action='store_true', help="Caption every transcript again")
+    p = sub.add_parser('show', help="Print the captions of one transcript")
+    p.add_argument('transcript', help="Transcript ID (space ID) or path to a transcript file")
+    p.add_argument('--vtt', action='store_true', help="WebVTT instead of SRT")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with instr.run('subtitles'):
+            build(workers=args.workers, full=args.full)
+        return
+
+    path = Path(args.transcript)
+    transcript = open_path(path) if path.exists() else open_transcript(args.transcript)
+    if transcript is None:
+        print(f"❌ No se encontró la transcripción {args.transcript}")
+        return
+    cues = list(build_cues(transcript_words(transcript)))
+    print(to_vtt(cues) if args.vtt else to_srt(cues))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,109 +1,53 @@
-import zipfile
-import xml.etree.ElementTree as ET
-import json
+import sys
 import re
+import copy
+from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent))
+
+from xlsx_reader import XlsxReader
+from episode_matcher import EpisodeMatcher, MatchReport
+from episode_schema import canonical_duration, parse_listeners
+from db_io import edit_json
+from merge_databases import log_rewrite
+
 file_path = 'shared/inputs/Cohosted - Spaces Dashboard.xlsx'
 db_path = 'shared/episodes_database.json'
 
-# --- XLSX Parsing Logic (Manual) ---
+# --- XLSX Parsing Logic ---
+
+# A=Host, B=Description, C=Listeners, D=Link, E=Cohost
+COLUMNS = {
+    'A': 'host_raw',
+    'B': 'description_raw',
+    'C': 'listeners',
+    'D': 'space_url_raw',
+    'E': 'cohost_raw',
+}
+LINK_KEYS = {
+    'space_url_raw': 'space_url_link',
+    'host_raw': 'host_link',
+    'description_raw': 'description_link',
+}
+
+def parse_sheet(reader):
+    """Yield one dict per non-empty row, keyed by COLUMNS"""
+    for row in reader.iter_rows(typed=False):
+        row_dict = {}
+        for col, key in COLUMNS.items():
+            cell = row[col]
+            if cell is None:
+                continue
+            row_dict[key] = cell.raw
+            if key in LINK_KEYS and cell.link:
+                row_dict[LINK_KEYS[key]] = cell.link
 
-def parse_shared_strings(zf):
-    strings = []
-    try:
-        with zf.open('xl/sharedStrings.xml') as f:
-            tree = ET.parse(f)
-            root = tree.getroot()
-            ns = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-            for si in root.findall('main:si', ns):
-                text = ""
-                t = si.find('main:t', ns)
-                if t is not None:
-                    text += t.text or ""
-                for r in si.findall('main:r', ns):
-                    t = r.find('main:t', ns)
-                    if t is not None:
-                        text += t.text or ""
-                strings.append(text)
-    except KeyError:
-        pass
-    return strings
-
-def parse_hyperlinks(zf):
-    links = {}
-    try:
-        with zf.open('xl/worksheets/_rels/sheet1.xml.rels') as f:
-            tree = ET.parse(f)
-            root = tree.getroot()
-            ns = {'rel': 'http://schemas.openxmlformats.org/package/2006/relationships'}
-            for rel in root.findall('rel:Relationship', ns):
-                if rel.attrib.get('Type').endswith('/hyperlink'):
-                    links[rel.attrib.get('Id')] = rel.attrib.get('Target')
-    except KeyError:
-        pass
-    return links
-
-def parse_sheet(zf, strings, links_map):
-    rows = []
-    with zf.open('xl/worksheets/sheet1.xml') as f:
-        tree = ET.parse(f)
-        root = tree.getroot()
-        ns = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-        
-        cell_hyperlinks = {}
-        hyperlinks_tag = root.find('main:hyperlinks', ns)
-        if hyperlinks_tag is not None:
-            for hl in hyperlinks_tag.findall('main:hyperlink', ns):
-                ref = hl.attrib.get('ref')
-                rId = hl.attrib.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                if rId in links_map:
-                    cell_hyperlinks[ref] = links_map[rId]
-
-        sheet_data = root.find('main:sheetData', ns)
-        for row in sheet_data.findall('main:row', ns):
-            row_dict = {}
-            for c in row.findall('main:c', ns):
-                ref = c.attrib.get('r')
-                col_letter = "".join(filter(str.isalpha, ref))
-                t = c.attrib.get('t')
-                v = c.find('main:v', ns)
-                val = ""
-                if v is not None:
-                    if t == 's':
-                        val = strings[int(v.text)]
-                    else:
-                        val = v.text
-                
-                link = cell_hyperlinks.get(ref)
-                
-                # Map columns to keys
-                # A=Host, B=Description, C=Listeners, D=Link, E=Cohost
-                key = None
-                if col_letter == 'A': key = 'host_raw'
-                elif col_letter == 'B': key = 'description_raw'
-                elif col_letter == 'C': key = 'listeners'
-                elif col_letter == 'D': key = 'space_url_raw'
-                elif col_letter == 'E': key = 'cohost_raw'
-                
-                if key:
-                    row_dict[key] = val
-                    if key == 'space_url_raw' and link:
-                        row_dict['space_url_link'] = link
-                    if key == 'host_raw' and link:
-                        row_dict['host_link'] = link
-                    if key == 'description_raw' and link:
-                        row_dict['description_link'] = link
-
-            if row_dict:
-                rows.append(row_dict)
-    return rows
+        if row_dict:
+            yield row_dict
 
 # --- Main Sync Logic ---
 
-def normalize_title(t):
-    return re.sub(r'[^a-z0-9]', '', t.lower())
-
 def extract_date(date_str):
     # Format: Nov 3 2025
     try:
@@ -128,13 +72,9 @@ def extract_handle(raw_host, link):
 def sync():
     # 1. Parse Excel
     excel_rows = []
-    with zipfile.ZipFile(file_path, 'r') as zf:
-        strings = parse_shared_strings(zf)
-        links_map = parse_hyperlinks(zf)
-        raw_rows = parse_sheet(zf, strings, links_map)
-        
+    with XlsxReader(file_path) as reader:
         # Skip header rows (first 2 rows usually) and empty rows
-        for r in raw_rows:
+        for r in parse_sheet(reader):
             if not r.get('description_raw'):
                 continue
             if 'Ended:' not in r['description_raw']:
@@ -151,13 +91,9 @@ def sync():
             date_str = extract_date(date_part)
             
             duration_match = re.search(r'Duration: (.*?)$', desc_raw)
-            duration = duration_match.group(1).strip() if duration_match else ""
+            duration = canonical_duration(duration_match.group(1).strip()) if duration_match else ""
             
-            listeners = r.get('listeners', '0')
-            try:
-                listeners = int(float(listeners))
-            except ValueError:
-                listeners = 0
+            listeners = parse_listeners(r.get('listeners')) or 0
             
             space_url = r.get('space_url_link') or ""
             
@@ -177,73 +113,55 @@ def sync():
             
     print(f"Parsed {len(excel_rows)} rows from Excel.")
 
-    # 2. Load DB
-    with open(db_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 2. Load DB and update it under its lock
+    with edit_json(db_path) as data:
+        # Snapshot for the consolidation change log (a new space_url changes a record's key)
+        old_episodes = copy.deepcopy(data.get('episodes', []))
     
-    episodes = data.get('episodes', [])
-    updated_count = 0
+        episodes = data.get('episodes', [])
+        updated_count = 0
     
-    # create map for faster lookup
-    ep_map = {}
-    for ep in episodes:
-        # Use normalized title as key
-        # Also maybe date? 
-        key = normalize_title(ep.get('title', ''))
-        if key:
-            if key not in ep_map:
-                ep_map[key] = []
-            ep_map[key].append(ep)
-
-    # 3. Match and Update
-    for row in excel_rows:
-        key = normalize_title(row['title'])
-        matches = ep_map.get(key)
-        
-        target_ep = None
-        if matches:
-            # If multiple matches, try to match date
-            if len(matches) > 1 and row['date']:
-                for m in matches:
-                    if m.get('date') == row['date']:
-                        target_ep = m
-                        break
-            if not target_ep:
-                target_ep = matches[0]
+        matcher = EpisodeMatcher(episodes)
+        report = MatchReport()
+
+        # 3. Match and Update
+        for row in excel_rows:
+            candidate = matcher.best(row, report=report)
+            target_ep = candidate.record if candidate else None
         
-        if target_ep:
-            # Update fields
-            target_ep['space_url'] = row['space_url']
-            target_ep['listeners'] = row['listeners']
-            target_ep['duration'] = row['duration']
-            target_ep['analytics_source'] = 'spaces_dashboard_excel'
-            if row['spacesdashboard_url']:
-                target_ep['spacesdashboard_url'] = row['spacesdashboard_url']
+            if target_ep:
+                # Update fields
+                target_ep['space_url'] = row['space_url']
+                target_ep['listeners'] = row['listeners']
+                target_ep['duration'] = row['duration']
+                target_ep['analytics_source'] = 'spaces_dashboard_excel'
+                if row['spacesdashboard_url']:
+                    target_ep['spacesdashboard_url'] = row['spacesdashboard_url']
             
-            # Only update host if it's currently BandaWeb3 or empty?
-            # Or if Excel has a better host (not meximalist matching default)
-            # The prompt says "revisa... actualiza la info" so I'll trust the Excel
-            if row['host'] and row['host'] != '@meximalist': 
-                 # Only update host if it's NOT meximalist (since user said co-hosted list)
-                 # Wait, usually Host in Excel A column is the Creator. 
-                 # If Creator is NOT meximalist, then it is a co-hosted space initiated by someone else.
-                 target_ep['host'] = row['host']
+                # Only update host if it's currently BandaWeb3 or empty?
+                # Or if Excel has a better host (not meximalist matching default)
+                # The prompt says "revisa... actualiza la info" so I'll trust the Excel
+                if row['host'] and row['host'] != '@meximalist': 
+                     # Only update host if it's NOT meximalist (since user said co-hosted list)
+                     # Wait, usually Host in Excel A column is the Creator. 
+                     # If Creator is NOT meximalist, then it is a co-hosted space initiated by someone else.
+                     target_ep['host'] = row['host']
             
-            # Ensure type is co-hosted if not already?
-            if target_ep.get('type') != 'co-hosted':
-                 # Maybe user wants us to correct types too?
-                 # "listado de los episodios que type cohosted"
-                 pass 
-
-            updated_count += 1
-            print(f"Updated: {target_ep['title']}")
-        else:
-            print(f"Skipped (No Match): {row['title']} ({row['date']})")
-    
-    # 4. Save
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+                # Ensure type is co-hosted if not already?
+                if target_ep.get('type') != 'co-hosted':
+                     # Maybe user wants us to correct types too?
+                     # "listado de los episodios que type cohosted"
+                     pass 
+
+                updated_count += 1
+                print(f"Updated: {target_ep['title']}")
+            else:
+                print(f"Skipped (No Match): {row['title']} ({row['date']})")
+
+    # 4. Saved on leaving the block; record the changes for merge_databases
+    log_rewrite('episodes', old_episodes, episodes)
 
+    report.print_summary()
     print(f"\nSuccessfully updated {updated_count} episodes.")
 
 if __name__ == '__main__':
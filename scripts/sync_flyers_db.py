@@ -1,7 +1,7 @@
-import json
 import os
 import re
 import argparse
+from db_io import load_json, save_json
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,8 +10,7 @@ FLYERS_DIR = os.path.join(BASE_DIR, 'shared', 'flyers')
 
 def sync_flyers(commit=False):
     print(f"Loading database from {DB_PATH}")
-    with open(DB_PATH, 'r') as f:
-        data = json.load(f)
+    data = load_json(DB_PATH)
 
     episodes = data.get('episodes', [])
     print(f"Found {len(episodes)} episodes.")
@@ -96,8 +95,7 @@ def sync_flyers(commit=False):
         print(f"Total episodes to update: {updated_count}")
         if commit:
             print("Saving changes to database...")
-            with open(DB_PATH, 'w') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            save_json(DB_PATH, data)
             print("Done.")
         else:
             print("Dry run complete. Use --commit to save changes.")
@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 import time
 import subprocess
+from db_io import save_json
 
 # Configuración
 ENV_FILE = Path(".env")
@@ -252,8 +253,7 @@ def main():
             
             # Guardar resultado
             output_path = Path("shared/transcriptions") / f"{TEST_FILE.replace('.mp3', '')}_fireflies.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(transcript, f, indent=2, ensure_ascii=False)
+            save_json(output_path, transcript)
             print(f"\n💾 Transcripción guardada: {output_path}")
             
             # Mostrar muestra
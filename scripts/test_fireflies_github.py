@@ -4,9 +4,9 @@ Script para transcribir con Fireflies usando URLs de GitHub
 """
 import os
 import requests
-import json
 from pathlib import Path
 import time
+from db_io import save_json
 
 # Configuración
 ENV_FILE = Path(".env")
@@ -302,8 +302,7 @@ def main():
             output_dir = Path("shared/transcriptions_fireflies")
             output_dir.mkdir(parents=True, exist_ok=True)
             output_path = output_dir / f"{TEST_FILE.replace('.mp3', '')}_fireflies.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(transcript, f, indent=2, ensure_ascii=False)
+            save_json(output_path, transcript)
             print(f"\n💾 Transcripción guardada: {output_path}")
             
             # Mostrar muestra
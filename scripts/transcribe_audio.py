@@ -7,12 +7,14 @@ Much faster than local Whisper and includes timestamps
 
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 import openai
+from db_io import save_json
+from transcript_reader import whisper_segments
+from subtitles import build_cues, words_of, write_captions
 
 # Load environment variables
 load_dotenv(dotenv_path="../config/.env")
@@ -120,46 +122,23 @@ def save_transcription(result, output_dir, format="all"):
     # Save as JSON (includes timestamps)
     if format in ["json", "all"]:
         json_path = output_dir / "transcription.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        save_json(json_path, result)
         saved_files["json"] = json_path
         print(f"✓ Saved JSON: {json_path}")
 
-    # Save as SRT (subtitle format with timestamps)
+    # Save as SRT and WebVTT (cues bounded by line length and duration)
     if format in ["srt", "all"] and result.get("segments"):
         srt_path = output_dir / "transcription.srt"
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(result["segments"], 1):
-                # SRT format
-                start_time = format_timestamp_srt(segment["start"])
-                end_time = format_timestamp_srt(segment["end"])
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{segment['text'].strip()}\n\n")
+        vtt_path = output_dir / "transcription.vtt"
+        write_captions(build_cues(words_of(whisper_segments(result))), srt_path, vtt_path)
         saved_files["srt"] = srt_path
+        saved_files["vtt"] = vtt_path
         print(f"✓ Saved SRT: {srt_path}")
+        print(f"✓ Saved VTT: {vtt_path}")
 
     return saved_files
 
 
-def format_timestamp_srt(seconds):
-    """
-    Convert seconds to SRT timestamp format (HH:MM:SS,mmm)
-
-    Args:
-        seconds (float): Time in seconds
-
-    Returns:
-        str: Formatted timestamp
-    """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-
 def generate_stats(result):
     """
     Generate statistics about the transcription
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import os
 import requests
-import json
 from pathlib import Path
 from datetime import timedelta
+from db_io import load_json, save_json
+from transcript_reader import deepgram_segments
+import instrumentation as instr
 
 # Configuración
 AUDIO_DIR = Path("shared/audio")
@@ -26,7 +28,6 @@ def load_api_key():
 
 def load_episode_metadata(space_id):
     """Carga metadata del episodio desde la base de datos"""
-    import json
     from pathlib import Path
     
     # Intentar primero con episodes_database.json
@@ -40,8 +41,7 @@ def load_episode_metadata(space_id):
             continue
         
         try:
-            with open(db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(db_path)
             
             # Buscar episodio por space_id en space_url
             episodes = data.get('episodes', [])
@@ -165,12 +165,15 @@ def transcribe_file(filepath, api_key):
     print(f"🚀 Enviando a Deepgram: {filepath.name}...")
     
     try:
-        with open(filepath, 'rb') as audio:
+        with open(filepath, 'rb') as audio, instr.timed_call('deepgram'):
             response = requests.post(url, headers=headers, data=audio)
+        instr.inc('bytes_uploaded', filepath.stat().st_size, api='deepgram')
             
         if response.status_code == 200:
+            instr.inc('bytes_downloaded', len(response.content), api='deepgram')
             return response.json()
         else:
+            instr.inc('api_errors', api='deepgram', status=response.status_code)
             print(f"❌ Error API: {response.status_code} - {response.text}")
             return None
     except Exception as e:
@@ -202,21 +205,17 @@ def generate_formatted_transcript(result, space_id=None):
     
     # Obtener utterances (segmentos por hablante)
     if 'results' in result and 'utterances' in result['results']:
-        utterances = result['results']['utterances']
-        
         # Agrupar utterances consecutivos del mismo hablante
         grouped_utterances = []
         current_group = None
         
-        for utt in utterances:
-            speaker = utt.get('speaker', 0)
-            start = utt.get('start', 0)
-            end = utt.get('end', 0)
-            text = utt.get('transcript', '').strip()
-            confidence = utt.get('confidence', 0)
-            
-            if not text:  # Saltar utterances vacíos
-                continue
+        # deepgram_segments ya salta los utterances vacíos
+        for seg in deepgram_segments(result, words=False):
+            speaker = seg.speaker
+            start = seg.start
+            end = seg.end
+            text = seg.text
+            confidence = seg.confidence or 0
             
             # Si es el mismo hablante, agregar al grupo actual
             if current_group and current_group['speaker'] == speaker:
@@ -308,12 +307,12 @@ def generate_formatted_transcript(result, space_id=None):
                 # Formatear cada chunk
                 for chunk_start, chunk_end, chunk_text in chunks:
                     timestamp = format_timestamp(chunk_start)
-                    formatted_lines.append(f"\n[Speaker {speaker} - {timestamp}]")
+                    formatted_lines.append(f"\n[{speaker} - {timestamp}]")
                     formatted_lines.append(chunk_text)
             else:
                 # Segmento corto, no dividir
                 timestamp = format_timestamp(start)
-                formatted_lines.append(f"\n[Speaker {speaker} - {timestamp}]")
+                formatted_lines.append(f"\n[{speaker} - {timestamp}]")
                 formatted_lines.append(combined_text)
     
     # Si no hay utterances, usar párrafos
@@ -353,19 +352,21 @@ def main():
             
         print(f"\n🎙️  Procesando: {mp3_path.name} (Tamaño: {mp3_path.stat().st_size / (1024*1024):.2f} MB)")
         
-        result = transcribe_file(mp3_path, api_key)
+        with instr.span('transcribe', file=mp3_path.name):
+            result = transcribe_file(mp3_path, api_key)
         
         if result:
             # 1. Guardar JSON completo con toda la metadata
-            with open(json_output_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            save_json(json_output_path, result)
             print(f"   ✅ JSON completo: {json_output_path.name}")
             
             # 2. Guardar transcripción formateada con hablantes
             txt_output_path = TRANSCRIPT_DIR / f"{mp3_path.stem}.txt"
-            formatted_text = generate_formatted_transcript(result, space_id=mp3_path.stem)
+            with instr.span('format', file=mp3_path.name):
+                formatted_text = generate_formatted_transcript(result, space_id=mp3_path.stem)
             with open(txt_output_path, 'w', encoding='utf-8') as f:
                 f.write(formatted_text)
+            instr.inc('transcripts_written')
             print(f"   ✅ Transcripción TXT: {txt_output_path.name}")
             
 
@@ -379,4 +380,5 @@ def main():
     print("\n✨ Proceso completado.")
 
 if __name__ == "__main__":
-    main()
+    with instr.run('transcribe_deepgram'):
+        main()
@@ -8,8 +8,8 @@ sys.path.insert(0, 'scripts')
 
 # Importar funciones del script principal
 from pathlib import Path
-import json
 from transcribe_deepgram import load_api_key, transcribe_file, generate_formatted_transcript
+from db_io import save_json
 
 # Configuración
 AUDIO_DIR = Path("shared/audio")
@@ -39,8 +39,7 @@ def main():
     if result:
         # 1. Guardar JSON completo
         json_output_path = TRANSCRIPT_DIR / f"{mp3_path.stem}.json"
-        with open(json_output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        save_json(json_output_path, result)
         print(f"   ✅ JSON completo: {json_output_path.name}")
         
         # 2. Guardar transcripción formateada
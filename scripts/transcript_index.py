@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Time-range index for transcripts: read 00:42:10-00:44:00 without
+scanning the whole file.
+
+Each transcript gets a sidecar next to its compact cache
+(shared/cache/transcripts/<stem>.<hash>.idx.json) with, per segment:
+
+    starts   segment start times (sorted)
+    ends     segment end times; a TXT block ends where the next one starts
+             and the last one at the "Duración: HH:MM:SS" of the header
+             (None, open-ended, when the header has no duration)
+    offsets  byte offset of the segment in the body file: the TXT itself
+             ("[Speaker 0 - 00:01:06]" line), or the compact JSONL cache
+             of a JSON source (see transcript_reader)
+    words    Deepgram utterances only: position of the segment's first
+             word in results.channels[0].alternatives[0].words (None for
+             sources whose segments carry no word timings, e.g. Deepgram
+             files without utterances)
+
+A range lookup is two binary searches over starts, then one seek and one
+read of exactly the bytes between the first and last matching segment.
+The sidecar is rebuilt when the source's size/mtime changes.
+
+    from transcript_index import text_between
+
+    text_between(open_transcript('1BRKjZoZvpaKw'), '00:42:10', '00:44:00')
+
+Usage:
+    python3 scripts/transcript_index.py show 1BRKjZoZvpaKw 00:42:10 00:44:00
+    python3 scripts/transcript_index.py show 1BRKjZoZvpaKw 2530 2640 --words
+    python3 scripts/transcript_index.py build [--workers 4]
+"""
+
+import re
+import sys
+import json
+import argparse
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import write_atomic
+from transcript_reader import (CACHE_VERSION, block_header, cache_segment, format_timestamp, open_path,
+                               open_transcript, segment_words, transcript_ids, txt_segments)
+import instrumentation as instr
+
+INDEX_VERSION = 3
+
+_TIME = re.compile(r'^(?:(\d+):)?(\d+):(\d\d(?:\.\d+)?)$')
+# TXT header line with the episode length (Fireflies TXT "segundos" values are not reliable)
+_DURATION = re.compile(r'^Duración:\s*(\d+):(\d\d):(\d\d)\s*$')
+
+
+def parse_time(value):
+    """Seconds of "HH:MM:SS", "MM:SS" or a number of seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _TIME.match(value.strip())
+    if m:
+        return int(m.group(1) or 0) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+    return float(value)
+
+
+def index_path(transcript):
+    return transcript.cache_path().with_suffix('.idx.json')
+
+
+def _stamp(transcript):
+    st = transcript.path.stat()
+    return {"v": INDEX_VERSION, "cache": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def build_index(transcript):
+    """Sidecar index of a transcript (also writes it)"""
+    body = transcript.body_path()   # also sets transcript.source
+    starts, ends, offsets, words = [], [], [], []
+    offset = 0
+    with open(body, 'rb') as f:
+        if body.suffix == '.txt':
+            duration = None
+            for line in f:
+                text = line.decode('utf-8', errors='ignore')
+                block = block_header(text)
+                if block:
+                    starts.append(block[1])
+                    offsets.append(offset)
+                elif not starts:
+                    m = _DURATION.match(text)
+                    if m:
+                        duration = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3))
+                offset += len(line)
+            # A TXT block lasts until the next one starts, the last one until the end of the episode
+            ends = starts[1:] + ([max(starts[-1], duration) if duration is not None else None] if starts else [])
+        else:
+            offset = len(f.readline())   # cache header
+            position = 0
+            timed = False
+            for line in f:
+                seg = cache_segment(line)
+                starts.append(seg.start)
+                ends.append(seg.end)
+                offsets.append(offset)
+                words.append(position)
+                position += len(seg.words or ())
+                timed = timed or bool(seg.words)
+                offset += len(line)
+
+    index = {**_stamp(transcript), "source": transcript.source, "body_size": offset,
+             "starts": starts, "ends": ends, "offsets": offsets,
+             # Utterance words are the channel's words array, in order
+             "words": words if transcript.source == 'deepgram' and timed else None}
+    write_atomic(index_path(transcript), json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    instr.inc('transcript_indexes_built')
+    return index
+
+
+def load_index(transcript):
+    """The transcript's sidecar index, rebuilt if missing or stale"""
+    path = index_path(transcript)
+    if path.exists():
+        index = json.loads(path.read_bytes())
+        if all(index.get(k) == v for k, v in _stamp(transcript).items()):
+            transcript.source = index['source']
+            return index
+    return build_index(transcript)
+
+
+def segment_range(index, start, end):
+    """[i, j): segments that overlap start..end (seconds); an end of None is open"""
+    starts, ends = index['starts'], index['ends']
+    i = bisect_right(starts, start) - 1
+    if i < 0 or (ends[i] is not None and ends[i] < start):
+        i += 1
+    return i, max(i, bisect_left(starts, end))
+
+
+def segments_between(transcript, start, end, index=None):
+    """Segments overlapping start..end ("HH:MM:SS" or seconds), reading only their bytes"""
+    start, end = parse_time(start), parse_time(end)
+    index = index or load_index(transcript)
+    i, j = segment_range(index, start, end)
+    if i >= j:
+        return []
+
+    offsets = index['offsets']
+    lo = offsets[i]
+    hi = offsets[j] if j < len(offsets) else index['body_size']
+    with open(transcript.body_path(), 'rb') as f:
+        f.seek(lo)
+        lines = f.read(hi - lo).decode('utf-8', errors='ignore').splitlines()
+    instr.inc('transcript_bytes_read', hi - lo)
+
+    if index['source'] == 'txt':
+        segments = list(txt_segments(lines))
+        # The chunk's last block ends where the next (unread) one starts; an
+        # open-ended last block is cut at the end of the range
+        last = segments[-1]
+        last_end = index['ends'][j - 1]
+        return segments[:-1] + [last._replace(end=last_end if last_end is not None else max(last.start, end))]
+    return [cache_segment(line) for line in lines if line]
+
+
+def words_between(transcript, start, end, index=None):
+    """(position, word, start, end) of the words inside start..end.
+    position indexes the Deepgram channel words array, or is None."""
+    start, end = parse_time(start), parse_time(end)
+    index = index or load_index(transcript)
+    i, _ = segment_range(index, start, end)
+    positions = index.get('words')
+    result = []
+    for k, seg in enumerate(segments_between(transcript, start, end, index), i):
+        for n, (word, w_start, w_end) in enumerate(segment_words(seg)):
+            if w_end > start and w_start < end:
+                result.append((positions[k] + n if positions else None, word, w_start, w_end))
+    return result
+
+
+def text_between(transcript, start, end, index=None):
+    return ' '.join(word for _, word, _, _ in words_between(transcript, start, end, index))
+
+
+def _build_one(transcript_id):
+    transcript = open_transcript(transcript_id)
+    if transcript is None:
+        return 0
+    return len(load_index(transcript)['starts'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-range index of transcripts")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('show', help="Print the text of a time range")
+    p.add_argument('transcript', help="Transcript ID (space ID) or path to a transcript file")
+    p.add_argument('start', help="HH:MM:SS or seconds")
+    p.add_argument('end', help="HH:MM:SS or seconds")
+    p.add_argument('--words', action='store_true', help="One word per line with its timing")
+    p = sub.add_parser('build', help="Build or refresh the index of every transcript")
+    p.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        ids = transcript_ids()
+        with instr.run('transcript_index'), ProcessPoolExecutor(max_workers=args.workers) as pool:
+            segments = sum(pool.map(_build_one, ids, chunksize=8))
+        print(f"✅ {len(ids)} transcripciones indexadas ({segments} segmentos)")
+        return
+
+    path = Path(args.transcript)
+    transcript = open_path(path) if path.exists() else open_transcript(args.transcript)
+    if transcript is None:
+        print(f"❌ No se encontró la transcripción {args.transcript}")
+        return
+
+    if args.words:
+        for position, word, start, end in words_between(transcript, args.start, args.end):
+            print(f"{'' if position is None else position:>7}  {start:9.2f} {end:9.2f}  {word}")
+        return
+    for seg in segments_between(transcript, args.start, args.end):
+        print(f"[{seg.speaker or '?'} - {format_timestamp(seg.start)}]\n{seg.text}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+One reader for every transcript shape in the repo.
+
+    from transcript_reader import open_transcript
+
+    transcript = open_transcript('1BRKjZoZvpaKw')      # space ID / transcript_id
+    for seg in transcript.segments():                   # lazy
+        print(seg.speaker, seg.start, seg.end, seg.text, seg.confidence)
+
+Sources, in order of preference for a transcript ID:
+
+    shared/transcriptions/<id>.json                     Deepgram (results.utterances, else channels paragraphs)
+    shared/transcriptions_fireflies/<id>_fireflies.json Fireflies (sentences; upload receipts are skipped)
+    shared/transcriptions/<id>.txt                      formatted TXT ("[Speaker 0 - 00:01:06]" blocks)
+    shared/transcriptions_fireflies/<id>_fireflies.txt  formatted TXT ("[Name - 294.3s]" blocks)
+
+open_path() also reads Whisper output (transcribe_audio.py: "segments")
+and plain TXT, and open_episode_dir() reads an episode folder's
+transcripts/transcription.json|txt.
+
+Every source yields Segment(speaker, start, end, text, confidence, words).
+Times are in seconds. confidence is None when the source has none.
+words holds [(word, start, end), ...] when the source has word timings
+(Deepgram), else None.
+
+JSON sources are parsed once and cached as compact JSONL in
+shared/cache/transcripts/. The cache keeps one segment per line and
+drops Deepgram's per-word metadata, and it is invalidated by the source's
+size/mtime. Later reads stream the cache line by line instead of loading
+the full JSON (the Deepgram files run to several MB each).
+
+Usage:
+    python3 scripts/transcript_reader.py 1BRKjZoZvpaKw            # print segments
+    python3 scripts/transcript_reader.py path/to/file.json --text
+"""
+
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from collections import namedtuple
+
+sys.path.append(str(Path(__file__).parent))
+from db_io import load_json, write_atomic
+
+TRANSCRIPTS_DIR = Path('shared/transcriptions')
+FIREFLIES_DIR = Path('shared/transcriptions_fireflies')
+CACHE_DIR = Path('shared/cache/transcripts')
+CACHE_VERSION = 2
+
+Segment = namedtuple('Segment', 'speaker start end text confidence words')
+
+# "[Speaker 0 - 00:01:06]" (Deepgram TXT) or "[Mexi BandaWeb3 - 294.3s]" (Fireflies TXT)
+_BLOCK = re.compile(r'^\[(.+?) - (?:(\d+):(\d\d):(\d\d)|([\d.]+)s)\]\s*$')
+
+
+# --- Parsers: raw source -> Segment iterator ---
+
+def deepgram_segments(result, words=True):
+    """Segments of a Deepgram response: utterances, else paragraph sentences.
+    words=False skips the per-word timings (formatters do not need them)."""
+    results = result.get('results', {})
+    utterances = results.get('utterances')
+    if utterances:
+        for utt in utterances:
+            text = (utt.get('transcript') or '').strip()
+            if not text:
+                continue
+            timings = [(w.get('punctuated_word') or w.get('word', ''), w.get('start', 0), w.get('end', 0))
+                       for w in utt.get('words') or []] if words else None
+            yield Segment(f"Speaker {utt.get('speaker', 0)}", utt.get('start', 0), utt.get('end', 0),
+                          text, utt.get('confidence'), timings or None)
+        return
+
+    channels = results.get('channels') or []
+    alternatives = channels[0].get('alternatives') if channels else None
+    if not alternatives:
+        return
+    alt = alternatives[0]
+    paragraphs = (alt.get('paragraphs') or {}).get('paragraphs') or []
+    for para in paragraphs:
+        speaker = f"Speaker {para.get('speaker', 0)}"
+        for sentence in para.get('sentences') or []:
+            yield Segment(speaker, sentence.get('start', 0), sentence.get('end', 0),
+                          sentence.get('text', '').strip(), None, None)
+    if not paragraphs and alt.get('transcript'):
+        all_words = alt.get('words') or []
+        end = all_words[-1].get('end', 0) if all_words else 0
+        yield Segment(None, 0, end, alt['transcript'], alt.get('confidence'), None)
+
+
+def fireflies_segments(data):
+    """Segments of a Fireflies transcript (sentences). Some exports have no
+    end_time; those sentences end where the next one starts."""
+    sentences = data.get('sentences') or []
+    for n, sentence in enumerate(sentences):
+        speaker = sentence.get('speaker_name') or f"Speaker {sentence.get('speaker_id', 'N/A')}"
+        start = sentence.get('start_time', 0) or 0
+        end = sentence.get('end_time', 0) or 0
+        if end < start:
+            end = max(start, sentences[n + 1].get('start_time', 0) or 0) if n + 1 < len(sentences) else start
+        yield Segment(speaker, start, end, sentence.get('text', ''), None, None)
+
+
+def whisper_segments(data):
+    """Segments of a Whisper result (transcribe_audio.py); no speakers"""
+    segments = data.get('segments') or []
+    if not segments and data.get('text'):
+        yield Segment(None, 0, data.get('duration') or 0, data['text'], None, None)
+    for seg in segments:
+        yield Segment(None, seg.get('start', 0), seg.get('end', 0), (seg.get('text') or '').strip(), None, None)
+
+
+def txt_segments(lines):
+    """
+    Segments of a formatted TXT: one per "[speaker - time]" block, text up
+    to the next block. The metadata header before the first block is
+    skipped. A TXT without blocks is one untimed segment. Block ends are
+    the next block's start (the last block ends where it starts).
+    """
+    pending = None
+    body = []
+    plain = []
+    for line in lines:
+        block = block_header(line)
+        if block:
+            speaker, start = block
+            if pending:
+                yield pending._replace(end=start, text=' '.join(body))
+            pending = Segment(speaker, start, start, '', None, None)
+            body = []
+        elif pending:
+            if line.strip():
+                body.append(line.strip())
+        elif line.strip():
+            plain.append(line.strip())
+    if pending:
+        yield pending._replace(text=' '.join(body))
+    elif plain:
+        yield Segment(None, 0, 0, ' '.join(plain), None, None)
+
+
+def block_header(line):
+    """(speaker, start seconds) of a TXT block header line, else None"""
+    m = _BLOCK.match(line)
+    if not m:
+        return None
+    if m.group(5) is not None:
+        return m.group(1), float(m.group(5))
+    return m.group(1), int(m.group(2)) * 3600 + int(m.group(3)) * 60 + int(m.group(4))
+
+
+def cache_segment(line):
+    """Segment of one line of the compact cache"""
+    speaker, start, end, text, confidence, words = json.loads(line)
+    return Segment(speaker, start, end, text, confidence, [tuple(w) for w in words] if words else None)
+
+
+def segment_words(seg):
+    """(word, start, end) of a segment; without word timings the span is split evenly"""
+    if seg.words:
+        return seg.words
+    parts = seg.text.split()
+    step = (seg.end - seg.start) / len(parts) if parts and seg.end > seg.start else 0
+    return [(word, seg.start + i * step, seg.start + (i + 1) * step) for i, word in enumerate(parts)]
+
+
+def detect(data):
+    """Source kind of a parsed transcript JSON, or None (e.g. a Fireflies upload receipt)"""
+    if not isinstance(data, dict):
+        return None
+    if 'results' in data:
+        return 'deepgram'
+    if 'sentences' in data:
+        return 'fireflies'
+    if 'segments' in data or 'text' in data:
+        return 'whisper'
+    return None
+
+
+PARSERS = {
+    'deepgram': deepgram_segments,
+    'fireflies': fireflies_segments,
+    'whisper': whisper_segments,
+}
+
+
+# --- Transcript ---
+
+class Transcript:
+    """A transcript file; segments() streams from the compact cache for JSON sources"""
+
+    __slots__ = ('path', 'source')
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.source = None   # known after the first read (see probe)
+
+    def __repr__(self):
+        return f"Transcript({str(self.path)!r}, {self.source!r})"
+
+    def segments(self):
+        if self.path.suffix == '.txt':
+            self.source = 'txt'
+            with open(self.path, encoding='utf-8', errors='ignore') as f:
+                yield from txt_segments(f)
+            return
+        yield from self._cached_segments()
+
+    def body_path(self):
+        """File the segments are read from: the TXT itself, else the (fresh) compact cache"""
+        self.probe()
+        return self.path if self.path.suffix == '.txt' else self.cache_path()
+
+    def probe(self):
+        """Source kind, or None if the file holds no transcript"""
+        if self.path.suffix == '.txt':
+            self.source = 'txt'
+            return self.source
+        for _ in self._cached_segments():
+            break
+        return self.source
+
+    def text(self):
+        return ' '.join(seg.text for seg in self.segments() if seg.text)
+
+    def words(self):
+        """(word, start, end) for every word; segments without word timings are split evenly"""
+        for seg in self.segments():
+            yield from segment_words(seg)
+
+    # Compact cache: header line, then one JSON array per segment
+
+    def cache_path(self):
+        digest = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()[:16]
+        return CACHE_DIR / f"{self.path.stem}.{digest}.jsonl"
+
+    def _cached_segments(self):
+        st = self.path.stat()
+        stamp = {"v": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        cache = self.cache_path()
+        try:
+            f = open(cache, encoding='utf-8')
+        except FileNotFoundError:
+            f = None
+        if f is not None:
+            with f:
+                header = json.loads(f.readline() or 'null')
+                if header and all(header.get(k) == v for k, v in stamp.items()):
+                    self.source = header.get('source')
+                    for line in f:
+                        yield cache_segment(line)
+                    return
+
+        data = load_json(self.path)
+        self.source = detect(data)
+        segments = list(PARSERS[self.source](data)) if self.source else []
+        del data
+        lines = [json.dumps({**stamp, "source": self.source})]
+        lines.extend(json.dumps(list(seg), ensure_ascii=False, separators=(',', ':')) for seg in segments)
+        write_atomic(cache, ('\n'.join(lines) + '\n').encode('utf-8'))
+        yield from segments
+
+
+def sources(transcript_id):
+    """Candidate files for a transcript ID, preferred first"""
+    return [
+        TRANSCRIPTS_DIR / f"{transcript_id}.json",
+        FIREFLIES_DIR / f"{transcript_id}_fireflies.json",
+        TRANSCRIPTS_DIR / f"{transcript_id}.txt",
+        FIREFLIES_DIR / f"{transcript_id}_fireflies.txt",
+    ]
+
+
+def transcript_ids():
+    """IDs of every transcript in shared/transcriptions and shared/transcriptions_fireflies"""
+    ids = set()
+    for pattern in ('*.json', '*.txt'):
+        ids.update(p.stem for p in TRANSCRIPTS_DIR.glob(pattern))
+        ids.update(p.stem[:-len('_fireflies')] for p in FIREFLIES_DIR.glob(f'*_fireflies{pattern[1:]}'))
+    return sorted(ids)
+
+
+def open_transcript(transcript_id):
+    """Best available transcript for a space ID / episode transcript_id, or None"""
+    for path in sources(transcript_id):
+        if path.exists():
+            transcript = Transcript(path)
+            if transcript.probe():
+                return transcript
+    return None
+
+
+def open_path(path):
+    return Transcript(path)
+
+
+def open_episode_dir(episode_dir):
+    """transcripts/transcription.json (Whisper) or .txt of an episode folder, or None"""
+    transcripts_dir = Path(episode_dir) / "transcripts"
+    for name in ("transcription.json", "transcription.txt"):
+        path = transcripts_dir / name
+        if path.exists():
+            return Transcript(path)
+    return None
+
+
+def format_timestamp(seconds):
+    h, rem = divmod(int(seconds), 3600)
+    return f"{h:02d}:{rem // 60:02d}:{rem % 60:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a transcript through the unified reader")
+    parser.add_argument('transcript', help="Transcript ID (space ID) or path to a transcript file")
+    parser.add_argument('--text', action='store_true', help="Plain text only")
+    args = parser.parse_args()
+
+    path = Path(args.transcript)
+    transcript = open_path(path) if path.exists() else open_transcript(args.transcript)
+    if transcript is None:
+        print(f"❌ No se encontró la transcripción {args.transcript}")
+        return
+
+    if args.text:
+        print(transcript.text())
+        return
+    count = 0
+    for seg in transcript.segments():
+        count += 1
+        conf = f" ({seg.confidence:.2f})" if seg.confidence is not None else ""
+        print(f"[{format_timestamp(seg.start)} - {format_timestamp(seg.end)}] {seg.speaker or '?'}{conf}: {seg.text}")
+    print(f"\n{count} segmentos ({transcript.source}: {transcript.path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,11 @@
 """
 Script to update all episodes with host @meximalist or BandaWeb3 to have type: "hosted"
 """
-import json
+from db_io import load_json, save_json
 
 def update_hosted_types():
     # Load the database
-    with open('shared/episodes_database.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json('shared/episodes_database.json')
     
     episodes = data.get('episodes', [])
     updated_count = 0
@@ -24,8 +23,7 @@ def update_hosted_types():
                 print(f"Updated episode: {episode.get('title', 'Unknown')} - Old type: '{current_type}' -> New type: 'hosted'")
     
     # Save the updated database
-    with open('shared/episodes_database.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_json('shared/episodes_database.json', data)
     
     print(f"\n✅ Total episodes updated: {updated_count}")
     
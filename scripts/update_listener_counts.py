@@ -1,11 +1,11 @@
 import json
 import re
 from pathlib import Path
+from db_io import load_json
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
         
     # Create lookup map for episodes: normalized title -> episode object
     # AND title -> episode object
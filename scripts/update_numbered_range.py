@@ -2,12 +2,11 @@
 """
 Update episodes with number between 0 and 74 to have is_numbered=true
 """
-import json
+from db_io import load_json, save_json
 
 def update_numbered_range():
     path = 'shared/episodes_database.json'
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(path)
     
     episodes = data.get('episodes', [])
     count = 0
@@ -39,8 +38,7 @@ def update_numbered_range():
         except ValueError:
             continue
             
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_json(path, data)
         
     print(f"\nSuccessfully updated {count} new numbered episodes.")
 
@@ -1,138 +1,265 @@
-import json
+import sys
 from pathlib import Path
-import re
+from datetime import datetime
+import statistics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(str(Path(__file__).parent))
+from merge_databases import merge_key, log_changes
+from episode_schema import parse_duration, parse_listeners, parse_date
+from db_io import load_json, save_json, file_lock
 
 SHARED_DIR = Path('shared')
 EPISODES_DB_PATH = SHARED_DIR / 'episodes_database.json'
+SPOKEN_DB_PATH = SHARED_DIR / 'spoken_database.json'
+STATE_PATH = SHARED_DIR / 'cache' / 'stats_state.json'
+
+PERCENTILES = (25, 50, 75, 90, 99)
+TOP_HOSTS = 10
+
+# Stats keys that don't describe the data itself
+VOLATILE_KEYS = ('last_updated',)
+
+def parse_duration_to_seconds(duration_str):
+    """Seconds in a stored duration (see episode_schema.parse_duration); 0 when unknown"""
+    return parse_duration(duration_str) or 0
 
 def parse_duration_to_minutes(duration_str):
-    if not duration_str:
-        return 0
-    
-    # Handle HH:MM:SS or MM:SS
-    parts = duration_str.split(':')
-    if len(parts) == 3: # HH:MM:SS
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = int(parts[2])
-        return hours * 60 + minutes + (seconds / 60)
-    elif len(parts) == 2: # MM:SS
-        minutes = int(parts[0])
-        seconds = int(parts[1])
-        return minutes + (seconds / 60)
+    return parse_duration_to_seconds(duration_str) / 60
+
+def raw_fields(ep):
+    """The fields stats depend on, as stored in the DB"""
+    return [ep.get('duration', ''), ep.get('listeners'), ep.get('type', 'unknown'),
+            ep.get('host') or 'unknown', ep.get('date') or '']
+
+def contribution(raw):
+    """Parsed contribution of one record: [seconds, listeners, type, host, month]"""
+    duration, listeners, ep_type, host, date = raw
+    day = parse_date(date)
+    return [parse_duration_to_seconds(duration), parse_listeners(listeners), ep_type, host,
+            day.isoformat()[:7] if day else '']
+
+
+class StatsAggregator:
+    """Running totals over a DB's records, updated by adding/removing contributions"""
+
+    def __init__(self, values=None):
+        values = values or {}
+        self.total_episodes = values.get('total_episodes', 0)
+        self.total_seconds = values.get('total_seconds', 0)
+        self.total_listeners = values.get('total_listeners', 0)
+        self.listeners_count = values.get('listeners_count', 0)
+        self.by_type = dict(values.get('by_type', {}))
+        self.by_host = dict(values.get('by_host', {}))
+        # month -> [episodes, seconds, listeners]
+        self.by_month = {m: list(v) for m, v in values.get('by_month', {}).items()}
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        counter[key] = counter.get(key, 0) + delta
+        if not counter[key]:
+            del counter[key]
+
+    def add(self, c, sign=1):
+        seconds, listeners, ep_type, host, month = c
+        self.total_episodes += sign
+        self.total_seconds += sign * seconds
+        if listeners is not None:
+            self.total_listeners += sign * listeners
+            self.listeners_count += sign
+        self._bump(self.by_type, ep_type, sign)
+        self._bump(self.by_host, host, sign)
+        if month:
+            row = self.by_month.setdefault(month, [0, 0, 0])
+            row[0] += sign
+            row[1] += sign * seconds
+            row[2] += sign * (listeners or 0)
+            if not row[0]:
+                del self.by_month[month]
+
+    def remove(self, c):
+        self.add(c, sign=-1)
+
+    def to_dict(self):
+        return {
+            'total_episodes': self.total_episodes,
+            'total_seconds': self.total_seconds,
+            'total_listeners': self.total_listeners,
+            'listeners_count': self.listeners_count,
+            'by_type': self.by_type,
+            'by_host': self.by_host,
+            'by_month': self.by_month,
+        }
+
+    def stats(self, with_types=True):
+        total_minutes = self.total_seconds / 60
+        avg_duration_minutes = total_minutes / self.total_episodes if self.total_episodes > 0 else 0
+        avg_listeners = self.total_listeners / self.listeners_count if self.listeners_count > 0 else 0
+
+        stats = {
+            "total_episodes": self.total_episodes,
+            "total_duration_hours": round(total_minutes / 60, 2),
+            "average_duration_minutes": round(avg_duration_minutes, 1),
+            "total_listeners": self.total_listeners,
+            "average_listeners": round(avg_listeners, 1),
+            "episodes_with_listener_data": self.listeners_count,
+        }
+        if with_types:
+            stats["breakdown_by_type"] = dict(sorted(self.by_type.items(), key=lambda x: (-x[1], x[0])))
+        stats["top_hosts"] = dict(sorted(self.by_host.items(), key=lambda x: (-x[1], x[0]))[:TOP_HOSTS])
+        stats["by_month"] = {
+            month: {"episodes": row[0], "hours": round(row[1] / 3600, 2), "listeners": row[2]}
+            for month, row in sorted(self.by_month.items())
+        }
+        return stats
+
+
+def rollups(contributions):
+    """
+    Listener percentiles and hours per year over all contributions, in one
+    vectorized pass (numpy when available, statistics module otherwise)
+    """
+    listeners = [c[1] for c in contributions if c[1] is not None]
+    dated = [(c[4][:4], c[0]) for c in contributions if c[4]]
+
+    if np is not None:
+        if listeners:
+            values = np.percentile(np.asarray(listeners, dtype=float), PERCENTILES)
+            percentiles = {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, values)}
+        else:
+            percentiles = {}
+        if dated:
+            years, inverse = np.unique(np.asarray([y for y, _ in dated]), return_inverse=True)
+            seconds = np.bincount(inverse, weights=np.asarray([s for _, s in dated], dtype=float))
+            hours_by_year = {str(y): round(float(s) / 3600, 2) for y, s in zip(years, seconds)}
+        else:
+            hours_by_year = {}
     else:
-        return 0
+        percentiles = {}
+        if len(listeners) > 1:
+            cuts = statistics.quantiles(listeners, n=100, method='inclusive')
+            percentiles = {f"p{p}": round(cuts[p - 1], 1) for p in PERCENTILES}
+        elif listeners:
+            percentiles = {f"p{p}": float(listeners[0]) for p in PERCENTILES}
+        totals = {}
+        for year, seconds in dated:
+            totals[year] = totals.get(year, 0) + seconds
+        hours_by_year = {y: round(s / 3600, 2) for y, s in sorted(totals.items())}
+
+    return {"listeners_percentiles": percentiles, "hours_by_year": hours_by_year}
 
-def update_stats():
+
+def record_keys(episodes):
+    """Stable key per record; repeated keys get an occurrence suffix"""
+    seen = {}
+    for ep in episodes:
+        key = merge_key(ep)
+        seen[key] = seen.get(key, 0) + 1
+        yield key if seen[key] == 1 else f"{key}#{seen[key]}"
+
+
+def refresh_stats(data, state, with_types=True, full=False):
+    """
+    Bring data['stats'] up to date from per-record deltas.
+
+    state holds the raw fields, parsed contribution and running aggregates of
+    the last run; only records whose fields changed are re-parsed. With
+    full=True everything is re-parsed. Returns True if data['stats'] changed.
+    """
+    episodes = data.get('episodes', [])
+    if full or not state:
+        state = {'records': {}, 'aggregates': {}}
+    records = state['records']
+    agg = StatsAggregator(state['aggregates'])
+
+    seen = set()
+    deltas = 0
+    for key, ep in zip(record_keys(episodes), episodes):
+        seen.add(key)
+        raw = raw_fields(ep)
+        cached = records.get(key)
+        if cached is not None and cached['raw'] == raw:
+            continue
+        if cached is not None:
+            agg.remove(cached['c'])
+        c = contribution(raw)
+        agg.add(c)
+        records[key] = {'raw': raw, 'c': c}
+        deltas += 1
+
+    for key in [k for k in records if k not in seen]:
+        agg.remove(records.pop(key)['c'])
+        deltas += 1
+
+    state['aggregates'] = agg.to_dict()
+
+    old_stats = data.get('stats') or {}
+    stats = agg.stats(with_types=with_types)
+    if deltas or full or 'listeners_percentiles' not in old_stats:
+        stats.update(rollups([r['c'] for r in records.values()]))
+    else:
+        stats["listeners_percentiles"] = old_stats.get("listeners_percentiles", {})
+        stats["hours_by_year"] = old_stats.get("hours_by_year", {})
+
+    comparable = lambda s: {k: v for k, v in s.items() if k not in VOLATILE_KEYS}
+    changed = comparable(stats) != comparable(old_stats)
+    if changed:
+        stats["last_updated"] = datetime.now().isoformat()
+        data['stats'] = stats
+    return changed, state
+
+
+def load_state():
+    if STATE_PATH.exists():
+        try:
+            return load_json(STATE_PATH)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_state(state):
+    save_json(STATE_PATH, state, indent=None)
+
+def update_stats(full=False):
+    """
+    Refresh the 'stats' block of both databases.
+
+    Each DB file is rewritten only when its stats actually changed, so a
+    build with no data changes leaves the files untouched.
+    """
     if not EPISODES_DB_PATH.exists():
         print("Error: Episodes database not found.")
         return
 
-    with open(EPISODES_DB_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    state = load_state()
 
-    episodes = data.get('episodes', [])
-    
-    total_episodes = len(episodes)
-    total_duration_minutes = 0
-    total_listeners = 0
-    listeners_count = 0 # Count of episodes that actually have listener data
-    
-    type_counts = {}
+    for name, path, with_types in (('episodes', EPISODES_DB_PATH, True),
+                                   ('spoken', SPOKEN_DB_PATH, False)):
+        label = name.capitalize()
+        if not path.exists():
+            print(f"{label} database not found, skipping.")
+            continue
 
-    for ep in episodes:
-        # Duration
-        dur_str = ep.get('duration', '')
-        total_duration_minutes += parse_duration_to_minutes(dur_str)
+        # Held across read-modify-write so a concurrent sync's edits aren't lost
+        with file_lock(path):
+            data = load_json(path)
+            changed, state[name] = refresh_stats(data, state.get(name), with_types=with_types, full=full)
+            if changed:
+                save_json(path, data)
+                # Only the stats block changed: record the new stamp so the next
+                # consolidation doesn't rescan the episodes
+                log_changes(name, path=path)
 
-        # Listeners
-        listeners = ep.get('listeners')
-        if listeners is not None:
-             # Ensure it's a number
-             try:
-                 l_val = int(listeners)
-                 total_listeners += l_val
-                 listeners_count += 1
-             except (ValueError, TypeError):
-                 pass
-
-        # Type breakdown
-        ep_type = ep.get('type', 'unknown')
-        type_counts[ep_type] = type_counts.get(ep_type, 0) + 1
-
-    # Calculate averages
-    avg_duration_minutes = total_duration_minutes / total_episodes if total_episodes > 0 else 0
-    avg_listeners = total_listeners / listeners_count if listeners_count > 0 else 0
-
-    stats = {
-        "total_episodes": total_episodes,
-        "total_duration_hours": round(total_duration_minutes / 60, 2),
-        "average_duration_minutes": round(avg_duration_minutes, 1),
-        "total_listeners": total_listeners,
-        "average_listeners": round(avg_listeners, 1),
-        "episodes_with_listener_data": listeners_count,
-        "breakdown_by_type": type_counts,
-        "last_updated": "2025-12-07" # In a real automated system this would be dynamic, but for now fixed or datetime.now()
-    }
-
-    # Add timestamp
-    from datetime import datetime
-    stats["last_updated"] = datetime.now().isoformat()
-
-    data['stats'] = stats
-
-    with open(EPISODES_DB_PATH, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        
-    print("Episodes stats updated.")
-
-    # Update Spoken Database
-    SPOKEN_DB_PATH = SHARED_DIR / 'spoken_database.json'
-    if SPOKEN_DB_PATH.exists():
-        with open(SPOKEN_DB_PATH, 'r', encoding='utf-8') as f:
-            spoken_data = json.load(f)
-        
-        spoken_eps = spoken_data.get('episodes', [])
-        
-        s_total = len(spoken_eps)
-        s_duration = 0
-        s_listeners = 0
-        s_listeners_count = 0
-        
-        for ep in spoken_eps:
-            s_duration += parse_duration_to_minutes(ep.get('duration', ''))
-            
-            l = ep.get('listeners')
-            if l is not None:
-                try:
-                    lv = int(l)
-                    s_listeners += lv
-                    s_listeners_count += 1
-                except:
-                    pass
-        
-        s_avg_dur = s_duration / s_total if s_total > 0 else 0
-        s_avg_lis = s_listeners / s_listeners_count if s_listeners_count > 0 else 0
-        
-        spoken_stats = {
-            "total_episodes": s_total,
-            "total_duration_hours": round(s_duration / 60, 2),
-            "average_duration_minutes": round(s_avg_dur, 1),
-            "total_listeners": s_listeners,
-            "average_listeners": round(s_avg_lis, 1),
-            "episodes_with_listener_data": s_listeners_count,
-            "last_updated": datetime.now().isoformat()
-        }
-        
-        spoken_data['stats'] = spoken_stats
-        
-        with open(SPOKEN_DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(spoken_data, f, indent=2, ensure_ascii=False)
-            
-        print("Spoken stats updated.")
-        print(json.dumps(spoken_stats, indent=2))
-    else:
-        print("Spoken database not found, skipping.")
+        if changed:
+            print(f"{label} stats updated.")
+        else:
+            print(f"{label} stats unchanged.")
+
+    save_state(state)
 
 if __name__ == "__main__":
-    update_stats()
+    update_stats(full='--full' in sys.argv)
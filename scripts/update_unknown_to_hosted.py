@@ -1,9 +1,8 @@
-import json
+from db_io import load_json, save_json
 
 db_path = 'shared/episodes_database.json'
 
-with open(db_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(db_path)
 
 count = 0
 for ep in data['episodes']:
@@ -13,7 +12,6 @@ for ep in data['episodes']:
         count += 1
         print(f"Updated: {ep.get('title')}")
 
-with open(db_path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+save_json(db_path, data)
 
 print(f"Successfully updated {count} episodes to 'hosted'.")
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from db_io import load_json
 
 # Extracted from CharmVerse (Browser Subagent)
 charmverse_data = {
@@ -24,8 +25,7 @@ charmverse_data = {
 
 def main():
     db_path = Path("data/episodes_database.json")
-    with open(db_path, "r") as f:
-        db = json.load(f)
+    db = load_json(db_path)
 
     updated_count = 0
     
@@ -4,9 +4,10 @@ Script para transcribir TODOS los episodios con Fireflies usando URLs de GitHub
 """
 import os
 import requests
-import json
 from pathlib import Path
 import time
+from db_io import load_json, save_json
+import instrumentation as instr
 
 # Configuración
 ENV_FILE = Path(".env")
@@ -33,7 +34,6 @@ def load_fireflies_api_key():
 
 def load_episode_metadata(space_id):
     """Carga metadata del episodio desde la base de datos"""
-    import json
     from pathlib import Path
     
     db_paths = [
@@ -46,8 +46,7 @@ def load_episode_metadata(space_id):
             continue
         
         try:
-            with open(db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(db_path)
             
             episodes = data.get('episodes', [])
             for episode in episodes:
@@ -96,11 +95,13 @@ def upload_audio_to_fireflies(audio_url, title, api_key, language='es'):
     }
     
     try:
-        response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=30)
+        with instr.timed_call('fireflies', query='uploadAudio'):
+            response = requests.post(GRAPHQL_ENDPOINT, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
             if 'errors' in result:
+                instr.inc('api_errors', api='fireflies', query='uploadAudio')
                 return None
             return result.get('data', {}).get('uploadAudio', {})
         else:
@@ -166,16 +167,18 @@ def main():
         print(f"            Título: {title[:60]}...")
         
         # Subir a Fireflies
-        result = upload_audio_to_fireflies(
-            audio_url=github_url,
-            title=title,
-            api_key=api_key,
-            language='es'
-        )
+        with instr.span('upload', file=filename):
+            result = upload_audio_to_fireflies(
+                audio_url=github_url,
+                title=title,
+                api_key=api_key,
+                language='es'
+            )
         
         if result and result.get('success'):
             print(f"            ✅ {result.get('message', 'Uploaded')}")
             uploaded += 1
+            instr.inc('uploads', status='queued')
             
             # Guardar registro de subida
             upload_record = {
@@ -188,10 +191,10 @@ def main():
             }
             
             record_file = OUTPUT_DIR / f"{space_id}_upload_record.json"
-            with open(record_file, 'w', encoding='utf-8') as f:
-                json.dump(upload_record, f, indent=2, ensure_ascii=False)
+            save_json(record_file, upload_record)
         else:
             print(f"            ❌ Error al subir")
+            instr.inc('uploads', status='failed')
             failed += 1
         
         # Pequeña pausa para no saturar la API
@@ -213,4 +216,5 @@ def main():
     print("   python3 scripts/download_fireflies_transcripts.py")
 
 if __name__ == "__main__":
-    main()
+    with instr.run('upload_all_to_fireflies'):
+        main()
@@ -1,4 +1,3 @@
-import json
 import zipfile
 import re
 from datetime import datetime
@@ -6,6 +5,7 @@ import sys
 import os
 sys.path.append(os.getcwd())
 import scripts.manual_xlsx_parse as parser
+from db_io import load_json
 
 # --- Helpers ---
 def normalize_title(t):
@@ -63,8 +63,7 @@ except Exception as e:
     exit(1)
 
 # 2. Load DB
-with open(db_path, 'r', encoding='utf-8') as f:
-    db = json.load(f)
+db = load_json(db_path)
 
 # Build lookups
 db_titles = set()
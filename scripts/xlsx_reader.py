@@ -0,0 +1,323 @@
+"""
+Streaming XLSX reader shared by the Excel sync/import scripts.
+
+Spaces Dashboard exports are read straight from the zip with
+ElementTree.iterparse, clearing each row once it has been yielded, so memory
+stays flat no matter how many rows the sheet has. Only the shared-strings
+table and the cell -> hyperlink map are kept in memory.
+
+    from xlsx_reader import XlsxReader
+
+    with XlsxReader('shared/inputs/Spoken - Spaces Dashboard.xlsx') as xlsx:
+        for row in xlsx.iter_rows(min_row=4):
+            print(row.number, row.value('B'), row.link('E'))
+
+parse_shared_strings / parse_hyperlinks / parse_sheet keep the list-of-cell-
+dicts interface that manual_xlsx_parse.py has always exposed.
+"""
+
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_REF_RE = re.compile(r'^([A-Z]+)(\d+)$')
+
+
+def split_ref(ref):
+    """'AB12' -> ('AB', 12)"""
+    match = _REF_RE.match(ref)
+    return match.group(1), int(match.group(2))
+
+
+def column_index(letters):
+    """'A' -> 1, 'AB' -> 28"""
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def column_letters(index):
+    """28 -> 'AB'"""
+    letters = ''
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class Cell:
+    """One cell: reference, typed value, raw text and hyperlink target."""
+
+    __slots__ = ('ref', 'value', 'raw', 'link')
+
+    def __init__(self, ref, value, raw, link):
+        self.ref = ref
+        self.value = value
+        self.raw = raw
+        self.link = link
+
+    def __repr__(self):
+        return f"Cell({self.ref!r}, {self.value!r}, link={self.link!r})"
+
+
+class Row:
+    """A sheet row; cells are looked up by column letter."""
+
+    __slots__ = ('number', 'cells')
+
+    def __init__(self, number, cells):
+        self.number = number
+        self.cells = cells
+
+    def __getitem__(self, col):
+        return self.cells.get(col)
+
+    def value(self, col, default=''):
+        cell = self.cells.get(col)
+        return default if cell is None or cell.value is None else cell.value
+
+    def link(self, col):
+        cell = self.cells.get(col)
+        return cell.link if cell is not None else None
+
+    def __repr__(self):
+        return f"Row({self.number}, {list(self.cells.values())!r})"
+
+
+def _convert(cell_type, text):
+    """Typed value for a cell's <v> text"""
+    if cell_type == 'b':
+        return text == '1'
+    if cell_type in ('str', 'e', 'd'):
+        return text
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() and 'E' not in text.upper() else number
+
+
+def _iter_sheet(f, rows=False):
+    """
+    iterparse over a worksheet that drops each <row> once it has been seen.
+
+    With rows=True the row element is yielded before it is cleared; either
+    way it is detached from <sheetData>, so the tree never grows.
+    """
+    sheet_data = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == f'{NS_MAIN}sheetData':
+                sheet_data = elem
+            continue
+
+        if elem.tag == f'{NS_MAIN}row':
+            if rows:
+                yield event, elem
+            elem.clear()
+            if sheet_data is not None:
+                sheet_data.remove(elem)
+        else:
+            yield event, elem
+
+
+class XlsxReader:
+    """Lazy, streaming reader over the worksheets of an .xlsx file."""
+
+    def __init__(self, source, shared_strings=None):
+        """
+        Args:
+            source: Path to the .xlsx file, or an already open ZipFile
+            shared_strings: Pre-parsed shared strings to reuse (optional)
+        """
+        self._owns_zip = not isinstance(source, zipfile.ZipFile)
+        self.zf = zipfile.ZipFile(source, 'r') if self._owns_zip else source
+        self._strings = shared_strings
+        self._sheets = None
+
+    def close(self):
+        if self._owns_zip:
+            self.zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- Workbook structure ---
+
+    @property
+    def sheets(self):
+        """Ordered {sheet name: zip path of its XML}"""
+        if self._sheets is None:
+            self._sheets = {}
+            targets = {}
+            try:
+                with self.zf.open('xl/_rels/workbook.xml.rels') as f:
+                    for rel in ET.parse(f).getroot().iter(f'{NS_PKG_REL}Relationship'):
+                        targets[rel.get('Id')] = rel.get('Target')
+                with self.zf.open('xl/workbook.xml') as f:
+                    for sheet in ET.parse(f).getroot().iter(f'{NS_MAIN}sheet'):
+                        target = targets.get(sheet.get(f'{NS_REL}id'), '')
+                        path = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+                        self._sheets[sheet.get('name')] = posixpath.normpath(path)
+            except KeyError:
+                pass
+            if not self._sheets:
+                self._sheets = {'Sheet1': 'xl/worksheets/sheet1.xml'}
+        return self._sheets
+
+    @property
+    def sheet_names(self):
+        return list(self.sheets)
+
+    def _sheet_path(self, sheet):
+        if sheet is None:
+            return next(iter(self.sheets.values()))
+        if isinstance(sheet, int):
+            return list(self.sheets.values())[sheet]
+        return self.sheets[sheet]
+
+    @property
+    def shared_strings(self):
+        """Shared-strings table, streamed once and cached"""
+        if self._strings is None:
+            self._strings = []
+            try:
+                with self.zf.open('xl/sharedStrings.xml') as f:
+                    for event, elem in ET.iterparse(f, events=('end',)):
+                        if elem.tag == f'{NS_MAIN}si':
+                            # Plain <t> or rich-text runs <r><t>; phonetic <rPh> is skipped
+                            parts = []
+                            for child in elem:
+                                if child.tag == f'{NS_MAIN}t':
+                                    parts.append(child.text or '')
+                                elif child.tag == f'{NS_MAIN}r':
+                                    t = child.find(f'{NS_MAIN}t')
+                                    if t is not None:
+                                        parts.append(t.text or '')
+                            self._strings.append(''.join(parts))
+                            elem.clear()
+            except KeyError:
+                pass
+        return self._strings
+
+    def hyperlinks(self, sheet=None):
+        """{cell ref: target URL} for one sheet"""
+        sheet_path = self._sheet_path(sheet)
+        rels_path = posixpath.join(posixpath.dirname(sheet_path), '_rels',
+                                   posixpath.basename(sheet_path) + '.rels')
+        targets = {}
+        try:
+            with self.zf.open(rels_path) as f:
+                for rel in ET.parse(f).getroot().iter(f'{NS_PKG_REL}Relationship'):
+                    if rel.get('Type', '').endswith('/hyperlink'):
+                        targets[rel.get('Id')] = rel.get('Target')
+        except KeyError:
+            return {}
+
+        # <hyperlinks> sits after <sheetData>, so stream past the rows
+        links = {}
+        with self.zf.open(sheet_path) as f:
+            for event, elem in _iter_sheet(f):
+                if elem.tag == f'{NS_MAIN}hyperlink':
+                    target = targets.get(elem.get(f'{NS_REL}id'))
+                    if target:
+                        links[elem.get('ref')] = target
+        return links
+
+    # --- Rows ---
+
+    def iter_rows(self, sheet=None, min_row=1, typed=True):
+        """
+        Yield Row records one at a time
+
+        Args:
+            sheet: Sheet name or index (default: first sheet)
+            min_row: First row number to yield (1-based, like openpyxl)
+            typed: Convert numbers/booleans; otherwise values are raw text
+        """
+        strings = self.shared_strings
+        links = self.hyperlinks(sheet)
+        tag_c, tag_v, tag_is, tag_t = (f'{NS_MAIN}c', f'{NS_MAIN}v', f'{NS_MAIN}is', f'{NS_MAIN}t')
+
+        # 'r' is optional on rows and cells; without it a row follows the
+        # previous one and a cell the previous cell
+        number = 0
+        with self.zf.open(self._sheet_path(sheet)) as f:
+            for event, elem in _iter_sheet(f, rows=True):
+                if elem.tag != f'{NS_MAIN}row':
+                    continue
+
+                r = elem.get('r')
+                number = int(r) if r else number + 1
+                if number < min_row:
+                    continue
+
+                cells = {}
+                column = 0
+                for c in elem.iter(tag_c):
+                    ref = c.get('r')
+                    if ref:
+                        col = split_ref(ref)[0]
+                        column = column_index(col)
+                    else:
+                        column += 1
+                        col = column_letters(column)
+                        ref = f'{col}{number}'
+                    cell_type = c.get('t')
+                    v = c.find(tag_v)
+
+                    if cell_type == 'inlineStr':
+                        inline = c.find(tag_is)
+                        raw = ''.join(t.text or '' for t in inline.iter(tag_t)) if inline is not None else ''
+                        value = raw
+                    elif v is None or v.text is None:
+                        raw = ''
+                        value = None
+                    elif cell_type == 's':
+                        raw = strings[int(v.text)]
+                        value = raw
+                    else:
+                        raw = v.text
+                        value = _convert(cell_type, raw) if typed else raw
+
+                    cells[col] = Cell(ref, value, raw, links.get(ref))
+
+                yield Row(number, cells)
+
+
+# --- manual_xlsx_parse compatible interface ---
+
+def parse_shared_strings(zf):
+    return XlsxReader(zf).shared_strings
+
+
+def parse_hyperlinks(zf):
+    """Relationship ID -> target for the first sheet"""
+    links = {}
+    try:
+        with zf.open('xl/worksheets/_rels/sheet1.xml.rels') as f:
+            for rel in ET.parse(f).getroot().iter(f'{NS_PKG_REL}Relationship'):
+                if rel.get('Type', '').endswith('/hyperlink'):
+                    links[rel.get('Id')] = rel.get('Target')
+    except KeyError:
+        pass
+    return links
+
+
+def parse_sheet(zf, strings, links_map):
+    """All rows of the first sheet as lists of {'ref', 'value', 'link'} dicts (raw text values)"""
+    reader = XlsxReader(zf, shared_strings=strings)
+    return [
+        [{'ref': c.ref, 'value': c.raw, 'link': c.link} for c in row.cells.values()]
+        for row in reader.iter_rows(typed=False)
+    ]
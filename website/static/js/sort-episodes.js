@@ -0,0 +1,22 @@
+// Client-side sorting of the episode cards on the simple_build listing pages
+function sortEpisodes(sortBy) {
+    const grid = document.getElementById('episodes-grid');
+    const episodes = Array.from(grid.getElementsByClassName('episode-card'));
+
+    episodes.sort((a, b) => {
+        if (sortBy === 'date-desc') {
+            return b.dataset.date.localeCompare(a.dataset.date);
+        } else if (sortBy === 'date-asc') {
+            return a.dataset.date.localeCompare(b.dataset.date);
+        } else if (sortBy === 'listeners-desc') {
+            return parseInt(b.dataset.listeners || 0) - parseInt(a.dataset.listeners || 0);
+        } else if (sortBy === 'listeners-asc') {
+            return parseInt(a.dataset.listeners || 0) - parseInt(b.dataset.listeners || 0);
+        }
+        return 0;
+    });
+
+    // Clear and re-append sorted episodes
+    grid.innerHTML = '';
+    episodes.forEach(ep => grid.appendChild(ep));
+}
@@ -0,0 +1,170 @@
+// Filtering, pagination and sorting for the spoken.html table
+let currentPage = 1;
+const rowsPerPage = 25;
+
+// Run initial render when DOM is loaded
+document.addEventListener("DOMContentLoaded", function() {
+    filterTable(); // This will effectively render page 1
+});
+
+function renderTable() {
+    const table = document.getElementById("spokenTable");
+    const tr = table.getElementsByTagName("tr");
+    const paginationControls = document.getElementById("paginationControls");
+    
+    // Get all rows that MATCH the filters
+    let filteredRows = [];
+    const hostFilterInput = document.getElementById("hostFilter");
+    const typeFilterInput = document.getElementById("typeFilter");
+    const hostFilter = hostFilterInput.value.toUpperCase();
+    const typeFilter = typeFilterInput.value.toUpperCase();
+    
+    for (let i = 1; i < tr.length; i++) {
+         const hostTd = tr[i].getElementsByTagName("td")[2]; // Host column index 2 (after Type)
+         const rowType = tr[i].getAttribute('data-type') || '';
+         
+         if (hostTd) {
+            const hostValue = hostTd.textContent || hostTd.innerText;
+            const hostMatch = hostFilter === "ALL" || hostValue.toUpperCase().includes(hostFilter) || hostValue.toUpperCase() === hostFilter;
+            const typeMatch = typeFilter === "ALL" || rowType.toUpperCase() === typeFilter;
+            
+            if (hostMatch && typeMatch) {
+                filteredRows.push(tr[i]);
+            } else {
+                tr[i].style.display = "none"; // Hide completely if not matching filters
+            }
+         }
+    }
+    
+    // Now calculate pagination based on FILTERED rows
+    const totalRows = filteredRows.length;
+    const totalPages = Math.ceil(totalRows / rowsPerPage);
+    
+    if (currentPage > totalPages) currentPage = totalPages;
+    if (currentPage < 1) currentPage = 1;
+    
+    const startIndex = (currentPage - 1) * rowsPerPage;
+    const endIndex = startIndex + rowsPerPage;
+    
+    // Show/Hide filtered rows based on pagination
+    for (let j = 0; j < filteredRows.length; j++) {
+        if (j >= startIndex && j < endIndex) {
+            filteredRows[j].style.display = "";
+        } else {
+            filteredRows[j].style.display = "none";
+        }
+    }
+    
+    // Update Controls - Numbered Links
+    let controlsHTML = '';
+    
+    if (totalPages > 1) {
+        // Add Previous
+        controlsHTML += `<button onclick="changePage(${currentPage - 1})" ${currentPage === 1 ? 'disabled' : ''}>&laquo;</button>`;
+        
+        // Numbered pages
+        for (let p = 1; p <= totalPages; p++) {
+            // Determine if we should show this page button (simple version: show all, or range)
+            // Showing all for user request "ir a cualquiera rápido" unless it's huge. 
+            // 657 / 25 = 27 pages. Showing 27 buttons is reasonable.
+            controlsHTML += `<button onclick="changePage(${p})" class="${p === currentPage ? 'current' : ''}">${p}</button>`;
+        }
+        
+        // Add Next
+        controlsHTML += `<button onclick="changePage(${currentPage + 1})" ${currentPage === totalPages ? 'disabled' : ''}>&raquo;</button>`;
+    }
+    
+    paginationControls.innerHTML = controlsHTML;
+}
+
+function changePage(pageNum) {
+    if (pageNum < 1) return;
+    // Max page check is done inside renderTable but verifying here is good too, 
+    // though we need totalPages which is calculated inside renderTable.
+    // renderTable handles bounds checks safely.
+    currentPage = pageNum;
+    renderTable();
+    window.scrollTo(0, 0);
+}
+
+function filterTable() {
+    // When filter changes, reset to page 1
+    currentPage = 1;
+    renderTable();
+}
+
+// function filterTableOld() { ... }
+
+function sortTable(n, isNumeric) {
+    var table, rows, switching, i, x, y, shouldSwitch, dir, switchcount = 0;
+    table = document.getElementById("spokenTable");
+    switching = true;
+    // Set the sorting direction to ascending:
+    dir = "asc";
+    
+    // Reset headers classes
+    var headers = table.getElementsByTagName("th");
+    for (i = 0; i < headers.length; i++) {
+        headers[i].classList.remove("sort-asc", "sort-desc");
+    }
+
+    while (switching) {
+        switching = false;
+        rows = table.rows;
+        // Iterate only over visible rows? 
+        // Standard sorting reorders DOM, so hidden rows would also be reordered.
+        // This is fine. But for user experience, let's just sort all rows.
+        
+        for (i = 1; i < (rows.length - 1); i++) {
+            shouldSwitch = false;
+            x = rows[i].getElementsByTagName("TD")[n];
+            y = rows[i + 1].getElementsByTagName("TD")[n];
+            
+            var xVal, yVal;
+            
+            if (x.hasAttribute('data-val')) {
+                xVal = x.getAttribute('data-val');
+                yVal = y.getAttribute('data-val');
+            } else {
+                xVal = x.innerHTML.toLowerCase();
+                yVal = y.innerHTML.toLowerCase();
+            }
+
+            if (isNumeric) {
+                 xVal = parseFloat(xVal) || 0;
+                 yVal = parseFloat(yVal) || 0;
+            }
+
+            if (dir == "asc") {
+                if (xVal > yVal) {
+                    shouldSwitch = true;
+                    break;
+                }
+            } else if (dir == "desc") {
+                if (xVal < yVal) {
+                    shouldSwitch = true;
+                    break;
+                }
+            }
+        }
+        if (shouldSwitch) {
+            rows[i].parentNode.insertBefore(rows[i + 1], rows[i]);
+            switching = true;
+            switchcount ++;
+        } else {
+            if (switchcount == 0 && dir == "asc") {
+                dir = "desc";
+                switching = true;
+            }
+        }
+    }
+    // Re-render pagination after sorting to ensure correct view
+    renderTable();
+    
+    // Update header class
+    if (dir === "asc") {
+        headers[n].classList.add("sort-asc");
+    } else {
+        headers[n].classList.add("sort-desc");
+    }
+}